@@ -0,0 +1,129 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Shared helpers for benchmarks.
+
+Benchmark is a plain script that is launched from project root, e.g.
+
+    python dev/profiling/benchmarks/config_history.py
+
+It creates separate test database (same way as test runner does), so it's safe to launch it against working ADCM
+settings, but it's still better to point `DB_*` env variables to PostgreSQL to get representative numbers.
+
+Unless `ADCM_BASE_DIR` is set, ADCM is pointed to a temporary base directory,
+so logs, secrets and token files written on settings import don't end up in project's `data` directory.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from statistics import mean, median
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Callable, Iterable
+import os
+import sys
+
+PROJECT_ROOT = Path(__file__).absolute().parents[3]
+
+
+def _prepare_base_dir() -> Path:
+    base_dir = Path(mkdtemp(prefix="adcm-benchmark-"))
+    for name in ("python", "conf"):
+        (base_dir / name).symlink_to(PROJECT_ROOT / name, target_is_directory=True)
+
+    for name in ("bundle", "download", "file", "log", "run", "var"):
+        (base_dir / "data" / name).mkdir(parents=True)
+
+    return base_dir
+
+
+if "ADCM_BASE_DIR" not in os.environ:
+    os.environ["ADCM_BASE_DIR"] = str(_prepare_base_dir())
+
+sys.path.insert(0, str(PROJECT_ROOT / "python"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "adcm.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def benchmark_environment():
+    """Test database with initial ADCM data and temporary directories for bundles, files and runs"""
+
+    from init_db import init
+    from rbac.upgrade.role import init_roles
+
+    stack, data = Path(mkdtemp()), Path(mkdtemp()) / "data"
+    directories = {
+        "STACK_DIR": stack,
+        "BUNDLE_DIR": stack / "data" / "bundle",
+        "DOWNLOAD_DIR": stack / "data" / "download",
+        "FILE_DIR": stack / "data" / "file",
+        "DATA_DIR": data,
+        "RUN_DIR": data / "run",
+        "LOG_DIR": data / "log",
+        "VAR_DIR": data / "var",
+    }
+    for directory in directories.values():
+        directory.mkdir(exist_ok=True, parents=True)
+
+    setup_test_environment()
+    original_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        with override_settings(**directories):
+            init_roles()
+            init()
+            yield directories
+    finally:
+        connection.creation.destroy_test_db(original_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func: Callable[[], object], repeat: int = 1) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+
+    return timings
+
+
+def report(title: str, header: Iterable[str], rows: Iterable[Iterable[object]]) -> None:
+    header = tuple(header)
+    rows = [tuple(map(_format, row)) for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+
+    print(f"\n{title}")
+    print(" | ".join(name.ljust(width) for name, width in zip(header, widths)))
+    print("-+-".join("-" * width for width in widths))
+    for row in rows:
+        print(" | ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def summary(timings: list[float]) -> str:
+    return f"mean {mean(timings) * 1000:.2f}ms / median {median(timings) * 1000:.2f}ms"
+
+
+def _format(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.4f}"
+
+    return str(value)
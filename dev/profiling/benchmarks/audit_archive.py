@@ -0,0 +1,120 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Audit cleanup with archiving of millions of records: whole archive rewrite versus segment per run
+
+Amount of rows archived per run may be passed as the first argument, default is 1 000 000.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest.mock import patch
+import sys
+
+from _utils import benchmark_environment, measure, report
+
+RUNS = 3
+ROWS_PER_RUN = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+INSERT_BATCH = 50_000
+
+
+def enable_archiving() -> None:
+    from cm.models import ADCM, ConfigLog
+
+    adcm = ADCM.objects.first()
+    config_log = ConfigLog.objects.get(id=adcm.config.current)
+    config_log.config["audit_data_retention"].update({"retention_period": 1, "data_archiving": True})
+    config_log.save(update_fields=["config"])
+
+
+def create_old_operations(amount: int) -> None:
+    from audit.models import AuditLog, AuditLogOperationResult, AuditLogOperationType
+    from django.utils import timezone
+
+    for offset in range(0, amount, INSERT_BATCH):
+        AuditLog.objects.bulk_create(
+            objs=[
+                AuditLog(
+                    operation_name=f"Synthetic operation {offset + i}",
+                    operation_type=AuditLogOperationType.UPDATE,
+                    operation_result=AuditLogOperationResult.SUCCESS,
+                    object_changes={"current": {"value": offset + i}, "previous": {"value": 0}},
+                    address="127.0.0.1",
+                )
+                for i in range(min(INSERT_BATCH, amount - offset))
+            ]
+        )
+
+    AuditLog.objects.filter(operation_name__startswith="Synthetic").update(
+        operation_time=timezone.now() - timedelta(days=10)
+    )
+
+
+def clear(mode: str, archive_dir: Path) -> None:
+    from audit.management.commands.clearaudit import Command
+    from django.core.management import call_command
+
+    tarfile_cfg = {
+        access: {**config, "name": str(archive_dir / Command.archive_name)}
+        for access, config in Command.tarfile_cfg.items()
+    }
+
+    with patch.multiple(
+        Command,
+        archive_base_dir=str(archive_dir),
+        archive_tmp_dir=str(archive_dir / "tmp"),
+        tarfile_cfg=tarfile_cfg,
+    ):
+        call_command("clearaudit", archive_mode=mode, stdout=StringIO())
+
+
+def run(mode: str) -> list[tuple]:
+    archive_dir = Path(mkdtemp())
+
+    rows = []
+    for run_number in range(1, RUNS + 1):
+        create_old_operations(amount=ROWS_PER_RUN)
+
+        (duration,) = measure(lambda: clear(mode=mode, archive_dir=archive_dir))
+
+        archive_size = sum(path.stat().st_size for path in archive_dir.glob("*.tar.gz"))
+        rows.append(
+            (
+                mode,
+                run_number,
+                ROWS_PER_RUN,
+                duration,
+                f"{ROWS_PER_RUN / duration:.0f}",
+                f"{archive_size / 1024 / 1024:.1f}",
+            )
+        )
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        enable_archiving()
+        rows = [row for mode in ("rewrite", "segment") for row in run(mode=mode)]
+
+    report(
+        title="Audit cleanup with archiving, same amount of records on each run",
+        header=("mode", "run", "records", "time, s", "records/s", "archive size, MB"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
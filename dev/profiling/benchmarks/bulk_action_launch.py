@@ -0,0 +1,105 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Launch of one action on hundreds of hosts: one by one versus bulk launch"""
+
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+from _utils import benchmark_environment, measure, report
+from django.db import connection
+
+HOSTS = (100, 300)
+BUNDLE_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles" / "provider"
+
+
+def prepare_hosts(amount: int) -> list:
+    from adcm.tests.base import BusinessLogicMixin
+    from cm.adcm_config.config import init_object_config
+    from cm.models import Host, HostProvider, Prototype
+
+    provider = HostProvider.objects.filter(name="benchmark").first()
+    if provider is None:
+        provider = BusinessLogicMixin.add_provider(bundle=BusinessLogicMixin().add_bundle(BUNDLE_DIR), name="benchmark")
+
+    # hosts are created directly, because `add_host` rechecks issues of all provider's hosts each time
+    prototype = Prototype.objects.get(bundle=provider.prototype.bundle, type="host")
+    for i in range(Host.objects.count(), amount):
+        host = Host.objects.create(prototype=prototype, provider=provider, fqdn=f"host-{i}")
+        host.config = init_object_config(proto=prototype, obj=host)
+        host.save(update_fields=["config"])
+
+    return list(Host.objects.select_related("prototype", "cluster").order_by("pk")[:amount])
+
+
+def count_query(queries: list, execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+def cleanup() -> None:
+    from cm.models import ConcernItem, TaskLog
+
+    TaskLog.objects.all().delete()
+    ConcernItem.objects.filter(type="lock").delete()
+
+
+def launch_one_by_one(action, hosts: list) -> None:
+    from cm.services.job.action import ActionRunPayload, run_action
+
+    for host in hosts:
+        run_action(action=action, obj=host, payload=ActionRunPayload())
+
+
+def launch_bulk(action, hosts: list) -> None:
+    from cm.services.job.action import ActionRunPayload, run_action_bulk
+
+    run_action_bulk(action=action, objects=hosts, payload=ActionRunPayload())
+
+
+def run(amount: int) -> list[tuple]:
+    from cm.models import Action
+
+    hosts = prepare_hosts(amount=amount)
+    action = Action.objects.select_related("prototype").get(name="action_on_host")
+
+    rows = []
+    for name, func in (("one by one", launch_one_by_one), ("bulk", launch_bulk)):
+        cleanup()
+        # runner processes aren't spawned, only launch path itself is measured
+        queries = []
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock, connection.execute_wrapper(
+            partial(count_query, queries)
+        ):
+            (duration,) = measure(lambda func=func: func(action, hosts))
+
+        rows.append((amount, name, popen_mock.call_count, len(queries), duration, f"{amount / duration:.1f}"))
+
+    cleanup()
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [row for amount in HOSTS for row in run(amount=amount)]
+
+    report(
+        title="Launch of host action on many hosts",
+        header=("hosts", "implementation", "runner processes", "queries", "time, s", "tasks/s"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
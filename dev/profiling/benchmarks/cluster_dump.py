@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""dumpcluster/loadcluster on clusters of different size: query per object versus streaming with bulk queries"""
+
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import json
+import tracemalloc
+
+from _utils import benchmark_environment, measure, report
+from django.conf import settings
+from django.db import connection
+
+HOSTS = (100, 1000, 5000)
+PASSWORD = "benchmark"
+BUNDLES_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles"
+
+
+def count_query(queries: list, execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+def prepare_cluster(amount: int, cluster_bundle, provider_bundle):
+    from adcm.tests.base import BusinessLogicMixin
+    from api_v2.service.utils import bulk_init_config
+    from cm.models import Host, HostComponent, Prototype, ServiceComponent
+
+    logic = BusinessLogicMixin()
+    cluster = logic.add_cluster(bundle=cluster_bundle, name=f"benchmark-{amount}")
+    provider = logic.add_provider(bundle=provider_bundle, name=f"benchmark-{amount}")
+    logic.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=cluster)
+
+    # hosts are created directly, because `add_host` rechecks issues of all provider's hosts each time
+    prototype = Prototype.objects.get(bundle=provider.prototype.bundle, type="host")
+    Host.objects.bulk_create(
+        Host(prototype=prototype, provider=provider, cluster=cluster, fqdn=f"host-{amount}-{i}") for i in range(amount)
+    )
+    bulk_init_config(objects=Host.objects.filter(cluster=cluster).select_related("prototype"))
+
+    components = list(ServiceComponent.objects.filter(cluster=cluster))
+    HostComponent.objects.bulk_create(
+        HostComponent(cluster=cluster, host_id=host_id, service_id=component.service_id, component=component)
+        for host_id in Host.objects.filter(cluster=cluster).values_list("id", flat=True)
+        for component in components
+    )
+
+    return cluster
+
+
+def legacy_dump(cluster_id: int) -> bytes:
+    """Dump as it was before streaming: every object is read with its own queries, document is encrypted at once"""
+
+    from cm.management.commands.dumpcluster import encrypt_data, get_cluster, get_config, get_groups, get_provider
+    from cm.models import ClusterObject, Host, HostComponent, ServiceComponent
+
+    def get_with_config(model, id_, fields):
+        obj = model.objects.values(*fields, "prototype__bundle__hash").get(id=id_)
+        obj["config"] = get_config(obj["config"])
+        obj["bundle_hash"] = obj.pop("prototype__bundle__hash")
+        return obj
+
+    cluster, bundle = get_cluster(cluster_id)
+    data = {"ADCM_VERSION": settings.ADCM_VERSION, "bundles": {bundle["hash"]: bundle}, "cluster": cluster}
+    data["groups"] = get_groups([cluster_id], "cluster")
+    data["hosts"] = [
+        get_with_config(Host, host_id, ("id", "fqdn", "description", "provider", "provider__name", "config", "state"))
+        for host_id in Host.objects.filter(cluster_id=cluster_id).values_list("id", flat=True)
+    ]
+    data["providers"] = []
+    for provider_id in {host["provider"] for host in data["hosts"]}:
+        provider, bundle = get_provider(provider_id)
+        data["providers"].append(provider)
+        data["groups"].extend(get_groups([provider_id], "hostprovider"))
+        data["bundles"][bundle["hash"]] = bundle
+
+    data["services"] = []
+    for service_id in ClusterObject.objects.filter(cluster_id=cluster_id).values_list("id", flat=True):
+        data["services"].append(get_with_config(ClusterObject, service_id, ("id", "prototype__name", "config")))
+        data["groups"].extend(get_groups([service_id], "clusterobject"))
+
+    data["components"] = []
+    for component_id in ServiceComponent.objects.filter(cluster_id=cluster_id).values_list("id", flat=True):
+        data["components"].append(
+            get_with_config(ServiceComponent, component_id, ("id", "prototype__name", "service", "config"))
+        )
+        data["groups"].extend(get_groups([component_id], "servicecomponent"))
+
+    data["host_components"] = [
+        HostComponent.objects.values("cluster", "host", "service", "component", "state").get(id=hc_id)
+        for hc_id in HostComponent.objects.filter(cluster_id=cluster_id).values_list("id", flat=True)
+    ]
+    data["adcm_password"] = settings.ANSIBLE_SECRET
+
+    return encrypt_data(PASSWORD, json.dumps(data, indent=2).encode(settings.ENCODING_UTF_8))
+
+
+def streaming_dump(cluster_id: int) -> str:
+    from cm.management.commands.dumpcluster import get_fernet, iter_records, write_records
+
+    stream = StringIO()
+    write_records(iter_records(cluster_id), get_fernet(PASSWORD), stream)
+
+    return stream.getvalue()
+
+
+def run(amount: int, bundles: tuple, directory: Path) -> list[tuple]:
+    from cm.management.commands.loadcluster import load
+    from cm.models import Host
+
+    cluster = prepare_cluster(amount, *bundles)
+
+    rows = []
+    for name, func in (("query per object", legacy_dump), ("streaming", streaming_dump)):
+        queries = []
+        with connection.execute_wrapper(partial(count_query, queries)):
+            (duration,) = measure(lambda func=func: func(cluster_id=cluster.pk))
+
+        tracemalloc.start()
+        func(cluster_id=cluster.pk)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        rows.append((amount, "dump", name, len(queries), duration, f"{peak / 2**20:.1f}"))
+
+    dump_path = directory / f"{amount}.dump"
+    dump_path.write_text(streaming_dump(cluster_id=cluster.pk), encoding=settings.ENCODING_UTF_8)
+    Host.objects.filter(cluster=cluster).delete()
+    cluster.delete()
+
+    queries = []
+    with patch("getpass.getpass", return_value=PASSWORD), redirect_stdout(StringIO()), connection.execute_wrapper(
+        partial(count_query, queries)
+    ):
+        (duration,) = measure(lambda: load(file_path=dump_path))
+
+    rows.append((amount, "load", "streaming", len(queries), duration, "-"))
+
+    return rows
+
+
+def main() -> None:
+    from adcm.tests.base import BusinessLogicMixin
+
+    with benchmark_environment(), TemporaryDirectory() as directory:
+        bundles = tuple(BusinessLogicMixin().add_bundle(BUNDLES_DIR / name) for name in ("cluster_1", "provider"))
+        rows = [row for amount in HOSTS for row in run(amount=amount, bundles=bundles, directory=Path(directory))]
+
+    report(
+        title="Cluster dump and load, each host is mapped to all 3 components",
+        header=("hosts", "command", "implementation", "queries", "time, s", "peak memory, MiB"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
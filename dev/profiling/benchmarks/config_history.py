@@ -0,0 +1,81 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Storage size and read latency of ConfigLog history in full and delta modes"""
+
+from copy import deepcopy
+import json
+import random
+
+from _utils import benchmark_environment, measure, report, summary
+from django.test.utils import override_settings
+
+HISTORY_LENGTHS = (100, 1000)
+
+rng = random.Random(42)  # noqa: S311
+
+
+def run(history_length: int, delta_storage: bool) -> tuple:
+    from cm.adcm_config.config import save_object_config
+    from cm.models import ADCM, ConfigLog
+
+    adcm = ADCM.objects.first()
+    current = ConfigLog.objects.get(pk=adcm.config.current)
+    config, attr = deepcopy(current.config), deepcopy(current.attr)
+
+    def save_revisions() -> None:
+        for i in range(history_length):
+            save_object_config(
+                object_config=adcm.config,
+                config={**config, "global": {**config["global"], "adcm_url": f"http://adcm-{i}.local"}},
+                attr=attr,
+            )
+
+    with override_settings(CONFIG_LOG_DELTA_STORAGE=delta_storage):
+        write_timings = measure(save_revisions)
+
+    adcm.config.refresh_from_db()
+    history = ConfigLog.objects.filter(obj_ref=adcm.config)
+    stored_bytes = sum(
+        len(json.dumps(config_)) + len(json.dumps(attr_)) + len(json.dumps(delta))
+        for config_, attr_, delta in history.values_list("config", "attr", "delta")
+    )
+    history_ids = list(ConfigLog.objects.filter(obj_ref=adcm.config).values_list("pk", flat=True))
+
+    current_read = measure(lambda: ConfigLog.objects.get(pk=adcm.config.current), repeat=200)
+    history_read = measure(lambda: ConfigLog.objects.get(pk=rng.choice(history_ids)), repeat=200)
+
+    ConfigLog.objects.filter(obj_ref=adcm.config).exclude(pk=adcm.config.current).delete()
+
+    return (
+        history_length,
+        "delta" if delta_storage else "full",
+        f"{stored_bytes / 1024:.1f} KiB",
+        f"{write_timings[0] / history_length * 1000:.2f}ms",
+        summary(current_read),
+        summary(history_read),
+    )
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [run(length, delta_storage) for length in HISTORY_LENGTHS for delta_storage in (False, True)]
+
+    report(
+        title="ConfigLog history storage",
+        header=("revisions", "mode", "stored", "write / revision", "read current", "read history"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Playbook setting cluster config in a loop: adcm_config call per change versus deferred changes"""
+
+from functools import partial
+from pathlib import Path
+
+from _utils import benchmark_environment, measure, report
+from django.conf import settings
+from django.db import connection
+
+CHANGES = (50, 200)
+JOB_ID = 1
+BUNDLE_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles" / "cluster_full_config"
+
+
+def count_query(queries: list, execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+def set_one_by_one(cluster_id: int, values: range) -> None:
+    from ansible_plugin.utils import set_cluster_config
+
+    for value in values:
+        set_cluster_config(cluster_id=cluster_id, config={"integer": value}, attr={})
+
+
+def set_deferred(cluster_id: int, values: range) -> None:
+    from ansible_plugin.utils import flush_deferred_config, set_cluster_config
+
+    for value in values:
+        set_cluster_config(cluster_id=cluster_id, config={"integer": value}, attr={}, defer_job_id=JOB_ID)
+
+    flush_deferred_config(job_id=JOB_ID)
+
+
+def main() -> None:
+    with benchmark_environment():
+        from adcm.tests.base import BusinessLogicMixin
+        from cm.models import ConfigLog
+
+        (settings.RUN_DIR / str(JOB_ID)).mkdir(parents=True, exist_ok=True)
+        cluster = BusinessLogicMixin.add_cluster(bundle=BusinessLogicMixin().add_bundle(BUNDLE_DIR), name="benchmark")
+
+        rows = []
+        start = 0
+        for amount in CHANGES:
+            for name, func in (("call per change", set_one_by_one), ("deferred", set_deferred)):
+                # each run sets values different from the previous ones
+                values = range(start, start + amount)
+                start += amount
+
+                revisions = ConfigLog.objects.filter(obj_ref=cluster.config).count()
+                queries = []
+                with connection.execute_wrapper(partial(count_query, queries)):
+                    (duration,) = measure(lambda func=func, values=values: func(cluster_id=cluster.pk, values=values))
+
+                new_revisions = ConfigLog.objects.filter(obj_ref=cluster.config).count() - revisions
+                rows.append((amount, name, new_revisions, len(queries), duration))
+
+    report(
+        title="Cluster config changes made by adcm_config plugin within one job",
+        header=("changes", "implementation", "new revisions", "queries", "time, s"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Big job output: redirect to file and read it after job versus reading pipes with chunks saved to database"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import os
+import sys
+import subprocess
+import tracemalloc
+
+from _utils import benchmark_environment, measure, report
+from django.conf import settings
+
+OUTPUT_MIB = (10, 100)
+SCRIPT = """
+import sys
+line = "ok: [host-1] => (item=/etc/hosts) " + "x" * 987 + "\\n"
+for _ in range({lines}):
+    sys.stdout.write(line)
+"""
+
+
+def prepare_job():
+    from cm.models import JobLog, JobStatus, LogStorage
+    from django.utils import timezone
+
+    job = JobLog.objects.create(status=JobStatus.CREATED, start_date=timezone.now(), finish_date=timezone.now())
+    LogStorage.objects.bulk_create(
+        LogStorage(job=job, name="python", type=type_, format="txt") for type_ in ("stdout", "stderr")
+    )
+    work_dir = settings.RUN_DIR / str(job.pk)
+    work_dir.mkdir(parents=True)
+
+    return job, work_dir
+
+
+def legacy_run(mib: int) -> int:
+    """Run as it was before: output is redirected to files and whole file is saved to log's body after job"""
+
+    from cm.models import LogStorage
+
+    job, work_dir = prepare_job()
+    with (work_dir / "python-stdout.txt").open(mode="a+", encoding="utf-8") as out, (
+        work_dir / "python-stderr.txt"
+    ).open(mode="a+", encoding="utf-8") as err:
+        command = [sys.executable, "-c", SCRIPT.format(lines=mib * 1024)]
+        process = subprocess.Popen(command, stdout=out, stderr=err)  # noqa: S603
+        process.wait()
+
+    for log_type in ("stderr", "stdout"):
+        log = LogStorage.objects.filter(job_id=job.pk, name="python", type=log_type).first()
+        log.body = (work_dir / f"python-{log_type}.txt").read_text(encoding="utf-8")
+        log.save(update_fields=["body"])
+
+    return 2
+
+
+def pipeline_run(mib: int) -> int:
+    from cm.log import LogStorageOutputSink
+    from cm.models import LogChunk
+    from cm.services.job.run._target_factories import save_fs_logs_to_db
+    from core.job.executors import BundleExecutorConfig, ProcessExecutor
+    from core.job.types import BundleInfo, ScriptType
+
+    class InlinePythonExecutor(ProcessExecutor):
+        script_type = "python"
+
+        def _prepare_command(self) -> list[str]:
+            return [sys.executable, "-c", SCRIPT.format(lines=mib * 1024)]
+
+    job, work_dir = prepare_job()
+    config = BundleExecutorConfig(
+        work_dir=work_dir, job_script="", bundle=BundleInfo(root=work_dir, config_dir=work_dir)
+    )
+    executor = InlinePythonExecutor(config=config, output_sink=LogStorageOutputSink(job_id=job.pk, name="python"))
+    # executor changes directory to bundle root
+    cwd = Path.cwd()
+    try:
+        executor.execute().wait_finished()
+    finally:
+        os.chdir(cwd)
+
+    job_info = SimpleNamespace(id=job.pk, type=ScriptType.PYTHON)
+    for log_type in ("stderr", "stdout"):
+        save_fs_logs_to_db(job=job_info, work_dir=work_dir, log_type=log_type)
+
+    return LogChunk.objects.filter(log__job_id=job.pk).count()
+
+
+def run(mib: int) -> list[tuple]:
+    rows = []
+    for name, func in (("file read after job", legacy_run), ("chunks while running", pipeline_run)):
+        (duration,) = measure(lambda func=func: func(mib))
+
+        tracemalloc.start()
+        writes = func(mib)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        rows.append((mib, name, writes, duration, f"{peak / 2**20:.1f}"))
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [row for mib in OUTPUT_MIB for row in run(mib)]
+
+    report(
+        title="Job with big stdout, output is saved to database",
+        header=("output, MiB", "implementation", "log writes", "time, s", "peak memory, MiB"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
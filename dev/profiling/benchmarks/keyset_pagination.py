@@ -0,0 +1,105 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pages of large audit history: limit/offset versus keyset pagination at different depth
+
+Amount of audit records may be passed as the first argument, default is 1 000 000.
+"""
+
+from urllib.parse import parse_qs, urlparse
+import sys
+
+from _utils import benchmark_environment, measure, report, summary
+
+RECORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+INSERT_BATCH = 50_000
+PAGE_SIZE = 50
+
+
+def create_records(amount: int) -> None:
+    from audit.models import AuditLog, AuditLogOperationResult, AuditLogOperationType
+
+    for offset in range(0, amount, INSERT_BATCH):
+        AuditLog.objects.bulk_create(
+            objs=[
+                AuditLog(
+                    operation_name=f"Synthetic operation {offset + i}",
+                    operation_type=AuditLogOperationType.UPDATE,
+                    operation_result=AuditLogOperationResult.SUCCESS,
+                )
+                for i in range(min(INSERT_BATCH, amount - offset))
+            ]
+        )
+
+
+def get_page(query: dict) -> list:
+    from api_v2.pagination import OptionalKeysetPagination
+    from audit.models import AuditLog
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    class View:
+        keyset_ordering = "-pk"
+
+    pagination = OptionalKeysetPagination()
+    request = Request(APIRequestFactory().get("/api/v2/audit/operations/", query))
+    page = pagination.paginate_queryset(queryset=AuditLog.objects.order_by("-pk"), request=request, view=View())
+    pagination.get_paginated_response(data=[record.pk for record in page])
+
+    return page
+
+
+def cursor_at(depth: int) -> str:
+    """Cursor pointing to the same record as `offset=depth`, like the one from `next` link of previous page"""
+
+    from api_v2.pagination import _KeysetPagination
+    from audit.models import AuditLog
+    from rest_framework.pagination import Cursor
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    position = AuditLog.objects.order_by("-pk").values_list("pk", flat=True)[depth - 1]
+    keyset = _KeysetPagination(ordering="-pk")
+    keyset.base_url = "/api/v2/audit/operations/"
+    keyset.request = Request(APIRequestFactory().get(keyset.base_url))
+    link = keyset.encode_cursor(Cursor(offset=0, reverse=False, position=str(position)))
+
+    return parse_qs(urlparse(link).query)["cursor"][0]
+
+
+def main() -> None:
+    rows = []
+    with benchmark_environment():
+        create_records(amount=RECORDS)
+
+        for label, depth in (("first", 0), ("middle", RECORDS // 2), ("last", RECORDS - PAGE_SIZE)):
+            offset_query = {"limit": PAGE_SIZE, "offset": depth}
+            keyset_query = {"limit": PAGE_SIZE, "cursor": cursor_at(depth) if depth else ""}
+
+            for mode, query in (
+                ("offset", offset_query),
+                ("keyset", keyset_query),
+                ("keyset, approximate count", {**keyset_query, "count": "approximate"}),
+            ):
+                timings = measure(lambda query=query: get_page(query), repeat=5)
+                rows.append((RECORDS, label, mode, summary(timings)))
+
+    report(
+        title="Audit operations page of 50 records",
+        header=("records", "page", "pagination", "time"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
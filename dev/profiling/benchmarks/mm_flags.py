@@ -0,0 +1,130 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Flags update after host's maintenance mode toggle: hierarchy per flag versus one hierarchy of changed cluster"""
+
+from functools import partial
+from pathlib import Path
+
+from _utils import benchmark_environment, measure, report
+from django.db import connection
+
+HOSTS = (50, 200)
+CLUSTERS = 2
+BUNDLES_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles"
+
+
+def count_query(queries: list, execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+def prepare_cluster(amount: int, name: str, cluster_bundle, provider_bundle):
+    from adcm.tests.base import BusinessLogicMixin
+    from cm.models import Host, HostComponent, Prototype, ServiceComponent
+
+    cluster = BusinessLogicMixin.add_cluster(bundle=cluster_bundle, name=name)
+    provider = BusinessLogicMixin.add_provider(bundle=provider_bundle, name=name)
+    BusinessLogicMixin.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=cluster)
+
+    # hosts are created directly, because `add_host` rechecks issues of all provider's hosts each time
+    prototype = Prototype.objects.get(bundle=provider_bundle, type="host")
+    Host.objects.bulk_create(
+        Host(prototype=prototype, provider=provider, cluster=cluster, fqdn=f"{name}-host-{i}") for i in range(amount)
+    )
+    components = list(ServiceComponent.objects.filter(cluster=cluster))
+    HostComponent.objects.bulk_create(
+        HostComponent(cluster=cluster, host_id=host_id, service_id=component.service_id, component=component)
+        for host_id in Host.objects.filter(cluster=cluster).values_list("id", flat=True)
+        for component in components
+    )
+
+    return cluster
+
+
+def raise_flags(cluster) -> None:
+    """Outdated config flag on every object of cluster"""
+
+    from cm.converters import orm_object_to_core_type
+    from cm.models import ClusterObject, Host, ServiceComponent
+    from cm.services.concern.flags import BuiltInFlag, raise_flag, update_hierarchy_for_clusters
+    from core.types import CoreObjectDescriptor
+
+    objects = [
+        cluster,
+        *ClusterObject.objects.filter(cluster=cluster),
+        *ServiceComponent.objects.filter(cluster=cluster),
+        *Host.objects.filter(cluster=cluster),
+    ]
+    raise_flag(
+        flag=BuiltInFlag.ADCM_OUTDATED_CONFIG.value,
+        on_objects=[CoreObjectDescriptor(id=object_.id, type=orm_object_to_core_type(object_)) for object_ in objects],
+    )
+    update_hierarchy_for_clusters(cluster_ids=[cluster.id])
+
+
+def update_every_flag(cluster_id: int) -> None:  # noqa: ARG001
+    from cm.models import ConcernItem, ConcernType
+    from cm.services.concern.flags import update_hierarchy
+
+    for flag in ConcernItem.objects.filter(type=ConcernType.FLAG):
+        update_hierarchy(concern=flag)
+
+
+def update_cluster_flags(cluster_id: int) -> None:
+    from cm.services.concern.flags import update_hierarchy_for_clusters
+
+    update_hierarchy_for_clusters(cluster_ids=[cluster_id])
+
+
+def run(amount: int, bundles: tuple) -> list[tuple]:
+    from cm.models import ConcernItem, ConcernType, Host, MaintenanceMode
+
+    clusters = [prepare_cluster(amount, f"{amount}-{i}", *bundles) for i in range(CLUSTERS)]
+    for cluster in clusters:
+        raise_flags(cluster=cluster)
+
+    flags = ConcernItem.objects.filter(type=ConcernType.FLAG).count()
+    cluster = clusters[0]
+    host = Host.objects.filter(cluster=cluster).first()
+
+    rows = []
+    for name, func in (("hierarchy per flag", update_every_flag), ("cluster hierarchy", update_cluster_flags)):
+        Host.objects.filter(id=host.id).update(maintenance_mode=MaintenanceMode.ON)
+        queries = []
+        with connection.execute_wrapper(partial(count_query, queries)):
+            (duration,) = measure(lambda func=func: func(cluster_id=cluster.id))
+
+        rows.append((amount, flags, name, len(queries), duration))
+
+        Host.objects.filter(id=host.id).update(maintenance_mode=MaintenanceMode.OFF)
+        update_cluster_flags(cluster_id=cluster.id)
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        from adcm.tests.base import BusinessLogicMixin
+
+        bundles = tuple(BusinessLogicMixin().add_bundle(BUNDLES_DIR / name) for name in ("cluster_1", "provider"))
+        rows = [row for amount in HOSTS for row in run(amount=amount, bundles=bundles)]
+
+    report(
+        title=f"Flags update after host enters maintenance mode, {CLUSTERS} clusters with flag on every object",
+        header=("hosts in cluster", "flags", "implementation", "queries", "time, s"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concerns and status server update after maintenance mode change: rechecks per object versus single pass"""
+
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+from _utils import benchmark_environment, measure, report
+from django.db import connection
+
+HOSTS = (200, 2000)
+# previous implementation rebuilds hierarchy for each object, it takes too long on big clusters
+LEGACY_MAX_HOSTS = 200
+BUNDLES_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles"
+
+
+def count_query(queries: list, execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+def prepare_cluster(amount: int, cluster_bundle, provider_bundle):
+    from adcm.tests.base import BusinessLogicMixin
+    from api_v2.service.utils import bulk_init_config
+    from cm.converters import orm_object_to_core_type
+    from cm.issue import create_issue
+    from cm.models import ClusterObject, ConcernCause, ConcernType, Host, HostComponent, Prototype, ServiceComponent
+    from cm.services.concern.distribution import redistribute_concerns
+    from cm.services.concern.flags import BuiltInFlag, raise_flag
+    from core.types import CoreObjectDescriptor
+
+    name = f"benchmark-{amount}"
+    cluster = BusinessLogicMixin.add_cluster(bundle=cluster_bundle, name=name)
+    provider = BusinessLogicMixin.add_provider(bundle=provider_bundle, name=name)
+    BusinessLogicMixin.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=cluster)
+
+    # hosts are created directly, because `add_host` rechecks issues of all provider's hosts each time
+    prototype = Prototype.objects.get(bundle=provider_bundle, type="host")
+    Host.objects.bulk_create(
+        Host(prototype=prototype, provider=provider, cluster=cluster, fqdn=f"{name}-host-{i}") for i in range(amount)
+    )
+    hosts = Host.objects.filter(cluster=cluster).select_related("prototype")
+    bulk_init_config(objects=hosts)
+    components = list(ServiceComponent.objects.filter(cluster=cluster))
+    HostComponent.objects.bulk_create(
+        HostComponent(cluster=cluster, host_id=host.id, service_id=component.service_id, component=component)
+        for host in hosts
+        for component in components
+    )
+
+    # issue on cluster and flag on every object of cluster
+    create_issue(obj=cluster, issue_cause=ConcernCause.CONFIG)
+    objects = [cluster, *ClusterObject.objects.filter(cluster=cluster), *components, *hosts]
+    raise_flag(
+        flag=BuiltInFlag.ADCM_OUTDATED_CONFIG.value,
+        on_objects=[CoreObjectDescriptor(id=object_.id, type=orm_object_to_core_type(object_)) for object_ in objects],
+    )
+    redistribute_concerns(cluster_ids=[cluster.id], concern_types=(ConcernType.ISSUE, ConcernType.FLAG))
+
+    return cluster
+
+
+def legacy_update(obj) -> None:
+    """Update as it was before single pass: hierarchy rechecks, global issues scan, all flags, status server"""
+
+    from cm.issue import update_hierarchy_issues, update_issue_after_deleting
+    from cm.models import ConcernItem, ConcernType, Host, HostComponent
+    from cm.services.concern.flags import update_hierarchy
+    from cm.services.status.notify import reset_objects_in_mm
+
+    if isinstance(obj, Host):
+        update_hierarchy_issues(obj.provider)
+
+    providers = {host_component.host.provider for host_component in HostComponent.objects.filter(cluster=obj.cluster)}
+    for provider in providers:
+        update_hierarchy_issues(provider)
+
+    update_hierarchy_issues(obj.cluster)
+    update_issue_after_deleting()
+    for flag in ConcernItem.objects.filter(type=ConcernType.FLAG):
+        update_hierarchy(concern=flag)
+
+    reset_objects_in_mm()
+
+
+def single_pass_update(obj) -> None:
+    from cm.services.maintenance_mode import _update_mm_hierarchy_issues
+
+    _update_mm_hierarchy_issues(obj=obj)
+
+
+def run(amount: int, bundles: tuple) -> list[tuple]:
+    from cm.models import ClusterObject, Host, MaintenanceMode
+
+    cluster = prepare_cluster(amount, *bundles)
+    host = Host.objects.filter(cluster=cluster).first()
+    service = ClusterObject.objects.filter(cluster=cluster).first()
+
+    implementations = [("single pass", single_pass_update)]
+    if amount <= LEGACY_MAX_HOSTS:
+        implementations.insert(0, ("rechecks per object", legacy_update))
+
+    rows = []
+    for name, func in implementations:
+        for obj in (host, service):
+            for value in (MaintenanceMode.ON, MaintenanceMode.OFF):
+                obj.maintenance_mode = value
+                obj.save()
+
+                queries = []
+                with patch("cm.services.status.notify.api_request") as status_request, connection.execute_wrapper(
+                    partial(count_query, queries)
+                ):
+                    (duration,) = measure(lambda func=func, obj=obj: func(obj))
+
+                rows.append(
+                    (amount, obj.prototype.type, value, name, len(queries), status_request.call_count, duration)
+                )
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        from adcm.tests.base import BusinessLogicMixin
+
+        bundles = tuple(BusinessLogicMixin().add_bundle(BUNDLES_DIR / name) for name in ("cluster_1", "provider"))
+        rows = [row for amount in HOSTS for row in run(amount=amount, bundles=bundles)]
+
+    report(
+        title="Update after maintenance mode change, every host is mapped to all 3 components",
+        header=("hosts", "object", "mm", "implementation", "queries", "status requests", "time, s"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
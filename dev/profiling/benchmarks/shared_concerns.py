@@ -0,0 +1,127 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serialization of concerns for host list where all hosts share the same lock"""
+
+from pathlib import Path
+
+from _utils import benchmark_environment, measure, report, summary
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+HOSTS = (100, 1000)
+BUNDLE_DIR = Path(__file__).absolute().parents[3] / "python" / "cm" / "tests" / "bundles" / "provider"
+
+
+def prepare_hosts(amount: int) -> None:
+    from adcm.tests.base import BusinessLogicMixin
+    from cm.models import ConcernItem, ConcernType, Host, HostProvider, Prototype
+    from django.contrib.contenttypes.models import ContentType
+
+    provider = HostProvider.objects.filter(name="benchmark").first()
+    if provider is None:
+        provider = BusinessLogicMixin.add_provider(bundle=BusinessLogicMixin().add_bundle(BUNDLE_DIR), name="benchmark")
+
+    # hosts are created directly, because `add_host` rechecks issues of all provider's hosts each time
+    prototype = Prototype.objects.get(bundle=provider.prototype.bundle, type="host")
+    Host.objects.bulk_create(
+        Host(prototype=prototype, provider=provider, fqdn=f"host-{i}") for i in range(Host.objects.count(), amount)
+    )
+
+    lock, _ = ConcernItem.objects.get_or_create(
+        type=ConcernType.LOCK,
+        name="benchmark lock",
+        owner_id=provider.pk,
+        owner_type=ContentType.objects.get_for_model(HostProvider),
+        defaults={"reason": {"message": "Object locked by running task on ${target}", "placeholder": {}}},
+    )
+    Host.concerns.through.objects.bulk_create(
+        (
+            Host.concerns.through(host_id=host_id, concernitem_id=lock.pk)
+            for host_id in Host.objects.exclude(concerns=lock).values_list("id", flat=True)
+        ),
+    )
+
+
+def serializer_classes():
+    from api_v2.concern.serializers import ConcernSerializer, ReasonSerializer
+    from cm.models import ConcernItem, Host
+    from cm.utils import get_obj_type
+    from rest_framework.fields import BooleanField, SerializerMethodField
+    from rest_framework.serializers import ModelSerializer
+
+    class LegacyConcernSerializer(ModelSerializer):
+        """Concern serialization as it was before rendered concerns were reused"""
+
+        is_blocking = BooleanField(source="blocking")
+        owner = SerializerMethodField()
+        reason = ReasonSerializer()
+
+        class Meta:
+            model = ConcernItem
+            fields = ("id", "type", "reason", "is_blocking", "cause", "owner")
+
+        def get_owner(self, obj):
+            return {"id": obj.owner_id, "type": get_obj_type(obj.owner_type.name) if obj.owner_type else None}
+
+    class LegacyHostSerializer(ModelSerializer):
+        concerns = LegacyConcernSerializer(many=True)
+
+        class Meta:
+            model = Host
+            fields = ("id", "concerns")
+
+    class HostSerializer(ModelSerializer):
+        concerns = ConcernSerializer(many=True)
+
+        class Meta:
+            model = Host
+            fields = ("id", "concerns")
+
+    return (("legacy", LegacyHostSerializer), ("shared", HostSerializer))
+
+
+def run(amount: int) -> list[tuple]:
+    from cm.models import Host
+
+    prepare_hosts(amount=amount)
+
+    rows = []
+    for name, serializer_class in serializer_classes():
+
+        def serialize(serializer_class=serializer_class):
+            return serializer_class(
+                instance=Host.objects.prefetch_related("concerns").order_by("pk")[:amount], many=True
+            ).data
+
+        with CaptureQueriesContext(connection) as queries:
+            serialize()
+
+        timings = measure(serialize, repeat=10)
+        rows.append((amount, name, len(queries), summary(timings)))
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [row for amount in HOSTS for row in run(amount=amount)]
+
+    report(
+        title="Host list concerns serialization, one lock shared by all hosts",
+        header=("hosts", "implementation", "queries", "time"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Burst of task launches: runner per task started right away versus task scheduler with concurrency limit
+
+Runner is imitated by process that initializes Django and then "executes" jobs by sleeping,
+so memory and CPU of cold start are real while jobs themselves are not.
+Amount of launched tasks may be passed as the first argument, default is 100.
+"""
+
+from pathlib import Path
+from time import perf_counter, sleep
+import sys
+import subprocess
+
+from _utils import benchmark_environment, report
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+LIMITS = (4, 16)
+JOB_SECONDS = 1
+PYTHON_DIR = Path(__file__).absolute().parents[3] / "python"
+RUNNER_IMITATION = f"import adcm.init_django; import time; time.sleep({JOB_SECONDS})"
+
+
+def spawn_runner(task_id: int, venv: str) -> subprocess.Popen:
+    _ = task_id, venv
+    return subprocess.Popen(args=[sys.executable, "-c", RUNNER_IMITATION], cwd=PYTHON_DIR)
+
+
+def rss_mb(processes) -> float:
+    total = 0
+    for process in processes:
+        try:
+            status = Path(f"/proc/{process.pid}/status").read_text(encoding="utf-8")
+        except OSError:
+            continue
+
+        total += next((int(line.split()[1]) for line in status.splitlines() if line.startswith("VmRSS:")), 0)
+
+    return total / 1024
+
+
+class Sampler:
+    def __init__(self):
+        self.peak_processes = 0
+        self.peak_rss = 0.0
+
+    def sample(self, processes) -> None:
+        alive = [process for process in processes if process.poll() is None]
+        self.peak_processes = max(self.peak_processes, len(alive))
+        self.peak_rss = max(self.peak_rss, rss_mb(alive))
+
+
+def run_unbounded() -> tuple:
+    sampler = Sampler()
+    start = perf_counter()
+
+    processes = [spawn_runner(task_id=i, venv="default") for i in range(TASKS)]
+    while any(process.poll() is None for process in processes):
+        sampler.sample(processes)
+        sleep(0.1)
+
+    return "runner per task", TASKS, sampler.peak_processes, f"{sampler.peak_rss:.0f}", perf_counter() - start
+
+
+def run_scheduled(limit: int) -> tuple:
+    from cm.models import JobStatus, TaskLog
+    from cm.services.job.run import SchedulerLimits, TaskScheduler
+
+    TaskLog.objects.all().delete()
+    TaskLog.objects.bulk_create(TaskLog(object_id=1, status=JobStatus.CREATED) for _ in range(TASKS))
+
+    class Scheduler(TaskScheduler):
+        # status of imitated runner is changed on its exit, real runner does it itself
+        def _on_runner_finished(self, task_id: int, return_code: int) -> None:
+            _ = return_code
+            TaskLog.objects.filter(id=task_id).update(status=JobStatus.SUCCESS)
+
+    processes = []
+
+    def spawn(task_id: int, venv: str) -> subprocess.Popen:
+        processes.append(spawn_runner(task_id=task_id, venv=venv))
+        return processes[-1]
+
+    scheduler = Scheduler(limits=SchedulerLimits(total=limit, per_cluster=0, per_action=0), spawn=spawn)
+    sampler = Sampler()
+    start = perf_counter()
+
+    while TaskLog.objects.exclude(status=JobStatus.SUCCESS).exists():
+        scheduler.dispatch()
+        sampler.sample(processes)
+        sleep(0.1)
+
+    return f"scheduler, limit {limit}", TASKS, sampler.peak_processes, f"{sampler.peak_rss:.0f}", perf_counter() - start
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [run_unbounded(), *(run_scheduled(limit=limit) for limit in LIMITS)]
+
+    report(
+        title=f"Burst of task launches, each runner works {JOB_SECONDS}s after Django initialization",
+        header=("mode", "tasks", "peak runners", "peak RSS, MB", "total time, s"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Resolution of upgrade candidates for a cluster with hundreds of uploaded bundle versions"""
+
+from _utils import benchmark_environment, measure, report, summary
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUNDLE_VERSIONS = (100, 300)
+
+
+def legacy_get_upgrade(obj) -> list:
+    """Candidates resolution as it was before upgrades were indexed"""
+
+    from cm.models import Prototype, Upgrade
+    from cm.upgrade import check_upgrade_edition, check_upgrade_version
+
+    result = []
+    for upgrade in Upgrade.objects.filter(bundle__name=obj.prototype.bundle.name):
+        if not check_upgrade_version(prototype=obj.prototype, upgrade=upgrade)[0]:
+            continue
+
+        if not check_upgrade_edition(prototype=obj.prototype, upgrade=upgrade)[0]:
+            continue
+
+        if obj.locked or not upgrade.allowed(obj=obj):
+            continue
+
+        upgrade.license = Prototype.objects.filter(bundle=upgrade.bundle, name=upgrade.bundle.name).first().license
+        result.append(upgrade)
+
+    return result
+
+
+def prepare_bundles(amount: int) -> None:
+    from cm.bundle import order_versions
+    from cm.models import Bundle, Prototype, Upgrade
+
+    Upgrade.objects.all().delete()
+    Prototype.objects.filter(bundle__name="benchmark").delete()
+    Bundle.objects.filter(name="benchmark").delete()
+
+    for i in range(amount):
+        version = f"{i // 10}.{i % 10}"
+        bundle = Bundle.objects.create(name="benchmark", version=version)
+        Prototype.objects.create(type="cluster", name="benchmark", version=version, bundle=bundle)
+        # every bundle can upgrade from any older one
+        Upgrade.objects.create(
+            bundle=bundle, min_version="0.0", max_version=version, max_strict=True, state_available="any"
+        )
+
+    order_versions()
+
+
+def run(amount: int) -> list[tuple]:
+    from cm.models import Bundle, Cluster, Prototype
+    from cm.upgrade import get_upgrade
+
+    prepare_bundles(amount=amount)
+
+    rows = []
+    for label, version in (("oldest", "0.0"), ("middle", f"{amount // 20}.0")):
+        prototype = Prototype.objects.get(bundle=Bundle.objects.get(name="benchmark", version=version), type="cluster")
+        cluster = Cluster.objects.create(prototype=prototype, name=f"benchmark-{amount}-{label}")
+
+        for name, func in (("legacy", legacy_get_upgrade), ("indexed", get_upgrade)):
+            target = Cluster.objects.select_related("prototype__bundle").get(pk=cluster.pk)
+            with CaptureQueriesContext(connection) as queries:
+                candidates = func(target)
+
+            timings = measure(lambda func=func, target=target: func(target), repeat=20)
+            rows.append((amount, label, name, len(candidates), len(queries), summary(timings)))
+
+    return rows
+
+
+def main() -> None:
+    with benchmark_environment():
+        rows = [row for amount in BUNDLE_VERSIONS for row in run(amount=amount)]
+
+    report(
+        title="Upgrade candidates resolution",
+        header=("bundles", "cluster version", "implementation", "candidates", "queries", "time"),
+        rows=rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
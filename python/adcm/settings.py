@@ -376,4 +376,39 @@ STDOUT_STDERR_LOG_LINE_CUT_LENGTH = 1000
 STDOUT_STDERR_LOG_MAX_UNCUT_LENGTH = STDOUT_STDERR_LOG_CUT_LENGTH * STDOUT_STDERR_LOG_LINE_CUT_LENGTH
 STDOUT_STDERR_TRUNCATED_LOG_MESSAGE = "<Truncated. Download full version via link>"
 
+# Historical config records are stored as patches against periodic full snapshots
+CONFIG_LOG_DELTA_STORAGE = os.getenv("ADCM_CONFIG_LOG_DELTA_STORAGE") in {"1", "True", "true"}
+CONFIG_LOG_SNAPSHOT_INTERVAL = int(os.getenv("ADCM_CONFIG_LOG_SNAPSHOT_INTERVAL", "20"))
+
+# How many tasks of one bulk launch may be executed simultaneously
+TASK_BATCH_CONCURRENCY = int(os.getenv("ADCM_TASK_BATCH_CONCURRENCY", "8"))
+
+# Launched tasks wait in queue of `run_task_scheduler` instead of being started right away.
+# Limits of simultaneously running tasks: in total, of one cluster, of one action (0 is no limit)
+TASK_SCHEDULER_ENABLED = os.getenv("ADCM_TASK_SCHEDULER_ENABLED") in {"1", "True", "true"}
+TASK_SCHEDULER_LIMIT = int(os.getenv("ADCM_TASK_SCHEDULER_LIMIT", "16"))
+TASK_SCHEDULER_CLUSTER_LIMIT = int(os.getenv("ADCM_TASK_SCHEDULER_CLUSTER_LIMIT", "4"))
+TASK_SCHEDULER_ACTION_LIMIT = int(os.getenv("ADCM_TASK_SCHEDULER_ACTION_LIMIT", "0"))
+TASK_SCHEDULER_INTERVAL = float(os.getenv("ADCM_TASK_SCHEDULER_INTERVAL", "1"))
+
+# How many jobs of one `parallel_group` of action's scripts may be executed simultaneously
+JOB_PARALLEL_GROUP_LIMIT = int(os.getenv("ADCM_JOB_PARALLEL_GROUP_LIMIT", "4"))
+
+# ADCM Ansible plugins send their operations to the task runner over a Unix socket
+# instead of initializing Django in each Ansible worker
+ANSIBLE_PLUGIN_RPC_ENABLED = os.getenv("ADCM_ANSIBLE_PLUGIN_RPC_ENABLED") in {"1", "True", "true"}
+
+# How audit records of API calls are saved: "sync", "async" (background batches) or "on_commit" (batched on commit)
+# "async" needs threads in uwsgi (`enable-threads`), without them "on_commit" is used
+AUDIT_LOG_WRITE_MODE = os.getenv("ADCM_AUDIT_LOG_WRITE_MODE", "sync")
+AUDIT_LOG_WRITE_BATCH_SIZE = int(os.getenv("ADCM_AUDIT_LOG_WRITE_BATCH_SIZE", "500"))
+AUDIT_LOG_WRITE_FLUSH_INTERVAL = float(os.getenv("ADCM_AUDIT_LOG_WRITE_FLUSH_INTERVAL", "1"))
+
+# How clearaudit archives records: "rewrite" re-packs single archive, "segment" adds new archive file per run
+AUDIT_ARCHIVE_MODE = os.getenv("ADCM_AUDIT_ARCHIVE_MODE", "rewrite")
+AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv("ADCM_AUDIT_ARCHIVE_BATCH_SIZE", "10000"))
+
+# Below this planner estimate `count=approximate` of keyset pagination counts records exactly
+API_APPROXIMATE_COUNT_THRESHOLD = int(os.getenv("ADCM_API_APPROXIMATE_COUNT_THRESHOLD", "10000"))
+
 TEST_RUNNER = "adcm.tests.runner.SubTestParallelRunner"
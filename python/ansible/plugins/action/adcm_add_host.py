@@ -48,11 +48,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.add_host import ADCMAddHostPluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMAddHostPluginExecutor
+    executor_class = "ansible_plugin.executors.add_host.ADCMAddHostPluginExecutor"
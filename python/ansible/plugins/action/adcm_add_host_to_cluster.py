@@ -46,11 +46,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.add_host_to_cluster import ADCMAddHostToClusterPluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMAddHostToClusterPluginExecutor
+    executor_class = "ansible_plugin.executors.add_host_to_cluster.ADCMAddHostToClusterPluginExecutor"
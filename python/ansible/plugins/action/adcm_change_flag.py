@@ -83,10 +83,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.change_flag import ADCMChangeFlagPluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMChangeFlagPluginExecutor
+    executor_class = "ansible_plugin.executors.change_flag.ADCMChangeFlagPluginExecutor"
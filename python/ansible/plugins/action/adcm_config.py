@@ -17,18 +17,17 @@ from ansible.errors import AnsibleError
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    ContextActionModule,
-    set_cluster_config,
-    set_component_config,
-    set_component_config_by_name,
-    set_host_config,
-    set_provider_config,
-    set_service_config,
-    set_service_config_by_name,
-)
+from ansible_plugin.base import ContextActionModule
+from ansible_plugin.rpc import local_job_lock, plugin_function
+
+flush_deferred_config = plugin_function("flush_deferred_config")
+set_cluster_config = plugin_function("set_cluster_config")
+set_component_config = plugin_function("set_component_config")
+set_component_config_by_name = plugin_function("set_component_config_by_name")
+set_host_config = plugin_function("set_host_config")
+set_provider_config = plugin_function("set_provider_config")
+set_service_config = plugin_function("set_service_config")
+set_service_config_by_name = plugin_function("set_service_config_by_name")
 
 ANSIBLE_METADATA = {"metadata_version": "1.1", "supported_by": "Arenadata"}
 DOCUMENTATION = r"""
@@ -70,6 +69,18 @@ options:
     description: useful in cluster context only.
     In that context you are able to set a config value for a service belongs to the cluster.
 
+  - option-name: defer
+    required: false
+    type: bool
+    description: accumulate the change instead of saving it right away.
+    All deferred changes of the job are saved as a single config revision per object
+    at the end of the job or when task with 'flush' is executed.
+
+  - option-name: flush
+    required: false
+    type: bool
+    description: save changes deferred earlier in this job, 'type' and other options are not required.
+
 notes:
   - If type is 'service', there is no needs to specify service_name
 """
@@ -99,6 +110,16 @@ EXAMPLES = r"""
           key2: value2
       - key: "some_string"
         value: "string"
+
+- adcm_config:
+    type: "cluster"
+    key: "{{ item.key }}"
+    value: "{{ item.value }}"
+    defer: true
+  loop: "{{ settings | dict2items }}"
+
+- adcm_config:
+    flush: true
 """
 RETURN = r"""
 value:
@@ -109,7 +130,7 @@ value:
 
 class ActionModule(ContextActionModule):
     _VALID_ARGS = frozenset(
-        ("type", "key", "value", "parameters", "service_name", "component_name", "host_id", "active")
+        ("type", "key", "value", "parameters", "service_name", "component_name", "host_id", "active", "defer", "flush")
     )
     _MANDATORY_ARGS = ("type",)
 
@@ -122,10 +143,38 @@ class ActionModule(ContextActionModule):
             templar=templar,
             shared_loader_obj=shared_loader_obj,
         )
+        self._defer_job_id = None
+
+        if self._task.args.get("flush"):
+            self.check_flush()
+            self._config = {}
+            self._attr = {}
+            return
+
         is_params = self.check_params_and_keys()
         self._config = self._get_config(is_params=is_params)
         self._attr = self._get_attr(is_params=is_params)
 
+    def check_flush(self) -> None:
+        if set(self._task.args).intersection(("key", "value", "parameters", "active", "defer")):
+            raise AnsibleError("'flush' must not be used with 'key'/'value'/'active'/'parameters'/'defer'")
+
+    def run(self, tmp=None, task_vars=None):
+        if not self._task.args.get("flush"):
+            if self._task.args.get("defer"):
+                self._defer_job_id = task_vars["job"]["id"]
+
+            return super().run(tmp=tmp, task_vars=task_vars)
+
+        with local_job_lock(task_vars["job"]["id"]):
+            changed = flush_deferred_config(job_id=task_vars["job"]["id"])
+
+        # skip context routing of `ContextActionModule`, there's no object to route to
+        result = super(ContextActionModule, self).run(tmp=tmp, task_vars=task_vars)
+        result["changed"] = changed
+
+        return result
+
     def check_params_and_keys(self) -> bool:
         is_active = "active" in self._task.args
         is_key = "key" in self._task.args
@@ -187,6 +236,7 @@ class ActionModule(ContextActionModule):
             context["cluster_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -199,6 +249,7 @@ class ActionModule(ContextActionModule):
             self._task.args["service_name"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -211,6 +262,7 @@ class ActionModule(ContextActionModule):
             context["service_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -222,6 +274,7 @@ class ActionModule(ContextActionModule):
             context["host_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -233,6 +286,7 @@ class ActionModule(ContextActionModule):
             self._task.args["host_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -244,6 +298,7 @@ class ActionModule(ContextActionModule):
             context["provider_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -258,6 +313,7 @@ class ActionModule(ContextActionModule):
             self._task.args.get("service_name", None),
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
@@ -269,6 +325,7 @@ class ActionModule(ContextActionModule):
             context["component_id"],
             self._config,
             self._attr,
+            self._defer_job_id,
         )
         res["value"] = self._task.args.get("value", self._config)
 
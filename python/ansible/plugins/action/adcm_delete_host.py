@@ -34,11 +34,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.delete_host import ADCMDeleteHostPluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMDeleteHostPluginExecutor
+    executor_class = "ansible_plugin.executors.delete_host.ADCMDeleteHostPluginExecutor"
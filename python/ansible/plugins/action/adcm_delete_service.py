@@ -41,11 +41,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.delete_service import ADCMDeleteServicePluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMDeleteServicePluginExecutor
+    executor_class = "ansible_plugin.executors.delete_service.ADCMDeleteServicePluginExecutor"
@@ -15,18 +15,16 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    ContextActionModule,
-    set_cluster_multi_state,
-    set_component_multi_state,
-    set_component_multi_state_by_name,
-    set_host_multi_state,
-    set_provider_multi_state,
-    set_service_multi_state,
-    set_service_multi_state_by_name,
-)
+from ansible_plugin.base import ContextActionModule
+from ansible_plugin.rpc import plugin_function
+
+set_cluster_multi_state = plugin_function("set_cluster_multi_state")
+set_component_multi_state = plugin_function("set_component_multi_state")
+set_component_multi_state_by_name = plugin_function("set_component_multi_state_by_name")
+set_host_multi_state = plugin_function("set_host_multi_state")
+set_provider_multi_state = plugin_function("set_provider_multi_state")
+set_service_multi_state = plugin_function("set_service_multi_state")
+set_service_multi_state_by_name = plugin_function("set_service_multi_state_by_name")
 
 ANSIBLE_METADATA = {"metadata_version": "1.1", "supported_by": "Arenadata"}
 
@@ -15,18 +15,16 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    ContextActionModule,
-    unset_cluster_multi_state,
-    unset_component_multi_state,
-    unset_component_multi_state_by_name,
-    unset_host_multi_state,
-    unset_provider_multi_state,
-    unset_service_multi_state,
-    unset_service_multi_state_by_name,
-)
+from ansible_plugin.base import ContextActionModule
+from ansible_plugin.rpc import plugin_function
+
+unset_cluster_multi_state = plugin_function("unset_cluster_multi_state")
+unset_component_multi_state = plugin_function("unset_component_multi_state")
+unset_component_multi_state_by_name = plugin_function("unset_component_multi_state_by_name")
+unset_host_multi_state = plugin_function("unset_host_multi_state")
+unset_provider_multi_state = plugin_function("unset_provider_multi_state")
+unset_service_multi_state = plugin_function("unset_service_multi_state")
+unset_service_multi_state_by_name = plugin_function("unset_service_multi_state_by_name")
 
 ANSIBLE_METADATA = {"metadata_version": "1.1", "supported_by": "Arenadata"}
 
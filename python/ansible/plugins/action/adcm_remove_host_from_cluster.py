@@ -44,11 +44,8 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
 from ansible_plugin.base import ADCMAnsiblePlugin
-from ansible_plugin.executors.remove_host_from_cluster import ADCMRemoveHostFromClusterPluginExecutor
 
 
 class ActionModule(ADCMAnsiblePlugin):
-    executor_class = ADCMRemoveHostFromClusterPluginExecutor
+    executor_class = "ansible_plugin.executors.remove_host_from_cluster.ADCMRemoveHostFromClusterPluginExecutor"
@@ -15,18 +15,16 @@ import sys
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    ContextActionModule,
-    set_cluster_state,
-    set_component_state,
-    set_component_state_by_name,
-    set_host_state,
-    set_provider_state,
-    set_service_state,
-    set_service_state_by_name,
-)
+from ansible_plugin.base import ContextActionModule
+from ansible_plugin.rpc import plugin_function
+
+set_cluster_state = plugin_function("set_cluster_state")
+set_component_state = plugin_function("set_component_state")
+set_component_state_by_name = plugin_function("set_component_state_by_name")
+set_host_state = plugin_function("set_host_state")
+set_provider_state = plugin_function("set_provider_state")
+set_service_state = plugin_function("set_service_state")
+set_service_state_by_name = plugin_function("set_service_state_by_name")
 
 ANSIBLE_METADATA = {"metadata_version": "1.1", "supported_by": "Arenadata"}
 
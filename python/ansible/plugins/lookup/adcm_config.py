@@ -10,6 +10,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import nullcontext
 import sys
 
 from ansible.errors import AnsibleError
@@ -17,17 +18,15 @@ from ansible.plugins.lookup import LookupBase
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    set_cluster_config,
-    set_host_config,
-    set_provider_config,
-    set_service_config,
-    set_service_config_by_name,
-)
+from ansible_plugin.rpc import local_job_lock, plugin_function
 from cm.logger import logger
 
+set_cluster_config = plugin_function("set_cluster_config")
+set_host_config = plugin_function("set_host_config")
+set_provider_config = plugin_function("set_provider_config")
+set_service_config = plugin_function("set_service_config")
+set_service_config_by_name = plugin_function("set_service_config_by_name")
+
 DOCUMENTATION = """
     lookup: file
     author: Konstantin Voschanov <vka@arenadata.io>
@@ -39,6 +38,10 @@ DOCUMENTATION = """
       _terms:
         description: cluster|service|host, 'key/subkey', value
         required: True
+      defer:
+        description: accumulate the change and save it along with other deferred changes at the end of the job
+        type: bool
+        default: False
     notes:
       - if you run service action, you don't need specify service name
 """
@@ -52,6 +55,8 @@ EXAMPLES = """
 
 - debug: msg="set service config {{lookup('adcm_config', 'service', 'adh.cfg/port', 80, service_name='ZOOKEEPER') }}"
 
+- debug: msg="set cluster config {{lookup('adcm_config', 'cluster', 'adh.cfg/port', 80, defer=True) }}"
+
 """
 
 RETURN = """
@@ -70,6 +75,20 @@ class LookupModule(LookupBase):
             msg = "not enough arguments to set config ({} of 3)"
             raise AnsibleError(msg.format(len(terms)))
 
+        defer_job_id = None
+        if kwargs.get("defer"):
+            if "job" not in variables:
+                raise AnsibleError("there is no job in hostvars")
+            defer_job_id = variables["job"]["id"]
+
+        with local_job_lock(defer_job_id) if defer_job_id is not None else nullcontext():
+            res = self._set_config(terms=terms, variables=variables, kwargs=kwargs, defer_job_id=defer_job_id)
+
+        ret.append(res.value)
+        return ret
+
+    @staticmethod
+    def _set_config(terms, variables, kwargs, defer_job_id: int | None):
         conf = {terms[1]: terms[2]}
         attr = {}
 
@@ -79,11 +98,19 @@ class LookupModule(LookupBase):
             cluster = variables["cluster"]
             if "service_name" in kwargs:
                 res = set_service_config_by_name(
-                    cluster_id=cluster["id"], service_name=kwargs["service_name"], config=conf, attr=attr
+                    cluster_id=cluster["id"],
+                    service_name=kwargs["service_name"],
+                    config=conf,
+                    attr=attr,
+                    defer_job_id=defer_job_id,
                 )
             elif "job" in variables and "service_id" in variables["job"]:
                 res = set_service_config(
-                    cluster_id=cluster["id"], service_id=variables["job"]["service_id"], config=conf, attr=attr
+                    cluster_id=cluster["id"],
+                    service_id=variables["job"]["service_id"],
+                    config=conf,
+                    attr=attr,
+                    defer_job_id=defer_job_id,
                 )
             else:
                 msg = "no service_id in job or service_name and service_version in params"
@@ -92,18 +119,17 @@ class LookupModule(LookupBase):
             if "cluster" not in variables:
                 raise AnsibleError("there is no cluster in hostvars")
             cluster = variables["cluster"]
-            res = set_cluster_config(cluster_id=cluster["id"], config=conf, attr=attr)
+            res = set_cluster_config(cluster_id=cluster["id"], config=conf, attr=attr, defer_job_id=defer_job_id)
         elif terms[0] == "provider":
             if "provider" not in variables:
                 raise AnsibleError("there is no host provider in hostvars")
             provider = variables["provider"]
-            res = set_provider_config(provider_id=provider["id"], config=conf, attr=attr)
+            res = set_provider_config(provider_id=provider["id"], config=conf, attr=attr, defer_job_id=defer_job_id)
         elif terms[0] == "host":
             if "adcm_hostid" not in variables:
                 raise AnsibleError("there is no adcm_hostid in hostvars")
-            res = set_host_config(host_id=variables["adcm_hostid"], config=conf, attr=attr)
+            res = set_host_config(host_id=variables["adcm_hostid"], config=conf, attr=attr, defer_job_id=defer_job_id)
         else:
             raise AnsibleError(f"unknown object type: {terms[0]}")
 
-        ret.append(res.value)
-        return ret
+        return res
@@ -17,17 +17,15 @@ from ansible.plugins.lookup import LookupBase
 
 sys.path.append("/adcm/python")
 
-import adcm.init_django  # noqa: F401, isort:skip
-
-from ansible_plugin.utils import (
-    set_cluster_state,
-    set_host_state,
-    set_provider_state,
-    set_service_state,
-    set_service_state_by_name,
-)
+from ansible_plugin.rpc import plugin_function
 from cm.logger import logger
 
+set_cluster_state = plugin_function("set_cluster_state")
+set_host_state = plugin_function("set_host_state")
+set_provider_state = plugin_function("set_provider_state")
+set_service_state = plugin_function("set_service_state")
+set_service_state_by_name = plugin_function("set_service_state_by_name")
+
 DOCUMENTATION = """
     lookup: file
     author: Konstantin Voschanov <vka@arenadata.io>
@@ -10,17 +10,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# Module is imported by Ansible plugins that may not initialize Django (see `ansible_plugin.rpc`),
+# so Django and ADCM models should be imported only where they are used.
+
 from abc import abstractmethod
 from dataclasses import dataclass
 from typing import Any, Collection, Generic, Literal, Mapping, Protocol, TypeVar
-import fcntl
 
-from ansible.errors import AnsibleActionFail
+from ansible.errors import AnsibleActionFail, AnsibleError
 from ansible.module_utils._text import to_native
 from ansible.plugins.action import ActionBase
-from cm.models import ClusterObject, ServiceComponent
+from ansible.utils.vars import merge_hash
 from core.types import ADCMCoreType, CoreObjectDescriptor
-from django.conf import settings
 from pydantic import BaseModel, ValidationError, field_validator
 
 from ansible_plugin.errors import (
@@ -30,6 +31,23 @@ from ansible_plugin.errors import (
     PluginTargetDetectionError,
     PluginValidationError,
 )
+from ansible_plugin.messages import (
+    MSG_MANDATORY_ARGS,
+    MSG_NO_CLUSTER_CONTEXT,
+    MSG_NO_CONFIG,
+    MSG_NO_CONTEXT,
+    MSG_NO_ROUTE,
+    MSG_NO_SERVICE_NAME,
+    MSG_WRONG_CONTEXT,
+)
+from ansible_plugin.rpc import (
+    PluginCallError,
+    PluginResult,
+    call_executor,
+    get_rpc_socket,
+    import_object,
+    local_job_lock,
+)
 
 # Input
 
@@ -82,6 +100,8 @@ def from_objects(
     context: AnsibleJobContext,
     raw_arguments: dict,
 ) -> tuple[CoreObjectDescriptor, ...]:
+    from cm.models import ClusterObject, ServiceComponent
+
     if not isinstance(objects := raw_arguments.get("objects"), list):
         return ()
 
@@ -397,19 +417,67 @@ class ADCMAnsiblePlugin(ActionBase):
 
     ```
     class ActionModule(ADCMAnsiblePlugin):
-        executor_class = PluginExecutorDescendantClass
+        executor_class = "ansible_plugin.executors.module.PluginExecutorDescendantClass"
     ```
 
+    Executor may be specified as a class too,
+    yet the dotted path allows plugin to skip Django initialization when runner executes the call.
+
     The only time you'll need to override `run` is when more ansible runtime context awareness is required.
     """
 
     TRANSFERS_FILES = False
 
-    executor_class: type[ADCMAnsiblePluginExecutor]
+    executor_class: type[ADCMAnsiblePluginExecutor] | str
 
     def run(self, tmp=None, task_vars=None):
         super().run(tmp=tmp, task_vars=task_vars)
 
+        socket_path = get_rpc_socket()
+        if socket_path:
+            execution_result = self._execute_in_runner(socket_path=socket_path, task_vars=task_vars)
+        else:
+            execution_result = self._execute(task_vars=task_vars)
+
+        if execution_result.error:
+            raise AnsibleActionFail(message=to_native(execution_result.error.message)) from execution_result.error
+
+        result_value = {}
+        if isinstance(execution_result.value, Mapping):
+            result_value |= execution_result.value
+        elif execution_result.value is not None:
+            result_value["value"] = execution_result.value
+
+        return {"changed": execution_result.changed, **result_value}
+
+    def _execute_in_runner(self, socket_path: str, task_vars: dict) -> CallResult:
+        executor_class = self.executor_class
+        if not isinstance(executor_class, str):
+            executor_class = f"{executor_class.__module__}.{executor_class.__qualname__}"
+
+        result = call_executor(
+            socket_path=socket_path,
+            executor=executor_class,
+            arguments=dict(self._task.args),
+            context=task_vars.get("context", {}),
+        )
+
+        return CallResult(
+            value=result.get("value"),
+            changed=result.get("changed", False),
+            error=PluginRuntimeError(message=result["error"]) if result.get("error") else None,
+        )
+
+    def _execute(self, task_vars: dict) -> CallResult:
+        import fcntl
+
+        from django.conf import settings
+        import adcm.init_django  # noqa: F401
+
+        executor_class = self.executor_class
+        if isinstance(executor_class, str):
+            executor_class = import_object(executor_class)
+
         # Acquiring blocking lock on job's `config.json` file.
         #
         # Re-implemented from `job_lock` and similar functions,
@@ -427,16 +495,145 @@ class ADCMAnsiblePlugin(ActionBase):
         with (settings.RUN_DIR / str(task_vars["job"]["id"]) / "config.json").open(encoding="utf-8") as file:
             fcntl.flock(file.fileno(), fcntl.LOCK_EX)
 
-            executor = self.executor_class(arguments=self._task.args, context=task_vars.get("context", {}))
-            execution_result = executor.execute()
+            executor = executor_class(arguments=self._task.args, context=task_vars.get("context", {}))
+            return executor.execute()
 
-            if execution_result.error:
-                raise AnsibleActionFail(message=to_native(execution_result.error.message)) from execution_result.error
 
-        result_value = {}
-        if isinstance(execution_result.value, Mapping):
-            result_value |= execution_result.value
-        elif execution_result.value is not None:
-            result_value["value"] = execution_result.value
+# Legacy plugins
 
-        return {"changed": execution_result.changed, **result_value}
+
+def check_context_type(task_vars: dict, context_types: tuple, err_msg: str | None = None) -> None:
+    """
+    Check context type. Check if inventory.json and config.json were passed
+    and check if `context` exists in task variables, сheck if a context is of a given type.
+    """
+    if not task_vars:
+        raise AnsibleError(MSG_NO_CONFIG)
+
+    if "context" not in task_vars:
+        raise AnsibleError(MSG_NO_CONTEXT)
+
+    if not isinstance(task_vars["context"], dict):
+        raise AnsibleError(MSG_NO_CONTEXT)
+
+    context = task_vars["context"]
+    if context["type"] not in context_types:
+        if err_msg is None:
+            err_msg = MSG_WRONG_CONTEXT.format(", ".join(context_types), context["type"])
+        raise AnsibleError(err_msg)
+
+
+class ContextActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = None
+    _MANDATORY_ARGS = None
+
+    def _wrap_call(self, func, *args):
+        try:
+            res = func(*args)
+        except PluginCallError as e:
+            return {"failed": True, "msg": e.message}
+        if isinstance(res, PluginResult):
+            return {"changed": res.changed}
+        return {"changed": True}
+
+    def _check_mandatory(self):
+        for arg in self._MANDATORY_ARGS:
+            if arg not in self._task.args:
+                raise AnsibleError(MSG_MANDATORY_ARGS.format(self._MANDATORY_ARGS))
+
+    def _get_job_var(self, task_vars, name):
+        try:
+            return task_vars["job"][name]
+        except KeyError as error:
+            raise AnsibleError(MSG_NO_CLUSTER_CONTEXT) from error
+
+    def _do_cluster(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_service_by_name(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_service(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_host(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_component(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_component_by_name(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_provider(self, task_vars, context):
+        raise NotImplementedError
+
+    def _do_host_from_provider(self, task_vars, context):
+        raise NotImplementedError
+
+    def run(self, tmp=None, task_vars=None):
+        self._check_mandatory()
+        obj_type = self._task.args["type"]
+        job_id = task_vars["job"]["id"]
+
+        with local_job_lock(job_id):
+            res = self._route(task_vars=task_vars, obj_type=obj_type)
+
+        result = super().run(tmp, task_vars)
+
+        return merge_hash(result, res)
+
+    def _route(self, task_vars: dict, obj_type: str) -> dict:
+        if obj_type == "cluster":
+            check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
+            res = self._do_cluster(task_vars, {"cluster_id": self._get_job_var(task_vars, "cluster_id")})
+        elif obj_type == "service" and "service_name" in self._task.args:
+            check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
+            res = self._do_service_by_name(task_vars, {"cluster_id": self._get_job_var(task_vars, "cluster_id")})
+        elif obj_type == "service":
+            check_context_type(task_vars=task_vars, context_types=("service", "component"))
+            res = self._do_service(
+                task_vars,
+                {
+                    "cluster_id": self._get_job_var(task_vars, "cluster_id"),
+                    "service_id": self._get_job_var(task_vars, "service_id"),
+                },
+            )
+        elif obj_type == "host" and "host_id" in self._task.args:
+            check_context_type(task_vars=task_vars, context_types=("provider",))
+            res = self._do_host_from_provider(task_vars, {})
+        elif obj_type == "host":
+            check_context_type(task_vars=task_vars, context_types=("host",))
+            res = self._do_host(task_vars, {"host_id": self._get_job_var(task_vars, "host_id")})
+        elif obj_type == "provider":
+            check_context_type(task_vars=task_vars, context_types=("provider", "host"))
+            res = self._do_provider(task_vars, {"provider_id": self._get_job_var(task_vars, "provider_id")})
+        elif obj_type == "component" and "component_name" in self._task.args:
+            if "service_name" in self._task.args:
+                check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
+                res = self._do_component_by_name(
+                    task_vars,
+                    {
+                        "cluster_id": self._get_job_var(task_vars, "cluster_id"),
+                        "service_id": None,
+                    },
+                )
+            else:
+                check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
+                if task_vars["job"].get("service_id", None) is None:
+                    raise AnsibleError(MSG_NO_SERVICE_NAME)
+                res = self._do_component_by_name(
+                    task_vars,
+                    {
+                        "cluster_id": self._get_job_var(task_vars, "cluster_id"),
+                        "service_id": self._get_job_var(task_vars, "service_id"),
+                    },
+                )
+        elif obj_type == "component":
+            check_context_type(task_vars=task_vars, context_types=("component",))
+            res = self._do_component(task_vars, {"component_id": self._get_job_var(task_vars, "component_id")})
+        else:
+            raise AnsibleError(MSG_NO_ROUTE)
+
+        return res
@@ -0,0 +1,264 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bridge between ADCM Ansible plugins and task runner.
+
+Every Ansible task is executed in a forked worker,
+so plugin that works with ADCM directly has to initialize Django and open its own DB connection each time.
+When task runner serves plugin calls (path to its socket is passed in `PLUGIN_RPC_SOCKET_ENV`),
+plugin only sends the operation to runner's process where it's executed.
+Runner executes calls one by one, each of them under `job_lock` of the job,
+so they are serialized with plugins that are still executed in-process (e.g. `adcm_hc`).
+Plugin must not hold `job_lock` itself while its call is executed by runner.
+
+Each plugin invocation is a separate Ansible task (often in a separate worker) that needs the result right away,
+so calls aren't batched: one request carries exactly one call.
+
+This module is imported by plugins, so neither Django nor ADCM models should be imported on its level.
+"""
+
+from contextlib import nullcontext
+from importlib import import_module
+from pathlib import Path
+from socketserver import StreamRequestHandler, UnixStreamServer
+from threading import Thread
+from typing import Any, Callable, ContextManager, NamedTuple
+import os
+import json
+import socket
+import inspect
+
+from ansible.errors import AnsibleError
+
+PLUGIN_RPC_SOCKET_ENV = "ADCM_PLUGIN_RPC_SOCKET"
+
+EXECUTORS_PACKAGE = "ansible_plugin.executors"
+FUNCTIONS_MODULE = "ansible_plugin.utils"
+
+
+class PluginResult(NamedTuple):
+    value: dict | int | str
+    changed: bool
+
+
+class PluginCallError(Exception):
+    """Expected failure of plugin operation (like `AdcmEx`), its message is the plugin's failure message"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+def get_rpc_socket() -> str | None:
+    return os.environ.get(PLUGIN_RPC_SOCKET_ENV) or None
+
+
+def import_object(path: str) -> Any:
+    module, _, name = path.rpartition(".")
+
+    return getattr(import_module(module), name)
+
+
+# Protocol: each message is a JSON document on a separate line.
+# Request is `{"call": {...}}`, response is `{"result": {...}}`.
+
+
+def _send(stream, message: dict) -> None:
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def _receive(stream) -> dict | None:
+    line = stream.readline()
+    if not line:
+        return None
+
+    return json.loads(line)
+
+
+def call(socket_path: str, call_: dict) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+
+        with connection.makefile("rwb") as stream:
+            _send(stream, {"call": call_})
+            response = _receive(stream)
+
+    if response is None:
+        message = "Connection to ADCM task runner is closed without response"
+        raise AnsibleError(message)
+
+    return response["result"]
+
+
+def call_executor(socket_path: str, executor: str, arguments: dict, context: dict) -> dict:
+    return call(socket_path=socket_path, call_={"executor": executor, "arguments": arguments, "context": context})
+
+
+def call_function(name: str, *args, **kwargs) -> PluginResult | Any:
+    """
+    Call function of `FUNCTIONS_MODULE` via runner if it serves plugin calls or in current process otherwise.
+    `AdcmEx` is raised as `PluginCallError` in both cases.
+    """
+
+    socket_path = get_rpc_socket()
+    if socket_path is None:
+        from cm.errors import AdcmEx
+        import adcm.init_django  # noqa: F401
+
+        try:
+            return getattr(import_module(FUNCTIONS_MODULE), name)(*args, **kwargs)
+        except AdcmEx as err:
+            raise PluginCallError(message=err.msg) from err
+
+    result = call(socket_path=socket_path, call_={"function": name, "args": list(args), "kwargs": kwargs})
+
+    return _unpack_function_result(result=result)
+
+
+def local_job_lock(job_id: int) -> ContextManager:
+    """Lock job's plugin calls executed in current process, runner takes the lock for calls it executes"""
+
+    if get_rpc_socket() is not None:
+        return nullcontext()
+
+    import adcm.init_django  # noqa: F401
+
+    from ansible_plugin.utils import job_lock
+
+    return job_lock(job_id)
+
+
+def plugin_function(name: str) -> Callable[..., PluginResult | Any]:
+    def _call(*args, **kwargs):
+        return call_function(name, *args, **kwargs)
+
+    _call.__name__ = name
+
+    return _call
+
+
+def _unpack_function_result(result: dict) -> PluginResult | Any:
+    match result:
+        case {"call_error": message}:
+            raise PluginCallError(message=message)
+        case {"error": message}:
+            raise AnsibleError(message)
+        case {"plugin_result": True, "value": value, "changed": changed}:
+            return PluginResult(value=value, changed=changed)
+        case _:
+            return result.get("value")
+
+
+# Server side, executed in task runner's process
+
+
+class PluginRPCServer:
+    """
+    Serves plugin calls of one job on Unix socket from a separate thread of runner's process.
+    All calls are handled in this thread one after another, each under `job_lock` of the job if `job_id` is set.
+    """
+
+    def __init__(self, socket_path: Path, job_id: int | None = None):
+        self.socket_path = socket_path
+        self.job_id = job_id
+        self._server: UnixStreamServer | None = None
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        self.socket_path.unlink(missing_ok=True)
+
+        rpc_server = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self) -> None:
+                while (request := _receive(self.rfile)) is not None:
+                    _send(self.wfile, {"result": rpc_server.execute(call_=request["call"])})
+
+        self._server = UnixStreamServer(server_address=str(self.socket_path), RequestHandlerClass=Handler)
+        self.socket_path.chmod(0o600)
+
+        self._thread = Thread(target=self._serve, name=f"plugin-rpc-{self.socket_path.parent.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+        self._server = None
+        self._thread = None
+
+    def execute(self, call_: dict) -> dict:
+        from cm.errors import AdcmEx
+
+        from ansible_plugin.utils import job_lock
+
+        try:
+            lock = job_lock(self.job_id) if self.job_id is not None else nullcontext()
+        except (AdcmEx, OSError) as err:
+            return {"error": f"Failed to lock job {self.job_id}: {err}"}
+
+        with lock:
+            return self._execute(call_=call_)
+
+    def _execute(self, call_: dict) -> dict:
+        from cm.errors import AdcmEx
+
+        from ansible_plugin.base import ADCMAnsiblePluginExecutor
+
+        try:
+            if "executor" in call_:
+                executor_class = (
+                    import_object(call_["executor"]) if call_["executor"].startswith(f"{EXECUTORS_PACKAGE}.") else None
+                )
+                if not (inspect.isclass(executor_class) and issubclass(executor_class, ADCMAnsiblePluginExecutor)):
+                    return {"error": f"{call_['executor']} is not a plugin executor"}
+
+                result = executor_class(arguments=call_["arguments"], context=call_["context"]).execute()
+
+                return {
+                    "value": result.value,
+                    "changed": result.changed,
+                    "error": result.error.message if result.error else None,
+                }
+
+            function = getattr(import_module(FUNCTIONS_MODULE), call_["function"], None)
+            if call_["function"].startswith("_") or not (
+                inspect.isfunction(function) and function.__module__ == FUNCTIONS_MODULE
+            ):
+                return {"error": f"{call_['function']} is not a plugin function"}
+
+            result = function(*call_.get("args", ()), **call_.get("kwargs", {}))
+        except AdcmEx as err:
+            return {"call_error": err.msg}
+        except Exception as err:  # noqa: BLE001
+            return {"error": str(err) or err.__class__.__name__}
+
+        if isinstance(result, PluginResult):
+            return {"plugin_result": True, "value": result.value, "changed": result.changed}
+
+        # objects returned by functions (e.g. changed object) are passed as their string representation
+        return {"value": result if isinstance(result, (type(None), bool, int, float, str, list, dict)) else str(result)}
+
+    def _serve(self) -> None:
+        from django.db import connection
+
+        try:
+            self._server.serve_forever(poll_interval=0.1)
+        finally:
+            connection.close()
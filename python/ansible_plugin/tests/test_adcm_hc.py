@@ -0,0 +1,154 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+
+from cm.errors import AdcmEx
+from cm.models import HostComponent, ServiceComponent
+from cm.services.job.run.repo import JobRepoImpl
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ansible_plugin.tests.base import BaseTestEffectsOfADCMAnsiblePlugins
+from ansible_plugin.utils import change_hc
+
+HOSTS_AMOUNT = 50
+
+
+class TestChangeHostComponentMapInBatch(BaseTestEffectsOfADCMAnsiblePlugins):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.add_services_to_cluster(["service_1", "service_2"], cluster=self.cluster)
+        self.components = list(
+            ServiceComponent.objects.filter(cluster=self.cluster)
+            .select_related("service__prototype", "prototype")
+            .order_by("service__prototype__name", "prototype__name")
+        )
+
+        self.hosts = [self.host_1, self.host_2]
+        for i in range(3, HOSTS_AMOUNT + 1):
+            self.hosts.append(self.add_host(provider=self.provider, fqdn=f"host-{i}"))
+
+        for host in self.hosts:
+            self.add_host_to_cluster(cluster=self.cluster, host=host)
+
+        task = self.prepare_task(owner=self.cluster, name="dummy")
+        job, *_ = JobRepoImpl.get_task_jobs(task.id)
+        self.job_id = job.id
+        (settings.RUN_DIR / str(self.job_id)).mkdir(parents=True, exist_ok=True)
+        (settings.RUN_DIR / str(self.job_id) / "config.json").write_text("{}", encoding=settings.ENCODING_UTF_8)
+
+    @staticmethod
+    def _operations(action: str, hosts: list, components: list[ServiceComponent]) -> list[dict]:
+        return [
+            {
+                "action": action,
+                "service": component.service.prototype.name,
+                "component": component.prototype.name,
+                "host": host.fqdn,
+            }
+            for component in components
+            for host in hosts
+        ]
+
+    def _current_hc(self) -> dict[tuple[int, int], int]:
+        return {
+            (host_id, component_id): id_
+            for id_, host_id, component_id in HostComponent.objects.filter(cluster=self.cluster).values_list(
+                "id", "host_id", "component_id"
+            )
+        }
+
+    def test_batch_of_1000_operations_success(self) -> None:
+        add_all = self._operations(action="add", hosts=self.hosts, components=self.components)
+        remove_all = self._operations(action="remove", hosts=self.hosts, components=self.components)
+        operations = [*add_all, *remove_all, *add_all, *remove_all, *add_all]
+        self.assertEqual(len(operations), 1000)
+
+        change_hc(job_id=self.job_id, cluster_id=self.cluster.pk, operations=operations)
+
+        initial_hc = self._current_hc()
+        self.assertSetEqual(
+            set(initial_hc), {(host.pk, component.pk) for host in self.hosts for component in self.components}
+        )
+
+        service_1_components, service_2_components = self.components[:2], self.components[2:]
+        # component is removed and added back within the same batch, so its entries aren't changed
+        operations = [
+            *self._operations(action="remove", hosts=self.hosts, components=service_2_components),
+            *(
+                self._operations(action="remove", hosts=self.hosts, components=service_1_components[1:])
+                + self._operations(action="add", hosts=self.hosts, components=service_1_components[1:])
+            )
+            * 9,
+        ]
+        self.assertEqual(len(operations), 1000)
+
+        change_hc(job_id=self.job_id, cluster_id=self.cluster.pk, operations=operations)
+
+        expected_hc = {
+            key: id_
+            for key, id_ in initial_hc.items()
+            if key[1] in {component.pk for component in service_1_components}
+        }
+        self.assertDictEqual(self._current_hc(), expected_hc)
+
+    def test_queries_amount_does_not_depend_on_batch_size(self) -> None:
+        # both batches affect both services, because policies are applied per service
+        small_batch = self._operations(action="add", hosts=self.hosts[:5], components=self.components[::2])
+        add_rest = self._operations(action="add", hosts=self.hosts[10:], components=self.components)
+        remove_rest = self._operations(action="remove", hosts=self.hosts[10:], components=self.components)
+        big_batch = [*add_rest, *remove_rest, *add_rest, *remove_rest, *add_rest, *remove_rest, *add_rest]
+
+        # issues of hierarchy are recalculated after every change of map, it doesn't depend on operations
+        with patch("cm.api.update_hierarchy_issues"), patch("cm.api.update_issue_after_deleting"):
+            with CaptureQueriesContext(connection) as small_batch_queries:
+                change_hc(job_id=self.job_id, cluster_id=self.cluster.pk, operations=small_batch)
+
+            with CaptureQueriesContext(connection) as big_batch_queries:
+                change_hc(job_id=self.job_id, cluster_id=self.cluster.pk, operations=big_batch)
+
+        self.assertEqual(len(big_batch), 1120)
+        self.assertEqual(HostComponent.objects.filter(cluster=self.cluster).count(), 10 + 40 * 4)
+        self.assertEqual(len(big_batch_queries), len(small_batch_queries))
+
+    def test_failed_batch_is_not_saved(self) -> None:
+        operations = self._operations(action="add", hosts=self.hosts, components=self.components)
+        operations.append({**operations[-1], "action": "remove"})
+        operations.append({**operations[0], "action": "remove"})
+        operations.append({**operations[0], "action": "remove"})
+
+        with self.assertRaises(AdcmEx) as err:
+            change_hc(job_id=self.job_id, cluster_id=self.cluster.pk, operations=operations)
+
+        self.assertEqual(err.exception.code, "COMPONENT_CONFLICT")
+        self.assertEqual(err.exception.msg, 'There is no component "component_1" on host "host-1"')
+        self.assertFalse(HostComponent.objects.filter(cluster=self.cluster).exists())
+
+    def test_unknown_object_in_batch_fail(self) -> None:
+        operation = {"action": "add", "service": "service_1", "component": "component_1", "host": "host-1"}
+
+        for key, value, code in (
+            ("service", "service_3", "CLUSTER_SERVICE_NOT_FOUND"),
+            ("component", "component_3", "COMPONENT_NOT_FOUND"),
+            ("host", "host-1000", "HOST_NOT_FOUND"),
+        ):
+            with self.subTest(key), self.assertRaises(AdcmEx) as err:
+                change_hc(
+                    job_id=self.job_id, cluster_id=self.cluster.pk, operations=[operation, {**operation, key: value}]
+                )
+
+            self.assertEqual(err.exception.code, code)
+
+        self.assertFalse(HostComponent.objects.filter(cluster=self.cluster).exists())
@@ -0,0 +1,156 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest.mock import patch
+import os
+
+from ansible.errors import AnsibleError
+from cm.models import ConcernItem, ConcernType
+from django.test import SimpleTestCase, override_settings
+
+from ansible_plugin.rpc import (
+    PLUGIN_RPC_SOCKET_ENV,
+    PluginCallError,
+    PluginRPCServer,
+    call,
+    call_function,
+    local_job_lock,
+)
+from ansible_plugin.tests.base import BaseTestEffectsOfADCMAnsiblePlugins
+from ansible_plugin.utils import job_lock
+
+
+class TestPluginRPCServerCalls(BaseTestEffectsOfADCMAnsiblePlugins):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.server = PluginRPCServer(socket_path=Path("plugin.sock"))
+
+    def test_executor_call_success(self) -> None:
+        result = self.server.execute(
+            call_={
+                "executor": "ansible_plugin.executors.change_flag.ADCMChangeFlagPluginExecutor",
+                "arguments": {"operation": "up", "name": "custom"},
+                "context": {"type": "cluster", "cluster_id": self.cluster.pk},
+            }
+        )
+
+        self.assertDictEqual(result, {"value": {}, "changed": True, "error": None})
+        self.assertTrue(ConcernItem.objects.filter(type=ConcernType.FLAG, owner_id=self.cluster.pk).exists())
+
+    def test_executor_call_error_is_returned(self) -> None:
+        result = self.server.execute(
+            call_={
+                "executor": "ansible_plugin.executors.change_flag.ADCMChangeFlagPluginExecutor",
+                "arguments": {"operation": "up"},
+                "context": {"type": "cluster", "cluster_id": self.cluster.pk},
+            }
+        )
+
+        self.assertFalse(result["changed"])
+        self.assertIn("`name` should be specified", result["error"])
+
+    def test_function_call_success(self) -> None:
+        result = self.server.execute(call_={"function": "set_cluster_state", "args": [self.cluster.pk, "installed"]})
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.state, "installed")
+        self.assertEqual(result, {"value": str(self.cluster)})
+
+    def test_function_call_adcm_error(self) -> None:
+        result = self.server.execute(call_={"function": "set_cluster_state", "args": [self.cluster.pk + 100, "any"]})
+
+        self.assertIn("call_error", result)
+
+    def test_only_plugin_operations_allowed(self) -> None:
+        for call_ in (
+            {"executor": "os.system", "arguments": {}, "context": {}},
+            {"executor": "ansible_plugin.executors.change_flag.ChangeFlagArguments", "arguments": {}, "context": {}},
+            {"function": "_does_contain", "args": [{}, {}]},
+            {"function": "settings", "args": []},
+            {"function": "AdcmEx", "args": ["GENERAL_ERROR"]},
+        ):
+            with self.subTest(call=call_):
+                self.assertIn("error", self.server.execute(call_=call_))
+
+
+class TestPluginRPCBridge(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.socket_path = Path(self.directory.name) / "plugin.sock"
+        self.server = PluginRPCServer(socket_path=self.socket_path)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        self.directory.cleanup()
+
+    def test_calls_are_executed_by_server(self) -> None:
+        with patch.dict(os.environ, {PLUGIN_RPC_SOCKET_ENV: str(self.socket_path)}):
+            self.assertEqual(call_function("cast_to_type", field_type="integer", value="5", limits={}), 5)
+
+            with self.assertRaisesRegex(AnsibleError, "Could not convert 'five' to 'integer'"):
+                call_function("cast_to_type", "integer", "five", {})
+
+            with self.assertRaisesRegex(AnsibleError, "not a plugin function"):
+                call_function("_does_contain", {}, {})
+
+            with local_job_lock(job_id=1):
+                # plugin doesn't lock job (no lock file is required), runner does it for each call
+                pass
+
+    def test_calls_wait_for_job_lock(self) -> None:
+        run_dir = Path(self.directory.name) / "run"
+        (run_dir / "1").mkdir(parents=True)
+        (run_dir / "1" / "config.json").write_text("{}")
+
+        self.server.stop()
+        self.server = PluginRPCServer(socket_path=self.socket_path, job_id=1)
+        self.server.start()
+
+        results = []
+        client = Thread(
+            target=lambda: results.append(
+                call(
+                    socket_path=str(self.socket_path), call_={"function": "cast_to_type", "args": ["float", "1.5", {}]}
+                )
+            )
+        )
+
+        with override_settings(RUN_DIR=run_dir):
+            # lock taken by plugin executed in-process, e.g. `adcm_hc`
+            with job_lock(job_id=1):
+                client.start()
+                client.join(timeout=0.5)
+
+                self.assertTrue(client.is_alive())
+                self.assertListEqual(results, [])
+
+            client.join(timeout=5)
+
+        self.assertListEqual(results, [{"value": 1.5}])
+
+    def test_server_cleans_up_socket(self) -> None:
+        self.assertTrue(self.socket_path.is_socket())
+
+        self.server.stop()
+
+        self.assertFalse(self.socket_path.exists())
+
+    def test_adcm_error_is_raised_as_call_error(self) -> None:
+        with patch.object(self.server, "execute", return_value={"call_error": "Object is locked"}), patch.dict(
+            os.environ, {PLUGIN_RPC_SOCKET_ENV: str(self.socket_path)}
+        ), self.assertRaisesRegex(PluginCallError, "Object is locked"):
+            call_function("set_cluster_state", 1, "installed")
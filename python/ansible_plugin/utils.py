@@ -12,32 +12,26 @@
 
 from collections import defaultdict
 from copy import deepcopy
-from typing import Any, NamedTuple
+from pathlib import Path
+from typing import Any
 import json
 import fcntl
 
 # isort: off
 from ansible.errors import AnsibleError
-from ansible.plugins.action import ActionBase
-from ansible.utils.vars import merge_hash
 from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 
+from ansible_plugin.base import check_context_type
 from ansible_plugin.messages import (
-    MSG_NO_CONFIG,
-    MSG_NO_CONTEXT,
-    MSG_WRONG_CONTEXT,
     MSG_WRONG_CONTEXT_ID,
-    MSG_NO_CLUSTER_CONTEXT,
-    MSG_MANDATORY_ARGS,
-    MSG_NO_ROUTE,
-    MSG_NO_SERVICE_NAME,
     MSG_NO_MULTI_STATE_TO_DELETE,
 )
+from ansible_plugin.rpc import PluginResult
 from cm.adcm_config.ansible import ansible_decrypt
 from cm.adcm_config.config import get_option_value
-from cm.api import add_hc, get_hc, set_object_config_with_plugin
+from cm.api import add_hc, set_object_config_with_plugin
 from cm.errors import AdcmEx
 from cm.models import (
     Action,
@@ -48,6 +42,7 @@ from cm.models import (
     ConfigLog,
     GroupCheckLog,
     Host,
+    HostComponent,
     HostProvider,
     JobLog,
     JobStatus,
@@ -76,27 +71,6 @@ def job_lock(job_id):
         raise AdcmEx("LOCK_ERROR", e) from e
 
 
-def check_context_type(task_vars: dict, context_types: tuple, err_msg: str | None = None) -> None:
-    """
-    Check context type. Check if inventory.json and config.json were passed
-    and check if `context` exists in task variables, сheck if a context is of a given type.
-    """
-    if not task_vars:
-        raise AnsibleError(MSG_NO_CONFIG)
-
-    if "context" not in task_vars:
-        raise AnsibleError(MSG_NO_CONTEXT)
-
-    if not isinstance(task_vars["context"], dict):
-        raise AnsibleError(MSG_NO_CONTEXT)
-
-    context = task_vars["context"]
-    if context["type"] not in context_types:
-        if err_msg is None:
-            err_msg = MSG_WRONG_CONTEXT.format(", ".join(context_types), context["type"])
-        raise AnsibleError(err_msg)
-
-
 def get_object_id_from_context(
     task_vars: dict, id_type: str, context_types: tuple, err_msg: str | None = None, raise_: bool = True
 ) -> tuple[int | None, None | AnsibleError]:
@@ -130,118 +104,6 @@ def get_context_object(task_vars: dict, err_msg: str = None) -> ADCMEntity:
     return obj
 
 
-class ContextActionModule(ActionBase):
-    TRANSFERS_FILES = False
-    _VALID_ARGS = None
-    _MANDATORY_ARGS = None
-
-    def _wrap_call(self, func, *args):
-        try:
-            res = func(*args)
-        except AdcmEx as e:
-            return {"failed": True, "msg": e.msg}
-        if isinstance(res, PluginResult):
-            return {"changed": res.changed}
-        return {"changed": True}
-
-    def _check_mandatory(self):
-        for arg in self._MANDATORY_ARGS:
-            if arg not in self._task.args:
-                raise AnsibleError(MSG_MANDATORY_ARGS.format(self._MANDATORY_ARGS))
-
-    def _get_job_var(self, task_vars, name):
-        try:
-            return task_vars["job"][name]
-        except KeyError as error:
-            raise AnsibleError(MSG_NO_CLUSTER_CONTEXT) from error
-
-    def _do_cluster(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_service_by_name(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_service(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_host(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_component(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_component_by_name(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_provider(self, task_vars, context):
-        raise NotImplementedError
-
-    def _do_host_from_provider(self, task_vars, context):
-        raise NotImplementedError
-
-    def run(self, tmp=None, task_vars=None):
-        self._check_mandatory()
-        obj_type = self._task.args["type"]
-        job_id = task_vars["job"]["id"]
-        file_descriptor = job_lock(job_id)
-
-        if obj_type == "cluster":
-            check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
-            res = self._do_cluster(task_vars, {"cluster_id": self._get_job_var(task_vars, "cluster_id")})
-        elif obj_type == "service" and "service_name" in self._task.args:
-            check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
-            res = self._do_service_by_name(task_vars, {"cluster_id": self._get_job_var(task_vars, "cluster_id")})
-        elif obj_type == "service":
-            check_context_type(task_vars=task_vars, context_types=("service", "component"))
-            res = self._do_service(
-                task_vars,
-                {
-                    "cluster_id": self._get_job_var(task_vars, "cluster_id"),
-                    "service_id": self._get_job_var(task_vars, "service_id"),
-                },
-            )
-        elif obj_type == "host" and "host_id" in self._task.args:
-            check_context_type(task_vars=task_vars, context_types=("provider",))
-            res = self._do_host_from_provider(task_vars, {})
-        elif obj_type == "host":
-            check_context_type(task_vars=task_vars, context_types=("host",))
-            res = self._do_host(task_vars, {"host_id": self._get_job_var(task_vars, "host_id")})
-        elif obj_type == "provider":
-            check_context_type(task_vars=task_vars, context_types=("provider", "host"))
-            res = self._do_provider(task_vars, {"provider_id": self._get_job_var(task_vars, "provider_id")})
-        elif obj_type == "component" and "component_name" in self._task.args:
-            if "service_name" in self._task.args:
-                check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
-                res = self._do_component_by_name(
-                    task_vars,
-                    {
-                        "cluster_id": self._get_job_var(task_vars, "cluster_id"),
-                        "service_id": None,
-                    },
-                )
-            else:
-                check_context_type(task_vars=task_vars, context_types=("cluster", "service", "component"))
-                if task_vars["job"].get("service_id", None) is None:
-                    raise AnsibleError(MSG_NO_SERVICE_NAME)
-                res = self._do_component_by_name(
-                    task_vars,
-                    {
-                        "cluster_id": self._get_job_var(task_vars, "cluster_id"),
-                        "service_id": self._get_job_var(task_vars, "service_id"),
-                    },
-                )
-        elif obj_type == "component":
-            check_context_type(task_vars=task_vars, context_types=("component",))
-            res = self._do_component(task_vars, {"component_id": self._get_job_var(task_vars, "component_id")})
-        else:
-            raise AnsibleError(MSG_NO_ROUTE)
-
-        result = super().run(tmp, task_vars)
-        file_descriptor.close()
-
-        return merge_hash(result, res)
-
-
 # Helper functions for ansible plugins
 
 
@@ -344,30 +206,64 @@ def set_host_multi_state(host_id, multi_state):
     return _set_object_multi_state(obj, multi_state)
 
 
-def change_hc(job_id, cluster_id, operations):
+def change_hc(job_id: int, cluster_id: int, operations: list[dict]) -> None:
     """
     For use in ansible plugin adcm_hc
+
+    Names of all operations are resolved with one query per object type,
+    operations are applied to the set of map entries and only the difference with the current map is saved.
     """
-    file_descriptor = job_lock(job_id)
+
+    with job_lock(job_id):
+        _change_hc(job_id=job_id, cluster_id=cluster_id, operations=operations)
+
+
+def _change_hc(job_id: int, cluster_id: int, operations: list[dict]) -> None:
     action_id = JobLog.objects.values_list("task__action_id", flat=True).get(id=job_id)
     action = Action.objects.get(id=action_id)
     if action.hostcomponentmap:
         raise AdcmEx("ACTION_ERROR", "You can not change hc in plugin for action with hc_acl")
 
     cluster = Cluster.obj.get(id=cluster_id)
-    hostcomponent = get_hc(cluster)
+    services = {
+        service.prototype.name: service
+        for service in ClusterObject.objects.select_related("prototype").filter(cluster=cluster)
+    }
+    components = {
+        (component.service_id, component.prototype.name): component
+        for component in ServiceComponent.objects.select_related("prototype").filter(cluster=cluster)
+    }
+    hosts = {
+        host.fqdn: host
+        for host in Host.objects.filter(cluster=cluster, fqdn__in={operation["host"] for operation in operations})
+    }
+
+    hostcomponent = set(
+        HostComponent.objects.filter(cluster=cluster).values_list("host_id", "service_id", "component_id")
+    )
     for operation in operations:
-        service = ClusterObject.obj.get(cluster=cluster, prototype__name=operation["service"])
-        component = ServiceComponent.obj.get(cluster=cluster, service=service, prototype__name=operation["component"])
-        host = Host.obj.get(cluster=cluster, fqdn=operation["host"])
-        item = {
-            "host_id": host.id,
-            "service_id": service.id,
-            "component_id": component.id,
-        }
+        service = services.get(operation["service"])
+        if service is None:
+            raise AdcmEx(
+                ClusterObject.__error_code__,
+                f'Service "{operation["service"]}" does not exist in cluster #{cluster_id}',
+            )
+
+        component = components.get((service.pk, operation["component"]))
+        if component is None:
+            raise AdcmEx(
+                ServiceComponent.__error_code__,
+                f'Component "{operation["component"]}" does not exist in service "{operation["service"]}"',
+            )
+
+        host = hosts.get(operation["host"])
+        if host is None:
+            raise AdcmEx(Host.__error_code__, f'Host "{operation["host"]}" does not exist in cluster #{cluster_id}')
+
+        item = (host.pk, service.pk, component.pk)
         if operation["action"] == "add":
             if item not in hostcomponent:
-                hostcomponent.append(item)
+                hostcomponent.add(item)
             else:
                 msg = 'There is already component "{}" on host "{}"'
                 raise AdcmEx("COMPONENT_CONFLICT", msg.format(component.prototype.name, host.fqdn))
@@ -380,8 +276,13 @@ def change_hc(job_id, cluster_id, operations):
         else:
             raise AdcmEx("INVALID_INPUT", f'unknown hc action "{operation["action"]}"')
 
-    add_hc(cluster, hostcomponent)
-    file_descriptor.close()
+    add_hc(
+        cluster,
+        [
+            {"host_id": host_id, "service_id": service_id, "component_id": component_id}
+            for host_id, service_id, component_id in sorted(hostcomponent)
+        ],
+    )
 
 
 def cast_to_type(field_type: str, value: Any, limits: dict) -> Any:
@@ -399,16 +300,18 @@ def cast_to_type(field_type: str, value: Any, limits: dict) -> Any:
         raise AnsibleError(f"Could not convert '{value}' to '{field_type}'") from error
 
 
-class PluginResult(NamedTuple):
-    value: dict | int | str
-    changed: bool
+def _get_config_spec(prototype: Prototype) -> dict[tuple[str, str], PrototypeConfig]:
+    return {
+        (prototype_conf.name, prototype_conf.subname): prototype_conf
+        for prototype_conf in PrototypeConfig.objects.filter(prototype=prototype, action=None)
+    }
 
 
-def update_config(obj: ADCMEntity, conf: dict, attr: dict) -> PluginResult:
-    config_log = ConfigLog.objects.get(id=obj.config.current)
-
-    new_config = deepcopy(config_log.config)
-    new_attr = deepcopy(config_log.attr) if config_log.attr is not None else {}
+def _apply_config_changes(
+    spec: dict[tuple[str, str], PrototypeConfig], config: dict, attr: dict | None, conf: dict, attr_changes: dict
+) -> tuple[dict, dict]:
+    new_config = deepcopy(config)
+    new_attr = deepcopy(attr) if attr is not None else {}
 
     for keys, value in conf.items():
         keys_list = keys.split("/")
@@ -418,37 +321,55 @@ def update_config(obj: ADCMEntity, conf: dict, attr: dict) -> PluginResult:
             subkey = keys_list[1]
 
         if subkey:
-            try:
-                prototype_conf = PrototypeConfig.objects.get(
-                    name=key, subname=subkey, prototype=obj.prototype, action=None
-                )
-            except PrototypeConfig.DoesNotExist as error:
-                raise AnsibleError(f"Config parameter '{key}/{subkey}' does not exist") from error
+            prototype_conf = spec.get((key, subkey))
+            if prototype_conf is None:
+                raise AnsibleError(f"Config parameter '{key}/{subkey}' does not exist")
             new_config[key][subkey] = cast_to_type(
                 field_type=prototype_conf.type, value=value, limits=prototype_conf.limits
             )
         else:
-            try:
-                prototype_conf = PrototypeConfig.objects.get(name=key, subname="", prototype=obj.prototype, action=None)
-            except PrototypeConfig.DoesNotExist as error:
-                raise AnsibleError(f"Config parameter '{key}' does not exist") from error
+            prototype_conf = spec.get((key, ""))
+            if prototype_conf is None:
+                raise AnsibleError(f"Config parameter '{key}' does not exist")
             new_config[key] = cast_to_type(field_type=prototype_conf.type, value=value, limits=prototype_conf.limits)
 
-        if key in attr:
-            prototype_conf = PrototypeConfig.objects.filter(
-                name=key, prototype=obj.prototype, type="group", action=None
-            )
+        if key in attr_changes:
+            prototype_conf = spec.get((key, ""))
 
-            if not prototype_conf or "activatable" not in prototype_conf.first().limits:
+            if prototype_conf is None or prototype_conf.type != "group" or "activatable" not in prototype_conf.limits:
                 raise AnsibleError("'active' key should be used only with activatable group")
 
-            new_attr.update(attr)
+            new_attr.update(attr_changes)
 
-    for key in attr:
-        for subkey, value in config_log.config[key].items():
+    for key in attr_changes:
+        for subkey, value in config[key].items():
             if not new_config[key] or subkey not in new_config[key]:
                 new_config[key][subkey] = value
 
+    return new_config, new_attr
+
+
+def _config_result(conf: dict, changed: bool) -> PluginResult:
+    if len(conf) == 1:
+        return PluginResult(list(conf.values())[0], changed)
+
+    return PluginResult(conf, changed)
+
+
+def update_config(obj: ADCMEntity, conf: dict, attr: dict, defer_job_id: int | None = None) -> PluginResult:
+    if defer_job_id is not None:
+        return defer_config_update(job_id=defer_job_id, obj=obj, conf=conf, attr=attr)
+
+    config_log = ConfigLog.objects.get(id=obj.config.current)
+
+    new_config, new_attr = _apply_config_changes(
+        spec=_get_config_spec(prototype=obj.prototype),
+        config=config_log.config,
+        attr=config_log.attr,
+        conf=conf,
+        attr_changes=attr,
+    )
+
     if _does_contain(base_dict=config_log.config, part=new_config) and _does_contain(
         base_dict=config_log.attr, part=new_attr
     ):
@@ -457,40 +378,115 @@ def update_config(obj: ADCMEntity, conf: dict, attr: dict) -> PluginResult:
     set_object_config_with_plugin(obj=obj, config=new_config, attr=new_attr)
     send_config_creation_event(object_=obj)
 
-    if len(conf) == 1:
-        return PluginResult(list(conf.values())[0], True)
+    return _config_result(conf=conf, changed=True)
+
+
+def _deferred_config_path(job_id: int) -> Path:
+    return settings.RUN_DIR / str(job_id) / "deferred_config.json"
+
+
+def _read_deferred_config(job_id: int) -> dict[str, dict]:
+    path = _deferred_config_path(job_id=job_id)
+    if not path.is_file():
+        return {}
+
+    return json.loads(path.read_text(encoding=settings.ENCODING_UTF_8))
+
+
+def defer_config_update(job_id: int, obj: ADCMEntity, conf: dict, attr: dict) -> PluginResult:
+    """
+    Validate config changes and accumulate them in job's directory instead of saving new config revision.
+    Accumulated changes are saved as one revision per object by `flush_deferred_config`.
+    Caller should hold `job_lock`.
+    """
+
+    deferred = _read_deferred_config(job_id=job_id)
+    changes = deferred.setdefault(f"{obj.prototype.type}.{obj.pk}", {"config": {}, "attr": {}})
+
+    config_log = ConfigLog.objects.get(id=obj.config.current)
+    spec = _get_config_spec(prototype=obj.prototype)
+    pending_config, pending_attr = _apply_config_changes(
+        spec=spec,
+        config=config_log.config,
+        attr=config_log.attr,
+        conf=changes["config"],
+        attr_changes=changes["attr"],
+    )
+    new_config, new_attr = _apply_config_changes(
+        spec=spec, config=pending_config, attr=pending_attr, conf=conf, attr_changes=attr
+    )
+
+    if _does_contain(base_dict=pending_config, part=new_config) and _does_contain(
+        base_dict=pending_attr, part=new_attr
+    ):
+        return PluginResult(conf, False)
+
+    for key, value in conf.items():
+        # the latest change of the key should be applied last, e.g. after change of the whole group
+        changes["config"].pop(key, None)
+        changes["config"][key] = value
+
+    changes["attr"].update(attr)
+
+    _deferred_config_path(job_id=job_id).write_text(json.dumps(deferred), encoding=settings.ENCODING_UTF_8)
+
+    return _config_result(conf=conf, changed=True)
+
+
+def flush_deferred_config(job_id: int) -> bool:
+    """Save config changes accumulated during job, returns whether any config was changed"""
+
+    path = _deferred_config_path(job_id=job_id)
+    deferred = _read_deferred_config(job_id=job_id)
+    if not deferred:
+        return False
+
+    changed = False
+    for object_key, changes in deferred.items():
+        object_type, object_id = object_key.split(".")
+        obj = get_model_by_type(object_type=object_type).objects.filter(pk=int(object_id)).first()
+        if obj is None:
+            continue
+
+        changed |= update_config(obj=obj, conf=changes["config"], attr=changes["attr"]).changed
+
+    path.unlink()
 
-    return PluginResult(conf, True)
+    return changed
 
 
-def set_cluster_config(cluster_id: int, config: dict, attr: dict) -> PluginResult:
+def set_cluster_config(cluster_id: int, config: dict, attr: dict, defer_job_id: int | None = None) -> PluginResult:
     obj = Cluster.obj.get(id=cluster_id)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
-def set_host_config(host_id: int, config: dict, attr: dict) -> PluginResult:
+def set_host_config(host_id: int, config: dict, attr: dict, defer_job_id: int | None = None) -> PluginResult:
     obj = Host.obj.get(id=host_id)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
-def set_provider_config(provider_id: int, config: dict, attr: dict) -> PluginResult:
+def set_provider_config(provider_id: int, config: dict, attr: dict, defer_job_id: int | None = None) -> PluginResult:
     obj = HostProvider.obj.get(id=provider_id)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
-def set_service_config_by_name(cluster_id: int, service_name: str, config: dict, attr: dict) -> PluginResult:
+def set_service_config_by_name(
+    cluster_id: int, service_name: str, config: dict, attr: dict, defer_job_id: int | None = None
+) -> PluginResult:
     obj = get_service_by_name(cluster_id, service_name)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
-def set_service_config(cluster_id: int, service_id: int, config: dict, attr: dict) -> PluginResult:
+def set_service_config(
+    cluster_id: int, service_id: int, config: dict, attr: dict, defer_job_id: int | None = None
+) -> PluginResult:
     obj = ClusterObject.obj.get(id=service_id, cluster__id=cluster_id, prototype__type="service")
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
 def _does_contain(base_dict: dict, part: dict) -> bool:
@@ -523,16 +519,17 @@ def set_component_config_by_name(
     service_name: str,
     config: dict,
     attr: dict,
+    defer_job_id: int | None = None,
 ):
     obj = get_component_by_name(cluster_id, service_id, component_name, service_name)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
-def set_component_config(component_id: int, config: dict, attr: dict):
+def set_component_config(component_id: int, config: dict, attr: dict, defer_job_id: int | None = None):
     obj = ServiceComponent.obj.get(id=component_id)
 
-    return update_config(obj=obj, conf=config, attr=attr)
+    return update_config(obj=obj, conf=config, attr=attr, defer_job_id=defer_job_id)
 
 
 def check_missing_ok(obj: ADCMEntity, multi_state: str, missing_ok):
@@ -14,6 +14,7 @@ from pathlib import Path
 import json
 
 from ansible_plugin.utils import get_checklogs_data_by_job_id
+from cm.log import extract_log_content_from_db
 from cm.models import JobLog, JobStatus, LogStorage, TaskLog
 from cm.services.job.action import ActionRunPayload, run_action
 from django.conf import settings
@@ -287,7 +288,7 @@ class LogStorageRetrieveSerializer(HyperlinkedModelSerializer):
             with open(path_file, encoding=settings.ENCODING_UTF_8) as f:
                 content = f.read()
         except FileNotFoundError:
-            content = ""
+            content = extract_log_content_from_db(log_id=obj.id) or ""
 
         return content
 
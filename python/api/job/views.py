@@ -18,6 +18,7 @@ import tarfile
 from adcm.permissions import check_custom_perm, get_object_for_user
 from audit.utils import audit
 from cm.errors import AdcmEx
+from cm.log import extract_log_content_from_db
 from cm.models import ActionType, JobLog, JobStatus, LogStorage, TaskLog
 from cm.services.job.run import restart_task, run_task
 from cm.utils import str_remove_non_alnum
@@ -133,7 +134,11 @@ def get_task_download_archive_file_handler(task: TaskLog) -> io.BytesIO:
                     tarinfo = tarfile.TarInfo(
                         f'{f"{job.pk}-{dir_name_suffix}".strip("-")}' f"/{log_storage.name}-{log_storage.type}.txt",
                     )
-                    body = io.BytesIO(bytes(log_storage.body, settings.ENCODING_UTF_8))
+                    content = log_storage.body
+                    if content is None:
+                        content = extract_log_content_from_db(log_id=log_storage.id) or ""
+
+                    body = io.BytesIO(bytes(content, settings.ENCODING_UTF_8))
                     tarinfo.size = body.getbuffer().nbytes
                     tar_file.addfile(tarinfo=tarinfo, fileobj=body)
 
@@ -303,8 +308,8 @@ class LogStorageViewSet(PermissionListMixin, ListModelMixin, RetrieveModelMixin,
                     body = f.read()
                     length = len(body)
             else:
-                body = ""
-                length = 0
+                body = extract_log_content_from_db(log_id=log_storage.id) or ""
+                length = len(body)
         else:
             body = log_storage.body
             length = len(body)
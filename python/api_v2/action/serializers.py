@@ -13,7 +13,7 @@
 from adcm.serializers import EmptySerializer
 from cm.models import Action
 from drf_spectacular.utils import extend_schema_field
-from rest_framework.fields import CharField, ChoiceField, IntegerField
+from rest_framework.fields import CharField, ChoiceField, IntegerField, ListField
 from rest_framework.serializers import (
     BooleanField,
     DictField,
@@ -104,6 +104,12 @@ class ActionRunSerializer(EmptySerializer):
     is_verbose = BooleanField(required=False, default=False)
 
 
+class ActionBulkRunSerializer(EmptySerializer):
+    object_ids = ListField(child=IntegerField(), allow_empty=False)
+    configuration = ActionRunConfiguration(required=False, default=None, allow_null=True)
+    is_verbose = BooleanField(required=False, default=False)
+
+
 class ActionNameSerializer(ModelSerializer):
     class Meta:
         model = Action
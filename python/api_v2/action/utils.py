@@ -28,6 +28,7 @@ from cm.models import (
     PrototypeConfig,
     ServiceComponent,
 )
+from cm.services.action import get_granted_permissions
 from cm.services.bundle import ADCMBundlePathResolver, BundlePathResolver
 from django.conf import settings
 from jinja_config import get_jinja_config
@@ -45,7 +46,12 @@ def get_run_actions_permissions(actions: Iterable[Action]) -> list[str]:
 
 
 def filter_actions_by_user_perm(user: User, obj: ADCMEntity, actions: Iterable[Action]) -> Iterator[Action]:
-    mask = [user.has_perm(perm=perm, obj=obj) for perm in get_run_actions_permissions(actions=actions)]
+    actions = list(actions)
+    granted = get_granted_permissions(user=user, obj=obj)
+    if granted is None:
+        return iter(actions)
+
+    mask = [perm in granted for perm in get_run_actions_permissions(actions=actions)]
 
     return compress(data=actions, selectors=mask)
 
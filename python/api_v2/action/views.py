@@ -10,13 +10,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from itertools import compress
-
 from adcm.mixins import GetParentObjectMixin
-from audit.utils import audit
+from adcm.permissions import RUN_ACTION_PERM_PREFIX
+from audit.models import AuditLogOperationResult
+from audit.utils import audit, audit_bulk_action_launch
 from cm.errors import AdcmEx
-from cm.models import ADCM, Action, ConcernType, Host, HostComponent, PrototypeConfig
-from cm.services.job.action import ActionRunPayload, run_action
+from cm.models import ADCM, Action, ConcernType, Host, HostComponent, PrototypeConfig, get_model_by_type
+from cm.services.action import filter_available_actions, get_objects_granted_permissions
+from cm.services.job.action import ActionRunPayload, ObjectWithAction, run_action, run_action_bulk
 from cm.stack import check_hostcomponents_objects_exist
 from django.conf import settings
 from django.db.models import Q
@@ -38,6 +39,7 @@ from rest_framework.status import (
 
 from api_v2.action.filters import ActionFilter
 from api_v2.action.serializers import (
+    ActionBulkRunSerializer,
     ActionListSerializer,
     ActionRetrieveSerializer,
     ActionRunSerializer,
@@ -46,6 +48,7 @@ from api_v2.action.utils import (
     check_run_perms,
     filter_actions_by_user_perm,
     get_action_configuration,
+    get_str_hash,
     insert_service_ids,
     unique_hc_entries,
 )
@@ -174,8 +177,7 @@ class ActionViewSet(ListModelMixin, RetrieveModelMixin, GetParentObjectMixin, Ca
             raise NotFound()
 
         actions = self.filter_queryset(self.get_queryset())
-        allowed_actions_mask = [act.allowed(self.prototype_objects[act.prototype]) for act in actions]
-        actions = list(compress(actions, allowed_actions_mask))
+        actions = filter_available_actions(actions=actions, prototype_objects=self.prototype_objects)
         actions = filter_actions_by_user_perm(user=request.user, obj=self.parent_object, actions=actions)
 
         serializer = self.get_serializer_class()(instance=actions, many=True, context={"obj": self.parent_object})
@@ -301,3 +303,120 @@ class ActionViewSet(ListModelMixin, RetrieveModelMixin, GetParentObjectMixin, Ca
 class AdcmActionViewSet(ActionViewSet):
     def get_parent_object(self):
         return ADCM.objects.first()
+
+
+@extend_schema_view(
+    run_bulk=extend_schema(
+        operation_id="postActionBulkRun",
+        summary="POST action on multiple objects",
+        description="Run the same action on multiple objects. Either all tasks are launched or none of them.",
+        responses={
+            HTTP_200_OK: TaskListSerializer(many=True),
+            HTTP_400_BAD_REQUEST: ErrorSerializer,
+            HTTP_404_NOT_FOUND: ErrorSerializer,
+            HTTP_409_CONFLICT: ErrorSerializer,
+        },
+    ),
+)
+class ActionBulkRunViewSet(CamelCaseGenericViewSet):
+    queryset = (
+        Action.objects.select_related("prototype")
+        .exclude(name__in=settings.ADCM_SERVICE_ACTION_NAMES_SET)
+        .filter(upgrade__isnull=True)
+    )
+    serializer_class = ActionBulkRunSerializer
+
+    @action(methods=["post"], detail=True, url_path="run-bulk")
+    def run_bulk(self, request: Request, *args, **kwargs) -> Response:  # noqa: ARG002
+        target_action = self.get_object()
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        object_ids = set(serializer.validated_data["object_ids"])
+        objects = self._get_target_objects(target_action=target_action, object_ids=object_ids)
+
+        try:
+            if len(objects) != len(object_ids) or not self._has_run_permissions(
+                target_action=target_action, objects=objects
+            ):
+                raise NotFound()
+
+            for object_ in objects:
+                if reason := target_action.get_start_impossible_reason(object_):
+                    raise AdcmEx("ACTION_ERROR", msg=f"{object_}: {reason}")
+
+            configuration = serializer.validated_data["configuration"] or {"config": {}, "adcm_meta": {}}
+            if target_action.config_jinja:
+                prototype_configs, _ = get_jinja_config(action=target_action, obj=objects[0])
+                prototype_configs = [
+                    prototype_config for prototype_config in prototype_configs if prototype_config.type == "json"
+                ]
+            else:
+                prototype_configs = PrototypeConfig.objects.filter(
+                    prototype=target_action.prototype, type="json", action=target_action
+                ).order_by("pk")
+
+            tasks = run_action_bulk(
+                action=target_action,
+                objects=objects,
+                payload=ActionRunPayload(
+                    conf=represent_string_as_json_type(
+                        prototype_configs=prototype_configs, value=configuration["config"]
+                    ),
+                    attr=convert_adcm_meta_to_attr(adcm_meta=configuration["adcm_meta"]),
+                    verbose=serializer.validated_data["is_verbose"],
+                ),
+            )
+        except (AdcmEx, NotFound) as error:
+            result = AuditLogOperationResult.DENIED if isinstance(error, NotFound) else AuditLogOperationResult.FAIL
+            audit_bulk_action_launch(request=request, action=target_action, objects=objects, result=result)
+            raise
+
+        audit_bulk_action_launch(
+            request=request, action=target_action, objects=objects, result=AuditLogOperationResult.SUCCESS
+        )
+
+        return Response(status=HTTP_200_OK, data=TaskListSerializer(instance=tasks, many=True).data)
+
+    @staticmethod
+    def _get_target_objects(target_action: Action, object_ids: set[int]) -> list[ObjectWithAction]:
+        prototype = target_action.prototype
+
+        if target_action.host_action:
+            # host actions are available only on hosts mapped to action's owner
+            queryset = Host.objects.filter(cluster__isnull=False)
+            match prototype.type:
+                case "cluster":
+                    queryset = queryset.filter(cluster__prototype=prototype)
+                case "service":
+                    queryset = queryset.filter(hostcomponent__service__prototype=prototype)
+                case "component":
+                    queryset = queryset.filter(hostcomponent__component__prototype=prototype)
+                case _:
+                    return []
+        else:
+            queryset = get_model_by_type(object_type=prototype.type).objects.filter(prototype=prototype)
+
+        related = ["prototype"]
+        if target_action.host_action or prototype.type in {"service", "component", "host"}:
+            related.append("cluster")
+
+        return list(queryset.select_related(*related).filter(pk__in=object_ids).distinct().order_by("pk"))
+
+    def _has_run_permissions(self, target_action: Action, objects: list[ObjectWithAction]) -> bool:
+        user = self.request.user
+        model_name = objects[0].__class__.__name__.lower()
+        run_permission = f"{RUN_ACTION_PERM_PREFIX}{get_str_hash(value=target_action.name)}"
+
+        granted = get_objects_granted_permissions(user=user, objects=objects)
+        if granted is None:
+            return True
+
+        has_model_view_permission = user.has_perm(perm=f"cm.view_{model_name}")
+
+        return all(
+            run_permission in granted[object_]
+            and (has_model_view_permission or f"cm.view_{model_name}" in granted[object_])
+            for object_ in objects
+        )
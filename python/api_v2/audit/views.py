@@ -19,6 +19,7 @@ from rest_framework.permissions import DjangoObjectPermissions
 from api_v2.api_schema import ErrorSerializer
 from api_v2.audit.filters import AuditLogFilterSet, AuditSessionFilterSet
 from api_v2.audit.serializers import AuditLogSerializer, AuditSessionSerializer
+from api_v2.pagination import OptionalKeysetPagination
 from api_v2.views import CamelCaseReadOnlyModelViewSet
 
 
@@ -38,6 +39,9 @@ from api_v2.views import CamelCaseReadOnlyModelViewSet
 class AuditSessionViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet):
     queryset = AuditSession.objects.select_related("user").order_by("-login_time")
     serializer_class = AuditSessionSerializer
+    pagination_class = OptionalKeysetPagination
+    # records are created with current time, so pk keeps the same order and is indexed by itself
+    keyset_ordering = "-pk"
     permission_classes = [DjangoObjectPermissions]
     permission_required = ["audit.view_auditsession"]
     filterset_class = AuditSessionFilterSet
@@ -60,6 +64,8 @@ class AuditSessionViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet):
 class AuditLogViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet):
     queryset = AuditLog.objects.select_related("audit_object", "user").order_by("-operation_time")
     serializer_class = AuditLogSerializer
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = "-pk"
     permission_classes = [DjangoObjectPermissions]
     permission_required = ["audit.view_auditlog"]
     filterset_class = AuditLogFilterSet
@@ -20,7 +20,8 @@ from django_filters.rest_framework import (
     OrderingFilter,
 )
 
-from api_v2.filters import filter_service_status
+from api_v2.filters import filter_host_status, filter_service_status
+from api_v2.views import get_status_map
 
 
 class ClusterFilter(FilterSet):
@@ -63,16 +64,8 @@ class ClusterFilter(FilterSet):
 class ClusterHostFilter(FilterSet):
     status = ChoiceFilter(label="Host status", choices=ADCMEntityStatus.choices, method="filter_status")
 
-    @staticmethod
-    def filter_status(queryset: QuerySet, _: str, value: str) -> QuerySet:
-        status_map = retrieve_status_map()
-
-        hosts_up = {host_id for host_id, status_info in status_map.hosts.items() if status_info.status == 0}
-
-        if value == ADCMEntityStatus.UP:
-            return queryset.filter(pk__in=hosts_up)
-
-        return queryset.exclude(pk__in=hosts_up)
+    def filter_status(self, queryset: QuerySet, _: str, value: str) -> QuerySet:
+        return filter_host_status(queryset=queryset, value=value, status_map=get_status_map(request=self.request))
 
 
 class ClusterServiceFilter(FilterSet):
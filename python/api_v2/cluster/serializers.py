@@ -11,7 +11,7 @@
 # limitations under the License.
 
 from adcm.serializers import EmptySerializer
-from cm.adcm_config.config import get_main_info
+from cm.adcm_config.config import get_main_info, get_main_info_bulk
 from cm.models import (
     Cluster,
     ClusterObject,
@@ -20,13 +20,15 @@ from cm.models import (
     Prototype,
     ServiceComponent,
 )
-from cm.upgrade import get_upgrade
+from cm.upgrade import get_upgradable, get_upgrade
 from cm.validators import ClusterUniqueValidator, StartMidEndValidator
 from django.conf import settings
+from django.db.models import Manager
 from drf_spectacular.utils import extend_schema_field
 from rest_framework.fields import CharField, IntegerField
 from rest_framework.serializers import (
     BooleanField,
+    ListSerializer,
     ModelSerializer,
     SerializerMethodField,
 )
@@ -38,6 +40,18 @@ from api_v2.prototype.utils import get_license_text
 from api_v2.serializers import DependOnSerializer, WithStatusSerializer
 
 
+class ClusterListSerializer(ListSerializer):
+    """Resolves `is_upgradable` and `main_info` for all clusters of the page at once"""
+
+    def to_representation(self, data):
+        clusters = list(data.all() if isinstance(data, Manager) else data)
+
+        self.upgradable = get_upgradable(objects=clusters)
+        self.main_info = get_main_info_bulk(objects=clusters)
+
+        return super().to_representation(data=clusters)
+
+
 class ClusterSerializer(WithStatusSerializer):
     prototype = PrototypeRelatedSerializer()
     concerns = ConcernSerializer(many=True, read_only=True)
@@ -59,13 +73,18 @@ class ClusterSerializer(WithStatusSerializer):
             "is_upgradable",
             "main_info",
         ]
+        list_serializer_class = ClusterListSerializer
+
+    def get_is_upgradable(self, cluster: Cluster) -> bool:
+        if isinstance(self.parent, ClusterListSerializer):
+            return cluster.pk in self.parent.upgradable
 
-    @staticmethod
-    def get_is_upgradable(cluster: Cluster) -> bool:
         return bool(get_upgrade(obj=cluster))
 
-    @staticmethod
-    def get_main_info(cluster: Cluster) -> str | None:
+    def get_main_info(self, cluster: Cluster) -> str | None:
+        if isinstance(self.parent, ClusterListSerializer):
+            return self.parent.main_info[cluster.pk]
+
         return get_main_info(obj=cluster)
 
 
@@ -140,7 +140,8 @@ class ClusterViewSet(
     ObjectWithStatusViewMixin,
 ):
     queryset = (
-        Cluster.objects.prefetch_related("prototype", "concerns")
+        Cluster.objects.select_related("prototype__bundle")
+        .prefetch_related("concerns")
         .prefetch_related("clusterobject_set__prototype")
         .order_by("name")
     )
@@ -91,7 +91,7 @@ from api_v2.views import (
 class ComponentViewSet(
     PermissionListMixin, ConfigSchemaMixin, CamelCaseReadOnlyModelViewSet, ObjectWithStatusViewMixin
 ):
-    queryset = ServiceComponent.objects.select_related("cluster", "service").order_by("pk")
+    queryset = ServiceComponent.objects.select_related("cluster", "service").prefetch_related("concerns").order_by("pk")
     permission_classes = [DjangoModelPermissionsAudit]
     permission_required = [VIEW_COMPONENT_PERM]
     filterset_class = ComponentFilter
@@ -155,7 +155,11 @@ class ComponentViewSet(
     )
 )
 class HostComponentViewSet(PermissionListMixin, ListModelMixin, CamelCaseGenericViewSet, ObjectWithStatusViewMixin):
-    queryset = ServiceComponent.objects.select_related("cluster", "service").order_by("prototype__name")
+    queryset = (
+        ServiceComponent.objects.select_related("cluster", "service")
+        .prefetch_related("concerns")
+        .order_by("prototype__name")
+    )
     serializer_class = HostComponentSerializer
     permission_classes = [DjangoModelPermissionsAudit]
     permission_required = [VIEW_COMPONENT_PERM]
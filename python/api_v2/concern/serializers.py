@@ -13,9 +13,11 @@
 from adcm.serializers import EmptySerializer
 from cm.models import ConcernItem
 from cm.utils import get_obj_type
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Manager
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from rest_framework.fields import CharField, DictField, SerializerMethodField
-from rest_framework.serializers import BooleanField, ModelSerializer
+from rest_framework.serializers import BooleanField, ListSerializer, ModelSerializer
 
 
 @extend_schema_serializer(
@@ -34,6 +36,33 @@ class ReasonSerializer(EmptySerializer):
     placeholder = DictField()
 
 
+class ConcernListSerializer(ListSerializer):
+    """
+    Renders each distinct concern once per response.
+
+    Nested field is the same instance for all rows of the parent list,
+    so concerns shared by many objects (e.g. lock of cluster on all its hosts) are rendered once and reused.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._rendered = {}
+
+    def to_representation(self, data):
+        concerns = data.all() if isinstance(data, Manager) else data
+
+        result = []
+        for concern in concerns:
+            rendered = self._rendered.get(concern.pk)
+            if rendered is None:
+                rendered = self._rendered[concern.pk] = self.child.to_representation(concern)
+
+            result.append(rendered)
+
+        return result
+
+
 class ConcernSerializer(ModelSerializer):
     is_blocking = BooleanField(source="blocking")
     owner = SerializerMethodField()
@@ -42,9 +71,11 @@ class ConcernSerializer(ModelSerializer):
     class Meta:
         model = ConcernItem
         fields = ("id", "type", "reason", "is_blocking", "cause", "owner")
+        list_serializer_class = ConcernListSerializer
 
     def get_owner(self, obj):
+        # content types are cached by manager, unlike access through foreign key
         return {
             "id": obj.owner_id,
-            "type": get_obj_type(obj.owner_type.name) if obj.owner_type else None,
+            "type": get_obj_type(ContentType.objects.get_for_id(obj.owner_type_id).name) if obj.owner_type_id else None,
         }
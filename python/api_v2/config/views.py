@@ -40,6 +40,7 @@ from api_v2.config.utils import (
     represent_json_type_as_string,
     represent_string_as_json_type,
 )
+from api_v2.pagination import OptionalKeysetPagination
 from api_v2.views import CamelCaseGenericViewSet
 
 
@@ -85,6 +86,8 @@ class ConfigLogViewSet(
     ).order_by("-pk")
     permission_required = [VIEW_CONFIG_PERM]
     filter_backends = []
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = "-pk"
 
     def get_queryset(self, *args, **kwargs):
         parent_object = self.get_parent_object()
@@ -95,7 +98,13 @@ class ConfigLogViewSet(
         if not parent_object.config:
             return ConfigLog.objects.none()
 
-        return super().get_queryset(*args, **kwargs).filter(obj_ref=parent_object.config)
+        queryset = super().get_queryset(*args, **kwargs).filter(obj_ref=parent_object.config)
+
+        if self.action == "list":
+            # history list doesn't show configurations, so there's no need to load (and restore) them
+            queryset = queryset.defer("config", "attr", "delta")
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -13,8 +13,25 @@
 from itertools import chain
 
 from cm.models import ADCMEntityStatus
-from cm.services.status.client import retrieve_status_map
-from django.db.models import Q, QuerySet
+from cm.services.status.client import FullStatusMap, retrieve_status_map
+from django.db.models import Case, CharField, Q, QuerySet, Value, When
+
+
+def annotate_host_status(queryset: QuerySet, status_map: FullStatusMap) -> QuerySet:
+    return queryset.annotate(
+        status_value=Case(
+            When(pk__in=status_map.hosts_up, then=Value(ADCMEntityStatus.UP.value)),
+            default=Value(ADCMEntityStatus.DOWN.value),
+            output_field=CharField(),
+        )
+    )
+
+
+def filter_host_status(queryset: QuerySet, value: str, status_map: FullStatusMap) -> QuerySet:
+    if value == ADCMEntityStatus.UP:
+        return queryset.filter(pk__in=status_map.hosts_up)
+
+    return queryset.exclude(pk__in=status_map.hosts_up)
 
 
 def filter_service_status(queryset: QuerySet, value: str) -> QuerySet:
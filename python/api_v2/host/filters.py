@@ -10,35 +10,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from cm.models import Host
-from django_filters.rest_framework import BooleanFilter, CharFilter, FilterSet, OrderingFilter
+from cm.models import ADCMEntityStatus, Host
+from django.db.models import QuerySet
+from django_filters.rest_framework import BooleanFilter, CharFilter, ChoiceFilter, FilterSet, OrderingFilter
 
+from api_v2.filters import annotate_host_status, filter_host_status
+from api_v2.views import get_status_map
 
-class HostFilter(FilterSet):
+
+class _HostStatusFilterMixin:
+    """Status of hosts is taken from request's status map snapshot, filtering and sorting by it are done in DB"""
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        ordering = self.form.cleaned_data.get("ordering") or ()
+        if not any(value.lstrip("-") == "status" for value in ordering):
+            return super().filter_queryset(queryset)
+
+        queryset = annotate_host_status(queryset=queryset, status_map=get_status_map(request=self.request))
+        queryset = super().filter_queryset(queryset)
+
+        # status has only two values, unique fqdn keeps order (and so pagination) stable
+        return queryset.order_by(*queryset.query.order_by, "fqdn")
+
+    def filter_status(self, queryset: QuerySet, _: str, value: str) -> QuerySet:
+        return filter_host_status(queryset=queryset, value=value, status_map=get_status_map(request=self.request))
+
+
+class HostFilter(_HostStatusFilterMixin, FilterSet):
     name = CharFilter(label="Host name", field_name="fqdn", lookup_expr="icontains")
     hostprovider_name = CharFilter(label="Hostprovider name", field_name="provider__name")
     cluster_name = CharFilter(label="Cluster name", field_name="cluster__name")
     is_in_cluster = BooleanFilter(label="Is host in cluster", method="filter_is_in_cluster")
+    status = ChoiceFilter(label="Host status", choices=ADCMEntityStatus.choices, method="filter_status")
     ordering = OrderingFilter(
-        fields={"fqdn": "name", "id": "id"}, field_labels={"name": "Name", "id": "Id"}, label="ordering"
+        fields={"fqdn": "name", "id": "id", "status_value": "status"},
+        field_labels={"name": "Name", "id": "Id", "status": "Status"},
+        label="ordering",
     )
 
     class Meta:
         model = Host
-        fields = ["name", "hostprovider_name", "cluster_name", "is_in_cluster"]
+        fields = ["name", "hostprovider_name", "cluster_name", "is_in_cluster", "status"]
 
     @staticmethod
     def filter_is_in_cluster(queryset, _, value):
         return queryset.filter(cluster__isnull=not value)
 
 
-class HostClusterFilter(FilterSet):
+class HostClusterFilter(_HostStatusFilterMixin, FilterSet):
     name = CharFilter(label="Host name", field_name="fqdn", lookup_expr="icontains")
     hostprovider_name = CharFilter(label="Hostprovider name", field_name="provider__name")
+    status = ChoiceFilter(label="Host status", choices=ADCMEntityStatus.choices, method="filter_status")
     ordering = OrderingFilter(
-        fields={"fqdn": "name", "id": "id"}, field_labels={"name": "Name", "id": "Id"}, label="ordering"
+        fields={"fqdn": "name", "id": "id", "status_value": "status"},
+        field_labels={"name": "Name", "id": "Id", "status": "Status"},
+        label="ordering",
     )
 
     class Meta:
         model = Host
-        fields = ["name", "hostprovider_name", "ordering"]
+        fields = ["name", "hostprovider_name", "status", "ordering"]
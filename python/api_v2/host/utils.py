@@ -16,9 +16,10 @@ from cm.api import check_license
 from cm.api_context import CTX
 from cm.issue import add_concern_to_object, update_hierarchy_issues
 from cm.logger import logger
-from cm.models import Cluster, Host, HostProvider, Prototype
+from cm.models import Cluster, Host, HostComponent, HostProvider, Prototype
 from cm.services.maintenance_mode import get_maintenance_mode_response
 from cm.services.status.notify import reset_hc_map
+from django.db.models import Prefetch
 from django.db.transaction import atomic
 from rbac.models import re_apply_object_policy
 from rest_framework.request import Request
@@ -28,6 +29,11 @@ from rest_framework.status import HTTP_200_OK, HTTP_409_CONFLICT
 from api_v2.host.serializers import HostChangeMaintenanceModeSerializer
 
 
+def host_components_prefetch() -> Prefetch:
+    # mapping of the whole page is read with components and their prototypes in one query
+    return Prefetch("hostcomponent_set", queryset=HostComponent.objects.select_related("component__prototype"))
+
+
 def add_new_host_and_map_it(provider: HostProvider, fqdn: str, cluster: Cluster | None = None) -> Host:
     host_proto = Prototype.objects.get(type="host", bundle=provider.prototype.bundle)
     check_license(prototype=host_proto)
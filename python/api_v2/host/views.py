@@ -68,7 +68,7 @@ from api_v2.host.serializers import (
     HostSerializer,
     HostUpdateSerializer,
 )
-from api_v2.host.utils import add_new_host_and_map_it, maintenance_mode
+from api_v2.host.utils import add_new_host_and_map_it, host_components_prefetch, maintenance_mode
 from api_v2.views import (
     CamelCaseModelViewSet,
     CamelCaseReadOnlyModelViewSet,
@@ -184,7 +184,7 @@ from api_v2.views import (
 class HostViewSet(PermissionListMixin, ConfigSchemaMixin, ObjectWithStatusViewMixin, CamelCaseModelViewSet):
     queryset = (
         Host.objects.select_related("provider", "cluster", "cluster__prototype", "prototype")
-        .prefetch_related("concerns", "hostcomponent_set__component__prototype")
+        .prefetch_related("concerns", host_components_prefetch())
         .order_by("fqdn")
     )
     permission_required = [VIEW_HOST_PERM]
@@ -385,7 +385,7 @@ class HostClusterViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet, Obj
     # don't use it directly, use `get_queryset`
     queryset = (
         Host.objects.select_related("cluster", "cluster__prototype", "provider", "prototype")
-        .prefetch_related("concerns", "hostcomponent_set__component__prototype")
+        .prefetch_related("concerns", host_components_prefetch())
         .order_by("fqdn")
     )
     filterset_class = HostClusterFilter
@@ -406,17 +406,13 @@ class HostClusterViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet, Obj
             user=self.request.user, perms=VIEW_CLUSTER_PERM, klass=Cluster, id=self.kwargs["cluster_pk"]
         )
 
-        by_cluster_qs = (
+        # host components mapping is already prefetched by `queryset`, including "statuses" action
+        return (
             get_objects_for_user(**self.get_get_objects_for_user_kwargs(self.queryset))
             .filter(cluster=cluster)
             .order_by("fqdn")
         )
 
-        if self.action == "statuses":
-            return by_cluster_qs.prefetch_related("hostcomponent_set__component__prototype")
-
-        return by_cluster_qs
-
     @audit
     def create(self, request, *_, **kwargs):
         cluster = get_object_for_user(
@@ -485,7 +481,7 @@ class HostClusterViewSet(PermissionListMixin, CamelCaseReadOnlyModelViewSet, Obj
 
         return Response(
             data=ClusterHostStatusSerializer(
-                instance=Host.objects.prefetch_related("hostcomponent_set__component__prototype").get(id=host.id),
+                instance=Host.objects.prefetch_related(host_components_prefetch()).get(id=host.id),
                 context=self.get_serializer_context(),
             ).data
         )
@@ -109,7 +109,7 @@ from api_v2.views import CamelCaseReadOnlyModelViewSet
     ),
 )
 class HostProviderViewSet(PermissionListMixin, ConfigSchemaMixin, CamelCaseReadOnlyModelViewSet):
-    queryset = HostProvider.objects.select_related("prototype").order_by("name")
+    queryset = HostProvider.objects.select_related("prototype").prefetch_related("concerns").order_by("name")
     serializer_class = HostProviderSerializer
     permission_classes = [HostProviderPermissions]
     permission_required = [VIEW_PROVIDER_PERM]
@@ -11,15 +11,18 @@
 # limitations under the License.
 
 from cm.models import JobLog
-from rest_framework.fields import DateTimeField
+from drf_spectacular.utils import extend_schema_field
+from rest_framework.fields import DateTimeField, SerializerMethodField
 
-from api_v2.task.serializers import JobListSerializer, TaskRetrieveByJobSerializer
+from api_v2.task.serializers import JobListSerializer, PhaseTimingSerializer, TaskRetrieveByJobSerializer
+from api_v2.task.utils import timings_to_phases
 
 
 class JobRetrieveSerializer(JobListSerializer):
     parent_task = TaskRetrieveByJobSerializer(source="task", allow_null=True)
     start_time = DateTimeField(source="start_date")
     end_time = DateTimeField(source="finish_date")
+    timings = SerializerMethodField()
 
     class Meta:
         model = JobLog
@@ -32,6 +35,12 @@ class JobRetrieveSerializer(JobListSerializer):
             "start_time",
             "end_time",
             "duration",
+            "timings",
             "task_id",
             "is_terminatable",
         )
+
+    @staticmethod
+    @extend_schema_field(field=PhaseTimingSerializer(many=True))
+    def get_timings(obj: JobLog) -> list[dict]:
+        return timings_to_phases(timings=obj.timings)
@@ -31,6 +31,7 @@ from rest_framework.status import (
 from api_v2.api_schema import DefaultParams, ErrorSerializer
 from api_v2.job.permissions import JobPermissions
 from api_v2.job.serializers import JobRetrieveSerializer
+from api_v2.pagination import OptionalKeysetPagination
 from api_v2.task.serializers import JobListSerializer
 from api_v2.views import CamelCaseGenericViewSet
 
@@ -74,6 +75,8 @@ from api_v2.views import CamelCaseGenericViewSet
 class JobViewSet(PermissionListMixin, ListModelMixin, RetrieveModelMixin, CamelCaseGenericViewSet):
     queryset = JobLog.objects.select_related("task__action").order_by("pk")
     filter_backends = []
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = "pk"
     permission_classes = [JobPermissions]
     permission_required = [VIEW_JOBLOG_PERMISSION]
 
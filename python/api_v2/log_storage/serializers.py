@@ -15,7 +15,7 @@ import json
 
 from adcm import settings
 from ansible_plugin.utils import get_checklogs_data_by_job_id
-from cm.log import extract_log_content_from_fs
+from cm.log import extract_log_content_from_db, extract_log_content_from_fs
 from cm.models import LogStorage
 from rest_framework.fields import SerializerMethodField
 from rest_framework.serializers import ModelSerializer
@@ -42,6 +42,8 @@ class LogStorageSerializer(ModelSerializer):
         if content is None:
             if log_type in {"stdout", "stderr"}:
                 content = extract_log_content_from_fs(jobs_dir=settings.RUN_DIR, log_info=obj)
+                if content is None:
+                    content = extract_log_content_from_db(log_id=obj.id)
 
             if log_type == "check":
                 content = get_checklogs_data_by_job_id(obj.job_id)
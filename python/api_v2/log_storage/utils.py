@@ -16,6 +16,7 @@ import io
 import tarfile
 
 from adcm import settings
+from cm.log import extract_log_content_from_db
 from cm.models import (
     ActionType,
     ClusterObject,
@@ -85,7 +86,11 @@ def get_task_download_archive_file_handler(task: TaskLog) -> io.BytesIO:
                     tarinfo = tarfile.TarInfo(
                         f'{f"{job.pk}-{dir_name_suffix}".strip("-")}' f"/{log_storage.name}-{log_storage.type}.txt",
                     )
-                    body = io.BytesIO(bytes(log_storage.body, settings.ENCODING_UTF_8))
+                    content = log_storage.body
+                    if content is None:
+                        content = extract_log_content_from_db(log_id=log_storage.id) or ""
+
+                    body = io.BytesIO(bytes(content, settings.ENCODING_UTF_8))
                     tarinfo.size = body.getbuffer().nbytes
                     tarinfo.mtime = datetime.now(tz=timezone.utc).timestamp()
                     tar_file.addfile(tarinfo=tarinfo, fileobj=body)
@@ -15,6 +15,7 @@ import re
 
 from adcm import settings
 from adcm.permissions import VIEW_LOGSTORAGE_PERMISSION
+from cm.log import extract_log_content_from_db
 from cm.models import JobLog, LogStorage
 from django.http import HttpResponse
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
@@ -123,8 +124,8 @@ class LogStorageViewSet(PermissionListMixin, ListModelMixin, RetrieveModelMixin,
                     body = f.read()
                     length = len(body)
             else:
-                body = ""
-                length = 0
+                body = extract_log_content_from_db(log_id=log_storage.id) or ""
+                length = len(body)
         else:
             body = log_storage.body
             length = len(body)
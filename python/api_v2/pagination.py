@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from cm.errors import AdcmEx
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+COUNT_EXACT = "exact"
+COUNT_APPROXIMATE = "approximate"
+COUNT_NONE = "none"
+
+
+def get_approximate_count(queryset: QuerySet) -> int:
+    """
+    Estimate of rows amount from query planner, when it's big enough to make exact counting expensive.
+
+    Only PostgreSQL provides estimates, exact count is used for other DBs.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        (plan,) = cursor.fetchone()
+
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < settings.API_APPROXIMATE_COUNT_THRESHOLD:
+        return queryset.count()
+
+    return estimate
+
+
+class _KeysetPagination(CursorPagination):
+    page_size_query_param = "limit"
+
+    def __init__(self, ordering: str):
+        self.ordering = ordering
+
+
+class OptionalKeysetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination by default and keyset (cursor) pagination on demand.
+
+    Keyset mode is turned on by `cursor` query parameter (empty for the first page).
+    Pages are taken by indexed `keyset_ordering` of view, so the cost of a page doesn't depend on its position,
+    `ordering` parameter has no effect in this mode.
+    Total amount of records isn't counted in keyset mode unless `count` is `exact` or `approximate` (planner estimate).
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    default_keyset_ordering = "-pk"
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        self.keyset = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset=queryset, request=request, view=view)
+
+        match request.query_params.get(self.count_query_param, COUNT_NONE):
+            case "none":
+                self.count = None
+            case "exact":
+                self.count = queryset.count()
+            case "approximate":
+                self.count = get_approximate_count(queryset=queryset)
+            case _:
+                raise AdcmEx(
+                    code="BAD_REQUEST",
+                    msg=f"{self.count_query_param} - expected one of: {COUNT_NONE}, {COUNT_EXACT}, {COUNT_APPROXIMATE}",
+                )
+
+        self.keyset = _KeysetPagination(ordering=getattr(view, "keyset_ordering", self.default_keyset_ordering))
+
+        return self.keyset.paginate_queryset(queryset=queryset, request=request, view=view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        if self.keyset is None:
+            return super().get_paginated_response(data=data)
+
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("next", self.keyset.get_next_link()),
+                    ("previous", self.keyset.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            *super().get_schema_operation_parameters(view=view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Turns keyset pagination on, empty value requests the first page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Counting of total amount of records in keyset mode.",
+                "schema": {"type": "string", "enum": [COUNT_NONE, COUNT_EXACT, COUNT_APPROXIMATE]},
+            },
+        ]
@@ -97,7 +97,7 @@ class ServiceViewSet(
     CamelCaseGenericViewSet,
     ObjectWithStatusViewMixin,
 ):
-    queryset = ClusterObject.objects.select_related("cluster").order_by("pk")
+    queryset = ClusterObject.objects.select_related("cluster").prefetch_related("concerns").order_by("pk")
     filterset_class = ServiceFilter
     filter_backends = (DjangoFilterBackend,)
     permission_required = [VIEW_SERVICE_PERM]
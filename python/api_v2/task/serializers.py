@@ -11,10 +11,12 @@
 # limitations under the License.
 
 from cm.models import JobLog, JobStatus, TaskLog
-from rest_framework.fields import CharField, DateTimeField, SerializerMethodField
-from rest_framework.serializers import ModelSerializer
+from drf_spectacular.utils import extend_schema_field
+from rest_framework.fields import CharField, DateTimeField, FloatField, IntegerField, SerializerMethodField
+from rest_framework.serializers import ModelSerializer, Serializer
 
 from api_v2.action.serializers import ActionNameSerializer
+from api_v2.task.utils import timings_to_phases
 
 OBJECT_ORDER = {
     "adcm": 0,
@@ -26,6 +28,25 @@ OBJECT_ORDER = {
 }
 
 
+class PhaseTimingSerializer(Serializer):
+    phase = CharField()
+    duration = FloatField()
+
+
+class PhaseMetricsSerializer(Serializer):
+    phase = CharField()
+    count = IntegerField()
+    total = FloatField()
+    mean = FloatField()
+    max = FloatField()
+
+
+class TaskMetricsSerializer(Serializer):
+    tasks = IntegerField()
+    task_phases = PhaseMetricsSerializer(many=True)
+    job_phases = PhaseMetricsSerializer(many=True)
+
+
 class JobListSerializer(ModelSerializer):
     is_terminatable = SerializerMethodField()
     start_time = DateTimeField(source="start_date")
@@ -57,6 +78,7 @@ class TaskSerializer(ModelSerializer):
     objects = SerializerMethodField()
     start_time = DateTimeField(source="start_date")
     end_time = DateTimeField(source="finish_date")
+    timings = SerializerMethodField()
 
     class Meta:
         model = TaskLog
@@ -69,6 +91,7 @@ class TaskSerializer(ModelSerializer):
             "start_time",
             "end_time",
             "duration",
+            "timings",
             "is_terminatable",
             "child_jobs",
             "objects",
@@ -83,6 +106,11 @@ class TaskSerializer(ModelSerializer):
 
         return False
 
+    @staticmethod
+    @extend_schema_field(field=PhaseTimingSerializer(many=True))
+    def get_timings(obj: TaskLog) -> list[dict]:
+        return timings_to_phases(timings=obj.timings)
+
     @staticmethod
     def get_objects(obj: TaskLog) -> list[dict[str, int | str]]:
         return [{"type": k, **v} for k, v in sorted(obj.selector.items(), key=lambda k: OBJECT_ORDER[k[0]])]
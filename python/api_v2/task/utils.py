@@ -0,0 +1,47 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from typing import Iterable
+
+
+def timings_to_phases(timings: dict[str, float]) -> list[dict]:
+    """Phases of execution from the longest one"""
+
+    return [
+        {"phase": phase, "duration": duration}
+        for phase, duration in sorted(timings.items(), key=lambda item: item[1], reverse=True)
+    ]
+
+
+def aggregate_timings(timings: Iterable[dict[str, float]]) -> list[dict]:
+    """Statistics of phases across executions from the one that took most time in total"""
+
+    durations = defaultdict(list)
+    for entry in timings:
+        for phase, duration in entry.items():
+            durations[phase].append(duration)
+
+    return sorted(
+        (
+            {
+                "phase": phase,
+                "count": len(values),
+                "total": round(sum(values), 6),
+                "mean": round(sum(values) / len(values), 6),
+                "max": max(values),
+            }
+            for phase, values in durations.items()
+        ),
+        key=lambda entry: entry["total"],
+        reverse=True,
+    )
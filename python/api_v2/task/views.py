@@ -12,7 +12,8 @@
 
 from adcm.permissions import VIEW_TASKLOG_PERMISSION
 from audit.utils import audit
-from cm.models import TaskLog
+from cm.errors import AdcmEx
+from cm.models import JobLog, TaskLog
 from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponse
 from django_filters.rest_framework.backends import DjangoFilterBackend
@@ -24,6 +25,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
     HTTP_409_CONFLICT,
@@ -34,11 +36,16 @@ from api_v2.log_storage.utils import (
     get_task_download_archive_file_handler,
     get_task_download_archive_name,
 )
+from api_v2.pagination import OptionalKeysetPagination
 from api_v2.task.filters import TaskFilter
 from api_v2.task.permissions import TaskPermissions
-from api_v2.task.serializers import TaskListSerializer
+from api_v2.task.serializers import TaskListSerializer, TaskMetricsSerializer
+from api_v2.task.utils import aggregate_timings
 from api_v2.views import CamelCaseGenericViewSet
 
+METRICS_DEFAULT_TASKS = 100
+METRICS_MAX_TASKS = 1000
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -80,6 +87,25 @@ from api_v2.views import CamelCaseGenericViewSet
             **{err_code: ErrorSerializer for err_code in (HTTP_404_NOT_FOUND, HTTP_403_FORBIDDEN)},
         },
     ),
+    metrics=extend_schema(
+        operation_id="getTasksMetrics",
+        description="Get statistics of execution phases of the latest finished tasks and their jobs.",
+        summary="GET tasks metrics",
+        parameters=[
+            OpenApiParameter(name="jobName", description="Case insensitive and partial filter by job name."),
+            OpenApiParameter(name="objectName", description="Case insensitive and partial filter by object name."),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                description=f"Amount of the latest finished tasks to analyze, at most {METRICS_MAX_TASKS}.",
+                default=METRICS_DEFAULT_TASKS,
+            ),
+        ],
+        responses={
+            HTTP_200_OK: TaskMetricsSerializer,
+            HTTP_400_BAD_REQUEST: ErrorSerializer,
+        },
+    ),
     download=extend_schema(
         operation_id="getTaskLogsDownload",
         description="Download all task logs.",
@@ -101,6 +127,8 @@ from api_v2.views import CamelCaseGenericViewSet
 class TaskViewSet(PermissionListMixin, ListModelMixin, RetrieveModelMixin, CamelCaseGenericViewSet):
     queryset = TaskLog.objects.select_related("action").order_by("-pk")
     serializer_class = TaskListSerializer
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = "-pk"
     filterset_class = TaskFilter
     filter_backends = (DjangoFilterBackend,)
     permission_classes = [TaskPermissions]
@@ -120,6 +148,30 @@ class TaskViewSet(PermissionListMixin, ListModelMixin, RetrieveModelMixin, Camel
 
         return Response(status=HTTP_200_OK, data=TaskListSerializer(instance=task).data)
 
+    @action(methods=["get"], detail=False)
+    def metrics(self, request: Request, *args, **kwargs) -> Response:  # noqa: ARG002
+        limit = request.query_params.get("limit", str(METRICS_DEFAULT_TASKS))
+        if not limit.isdigit() or not 0 < int(limit) <= METRICS_MAX_TASKS:
+            raise AdcmEx(code="BAD_REQUEST", msg=f"limit - should be an integer from 1 to {METRICS_MAX_TASKS}")
+
+        task_timings = dict(
+            self.filter_queryset(self.get_queryset())
+            .filter(finish_date__isnull=False)
+            .order_by("-pk")
+            .values_list("id", "timings")[: int(limit)]
+        )
+        job_timings = JobLog.objects.filter(task_id__in=task_timings).values_list("timings", flat=True)
+
+        return Response(
+            data=TaskMetricsSerializer(
+                instance={
+                    "tasks": len(task_timings),
+                    "task_phases": aggregate_timings(timings=task_timings.values()),
+                    "job_phases": aggregate_timings(timings=job_timings),
+                }
+            ).data
+        )
+
     @action(methods=["get"], detail=True, url_path="logs/download")
     def download(self, request: Request, *args, **kwargs):  # noqa: ARG001, ARG002
         task = self.get_object()
@@ -13,18 +13,22 @@
 from functools import partial
 from operator import itemgetter
 from typing import TypeAlias
+from unittest.mock import patch
 import json
 
 from cm.models import (
     Action,
     Cluster,
     ClusterObject,
+    ConcernItem,
+    ConcernType,
     Host,
     HostComponent,
     HostProvider,
     JobLog,
     MaintenanceMode,
     ServiceComponent,
+    TaskLog,
 )
 from cm.tests.mocks.task_runner import RunTaskMock
 from django.urls import reverse
@@ -624,3 +628,61 @@ class TestAction(BaseAPITestCase):
             },
         )
         self.assertDictEqual(configuration["adcmMeta"], {"/activatable_group": {"isActive": True}})
+
+
+class TestActionBulkRun(BaseAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cluster = self.add_cluster(
+            self.add_bundle(self.test_bundles_dir / "cluster_actions"), "Cluster with Actions"
+        )
+        self.hosts = [self.add_host(provider=self.provider, fqdn=f"host-{i}") for i in range(3)]
+        for host in self.hosts[:2]:
+            self.add_host_to_cluster(self.cluster, host)
+
+        self.host_action = Action.objects.get(prototype=self.cluster.prototype, name="cluster_host_action_allowed")
+
+    def _run_bulk(self, hosts: list[Host]):
+        return self.client.post(
+            path=reverse(viewname="v2:action-run-bulk", kwargs={"pk": self.host_action.pk}),
+            data={"objectIds": [host.pk for host in hosts]},
+        )
+
+    def test_host_action_on_hosts_of_one_cluster_success(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock:
+            response = self._run_bulk(hosts=self.hosts[:2])
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        task_ids = [task["id"] for task in response.json()]
+        self.assertEqual(len(task_ids), 2)
+        self.assertListEqual(
+            list(TaskLog.objects.filter(id__in=task_ids).order_by("id").values_list("object_id", "owner_id")),
+            [(host.pk, self.cluster.pk) for host in self.hosts[:2]],
+        )
+
+        # tasks of the same cluster are passed to one runner that executes them one by one
+        popen_mock.assert_called_once()
+        command = popen_mock.call_args.kwargs["args"]
+        self.assertEqual(command[1], "start-batch")
+        self.assertListEqual(command[4:], [str(task_id) for task_id in task_ids])
+
+    def test_host_out_of_cluster_not_found_fail(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock:
+            response = self._run_bulk(hosts=self.hosts)
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+        self.assertFalse(TaskLog.objects.exists())
+        popen_mock.assert_not_called()
+
+    def test_locked_cluster_conflict_fail(self) -> None:
+        lock = ConcernItem.objects.create(type=ConcernType.LOCK, name="lock", reason={}, owner=self.cluster)
+        self.cluster.concerns.add(lock)
+
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock:
+            response = self._run_bulk(hosts=self.hosts[:2])
+
+        self.assertEqual(response.status_code, HTTP_409_CONFLICT)
+        self.assertEqual(response.json()["code"], "LOCK_ERROR")
+        self.assertFalse(TaskLog.objects.exists())
+        popen_mock.assert_not_called()
@@ -27,6 +27,8 @@ from cm.models import (
 from cm.services.status.client import FullStatusMap
 from cm.tests.mocks.task_runner import RunTaskMock
 from cm.tests.utils import gen_component, gen_host, gen_service, generate_hierarchy
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from guardian.models import GroupObjectPermission
 from rbac.models import User
 from rest_framework.status import (
@@ -57,6 +59,33 @@ class TestCluster(BaseAPITestCase):
 
         patched_request.assert_called_once()
 
+    def test_list_queries_count_does_not_depend_on_clusters_amount_success(self):
+        def count_list_queries() -> int:
+            with patch("cm.services.status.client.api_request"), CaptureQueriesContext(connection) as queries:
+                response = (self.client.v2 / "clusters").get()
+
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+            return len(queries)
+
+        expected_queries = count_list_queries()
+
+        for i in range(5):
+            self.add_cluster(bundle=self.bundle_1 if i % 2 else self.bundle_2, name=f"cluster_{i + 3}")
+
+        self.assertEqual(count_list_queries(), expected_queries)
+
+    def test_list_upgradable_and_main_info_match_detail_success(self):
+        with patch("cm.services.status.client.api_request"):
+            clusters = (self.client.v2 / "clusters").get().json()["results"]
+
+        for cluster in clusters:
+            with patch("api_v2.views.retrieve_status_map"), patch("api_v2.views.get_raw_status"):
+                detail = (self.client.v2 / "clusters" / cluster["id"]).get().json()
+
+            self.assertEqual(cluster["isUpgradable"], detail["isUpgradable"])
+            self.assertEqual(cluster["mainInfo"], detail["mainInfo"])
+
     def test_adcm_4539_ordering_success(self):
         cluster_3 = self.add_cluster(bundle=self.bundle_1, name="cluster_3", description="cluster_3")
         cluster_4 = self.add_cluster(bundle=self.bundle_2, name="cluster_4", description="cluster_3")
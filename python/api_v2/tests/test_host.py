@@ -10,9 +10,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from cm.models import Action, Host, HostComponent, HostProvider, ServiceComponent
+from unittest.mock import patch
+
+from cm.models import Action, ConcernItem, ConcernType, Host, HostComponent, HostProvider, ServiceComponent
+from cm.services.status.client import FullStatusMap
 from cm.tests.mocks.task_runner import RunTaskMock
 from core.types import ADCMCoreType
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.status import (
     HTTP_200_OK,
@@ -45,6 +51,37 @@ class TestHost(BaseAPITestCase):
         self.assertEqual(response.status_code, HTTP_200_OK)
         self.assertEqual(response.json()["count"], 1)
 
+    def test_list_shared_concern_success(self):
+        hosts = [
+            self.host,
+            *(self.add_host(bundle=self.provider_bundle, provider=self.provider, fqdn=f"locked-{i}") for i in range(3)),
+        ]
+        lock = ConcernItem.objects.create(
+            type=ConcernType.LOCK,
+            name="shared lock",
+            reason={"message": "Object locked", "placeholder": {}},
+            owner_id=self.provider.pk,
+            owner_type=ContentType.objects.get_for_model(HostProvider),
+        )
+        for host in hosts:
+            host.concerns.add(lock)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path=reverse(viewname="v2:host-list"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len([query for query in queries.captured_queries if "cm_concernitem" in query["sql"]]), 1)
+        expected_concern = {
+            "id": lock.pk,
+            "type": "lock",
+            "reason": {"message": "Object locked", "placeholder": {}},
+            "isBlocking": True,
+            "cause": None,
+            "owner": {"id": self.provider.pk, "type": "provider"},
+        }
+        for host in response.json()["results"]:
+            self.assertListEqual(host["concerns"], [expected_concern])
+
     def test_retrieve_success(self):
         response = self.client.get(
             path=reverse(viewname="v2:host-detail", kwargs={"pk": self.host.pk}),
@@ -904,3 +941,91 @@ class TestClusterHostComponent(BaseAPITestCase):
         self.assertListEqual(
             [component["name"] for component in response.json()["results"]], ["component_2", "component_1"]
         )
+
+
+class TestHostListStatusAndComponents(BaseAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.hosts = [
+            self.add_host(bundle=self.provider_bundle, provider=self.provider, fqdn=f"host-{i}") for i in range(4)
+        ]
+        for host in self.hosts:
+            self.add_host_to_cluster(cluster=self.cluster_1, host=host)
+
+        self.service = self.add_services_to_cluster(service_names=["service_1"], cluster=self.cluster_1).get()
+        self.component = ServiceComponent.objects.get(service=self.service, prototype__name="component_1")
+
+        self.status_map = FullStatusMap(
+            hosts={
+                str(self.hosts[1].pk): {"status": 0},
+                str(self.hosts[2].pk): {"status": 0},
+                str(self.hosts[3].pk): {"status": 16},
+            }
+        )
+
+    def _list(self, query: dict | None = None) -> list[dict]:
+        with patch("api_v2.views.retrieve_status_map", return_value=self.status_map) as retrieve_mock:
+            response = (self.client.v2 / "hosts").get(query=query)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        retrieve_mock.assert_called_once()
+
+        return response.json()["results"]
+
+    def test_filter_and_order_by_status_success(self):
+        # order of fqdns differs from order of creation, so hosts with the same status are sorted by fqdn explicitly
+        self.hosts[0].fqdn = "host-9"
+        self.hosts[0].save(update_fields=["fqdn"])
+
+        up = [{"name": host.fqdn, "status": "up"} for host in self.hosts[1:3]]
+        down = [{"name": host.fqdn, "status": "down"} for host in (self.hosts[3], self.hosts[0])]
+
+        for query, expected in (
+            ({"status": "up"}, up),
+            ({"status": "down"}, down),
+            ({"status": "down", "ordering": "-name"}, down[::-1]),
+            ({"ordering": "status"}, [*down, *up]),
+            ({"ordering": "-status"}, [*up, *down]),
+            ({"ordering": "-status,-name"}, [*up[::-1], *down[::-1]]),
+        ):
+            with self.subTest(query=query):
+                self.assertListEqual(
+                    [{"name": host["name"], "status": host["status"]} for host in self._list(query=query)], expected
+                )
+
+        self.status_map = FullStatusMap()
+
+        self.assertListEqual(self._list(query={"status": "up"}), [])
+        self.assertListEqual(
+            [host["name"] for host in self._list(query={"ordering": "-status"})],
+            sorted(host.fqdn for host in self.hosts),
+        )
+
+    def test_list_queries_count_does_not_depend_on_mapping_size_success(self):
+        def count_list_queries() -> int:
+            with CaptureQueriesContext(connection) as queries:
+                hosts = self._list()
+
+            self.assertEqual(len(hosts), len(self.hosts))
+
+            return len(queries)
+
+        self.add_hostcomponent_map(
+            cluster=self.cluster_1,
+            hc_map=[{"host_id": self.hosts[0].pk, "service_id": self.service.pk, "component_id": self.component.pk}],
+        )
+        expected_queries = count_list_queries()
+
+        self.add_hostcomponent_map(
+            cluster=self.cluster_1,
+            hc_map=[
+                {"host_id": host.pk, "service_id": self.service.pk, "component_id": component.pk}
+                for host in self.hosts
+                for component in ServiceComponent.objects.filter(service=self.service)
+            ],
+        )
+
+        self.assertEqual(count_list_queries(), expected_queries)
+        for host in self._list():
+            self.assertSetEqual({component["name"] for component in host["components"]}, {"component_1", "component_2"})
@@ -11,15 +11,19 @@
 # limitations under the License.
 
 from datetime import timedelta
+from io import BytesIO
 from unittest.mock import patch
+import tarfile
 
 from adcm.tests.base import BaseTestCase
+from cm.log import LogStorageOutputSink
 from cm.models import (
     ADCM,
     Action,
     ActionType,
     JobLog,
     JobStatus,
+    LogChunk,
     LogStorage,
     TaskLog,
 )
@@ -282,6 +286,50 @@ class TestJob(BaseTestCase):
         self.assertNotIn(self.TRUNCATED_LOG_MESSAGE, log)
         self.assertEqual(self.ansible_stdout_many_lines.body, log)
 
+    def test_log_saved_by_chunks_retrieve_and_download_success(self) -> None:
+        content = "первая строка\nsecond line\n" * 1000
+        data = content.encode("utf-8")
+        sink = LogStorageOutputSink(job_id=self.job_1.pk, name=self.log_1.name)
+        # chunk border is in the middle of multibyte character
+        for offset in range(0, len(data), 4095):
+            sink.append(stream="stderr", offset=offset, data=data[offset : offset + 4095])
+
+        self.assertEqual(LogChunk.objects.filter(log=self.log_1).count(), len(data) // 4095 + 1)
+
+        response = self.client.get(
+            path=reverse(viewname="v2:log-detail", kwargs={"job_pk": self.job_1.pk, "pk": self.log_1.pk})
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["content"], content)
+
+        response = self.client.get(
+            path=reverse(viewname="v2:log-download", kwargs={"job_pk": self.job_1.pk, "pk": self.log_1.pk})
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.content.decode("utf-8"), content)
+
+    def test_task_archive_of_logs_saved_by_chunks_without_run_dir_success(self) -> None:
+        content = "first line\nвторая строка\n" * 100
+        log = LogStorage.objects.create(job=self.job_2, name="ansible", type="stdout", format="txt")
+        LogStorage.objects.create(job=self.job_2, name="ansible", type="stderr", format="txt")
+        data = content.encode("utf-8")
+        sink = LogStorageOutputSink(job_id=self.job_2.pk, name=log.name)
+        for offset in range(0, len(data), 1000):
+            sink.append(stream="stdout", offset=offset, data=data[offset : offset + 1000])
+
+        self.assertFalse((settings.RUN_DIR / str(self.job_2.pk)).exists())
+
+        response = self.client.get(path=reverse(viewname="v2:tasklog-download", kwargs={"pk": self.task.pk}))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        with tarfile.open(fileobj=BytesIO(response.content), mode="r:gz") as archive:
+            files = {
+                member.name.rsplit("/", maxsplit=1)[-1]: archive.extractfile(member).read().decode("utf-8")
+                for member in archive.getmembers()
+            }
+
+        self.assertDictEqual(files, {"ansible-stdout.txt": content, "ansible-stderr.txt": ""})
+
     def test_job_log_not_found_download_fail(self):
         response: Response = self.client.get(
             path=reverse(viewname="v2:log-download", kwargs={"job_pk": self.job_1.pk, "pk": self.log_1.pk + 10})
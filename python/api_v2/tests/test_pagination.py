@@ -0,0 +1,104 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from audit.models import AuditLog, AuditLogOperationResult, AuditLogOperationType
+from cm.models import JobLog, TaskLog
+from django.utils import timezone
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from api_v2.tests.base import BaseAPITestCase
+
+
+class TestKeysetPagination(BaseAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.tasks = [
+            TaskLog.objects.create(object_id=self.cluster_1.pk, start_date=timezone.now(), finish_date=timezone.now())
+            for _ in range(7)
+        ]
+        for task in self.tasks:
+            JobLog.objects.create(task=task, start_date=timezone.now(), finish_date=timezone.now())
+
+        AuditLog.objects.bulk_create(
+            AuditLog(
+                operation_name=f"operation {i}",
+                operation_type=AuditLogOperationType.UPDATE,
+                operation_result=AuditLogOperationResult.SUCCESS,
+            )
+            for i in range(5)
+        )
+
+    def _walk(self, endpoint, query: dict) -> list[dict]:
+        pages = []
+        response = endpoint.get(query=query)
+        while True:
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            pages.append(response.json())
+
+            if not response.json()["next"]:
+                return pages
+
+            response = self.client.get(path=response.json()["next"])
+
+    def test_walk_by_keyset_pages_success(self):
+        for endpoint, expected_ids in (
+            (self.client.v2 / "tasks", sorted(TaskLog.objects.values_list("id", flat=True), reverse=True)),
+            (self.client.v2 / "jobs", sorted(JobLog.objects.values_list("id", flat=True))),
+            (
+                self.client.v2 / "audit" / "operations",
+                sorted(AuditLog.objects.values_list("id", flat=True), reverse=True),
+            ),
+        ):
+            with self.subTest(endpoint=str(endpoint)):
+                pages = self._walk(endpoint=endpoint, query={"cursor": "", "limit": 2})
+
+                self.assertEqual(len(pages), (len(expected_ids) + 1) // 2)
+                self.assertListEqual([entry["id"] for page in pages for entry in page["results"]], expected_ids)
+                self.assertTrue(all(page["count"] is None for page in pages))
+
+                offset_ids = [entry["id"] for entry in endpoint.get(query={"limit": 100}).json()["results"]]
+                if endpoint.path.endswith("/operations/"):
+                    # default ordering of audit records is by time, records were created at the same moment
+                    self.assertSetEqual(set(offset_ids), set(expected_ids))
+                else:
+                    self.assertListEqual(offset_ids, expected_ids)
+
+    def test_keyset_page_is_stable_on_new_records_success(self):
+        first_page = (self.client.v2 / "tasks").get(query={"cursor": "", "limit": 3}).json()
+
+        TaskLog.objects.create(object_id=self.cluster_1.pk, start_date=timezone.now(), finish_date=timezone.now())
+
+        second_page = self.client.get(path=first_page["next"]).json()
+        self.assertListEqual(
+            [entry["id"] for entry in second_page["results"]], [task.pk for task in self.tasks[3::-1]][:3]
+        )
+
+    def test_keyset_count_modes(self):
+        for count, expected in (("none", None), ("exact", 7), ("approximate", 7)):
+            with self.subTest(count=count):
+                response = (self.client.v2 / "tasks").get(query={"cursor": "", "count": count})
+
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertEqual(response.json()["count"], expected)
+
+        response = (self.client.v2 / "tasks").get(query={"cursor": "", "count": "wrong"})
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_offset_pagination_by_default_success(self):
+        response = (self.client.v2 / "tasks").get(query={"limit": 2, "offset": 2})
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 7)
+        self.assertListEqual(
+            [entry["id"] for entry in response.json()["results"]], [self.tasks[4].pk, self.tasks[3].pk]
+        )
@@ -34,7 +34,7 @@ from core.types import ADCMCoreType, CoreObjectDescriptor
 from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 
 from api_v2.tests.base import BaseAPITestCase
 
@@ -143,6 +143,72 @@ class TestTask(BaseAPITestCase):
 
         self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
 
+    def test_task_timings_from_longest_phase_success(self):
+        self.cluster_task.timings = {"configure": 0.5, "jobs": 12.25, "finish.update_issues": 1.0}
+        self.cluster_task.save(update_fields=["timings"])
+
+        response = self.client.get(
+            path=reverse(viewname="v2:tasklog-detail", kwargs={"pk": self.cluster_task.pk}),
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertListEqual(
+            response.json()["timings"],
+            [
+                {"phase": "jobs", "duration": 12.25},
+                {"phase": "finish.update_issues", "duration": 1.0},
+                {"phase": "configure", "duration": 0.5},
+            ],
+        )
+
+    def test_tasks_metrics_success(self):
+        for task, timings in ((self.cluster_task, {"jobs": 3.0}), (self.service_task, {"jobs": 1.0, "configure": 2.0})):
+            task.timings = timings
+            task.finish_date = timezone.now()
+            task.save(update_fields=["timings", "finish_date"])
+            task.joblog_set.update(timings={"run": 2.5, "spawn": 0.5})
+
+        response = self.client.get(path=reverse(viewname="v2:tasklog-metrics"), data={"jobName": "action"})
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["tasks"], 2)
+        self.assertListEqual(
+            data["taskPhases"],
+            [
+                {"phase": "jobs", "count": 2, "total": 4.0, "mean": 2.0, "max": 3.0},
+                {"phase": "configure", "count": 1, "total": 2.0, "mean": 2.0, "max": 2.0},
+            ],
+        )
+        jobs_amount = self.cluster_task.joblog_set.count() + self.service_task.joblog_set.count()
+        self.assertListEqual(
+            [(phase["phase"], phase["count"]) for phase in data["jobPhases"]],
+            [("run", jobs_amount), ("spawn", jobs_amount)],
+        )
+
+    def test_tasks_metrics_wrong_limit_fail(self):
+        for limit in ("0", "1001", "many"):
+            with self.subTest(limit=limit):
+                response = self.client.get(path=reverse(viewname="v2:tasklog-metrics"), data={"limit": limit})
+
+                self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_terminate_queued_task_success(self):
+        self.cluster_action.allow_to_terminate = True
+        self.cluster_action.save(update_fields=["allow_to_terminate"])
+
+        with patch("cm.models.os.kill") as kill_mock:
+            response = self.client.post(
+                path=reverse(viewname="v2:tasklog-terminate", kwargs={"pk": self.cluster_task.pk})
+            )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "aborted")
+        kill_mock.assert_not_called()
+        self.cluster_task.refresh_from_db()
+        self.assertEqual(self.cluster_task.status, "aborted")
+        self.assertSetEqual(set(self.cluster_task.joblog_set.values_list("status", flat=True)), {"aborted"})
+
     def test_task_log_download_success(self):
         with patch("api_v2.task.views.get_task_download_archive_file_handler", return_value=BytesIO(b"content")):
             response = self.client.get(
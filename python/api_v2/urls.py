@@ -35,6 +35,7 @@ urlpatterns = [
     path("jobs/", include("api_v2.job.urls")),
     path("tasks/", include("api_v2.task.urls")),
     path("adcm/", include("api_v2.adcm.urls")),
+    path("actions/", include("api_v2.action.urls")),
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", ProfileView.as_view(), name="profile"),
@@ -13,7 +13,7 @@
 from typing import Collection
 
 from cm.models import Cluster, ClusterObject, Host, ServiceComponent
-from cm.services.status.client import retrieve_status_map
+from cm.services.status.client import FullStatusMap, retrieve_status_map
 from cm.status_api import get_raw_status
 from djangorestframework_camel_case.parser import (
     CamelCaseFormParser,
@@ -32,6 +32,7 @@ from rest_framework.mixins import (
     UpdateModelMixin,
 )
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
 from rest_framework.routers import APIRootView
 from rest_framework.viewsets import GenericViewSet
 
@@ -78,6 +79,16 @@ class CamelCaseReadOnlyModelViewSet(RetrieveModelMixin, ListModelMixin, CamelCas
     pass
 
 
+def get_status_map(request: Request) -> FullStatusMap:
+    """Status map snapshot of request, so filters and serializers don't ask status server separately"""
+
+    status_map = getattr(request, "_status_map", None)
+    if status_map is None:
+        status_map = request._status_map = retrieve_status_map()
+
+    return status_map
+
+
 class ObjectWithStatusViewMixin(GenericViewSet):
     retrieve_status_map_actions: Collection[str] = ("list",)
     retrieve_single_status_actions: Collection[str] = ("retrieve", "update", "partial_update")
@@ -86,7 +97,7 @@ class ObjectWithStatusViewMixin(GenericViewSet):
         context = super().get_serializer_context()
 
         if self.action in self.retrieve_status_map_actions:
-            return {**context, "status_map": retrieve_status_map()}
+            return {**context, "status_map": get_status_map(request=self.request)}
 
         if self.action == "create":
             return {**context, "status": 0}
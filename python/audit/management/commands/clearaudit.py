@@ -11,17 +11,20 @@
 # limitations under the License.
 
 from datetime import timedelta
+from io import TextIOWrapper
 from pathlib import Path
 from shutil import rmtree
-from tarfile import TarFile
+from tarfile import TarFile, TarInfo
+from tempfile import SpooledTemporaryFile
 import os
 import csv
+import time
 import logging
 
 from cm.adcm_config.config import get_adcm_config
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Min, Q
 from django.utils import timezone
 
 from audit.models import AuditLog, AuditLogOperationResult, AuditObject, AuditSession
@@ -55,7 +58,27 @@ class Command(BaseCommand):
         AuditObject: "objects",
     }
 
+    # CSVs bigger than that are spooled to disk before being added to segment
+    segment_spool_size = 64 * 1024 * 1024
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--archive-mode",
+            choices=("rewrite", "segment"),
+            default=settings.AUDIT_ARCHIVE_MODE,
+            help="`rewrite` re-packs the whole archive, `segment` writes each run as a separate archive file",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.AUDIT_ARCHIVE_BATCH_SIZE,
+            help="Amount of records read from DB at once and primary key range deleted at once",
+        )
+
     def handle(self, *args, **options):  # noqa: ARG002
+        self.archive_mode = options.get("archive_mode", settings.AUDIT_ARCHIVE_MODE)
+        self.batch_size = max(options.get("batch_size", settings.AUDIT_ARCHIVE_BATCH_SIZE), 1)
+
         try:
             self.__handle()
         except Exception as e:  # noqa: BLE001
@@ -84,7 +107,10 @@ class Command(BaseCommand):
         if any(qs.exists() for qs in (target_operations, target_logins, target_objects)):
             make_audit_log("audit", AuditLogOperationResult.SUCCESS, "launched")
 
-        if config["data_archiving"]:
+        if config["data_archiving"] and self.archive_mode == "segment":
+            self.__log(f"Target audit records will be archived to new segment in `{self.archive_base_dir}`")
+            self.__archive_segment(target_operations, target_logins, target_objects)
+        elif config["data_archiving"]:
             archive_path = os.path.join(self.archive_base_dir, self.archive_name)
             self.__log(f"Target audit records will be archived to `{archive_path}`")
             self.__archive(target_operations, target_logins, target_objects)
@@ -113,16 +139,93 @@ class Command(BaseCommand):
             self.__log(f"Files {csv_filenames} will be added to archive `{self.archive_name}`")
         self.__archive_tmp_dir()
 
+    def __archive_segment(self, *querysets):
+        """
+        Write target records to new archive file, existing archives are left untouched.
+
+        Records are streamed from DB in batches straight to CSV members of the segment.
+        """
+
+        os.makedirs(self.archive_base_dir, exist_ok=True)
+
+        now = timezone.now()
+        segment_path = Path(self.archive_base_dir, f"audit_archive_{now:%Y-%m-%d_%H-%M-%S_%f}.tar.gz")
+        partial_path = segment_path.with_name(f"{segment_path.name}.part")
+
+        started = time.monotonic()
+        archived = 0
+        with TarFile.open(name=partial_path, mode="w:gz", encoding=settings.ENCODING_UTF_8, compresslevel=6) as tar:
+            for queryset in querysets:
+                archived += self.__add_csv_to_segment(
+                    tar=tar,
+                    queryset=queryset,
+                    name=f"audit_{now.date()}_{self.archive_model_postfix_map[queryset.model]}.csv",
+                )
+
+        if not archived:
+            partial_path.unlink()
+            self.__log("No targets for archiving")
+            return
+
+        partial_path.rename(segment_path)
+        self.__log_throughput(action=f"Archived to `{segment_path.name}`", amount=archived, started=started)
+
+    def __add_csv_to_segment(self, tar: TarFile, queryset, name: str) -> int:
+        fields = [f.attname for f in queryset.model._meta.fields]
+        written = 0
+
+        with SpooledTemporaryFile(max_size=self.segment_spool_size) as buffer:
+            text = TextIOWrapper(buffer, encoding=settings.ENCODING_UTF_8, newline="")
+            writer = csv.writer(text)
+            writer.writerow([f.column for f in queryset.model._meta.fields])
+
+            for row in queryset.values_list(*fields).iterator(chunk_size=self.batch_size):
+                writer.writerow([str(value) for value in row])
+                written += 1
+
+            text.flush()
+            text.detach()
+
+            if not written:
+                return 0
+
+            member = TarInfo(name=name)
+            member.size = buffer.tell()
+            member.mtime = int(time.time())
+            buffer.seek(0)
+            tar.addfile(tarinfo=member, fileobj=buffer)
+
+        return written
+
     def __delete(self, *querysets):
         was_deleted = False
         for queryset in querysets:
-            self.__log(f"Deleting {queryset.count()} {queryset.model._meta.object_name}")
-            if queryset.exists():
-                queryset.delete()
+            model_name = queryset.model._meta.object_name
+            started = time.monotonic()
+
+            deleted = self.__delete_in_batches(queryset=queryset)
+            if deleted:
                 was_deleted = True
 
+            self.__log_throughput(action=f"Deleted {model_name}", amount=deleted, started=started)
+
         return was_deleted
 
+    def __delete_in_batches(self, queryset) -> int:
+        """Delete `queryset` by primary key ranges of `batch_size`, so each DELETE (and its cascades) is bounded"""
+
+        bounds = queryset.aggregate(min_pk=Min("pk"), max_pk=Max("pk"))
+        if bounds["min_pk"] is None:
+            return 0
+
+        label = queryset.model._meta.label
+        deleted = 0
+        for start in range(bounds["min_pk"], bounds["max_pk"] + 1, self.batch_size):
+            _, deleted_per_model = queryset.filter(pk__gte=start, pk__lt=start + self.batch_size).delete()
+            deleted += deleted_per_model.get(label, 0)
+
+        return deleted
+
     def __extract_to_tmp_dir(self):
         if not os.path.exists(self.tarfile_cfg["read"]["name"]):
             return
@@ -182,6 +285,11 @@ class Command(BaseCommand):
                 header = csv_file.readline().strip().split(",")
         return header
 
+    def __log_throughput(self, action: str, amount: int, started: float):
+        duration = time.monotonic() - started
+        rate = amount / duration if duration > 0 else amount
+        self.__log(f"{action}: {amount} records in {duration:.2f}s ({rate:.0f} records/s)")
+
     def __log(self, msg, method="info"):
         prefix = "Audit cleanup/archiving:"
         if method in ("exc", "exception"):
@@ -13,7 +13,8 @@
 from json.decoder import JSONDecodeError
 import json
 
-from cm.models import ADCM, ConfigLog
+from cm.models import ADCM
+from cm.services.adcm import get_adcm_settings
 from django.conf import settings
 from django.contrib.auth import logout
 from django.contrib.auth.models import AnonymousUser, User
@@ -23,8 +24,9 @@ from django.utils import timezone
 from rbac.models import User as RBACUser
 
 from audit.cef_logger import cef_logger
-from audit.models import AuditSession, AuditSessionLoginResult, AuditUser
+from audit.models import AuditSession, AuditSessionLoginResult
 from audit.utils import get_client_ip
+from audit.writer import get_audit_user
 
 
 class LoginMiddleware:
@@ -44,7 +46,8 @@ class LoginMiddleware:
         else:
             details = {"username": username[: settings.USERNAME_MAX_LENGTH]}
             try:
-                user = User.objects.get(username=username)
+                # rbac user is read right away, so it's not fetched again on login attempts processing
+                user = RBACUser.objects.get(username=username)
                 if not user.is_active:
                     result = AuditSessionLoginResult.ACCOUNT_DISABLED
                 else:
@@ -56,7 +59,7 @@ class LoginMiddleware:
 
         audit_user = None
         if user is not None:
-            audit_user = AuditUser.objects.filter(username=user.username).order_by("-pk").first()
+            audit_user = get_audit_user(user=user)
 
         audit_session = AuditSession.objects.create(
             user=audit_user, login_result=result, login_details=details, address=request_host
@@ -70,22 +73,23 @@ class LoginMiddleware:
         user: RBACUser | User,
         result: AuditSessionLoginResult,
     ) -> HttpResponseForbidden | None:
-        user = user if isinstance(user, RBACUser) else user.user
-        config_log = None
         login_attempt_limit = None
         block_time_minutes = None
 
-        adcm = ADCM.objects.first()
-        if adcm:
-            config_log = ConfigLog.objects.filter(obj_ref=adcm.config).last()
+        try:
+            auth_policy = get_adcm_settings().config.get("auth_policy")
+        except ADCM.DoesNotExist:
+            auth_policy = None
 
-        if config_log and isinstance(config_log.config, dict) and config_log.config.get("auth_policy"):
-            login_attempt_limit = config_log.config["auth_policy"]["login_attempt_limit"]
-            block_time_minutes = config_log.config["auth_policy"]["block_time"]
+        if auth_policy:
+            login_attempt_limit = auth_policy["login_attempt_limit"]
+            block_time_minutes = auth_policy["block_time"]
 
         if not all((login_attempt_limit, block_time_minutes)):
             return None
 
+        user = user if isinstance(user, RBACUser) else user.user
+
         if result == AuditSessionLoginResult.SUCCESS:
             if user.blocked_at:
                 user_blocked_till = user.blocked_at + timezone.timedelta(minutes=block_time_minutes)
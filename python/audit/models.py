@@ -35,6 +35,7 @@ from django.db.models import (
     PositiveIntegerField,
     TextChoices,
 )
+from django.utils import timezone
 from rbac.models import Group, Policy, Role, User
 
 
@@ -91,7 +92,7 @@ class AuditLog(Model):
     operation_name = CharField(max_length=2000)
     operation_type = CharField(max_length=2000, choices=AuditLogOperationType.choices)
     operation_result = CharField(max_length=2000, choices=AuditLogOperationResult.choices)
-    operation_time = DateTimeField(auto_now_add=True)
+    operation_time = DateTimeField(default=timezone.now)
     user = ForeignKey(AuditUser, on_delete=CASCADE, null=True)
     object_changes = JSONField(default=dict)
     address = CharField(max_length=255, null=True)
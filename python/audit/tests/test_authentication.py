@@ -11,6 +11,9 @@
 # limitations under the License.
 
 from adcm.tests.base import BaseTestCase
+from cm.models import ADCM, ConfigLog
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rbac.models import User
@@ -231,3 +234,25 @@ class TestLoginMiddleware(BaseTestCase):
 
                 self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
                 self.assertEqual(self.send_profile_request(client=client).status_code, HTTP_401_UNAUTHORIZED)
+
+    def test_auth_policy_is_read_once_per_config_version(self) -> None:
+        data = {"username": "admin", "password": "wrong"}
+        endpoint = reverse(viewname="v2:login")
+        self.send_auth_request(endpoint=endpoint, data=data)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.send_auth_request(endpoint=endpoint, data=data)
+
+        self.assertFalse([query for query in queries.captured_queries if "cm_configlog" in query["sql"]])
+
+        adcm = ADCM.objects.first()
+        config_log = ConfigLog.objects.get(id=adcm.config.current)
+        config_log.config["auth_policy"]["login_attempt_limit"] = 3
+        config_log.save(update_fields=["config"])
+
+        for _ in range(3):
+            _, response = self.send_auth_request(endpoint=endpoint, data=data)
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+        self.admin.refresh_from_db()
+        self.assertIsNotNone(self.admin.blocked_at)
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tarfile import TarFile
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import csv
+
+from adcm.tests.base import BaseTestCase
+from cm.models import ADCM, ConfigLog
+from django.core.management import call_command
+from django.utils import timezone
+
+from audit.management.commands.clearaudit import Command
+from audit.models import AuditLog, AuditLogOperationResult, AuditLogOperationType
+
+
+class TestClearAuditSegments(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        adcm = ADCM.objects.first()
+        config_log = ConfigLog.objects.get(id=adcm.config.current)
+        config_log.config["audit_data_retention"].update({"retention_period": 1, "data_archiving": True})
+        config_log.save(update_fields=["config"])
+
+        self.archive_dir = TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+
+    def _create_operations(self, amount: int, days_ago: int) -> None:
+        AuditLog.objects.bulk_create(
+            objs=[
+                AuditLog(
+                    operation_name=f"old operation {days_ago}",
+                    operation_type=AuditLogOperationType.UPDATE,
+                    operation_result=AuditLogOperationResult.SUCCESS,
+                )
+                for _ in range(amount)
+            ]
+        )
+        AuditLog.objects.filter(operation_name=f"old operation {days_ago}").update(
+            operation_time=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def _clear(self) -> None:
+        with patch.object(Command, "archive_base_dir", self.archive_dir.name):
+            call_command("clearaudit", archive_mode="segment", batch_size=1000, stdout=StringIO())
+
+    def _read_operations(self, segment: Path) -> list[dict]:
+        with TarFile.open(name=segment, mode="r:gz") as tar:
+            (member,) = (member for member in tar.getmembers() if member.name.endswith("_operations.csv"))
+            return list(csv.DictReader(tar.extractfile(member).read().decode("utf-8").splitlines()))
+
+    def test_each_run_writes_new_segment(self):
+        self._create_operations(amount=2500, days_ago=5)
+        self._create_operations(amount=10, days_ago=0)
+
+        self._clear()
+
+        (first_segment,) = Path(self.archive_dir.name).glob("audit_archive_*.tar.gz")
+        operations = self._read_operations(segment=first_segment)
+        self.assertEqual(len(operations), 2500)
+        self.assertSetEqual({operation["operation_name"] for operation in operations}, {"old operation 5"})
+        self.assertFalse(AuditLog.objects.filter(operation_name="old operation 5").exists())
+        self.assertEqual(AuditLog.objects.filter(operation_name="old operation 0").count(), 10)
+
+        first_segment_content = first_segment.read_bytes()
+        self._create_operations(amount=3, days_ago=7)
+
+        self._clear()
+
+        segments = sorted(Path(self.archive_dir.name).glob("audit_archive_*.tar.gz"))
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(segments[0].read_bytes(), first_segment_content)
+        self.assertEqual(len(self._read_operations(segment=segments[1])), 3)
+        self.assertFalse(list(Path(self.archive_dir.name).glob("*.part")))
+
+    def test_no_segment_without_targets(self):
+        self._create_operations(amount=10, days_ago=0)
+
+        self._clear()
+
+        self.assertFalse(list(Path(self.archive_dir.name).iterdir()))
+        self.assertEqual(AuditLog.objects.filter(operation_name="old operation 0").count(), 10)
@@ -0,0 +1,150 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+from threading import Event
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from adcm.tests.base import BaseTestCase
+from django.db import transaction
+from rbac.models import User
+
+from audit.models import AuditLog, AuditLogOperationResult, AuditLogOperationType, AuditUser
+from audit.writer import ASYNC, ON_COMMIT, SYNC, AuditLogWriter, get_audit_user
+
+
+class TestAuditLogWriter(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.audit_user = get_audit_user(user=self.test_user)
+
+    def _make_record(self, name: str) -> AuditLog:
+        return AuditLog(
+            operation_name=name,
+            operation_type=AuditLogOperationType.UPDATE,
+            operation_result=AuditLogOperationResult.SUCCESS,
+            user=self.audit_user,
+        )
+
+    def test_sync_write_saves_record_right_away(self):
+        writer = AuditLogWriter(mode=SYNC)
+
+        with patch("audit.writer.cef_logger") as cef_logger_mock:
+            writer.write(audit_log=self._make_record(name="sync"), signature_id="sync")
+
+        self.assertTrue(AuditLog.objects.filter(operation_name="sync").exists())
+        cef_logger_mock.assert_called_once()
+
+    def test_on_commit_write_saves_records_in_batches_on_commit(self):
+        writer = AuditLogWriter(mode=ON_COMMIT, batch_size=2)
+
+        with patch("audit.writer.cef_logger") as cef_logger_mock, self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                writer.write(audit_log=self._make_record(name=f"record {i}"), signature_id="on_commit")
+
+            self.assertFalse(AuditLog.objects.filter(operation_name__startswith="record").exists())
+
+        records = AuditLog.objects.filter(operation_name__startswith="record").order_by("pk")
+        self.assertListEqual([record.operation_name for record in records], [f"record {i}" for i in range(5)])
+        self.assertTrue(all(record.operation_time for record in records))
+        self.assertEqual(cef_logger_mock.call_count, 5)
+        self.assertEqual(writer.flush(), 0)
+
+    def test_on_commit_write_saves_records_of_committed_savepoints_only(self):
+        writer = AuditLogWriter(mode=ON_COMMIT)
+
+        with patch("audit.writer.cef_logger"), self.captureOnCommitCallbacks(execute=True) as callbacks:
+            writer.write(audit_log=self._make_record(name="kept 0"), signature_id="on_commit")
+
+            try:
+                with transaction.atomic():
+                    writer.write(audit_log=self._make_record(name="dropped"), signature_id="on_commit")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+            with transaction.atomic():
+                writer.write(audit_log=self._make_record(name="kept 1"), signature_id="on_commit")
+
+            writer.write(audit_log=self._make_record(name="kept 2"), signature_id="on_commit")
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertListEqual(
+            list(
+                AuditLog.objects.filter(operation_name__startswith="kept")
+                .order_by("pk")
+                .values_list("operation_name", flat=True)
+            ),
+            ["kept 0", "kept 2", "kept 1"],
+        )
+        self.assertFalse(AuditLog.objects.filter(operation_name="dropped").exists())
+
+    def test_operation_time_is_time_of_write(self):
+        writer = AuditLogWriter(mode=ON_COMMIT)
+
+        with patch("audit.writer.cef_logger"), self.captureOnCommitCallbacks() as callbacks:
+            writer.write(audit_log=self._make_record(name="delayed"), signature_id="on_commit")
+
+        write_time = callbacks[0].records[0].audit_log.operation_time
+
+        with patch("django.utils.timezone.now", return_value=write_time + timedelta(hours=1)):
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(AuditLog.objects.get(operation_name="delayed").operation_time, write_time)
+
+    def test_async_write_saves_records_in_batches_by_background_thread(self):
+        writer = AuditLogWriter(mode=ASYNC, batch_size=2, flush_interval=60)
+        batches = []
+        all_saved = Event()
+
+        def persist(records):
+            batches.append([record.audit_log.operation_name for record in records])
+            if sum(map(len, batches)) == 4:
+                all_saved.set()
+
+        with patch.object(AuditLogWriter, "_persist", side_effect=persist):
+            for i in range(4):
+                writer.write(audit_log=self._make_record(name=f"record {i}"), signature_id="async")
+
+            self.assertTrue(all_saved.wait(timeout=10))
+
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertListEqual(sum(batches, []), [f"record {i}" for i in range(4)])
+        self.assertEqual(writer.flush(), 0)
+
+    def test_async_mode_falls_back_to_on_commit_without_uwsgi_threads(self):
+        with patch.dict("sys.modules", {"uwsgi": SimpleNamespace(opt={"master": True})}):
+            self.assertEqual(AuditLogWriter(mode=ASYNC).mode, ON_COMMIT)
+
+        with patch.dict("sys.modules", {"uwsgi": SimpleNamespace(opt={"enable-threads": True})}):
+            self.assertEqual(AuditLogWriter(mode=ASYNC).mode, ASYNC)
+
+    def test_unknown_mode_fail(self):
+        with self.assertRaises(ValueError):
+            AuditLogWriter(mode="unknown")
+
+    def test_audit_user_lookup_is_cached(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_audit_user(user=self.test_user), self.audit_user)
+
+    def test_audit_user_of_recreated_user_is_not_taken_from_cache(self):
+        username = self.test_user.username
+        self.test_user.delete()
+        user = User.objects.create_user(username=username, password="password")
+
+        audit_user = get_audit_user(user=user)
+
+        self.assertNotEqual(audit_user, self.audit_user)
+        self.assertEqual(audit_user, AuditUser.objects.filter(username=username).order_by("-pk").first())
@@ -12,6 +12,7 @@
 
 from contextlib import suppress
 from functools import wraps
+from typing import Iterable
 import re
 
 from api.cluster.serializers import ClusterAuditSerializer
@@ -68,9 +69,10 @@ from rest_framework.status import (
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
 from audit.cases.cases import get_audit_operation_and_object
-from audit.cases.common import get_or_create_audit_obj
+from audit.cases.common import get_obj_name, get_or_create_audit_obj
 from audit.cef_logger import cef_logger
 from audit.models import (
+    MODEL_TO_AUDIT_OBJECT_TYPE_MAP,
     AuditLog,
     AuditLogOperationResult,
     AuditLogOperationType,
@@ -79,6 +81,7 @@ from audit.models import (
     AuditOperation,
     AuditUser,
 )
+from audit.writer import get_audit_log_writer, get_audit_user
 
 AUDITED_HTTP_METHODS = frozenset(("POST", "DELETE", "PUT", "PATCH"))
 
@@ -558,21 +561,20 @@ def audit(func):
             else:
                 operation_result = AuditLogOperationResult.FAIL
 
-            if isinstance(view.request.user, DjangoUser):
-                audit_user = AuditUser.objects.filter(username=view.request.user.username).order_by("-pk").first()
-            else:
-                audit_user = None
-
-            auditlog = AuditLog.objects.create(
-                audit_object=audit_object,
-                operation_name=operation_name,
-                operation_type=audit_operation.operation_type,
-                operation_result=operation_result,
-                user=audit_user,
-                object_changes=object_changes,
-                address=get_client_ip(request=request),
+            audit_user = get_audit_user(user=view.request.user) if isinstance(view.request.user, DjangoUser) else None
+
+            get_audit_log_writer().write(
+                audit_log=AuditLog(
+                    audit_object=audit_object,
+                    operation_name=operation_name,
+                    operation_type=audit_operation.operation_type,
+                    operation_result=operation_result,
+                    user=audit_user,
+                    object_changes=object_changes,
+                    address=get_client_ip(request=request),
+                ),
+                signature_id=resolve(request.path).route,
             )
-            cef_logger(audit_instance=auditlog, signature_id=resolve(request.path).route)
 
         if error:
             raise error
@@ -648,3 +650,35 @@ def audit_job_finish(owner: NamedCoreObject, display_name: str, is_upgrade: bool
     )
 
     cef_logger(audit_instance=audit_log, signature_id="Action completion")
+
+
+def audit_bulk_action_launch(
+    request: WSGIRequest, action: Action, objects: Iterable[Model], result: AuditLogOperationResult
+) -> None:
+    """Bulk launch is audited the same way as launch of the action on each of objects one by one"""
+
+    audit_user = get_audit_user(user=request.user) if isinstance(request.user, DjangoUser) else None
+
+    operation_name = f"{action.display_name} action launched"
+    address = get_client_ip(request=request)
+    signature_id = resolve(request.path).route
+    writer = get_audit_log_writer()
+
+    for obj in objects:
+        object_type = MODEL_TO_AUDIT_OBJECT_TYPE_MAP[obj.__class__]
+        writer.write(
+            audit_log=AuditLog(
+                audit_object=get_or_create_audit_obj(
+                    object_id=str(obj.pk),
+                    object_name=get_obj_name(obj=obj, obj_type=object_type),
+                    object_type=object_type,
+                ),
+                operation_name=operation_name,
+                operation_type=AuditLogOperationType.UPDATE,
+                operation_result=result,
+                user=audit_user,
+                object_changes={},
+                address=address,
+            ),
+            signature_id=signature_id,
+        )
@@ -0,0 +1,219 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import NamedTuple
+import atexit
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User as DjangoUser
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from audit.cef_logger import cef_logger
+from audit.models import AuditLog, AuditUser
+
+logger = logging.getLogger("adcm")
+
+SYNC = "sync"
+ASYNC = "async"
+ON_COMMIT = "on_commit"
+WRITE_MODES = (SYNC, ASYNC, ON_COMMIT)
+
+_AUDIT_USERS_CACHE_SIZE = 1024
+
+
+class PendingRecord(NamedTuple):
+    audit_log: AuditLog
+    signature_id: str
+    empty_resource: bool
+
+
+class _CommitBatch:
+    """Records of one transaction (or savepoint) that are saved when it is committed"""
+
+    def __init__(self, writer: "AuditLogWriter", record: PendingRecord):
+        self.writer = writer
+        self.records = [record]
+
+    def __call__(self) -> None:
+        for i in range(0, len(self.records), self.writer.batch_size):
+            self.writer._persist(records=self.records[i : i + self.writer.batch_size])
+
+
+def _threads_are_enabled() -> bool:
+    try:
+        import uwsgi  # available only inside of uwsgi worker
+    except ImportError:
+        return True
+
+    # uwsgi doesn't run threads started by application unless `enable-threads` (or `threads`) is set
+    return bool(uwsgi.opt.get("enable-threads") or uwsgi.opt.get("threads"))
+
+
+class AuditLogWriter:
+    """
+    Persists audit records and emits CEF log line for each of them.
+
+    Modes:
+        sync      -- record is saved right away, one INSERT per record (legacy behavior)
+        async     -- record is buffered and saved by background thread in batches,
+                     either when `batch_size` records are collected or every `flush_interval` seconds;
+                     under uwsgi it requires `enable-threads`, without it writer falls back to on_commit mode
+        on_commit -- records of current transaction (or savepoint) are saved in batches when it is committed
+                     (or right away in autocommit), so request isn't finished until its records are saved;
+                     records of rolled back transaction are dropped together with it
+
+    Operation time of record is the time it's passed to `write`, not the time it's saved.
+    """
+
+    def __init__(self, mode: str = SYNC, batch_size: int = 500, flush_interval: float = 1.0):
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unknown audit log write mode {mode!r}, expected one of {WRITE_MODES}")
+
+        if mode == ASYNC and not _threads_are_enabled():
+            logger.warning("Audit log is written in %r mode: uwsgi runs without `enable-threads`", ON_COMMIT)
+            mode = ON_COMMIT
+
+        self.mode = mode
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+
+        self._buffer: deque[PendingRecord] = deque()
+        self._flush_lock = Lock()
+        self._wakeup = Event()
+        self._thread: Thread | None = None
+
+    def write(self, audit_log: AuditLog, signature_id: str, empty_resource: bool = False) -> None:
+        audit_log.operation_time = timezone.now()
+        record = PendingRecord(audit_log=audit_log, signature_id=signature_id, empty_resource=empty_resource)
+
+        if self.mode == SYNC:
+            self._persist(records=[record])
+            return
+
+        if self.mode == ON_COMMIT:
+            self._add_to_commit_batch(record=record)
+            return
+
+        self._buffer.append(record)
+        self._ensure_thread()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Save all records buffered for background thread, return amount of saved records"""
+
+        flushed = 0
+        with self._flush_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+
+                self._persist(records=batch)
+                flushed += len(batch)
+
+        return flushed
+
+    @staticmethod
+    def _persist(records: list[PendingRecord]) -> None:
+        if len(records) == 1:
+            records[0].audit_log.save()
+        else:
+            AuditLog.objects.bulk_create(objs=[record.audit_log for record in records])
+
+        for record in records:
+            cef_logger(
+                audit_instance=record.audit_log,
+                signature_id=record.signature_id,
+                empty_resource=record.empty_resource,
+            )
+
+    def _add_to_commit_batch(self, record: PendingRecord) -> None:
+        connection = transaction.get_connection()
+        savepoints = set(connection.savepoint_ids)
+
+        # callbacks of rolled back savepoint are discarded by Django, so batch is looked up among registered ones
+        for callback_savepoints, callback in connection.run_on_commit:
+            if callback_savepoints == savepoints and isinstance(callback, _CommitBatch) and callback.writer is self:
+                callback.records.append(record)
+                return
+
+        # in autocommit callback is called right away
+        transaction.on_commit(_CommitBatch(writer=self, record=record))
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._flush_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to save audit log records")
+            finally:
+                close_old_connections()
+
+
+_writer: AuditLogWriter | None = None
+_audit_users: dict[str, AuditUser] = {}
+
+
+def get_audit_log_writer() -> AuditLogWriter:
+    global _writer  # noqa: PLW0603
+
+    if _writer is None:
+        _writer = AuditLogWriter(
+            mode=settings.AUDIT_LOG_WRITE_MODE,
+            batch_size=settings.AUDIT_LOG_WRITE_BATCH_SIZE,
+            flush_interval=settings.AUDIT_LOG_WRITE_FLUSH_INTERVAL,
+        )
+
+    return _writer
+
+
+def get_audit_user(user: DjangoUser) -> AuditUser | None:
+    """
+    Return latest `AuditUser` of `user`, lookups are cached per process.
+
+    Recreated user with the same name gets new `auth_user_id`, so cached record is checked against it.
+    """
+
+    audit_user = _audit_users.get(user.username)
+    if audit_user is not None and audit_user.auth_user_id == user.pk:
+        return audit_user
+
+    audit_user = AuditUser.objects.filter(username=user.username).order_by("-pk").first()
+    if audit_user is None:
+        return None
+
+    if len(_audit_users) >= _AUDIT_USERS_CACHE_SIZE:
+        _audit_users.clear()
+
+    _audit_users[user.username] = audit_user
+
+    return audit_user
@@ -13,14 +13,15 @@
 from collections import OrderedDict
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Collection
 import re
 import copy
 import json
 
 from ansible.errors import AnsibleError
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, QuerySet
+from django.db.models.fields.json import KeyTransform
 from jinja_config import get_jinja_config
 
 from cm.adcm_config.ansible import ansible_decrypt, ansible_encrypt_and_format
@@ -51,6 +52,7 @@ from cm.models import (
     ServiceComponent,
 )
 from cm.services.bundle import ADCMBundlePathResolver, BundlePathResolver, PathResolver
+from cm.services.config.history import compact_config_log
 from cm.utils import deep_merge, dict_to_obj, obj_to_dict
 from cm.variant import get_variant, process_variant
 
@@ -327,10 +329,14 @@ def update_group_configs_by_primary_object(
 
         config_log.save()
 
+        displaced_config_id = config_group.config.previous
         config_group.config.previous = config_group.config.current
         config_group.config.current = config_log.id
         config_group.config.save(update_fields=["previous", "current"])
 
+        if settings.CONFIG_LOG_DELTA_STORAGE and displaced_config_id:
+            compact_config_log(config_log_id=displaced_config_id)
+
         config_group.prepare_files_for_config(config=config_log.config)
 
 
@@ -359,10 +365,14 @@ def save_object_config(object_config: ObjectConfig, config: dict, attr: dict, de
     else:
         config_log.save()
 
+    displaced_config_id = object_config.previous
     object_config.previous = object_config.current
     object_config.current = config_log.id
     object_config.save(update_fields=["previous", "current"])
 
+    if settings.CONFIG_LOG_DELTA_STORAGE and displaced_config_id:
+        compact_config_log(config_log_id=displaced_config_id)
+
     return config_log
 
 
@@ -857,3 +867,56 @@ def get_main_info(obj: ADCMEntity | None) -> str | None:
     )
 
     return get_default(main_info, path_resolver=path_resolver)
+
+
+def get_main_info_bulk(objects: Collection[ADCMEntity]) -> dict[int, str | None]:
+    """
+    Same as `get_main_info` for each of `objects` (of the same model) in two queries.
+
+    Only `__main_info` key of current configs is read from DB, not whole configs.
+    """
+
+    main_info = {obj.pk: None for obj in objects}
+    config_objects = {obj.config_id: obj for obj in objects if obj.config_id}
+    if not config_objects:
+        return main_info
+
+    without_main_info = []
+    for config_id, has_main_info, value in (
+        ConfigLog.objects.filter(obj_ref_id__in=config_objects, id=F("obj_ref__current"))
+        .annotate(
+            has_main_info=ExpressionWrapper(Q(config__has_key="__main_info"), output_field=BooleanField()),
+            main_info=KeyTransform("__main_info", "config"),
+        )
+        .values_list("obj_ref_id", "has_main_info", "main_info")
+    ):
+        obj = config_objects[config_id]
+        if has_main_info:
+            main_info[obj.pk] = value
+        else:
+            without_main_info.append(obj)
+
+    if not without_main_info:
+        return main_info
+
+    defaults = {
+        prototype_config.prototype_id: prototype_config
+        for prototype_config in PrototypeConfig.objects.filter(
+            prototype_id__in={obj.prototype_id for obj in without_main_info},
+            action=None,
+            name="__main_info",
+            subname="",
+        )
+    }
+    for obj in without_main_info:
+        if obj.prototype_id not in defaults:
+            continue
+
+        path_resolver = (
+            ADCMBundlePathResolver()
+            if isinstance(obj, ADCM)
+            else BundlePathResolver(bundle_hash=obj.prototype.bundle.hash)
+        )
+        main_info[obj.pk] = get_default(defaults[obj.prototype_id], path_resolver=path_resolver)
+
+    return main_info
@@ -464,11 +464,26 @@ def check_sub_key(hc_in):
 
 
 def make_host_comp_list(cluster: Cluster, hc_in: list[dict]) -> list[tuple[ClusterObject, Host, ServiceComponent]]:
+    hosts = Host.objects.select_related("cluster", "prototype").in_bulk({item["host_id"] for item in hc_in})
+    services = ClusterObject.objects.select_related("prototype").filter(cluster=cluster).in_bulk()
+    components = ServiceComponent.objects.select_related("prototype").filter(cluster=cluster).in_bulk()
+
     host_comp_list = []
     for item in hc_in:
-        host = Host.obj.get(pk=item["host_id"])
-        service = ClusterObject.obj.get(pk=item["service_id"], cluster=cluster)
-        comp = ServiceComponent.obj.get(pk=item["component_id"], cluster=cluster, service=service)
+        host = hosts.get(item["host_id"])
+        if host is None:
+            raise AdcmEx(Host.__error_code__, f"Host {{'pk': {item['host_id']}}} does not exist")
+
+        service = services.get(item["service_id"])
+        if service is None:
+            raise AdcmEx(ClusterObject.__error_code__, f"ClusterObject {{'pk': {item['service_id']}}} does not exist")
+
+        comp = components.get(item["component_id"])
+        if comp is None or comp.service_id != service.pk:
+            raise AdcmEx(
+                ServiceComponent.__error_code__, f"ServiceComponent {{'pk': {item['component_id']}}} does not exist"
+            )
+
         if not host.cluster:
             raise_adcm_ex("FOREIGN_HOST", f"host #{host.pk} {host.fqdn} does not belong to any cluster")
 
@@ -489,7 +504,7 @@ def check_hc(cluster: Cluster, hc_in: list[dict]) -> list[tuple[ClusterObject, H
 
     check_hc_requires(shc_list=host_comp_list)
     check_bound_components(shc_list=host_comp_list)
-    for service in ClusterObject.objects.filter(cluster=cluster):
+    for service in ClusterObject.objects.select_related("prototype").filter(cluster=cluster):
         check_component_constraint(
             cluster=cluster, service_prototype=service.prototype, hc_in=[i for i in host_comp_list if i[0] == service]
         )
@@ -502,32 +517,40 @@ def check_hc(cluster: Cluster, hc_in: list[dict]) -> list[tuple[ClusterObject, H
 def check_maintenance_mode(
     cluster: Cluster, host_comp_list: list[tuple[ClusterObject, Host, ServiceComponent]]
 ) -> None:
-    for service, host, comp in host_comp_list:
-        try:
-            HostComponent.objects.get(cluster=cluster, service=service, host=host, component=comp)
-        except HostComponent.DoesNotExist:
-            if host.maintenance_mode == MaintenanceMode.ON:
-                raise_adcm_ex("INVALID_HC_HOST_IN_MM")
-
+    existing_hc = _get_hc_entries(cluster=cluster)
 
-def still_existed_hc(cluster: Cluster, host_comp_list: list[tuple[ClusterObject, Host, ServiceComponent]]) -> list:
-    result = []
     for service, host, comp in host_comp_list:
-        try:
-            existed_hc = HostComponent.objects.get(cluster=cluster, service=service, host=host, component=comp)
-            result.append(existed_hc)
-        except HostComponent.DoesNotExist:
-            continue
+        if (host.pk, service.pk, comp.pk) not in existing_hc and host.maintenance_mode == MaintenanceMode.ON:
+            raise_adcm_ex("INVALID_HC_HOST_IN_MM")
 
-    return result
+
+def _get_hc_entries(cluster: Cluster) -> dict[tuple[int, int, int], HostComponent]:
+    return {
+        (hostcomponent.host_id, hostcomponent.service_id, hostcomponent.component_id): hostcomponent
+        for hostcomponent in HostComponent.objects.filter(cluster=cluster).select_related("host", "service")
+    }
 
 
 def save_hc(
     cluster: Cluster, host_comp_list: list[tuple[ClusterObject, Host, ServiceComponent]]
 ) -> list[HostComponent]:
-    hc_queryset = HostComponent.objects.filter(cluster=cluster).order_by("id")
-    service_set = {hc.service for hc in hc_queryset}
-    old_hosts = {i.host for i in hc_queryset.select_related("host")}
+    """
+    Save new host-component map of the cluster.
+    Only the difference with the current map is written: entries that remain in map are kept as is.
+    """
+
+    existing_hc = _get_hc_entries(cluster=cluster)
+    new_hc = {(host.pk, service.pk, comp.pk): (service, host, comp) for service, host, comp in host_comp_list}
+
+    removed_hc = [hostcomponent for key, hostcomponent in existing_hc.items() if key not in new_hc]
+    added_hc = [
+        HostComponent(cluster=cluster, service=service, host=host, component=comp)
+        for key, (service, host, comp) in new_hc.items()
+        if key not in existing_hc
+    ]
+
+    service_set = {hc.service for hc in existing_hc.values()}
+    old_hosts = {hc.host for hc in existing_hc.values()}
     new_hosts = {i[1] for i in host_comp_list}
 
     for removed_host in old_hosts.difference(new_hosts):
@@ -536,38 +559,44 @@ def save_hc(
     for added_host in new_hosts.difference(old_hosts):
         add_concern_to_object(object_=added_host, concern=CTX.lock)
 
-    still_hc = still_existed_hc(cluster, host_comp_list)
-    host_service_of_still_hc = {(hc.host, hc.service) for hc in still_hc}
+    host_service_of_still_hc = {(hc.host, hc.service) for key, hc in existing_hc.items() if key in new_hc}
 
-    for removed_hc in set(hc_queryset) - set(still_hc):
-        groupconfigs = GroupConfig.objects.filter(
+    groupconfigs = (
+        GroupConfig.objects.filter(
             object_type__model__in=["clusterobject", "servicecomponent"],
-            hosts=removed_hc.host,
+            hosts__in={removed.host_id for removed in removed_hc},
         )
-        for group_config in groupconfigs:
+        .select_related("object_type")
+        .prefetch_related("hosts")
+        .distinct()
+    )
+    for group_config in groupconfigs:
+        group_config_hosts = set(group_config.hosts.all())
+        hosts_to_remove = set()
+        for removed in removed_hc:
+            if removed.host not in group_config_hosts:
+                continue
+
             if (group_config.object_type.model == "clusterobject") and (
-                (removed_hc.host, removed_hc.service) in host_service_of_still_hc
+                (removed.host, removed.service) in host_service_of_still_hc
             ):
                 continue
 
-            group_config.hosts.remove(removed_hc.host)
+            hosts_to_remove.add(removed.host)
 
-    hc_queryset.delete()
-    host_component_list = []
+        if hosts_to_remove:
+            group_config.hosts.remove(*hosts_to_remove)
 
-    for service, host, comp in host_comp_list:
-        host_component = HostComponent(
-            cluster=cluster,
-            service=service,
-            host=host,
-            component=comp,
-        )
-        host_component.save()
-        host_component_list.append(host_component)
+    HostComponent.objects.filter(id__in=[hc.pk for hc in removed_hc]).delete()
+    HostComponent.objects.bulk_create(objs=added_hc)
+
+    # not every DB backend sets ids of bulk created objects, so saved entries are read back
+    saved_hc = _get_hc_entries(cluster=cluster) if added_hc else existing_hc
+    host_component_list = [saved_hc[key] for key in new_hc]
 
     update_hierarchy_issues(cluster)
 
-    for provider in {host.provider for host in Host.objects.filter(cluster=cluster)}:
+    for provider in HostProvider.objects.filter(host__cluster=cluster).distinct():
         update_hierarchy_issues(provider)
 
     update_issue_after_deleting()
@@ -20,4 +20,5 @@ class CmConfig(AppConfig):
         from cm.signals import (  # noqa: F401, PLC0415
             rename_audit_object,
             rename_audit_object_host,
+            reset_adcm_settings_cache,
         )
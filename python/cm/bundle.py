@@ -14,14 +14,15 @@ from collections import defaultdict
 from collections.abc import Iterable
 from pathlib import Path
 import os
+import bisect
 import shutil
 import hashlib
 import tarfile
-import functools
 
 from adcm_version import compare_adcm_versions, compare_prototype_versions
 from django.conf import settings
 from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.db.transaction import atomic
 from gnupg import GPG, ImportResult
 from graphlib import CycleError, TopologicalSorter
@@ -265,27 +266,221 @@ def update_bundle(bundle):
         raise
 
 
-def order_model_versions(model):
-    items = []
-    for obj in model.objects.order_by("id"):
-        items.append(obj)
-    ver = ""
-    count = 0
-    for obj in sorted(
-        items,
-        key=functools.cmp_to_key(lambda obj1, obj2: compare_prototype_versions(obj1.version, obj2.version)),
+VERSION_ORDER_GAP = 1024
+
+_VERSION_KEY_TILDE = "0"
+_VERSION_KEY_END = "1"
+_VERSION_KEY_TRAILING_SEPARATOR = "2"
+_VERSION_KEY_LETTERS = "3"
+_VERSION_KEY_DIGITS = "4"
+_VERSION_KEY_LETTERS_END = "!"
+
+
+def get_version_key(version: str) -> str:
+    """
+    Build string that being compared char by char (as python strings are) gives
+    the same order as `compare_prototype_versions` (RPM version comparison):
+    `~` < end of version < trailing separators < letters < digits,
+    digits are compared as numbers, letters are compared as strings, separators are ignored.
+    """
+
+    key = []
+    position, length = 0, len(version)
+
+    while position < length:
+        char = version[position]
+
+        if char == "~":
+            key.append(_VERSION_KEY_TILDE)
+            position += 1
+        elif char.isdigit():
+            end = position
+            while end < length and version[end].isdigit():
+                end += 1
+
+            digits = version[position:end].lstrip("0")
+            key.append(f"{_VERSION_KEY_DIGITS}{len(digits):03}{digits}")
+            position = end
+        elif char.isalpha():
+            end = position
+            while end < length and version[end].isalpha():
+                end += 1
+
+            key.append(f"{_VERSION_KEY_LETTERS}{version[position:end]}{_VERSION_KEY_LETTERS_END}")
+            position = end
+        else:
+            end = position
+            while end < length and not (version[end].isalnum() or version[end] == "~"):
+                end += 1
+
+            if end == length:
+                key.append(_VERSION_KEY_TRAILING_SEPARATOR)
+
+            position = end
+
+    key.append(_VERSION_KEY_END)
+
+    return "".join(key)
+
+
+def order_model_versions(model) -> set[int] | None:
+    """
+    Maintain `version_order` of model's rows incrementally:
+    only rows without `version_key` (newly added ones) are placed between existing orders,
+    whole table is re-numbered only when there's no gap left between neighbours
+    (or when existing orders are computed without keys, e.g. after migration).
+    Rows with equal versions share the same order.
+
+    Returns orders of existing versions that got new neighbours or None if all orders were changed.
+    """
+
+    new_rows = list(model.objects.filter(version_key="").only("id", "version", "version_order"))
+    if not new_rows:
+        return set()
+
+    for row in new_rows:
+        row.version_key = get_version_key(row.version)
+
+    model.objects.bulk_update(new_rows, ["version_key"])
+
+    if any(row.version_order != 0 for row in new_rows):
+        _renumber_model_versions(model)
+        return None
+
+    existing = dict(
+        model.objects.exclude(id__in=(row.id for row in new_rows))
+        .values_list("version_key", "version_order")
+        .distinct()
+    )
+    known_keys = sorted(existing)
+    orders = {}
+    neighbours = set()
+
+    for key in sorted({row.version_key for row in new_rows} - existing.keys()):
+        position = bisect.bisect_left(known_keys, key)
+        lower = existing[known_keys[position - 1]] if position > 0 else 0
+        upper = existing[known_keys[position]] if position < len(known_keys) else lower + 2 * VERSION_ORDER_GAP
+
+        if upper - lower < 2:
+            _renumber_model_versions(model)
+            return None
+
+        existing[key] = orders[key] = lower + (upper - lower) // 2
+        known_keys.insert(position, key)
+        neighbours.update((lower, upper))
+
+    for row in new_rows:
+        row.version_order = orders.get(row.version_key, existing[row.version_key])
+
+    model.objects.bulk_update(new_rows, ["version_order"])
+
+    return neighbours
+
+
+def _renumber_model_versions(model):
+    rows = list(model.objects.only("id", "version", "version_key", "version_order"))
+    orders = {}
+
+    for row in rows:
+        if not row.version_key:
+            row.version_key = get_version_key(row.version)
+
+        orders[row.version_key] = None
+
+    for position, key in enumerate(sorted(orders), start=1):
+        orders[key] = position * VERSION_ORDER_GAP
+
+    for row in rows:
+        row.version_order = orders[row.version_key]
+
+    model.objects.bulk_update(rows, ["version_key", "version_order"], batch_size=1000)
+
+
+def _first_matching_position(versions: list[str], predicate) -> int:
+    """Binary search of first version that satisfies monotonic predicate"""
+
+    low, high = 0, len(versions)
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(versions[middle]):
+            high = middle
+        else:
+            low = middle + 1
+
+    return low
+
+
+def index_upgrades(neighbours: set[int] | None = None) -> None:
+    """
+    Translate upgrades' version bounds to `Prototype.version_order` space,
+    so applicable upgrades can be found with a range query (see `cm.upgrade.get_upgrade`).
+    Should be called after each prototypes re-ordering.
+
+    When `neighbours` (see `order_model_versions`) are specified, only bounds that could be moved
+    by inserted versions are re-calculated (and the ones that weren't calculated yet).
+    """
+
+    orders, versions = [], []
+    for version_order, version in (
+        Prototype.objects.order_by("version_order").values_list("version_order", "version").distinct()
     ):
-        if ver != obj.version:
-            count += 1
-        obj.version_order = count
-        ver = obj.version
-    # Update all table in one time. That is much faster than one by one method
-    model.objects.bulk_update(items, ["version_order"])
+        orders.append(version_order)
+        versions.append(version)
+
+    if not orders:
+        return
+
+    upgrades = Upgrade.objects.order_by("id")
+    if neighbours is not None:
+        upgrades = upgrades.filter(
+            Q(min_version_order__isnull=True)
+            | Q(max_version_order__isnull=True)
+            | Q(min_version_order__in=neighbours)
+            | Q(max_version_order__in=neighbours)
+            # empty ranges
+            | Q(min_version_order__gt=F("max_version_order"))
+        )
+
+    upgrades = list(upgrades)
+    if not upgrades:
+        return
+
+    for upgrade in upgrades:
+        if upgrade.min_strict:
+            min_position = _first_matching_position(
+                versions, lambda version, bound=upgrade.min_version: compare_prototype_versions(version, bound) > 0
+            )
+        else:
+            min_position = _first_matching_position(
+                versions, lambda version, bound=upgrade.min_version: compare_prototype_versions(version, bound) >= 0
+            )
+
+        if upgrade.max_strict:
+            max_position = (
+                _first_matching_position(
+                    versions, lambda version, bound=upgrade.max_version: compare_prototype_versions(version, bound) >= 0
+                )
+                - 1
+            )
+        else:
+            max_position = (
+                _first_matching_position(
+                    versions, lambda version, bound=upgrade.max_version: compare_prototype_versions(version, bound) > 0
+                )
+                - 1
+            )
+
+        # empty range (min > max) is used when there are no suitable versions at all
+        upgrade.min_version_order = orders[min_position] if min_position < len(orders) else orders[-1] + 1
+        upgrade.max_version_order = orders[max_position] if max_position >= 0 else 0
+
+    Upgrade.objects.bulk_update(upgrades, ["min_version_order", "max_version_order"])
 
 
 def order_versions():
-    order_model_versions(Prototype)
+    neighbours = order_model_versions(Prototype)
     order_model_versions(Bundle)
+    index_upgrades(neighbours=neighbours)
 
 
 def process_file(bundle_file: str) -> tuple[str, Path]:
@@ -882,6 +1077,7 @@ def copy_stage_sub_actions(bundle: Bundle) -> None:
                 "multi_state_on_fail_unset",
                 "params",
                 "allow_to_terminate",
+                "parallel_group",
             ),
         )
         sub_action.action = action
@@ -1159,6 +1355,7 @@ def update_bundle_from_stage(bundle):
                         "multi_state_on_fail_set",
                         "multi_state_on_fail_unset",
                         "params",
+                        "parallel_group",
                     ),
                 )
                 sub.action = action
@@ -141,6 +141,7 @@ ERRORS = {
         HTTP_409_CONFLICT,
         ERR,
     ),
+    "DUMP_LOAD_FILE_DAMAGED": ("Loading error. Dump file is damaged", HTTP_400_BAD_REQUEST, ERR),
     "MESSAGE_TEMPLATING_ERROR": ("Message templating error", HTTP_409_CONFLICT, ERR),
     "ISSUE_INTEGRITY_ERROR": ("Issue object integrity error", HTTP_409_CONFLICT, ERR),
     "GROUP_CONFIG_HOST_ERROR": (
@@ -10,6 +10,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import defaultdict
 from functools import partial
 from typing import Iterable
 
@@ -166,7 +167,9 @@ def do_check_import(cluster: Cluster, service: ClusterObject | None = None) -> t
 
 def check_hc(cluster: Cluster) -> bool:
     shc_list = []
-    for hostcomponent in HostComponent.objects.filter(cluster=cluster):
+    for hostcomponent in HostComponent.objects.filter(cluster=cluster).select_related(
+        "service__prototype", "host", "component__prototype"
+    ):
         shc_list.append((hostcomponent.service, hostcomponent.host, hostcomponent.component))
 
     if not shc_list:
@@ -178,7 +181,7 @@ def check_hc(cluster: Cluster) -> bool:
                 logger.debug("void host components for %s", proto_ref(prototype=service.prototype))
                 return False
 
-    for service in ClusterObject.objects.filter(cluster=cluster):
+    for service in ClusterObject.objects.select_related("prototype").filter(cluster=cluster):
         try:
             check_component_constraint(
                 cluster=cluster, service_prototype=service.prototype, hc_in=[i for i in shc_list if i[0] == service]
@@ -196,6 +199,9 @@ def check_hc(cluster: Cluster) -> bool:
 
 
 def check_hc_requires(shc_list: list[tuple[ClusterObject, Host, ServiceComponent]]) -> None:
+    mapped_components = {(shc[0].prototype.name, shc[2].prototype.name) for shc in shc_list}
+    services_exist = {}
+
     for serv_host_comp in [i for i in shc_list if i[2].prototype.requires or i[0].prototype.requires]:
         for require in [*serv_host_comp[2].prototype.requires, *serv_host_comp[0].prototype.requires]:
             if require in serv_host_comp[2].prototype.requires:
@@ -205,7 +211,12 @@ def check_hc_requires(shc_list: list[tuple[ClusterObject, Host, ServiceComponent
 
             req_comp = require.get("component")
 
-            if not ClusterObject.objects.filter(prototype__name=require["service"]).exists() and not req_comp:
+            if require["service"] not in services_exist:
+                services_exist[require["service"]] = ClusterObject.objects.filter(
+                    prototype__name=require["service"]
+                ).exists()
+
+            if not services_exist[require["service"]] and not req_comp:
                 raise AdcmEx(
                     code="COMPONENT_CONSTRAINT_ERROR", msg=f"No required service \"{require['service']}\" for {ref}"
                 )
@@ -213,12 +224,7 @@ def check_hc_requires(shc_list: list[tuple[ClusterObject, Host, ServiceComponent
             if not req_comp:
                 continue
 
-            if not any(
-                {  # noqa: C419
-                    (shc[0].prototype.name == require["service"] and shc[2].prototype.name == req_comp)
-                    for shc in shc_list
-                }
-            ):
+            if (require["service"], req_comp) not in mapped_components:
                 raise AdcmEx(
                     code="COMPONENT_CONSTRAINT_ERROR",
                     msg=f'No required component "{req_comp}" of service "{require["service"]}" for {ref}',
@@ -226,14 +232,18 @@ def check_hc_requires(shc_list: list[tuple[ClusterObject, Host, ServiceComponent
 
 
 def check_bound_components(shc_list: list[tuple[ClusterObject, Host, ServiceComponent]]) -> None:
+    shc_by_names = defaultdict(list)
+    mapped_prototypes = set()
+    for shc in shc_list:
+        shc_by_names[(shc[0].prototype.name, shc[2].prototype.name)].append(shc)
+        mapped_prototypes.add((shc[1].pk, shc[2].prototype.pk))
+
     for shc in [i for i in shc_list if i[2].prototype.bound_to]:
         component_prototype = shc[2].prototype
         service_name = component_prototype.bound_to["service"]
         component_name = component_prototype.bound_to["component"]
 
-        bound_targets_shc = [
-            i for i in shc_list if i[0].prototype.name == service_name and i[2].prototype.name == component_name
-        ]
+        bound_targets_shc = shc_by_names.get((service_name, component_name), [])
 
         if not bound_targets_shc:
             bound_target_ref = f'component "{component_name}" of service "{service_name}"'
@@ -242,7 +252,7 @@ def check_bound_components(shc_list: list[tuple[ClusterObject, Host, ServiceComp
             raise AdcmEx(code="COMPONENT_CONSTRAINT_ERROR", msg=msg)
 
         for target_shc in bound_targets_shc:
-            if not [i for i in shc_list if i[1] == target_shc[1] and i[2].prototype == component_prototype]:
+            if (target_shc[1].pk, component_prototype.pk) not in mapped_prototypes:
                 bound_target_ref = f'component "{shc[2].prototype.name}" of service "{shc[0].prototype.name}"'
                 bound_requester_ref = (
                     f'component "{target_shc[2].prototype.name}" of service "{target_shc[0].prototype.name}"'
@@ -12,6 +12,13 @@
 
 from pathlib import Path
 from typing import Protocol
+import zlib
+
+from core.job.executors import OutputStream
+from django.db import connection
+
+from cm.logger import logger
+from cm.models import LogChunk, LogStorage
 
 
 class BasicLogInfo(Protocol):
@@ -27,3 +34,43 @@ def extract_log_content_from_fs(jobs_dir: Path, log_info: BasicLogInfo) -> str |
         return logfile.read_text(encoding="utf-8")
 
     return None
+
+
+def extract_log_content_from_db(log_id: int) -> str | None:
+    chunks = LogChunk.objects.filter(log_id=log_id).order_by("offset").values_list("body", flat=True)
+    if not chunks:
+        return None
+
+    return b"".join(zlib.decompress(chunk) for chunk in chunks).decode(encoding="utf-8", errors="replace")
+
+
+class LogStorageOutputSink:
+    """
+    Saves output of job's process to chunks of its stdout/stderr logs while it's running.
+
+    Is called from executor's output thread, so database connection of that thread is closed at the end.
+    """
+
+    def __init__(self, job_id: int, name: str):
+        self._job_id = job_id
+        self._name = name
+        self._log_ids: dict[str, int] | None = None
+
+    def append(self, stream: OutputStream, offset: int, data: bytes) -> None:
+        try:
+            if self._log_ids is None:
+                self._log_ids = dict(
+                    LogStorage.objects.filter(job_id=self._job_id, name=self._name).values_list("type", "id")
+                )
+
+            log_id = self._log_ids.get(stream)
+            if log_id is not None:
+                LogChunk.objects.create(log_id=log_id, offset=offset, size=len(data), body=zlib.compress(data))
+        except Exception:
+            logger.exception(
+                "Failed to save %s of job #%s, it will be saved from file after job is finished", stream, self._job_id
+            )
+            raise
+
+    def close(self) -> None:
+        connection.close()
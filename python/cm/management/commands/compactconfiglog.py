@@ -0,0 +1,44 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cm.models import ObjectConfig
+from cm.services.config.history import compact_config_history
+
+
+class Command(BaseCommand):
+    help = "Convert existing config history to delta storage (snapshots + patches)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--snapshot-interval",
+            type=int,
+            default=settings.CONFIG_LOG_SNAPSHOT_INTERVAL,
+            help="Amount of records between full snapshots",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        start = perf_counter()
+        converted = 0
+
+        for object_config_id in ObjectConfig.objects.order_by("pk").values_list("pk", flat=True).iterator():
+            with transaction.atomic():
+                converted += compact_config_history(
+                    object_config_ids=(object_config_id,), snapshot_interval=options["snapshot_interval"]
+                )
+
+        self.stdout.write(f"Converted {converted} config records in {perf_counter() - start:.2f}s")
@@ -10,7 +10,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import Counter
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 import sys
 import json
 import base64
@@ -37,6 +40,16 @@ from cm.models import (
     ServiceComponent,
 )
 
+# Dump is a header line followed by lines of encrypted chunks.
+# Each chunk is a newline-delimited list of JSON records: `{"type": <record type>, "data": <object>}`.
+# Records go in order of their dependencies: header, bundles, cluster, providers, hosts,
+# services, components, host components and groups.
+# Every chunk starts with `chunk` record holding its index, the last chunk holds only `end` record
+# with amount of chunks and records of each type, so truncated, reordered or incomplete dump is detected on load.
+DUMP_FORMAT_HEADER = "ADCM-CLUSTER-DUMP 2"
+RECORDS_IN_CHUNK = 1000
+OBJECTS_IN_BATCH = 1000
+
 
 def serialize_datetime_fields(obj, fields=None):
     """
@@ -78,6 +91,12 @@ def get_objects(model, fields, filters, datetime_fields=None):
     return objects
 
 
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 def get_bundle(prototype_id):
     """
     Returns bundle object in dictionary format
@@ -92,19 +111,6 @@ def get_bundle(prototype_id):
     return get_object(Bundle, prototype.bundle_id, fields)
 
 
-def get_bundle_hash(prototype_id):
-    """
-    Returns the hash of the bundle
-
-    :param prototype_id: Object ID
-    :type prototype_id: int
-    :return: The hash of the bundle
-    :rtype: str
-    """
-    bundle = get_bundle(prototype_id)
-    return bundle["hash"]
-
-
 def get_config(object_config_id):
     """
     Returns current and previous config
@@ -114,40 +120,69 @@ def get_config(object_config_id):
     :return: Current and previous config in dictionary format
     :rtype: dict
     """
-    fields = ("config", "attr", "date", "description")
-    try:
-        object_config = ObjectConfig.objects.get(id=object_config_id)
-    except ObjectConfig.DoesNotExist:
-        return None
-    config = {}
-    for name in ["current", "previous"]:
-        _id = getattr(object_config, name)
-        if _id:
-            config[name] = get_object(ConfigLog, _id, fields, ["date"])
-        else:
-            config[name] = None
-    return config
-
-
-def get_groups(object_id, model_name):
+    return get_configs([object_config_id]).get(object_config_id)
+
+
+def get_configs(object_config_ids):
+    """
+    Returns current and previous configs of several objects with two queries
+
+    :param object_config_ids: List of ObjectConfig IDs
+    :type object_config_ids: list
+    :return: Current and previous config in dictionary format by ObjectConfig ID
+    :rtype: dict
+    """
+    object_configs = list(
+        ObjectConfig.objects.filter(id__in=[id_ for id_ in object_config_ids if id_ is not None]).values(
+            "id", "current", "previous"
+        )
+    )
+    config_logs = {}
+    for config_log in ConfigLog.objects.filter(
+        id__in={object_config[name] for object_config in object_configs for name in ("current", "previous")}
+    ).values("id", "config", "attr", "date", "description"):
+        serialize_datetime_fields(config_log, ["date"])
+        config_logs[config_log.pop("id")] = config_log
+
+    return {
+        object_config["id"]: {name: config_logs.get(object_config[name]) for name in ("current", "previous")}
+        for object_config in object_configs
+    }
+
+
+def get_groups(object_ids, model_name):
     """Return list of groups. Each group contain dictionary with all needed information
 
-    :param object_id: Object ID
-    :type object_id: int
+    :param object_ids: IDs of objects
+    :type object_ids: list
     :param model_name: name of Type Object
     :type model_name: str
-    :return: List with GroupConfig on that object in dict format
+    :return: List with GroupConfig on that objects in dict format
     :rtype: list
     """
 
-    fields = ("object_id", "name", "description", "config", "object_type")
-    groups = []
-    for group_config in GroupConfig.objects.filter(object_id=object_id, object_type__model=model_name):
-        group = get_object(GroupConfig, group_config.id, fields)
-        group["config"] = get_config(group["config"])
+    fields = ("id", "object_id", "name", "description", "config", "object_type")
+    groups = list(
+        GroupConfig.objects.filter(object_id__in=object_ids, object_type__model=model_name)
+        .values(*fields)
+        .order_by("id")
+    )
+    if not groups:
+        return groups
+
+    configs = get_configs([group["config"] for group in groups])
+    hosts = {group["id"]: [] for group in groups}
+    for group_id, host_id in (
+        GroupConfig.hosts.through.objects.filter(groupconfig_id__in=list(hosts))
+        .values_list("groupconfig_id", "host_id")
+        .order_by("host_id")
+    ):
+        hosts[group_id].append(host_id)
+
+    for group in groups:
+        group["config"] = configs.get(group["config"])
         group["model_name"] = model_name
-        group["hosts"] = [host.id for host in group_config.hosts.order_by("id")]
-        groups.append(group)
+        group["hosts"] = hosts[group.pop("id")]
 
     return groups
 
@@ -202,18 +237,29 @@ def get_provider(provider_id):
     return provider, bundle
 
 
-def get_host(host_id):
+def iter_objects(queryset, fields):
     """
-    Returns host object in dictionary format
+    Yields batches of objects in dictionary format with their configs
 
-    :param host_id: Object ID
-    :type host_id: int
-    :return: Host object
-    :rtype: dict
+    :param queryset: Objects to dump
+    :param fields: List of fields
+    :type fields: tuple
+    :return: Lists of objects
+    :rtype: Iterator[list]
     """
+    queryset = queryset.values(*fields, "prototype__bundle__hash").order_by("id")
+    for objects in batched(queryset.iterator(chunk_size=OBJECTS_IN_BATCH), OBJECTS_IN_BATCH):
+        configs = get_configs([obj["config"] for obj in objects])
+        for obj in objects:
+            obj["config"] = configs.get(obj["config"])
+            obj["bundle_hash"] = obj.pop("prototype__bundle__hash")
+
+        yield objects
+
+
+def iter_hosts(cluster_id):
     fields = (
         "id",
-        "prototype",
         "fqdn",
         "description",
         "provider",
@@ -222,68 +268,33 @@ def get_host(host_id):
         "state",
         "_multi_state",
     )
-    host = get_object(Host, host_id, fields)
-    host["config"] = get_config(host["config"])
-    host["bundle_hash"] = get_bundle_hash(host.pop("prototype"))
-    return host
+    return iter_objects(Host.objects.filter(cluster_id=cluster_id), fields)
 
 
-def get_service(service_id):
-    """
-    Returns service object in dictionary format
-
-    :param service_id: Object ID
-    :type service_id: int
-    :return: Service object
-    :rtype: dict
-    """
+def iter_services(cluster_id):
     fields = (
         "id",
-        "prototype",
         "prototype__name",
         "config",
         "state",
         "_multi_state",
     )
-    service = get_object(ClusterObject, service_id, fields)
-    service["config"] = get_config(service["config"])
-    service["bundle_hash"] = get_bundle_hash(service.pop("prototype"))
-    return service
+    return iter_objects(ClusterObject.objects.filter(cluster_id=cluster_id), fields)
 
 
-def get_component(component_id):
-    """
-    Returns component object in dictionary format
-
-    :param component_id: Object ID
-    :type component_id: int
-    :return: Component object
-    :rtype: dict
-    """
+def iter_components(cluster_id):
     fields = (
         "id",
-        "prototype",
         "prototype__name",
         "service",
         "config",
         "state",
         "_multi_state",
     )
-    component = get_object(ServiceComponent, component_id, fields)
-    component["config"] = get_config(component["config"])
-    component["bundle_hash"] = get_bundle_hash(component.pop("prototype"))
-    return component
+    return iter_objects(ServiceComponent.objects.filter(cluster_id=cluster_id), fields)
 
 
-def get_host_component(host_component_id):
-    """
-    Returns host_component object in dictionary format
-
-    :param host_component_id: Object ID
-    :type host_component_id: int
-    :return: HostComponent object
-    :rtype: dict
-    """
+def iter_host_components(cluster_id):
     fields = (
         "cluster",
         "host",
@@ -291,10 +302,69 @@ def get_host_component(host_component_id):
         "component",
         "state",
     )
-    return get_object(HostComponent, host_component_id, fields)
+    queryset = HostComponent.objects.filter(cluster_id=cluster_id).values(*fields).order_by("id")
+    return queryset.iterator(chunk_size=OBJECTS_IN_BATCH)
 
 
-def encrypt_data(pass_from_user, result):
+def iter_records(cluster_id):
+    """
+    Yields records of all objects of cluster in order they should be loaded
+
+    :param cluster_id: Object ID
+    :type cluster_id: int
+    :return: Records in dictionary format
+    :rtype: Iterator[dict]
+    """
+    cluster, bundle = get_cluster(cluster_id)
+    provider_ids = sorted(
+        set(Host.objects.filter(cluster_id=cluster_id).values_list("provider_id", flat=True).distinct())
+    )
+    providers = []
+    bundles = {bundle["hash"]: bundle}
+    for provider_id in provider_ids:
+        provider, bundle = get_provider(provider_id)
+        providers.append(provider)
+        bundles[bundle["hash"]] = bundle
+
+    yield {"type": "header", "data": {"ADCM_VERSION": settings.ADCM_VERSION, "adcm_password": settings.ANSIBLE_SECRET}}
+    for bundle in bundles.values():
+        yield {"type": "bundle", "data": bundle}
+
+    yield {"type": "cluster", "data": cluster}
+    for provider in providers:
+        yield {"type": "provider", "data": provider}
+
+    for hosts in iter_hosts(cluster_id):
+        for host in hosts:
+            yield {"type": "host", "data": host}
+
+    service_ids = []
+    for services in iter_services(cluster_id):
+        for service in services:
+            service_ids.append(service["id"])
+            yield {"type": "service", "data": service}
+
+    component_ids = []
+    for components in iter_components(cluster_id):
+        for component in components:
+            component_ids.append(component["id"])
+            yield {"type": "component", "data": component}
+
+    for host_component in iter_host_components(cluster_id):
+        yield {"type": "host_component", "data": host_component}
+
+    for object_ids, model_name in (
+        ([cluster_id], "cluster"),
+        (provider_ids, "hostprovider"),
+        (service_ids, "clusterobject"),
+        (component_ids, "servicecomponent"),
+    ):
+        for ids in batched(object_ids, OBJECTS_IN_BATCH):
+            for group in get_groups(ids, model_name):
+                yield {"type": "group", "data": group}
+
+
+def get_fernet(pass_from_user):
     password = pass_from_user.encode()
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
@@ -304,95 +374,69 @@ def encrypt_data(pass_from_user, result):
         backend=default_backend(),
     )
     key = base64.urlsafe_b64encode(kdf.derive(password))
-    f = Fernet(key)
-    return f.encrypt(result)
-
+    return Fernet(key)
 
-def dump(cluster_id, output):
-    """
-    Saving objects to file in JSON format
 
-    :param cluster_id: Object ID
-    :type cluster_id: int
-    :param output: Path to file
-    :type output: str
-    """
-    cluster, bundle = get_cluster(cluster_id)
-
-    data = {
-        "ADCM_VERSION": settings.ADCM_VERSION,
-        "bundles": {
-            bundle["hash"]: bundle,
-        },
-        "cluster": cluster,
-        "hosts": [],
-        "providers": [],
-        "services": [],
-        "components": [],
-        "host_components": [],
-        "groups": [],
-    }
+def encrypt_data(pass_from_user, result):
+    return get_fernet(pass_from_user).encrypt(result)
 
-    provider_ids = set()
-    data["groups"].extend(get_groups(cluster_id, "cluster"))
 
-    for host_obj in Host.objects.filter(cluster_id=cluster["id"]):
-        host = get_host(host_obj.id)
-        provider_ids.add(host["provider"])
-        data["hosts"].append(host)
+def write_records(records, fernet, stream: TextIO):
+    """
+    Writes records to stream chunk by chunk, so the whole dump is never kept in memory
 
-    host_ids = [host["id"] for host in data["hosts"]]
+    :param records: Records in dictionary format
+    :type records: Iterable[dict]
+    :param fernet: Key to encrypt chunks with
+    :type fernet: Fernet
+    :param stream: Text stream to write to
+    """
 
-    for provider_obj in HostProvider.objects.filter(id__in=provider_ids):
-        provider, bundle = get_provider(provider_obj.id)
-        data["providers"].append(provider)
-        data["groups"].extend(get_groups(provider_obj.id, "hostprovider"))
-        data["bundles"][bundle["hash"]] = bundle
+    def write_chunk(index, chunk):
+        chunk = [{"type": "chunk", "data": {"index": index}}, *chunk]
+        data = "\n".join(json.dumps(record) for record in chunk).encode(settings.ENCODING_UTF_8)
+        stream.write(f"{fernet.encrypt(data).decode(settings.ENCODING_UTF_8)}\n")
 
-    for service_obj in ClusterObject.objects.filter(cluster_id=cluster["id"]):
-        service = get_service(service_obj.id)
-        data["groups"].extend(get_groups(service_obj.id, "clusterobject"))
-        data["services"].append(service)
+    stream.write(f"{DUMP_FORMAT_HEADER}\n")
+    counts = Counter()
+    chunks = 0
+    for chunk in batched(records, RECORDS_IN_CHUNK):
+        counts.update(record["type"] for record in chunk)
+        write_chunk(chunks, chunk)
+        chunks += 1
 
-    service_ids = [service["id"] for service in data["services"]]
+    write_chunk(chunks, [{"type": "end", "data": {"chunks": chunks, "records": dict(counts)}}])
 
-    for component_obj in ServiceComponent.objects.filter(cluster_id=cluster["id"], service_id__in=service_ids):
-        component = get_component(component_obj.id)
-        data["groups"].extend(get_groups(component_obj.id, "servicecomponent"))
-        data["components"].append(component)
 
-    component_ids = [component["id"] for component in data["components"]]
+def dump(cluster_id, output):
+    """
+    Saving objects to file in newline-delimited JSON format encrypted by chunks
 
-    for host_component_obj in HostComponent.objects.filter(
-        cluster_id=cluster["id"],
-        host_id__in=host_ids,
-        service_id__in=service_ids,
-        component_id__in=component_ids,
-    ):
-        host_component = get_host_component(host_component_obj.id)
-        data["host_components"].append(host_component)
-    data["adcm_password"] = settings.ANSIBLE_SECRET
-    result = json.dumps(data, indent=2).encode(settings.ENCODING_UTF_8)
+    :param cluster_id: Object ID
+    :type cluster_id: int
+    :param output: Path to file
+    :type output: str
+    """
     password = getpass.getpass()
-    encrypted = encrypt_data(password, result)
+    fernet = get_fernet(password)
 
     if output is not None:
-        with Path(output).open(mode="wb") as f:
-            f.write(encrypted)
+        with Path(output).open(mode="w", encoding=settings.ENCODING_UTF_8) as f:
+            write_records(iter_records(cluster_id), fernet, f)
         sys.stdout.write(f"Dump successfully done to file {output}\n")
     else:
-        sys.stdout.write(encrypted.decode(settings.ENCODING_UTF_8))
+        write_records(iter_records(cluster_id), fernet, sys.stdout)
 
 
 class Command(BaseCommand):
     """
-    Command for dump cluster object to JSON format
+    Command for dump cluster object to encrypted newline-delimited JSON format
 
     Example:
         manage.py dumpcluster --cluster_id 1 --output cluster.json
     """
 
-    help = "Dump cluster object to JSON format"
+    help = "Dump cluster object to encrypted newline-delimited JSON format"
 
     def add_arguments(self, parser):
         """
@@ -10,12 +10,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import Counter
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
+from typing import Iterator
 import sys
 import json
 import base64
 import getpass
+import binascii
 
 from ansible.parsing.vault import VaultAES256, VaultSecret
 from cryptography.fernet import Fernet, InvalidToken
@@ -25,11 +29,13 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
+from django.db import connection
 from django.db.transaction import atomic
 from django.db.utils import IntegrityError
 
 from cm.adcm_config.config import save_file_type
 from cm.errors import AdcmEx
+from cm.management.commands.dumpcluster import DUMP_FORMAT_HEADER, OBJECTS_IN_BATCH, batched, get_fernet
 from cm.models import (
     Bundle,
     Cluster,
@@ -74,6 +80,67 @@ def get_prototype(**kwargs):
     return Prototype.objects.get(bundle=bundle, **kwargs)
 
 
+def create_objects(model, objects):
+    """
+    Saves new objects with as few queries as DB backend allows
+
+    :param model: Type object
+    :param objects: List of objects
+    :type objects: list
+    """
+    # ids of created objects are required, but not every DB backend returns them from bulk insert
+    if connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(objects, batch_size=OBJECTS_IN_BATCH)
+    else:
+        for obj in objects:
+            obj.save()
+
+
+def create_configs(configs, prototypes, secret_fields=None):
+    """
+    Creating current ConfigLog, previous ConfigLog and ObjectConfig objects for several objects at once
+
+    :param configs: List of ConfigLog objects in dictionary format
+    :type configs: list
+    :param prototypes: List of prototypes of objects
+    :type prototypes: list
+    :param secret_fields: Secret fields by prototype ID, looked up in DB if not given
+    :type secret_fields: dict
+    :return: ObjectConfig objects, None for objects without config
+    :rtype: list
+    """
+    object_configs = [ObjectConfig(current=0, previous=0) if config is not None else None for config in configs]
+    create_objects(ObjectConfig, [conf for conf in object_configs if conf is not None])
+
+    config_logs = []
+    for conf, config, prototype in zip(object_configs, configs, prototypes):
+        if conf is None:
+            continue
+
+        fields = secret_fields.get(prototype.pk) if secret_fields is not None and prototype is not None else None
+        current_config = process_config(prototype, config["current"], fields)
+        deserializer_datetime_fields(current_config, ["date"])
+        previous_config = process_config(prototype, config["previous"], fields)
+        deserializer_datetime_fields(previous_config, ["date"])
+
+        config_logs.append(
+            (
+                conf,
+                ConfigLog(obj_ref=conf, **current_config),
+                ConfigLog(obj_ref=conf, **previous_config) if previous_config is not None else None,
+            )
+        )
+
+    create_objects(ConfigLog, [log for _, *logs in config_logs for log in logs if log is not None])
+
+    for conf, current, previous in config_logs:
+        conf.current = current.id
+        conf.previous = previous.id if previous is not None else 0
+    ObjectConfig.objects.bulk_update([conf for conf, *_ in config_logs], fields=["current", "previous"])
+
+    return object_configs
+
+
 def create_config(config, prototype=None):
     """
     Creating current ConfigLog, previous ConfigLog and ObjectConfig objects
@@ -83,27 +150,7 @@ def create_config(config, prototype=None):
     :return: ObjectConfig object
     :rtype: models.ObjectConfig
     """
-    if config is not None:
-        current_config = process_config(prototype, config["current"])
-        deserializer_datetime_fields(current_config, ["date"])
-        previous_config = process_config(prototype, config["previous"])
-        deserializer_datetime_fields(previous_config, ["date"])
-
-        conf = ObjectConfig.objects.create(current=0, previous=0)
-
-        current = ConfigLog.objects.create(obj_ref=conf, **current_config)
-        current_id = current.id
-        if previous_config is not None:
-            previous = ConfigLog.objects.create(obj_ref=conf, **previous_config)
-            previous_id = previous.id
-        else:
-            previous_id = 0
-
-        conf.current = current_id
-        conf.previous = previous_id
-        conf.save()
-        return conf
-    return None
+    return create_configs([config], [prototype])[0]
 
 
 def create_group(group, ex_hosts_list, obj):
@@ -129,7 +176,7 @@ def create_group(group, ex_hosts_list, obj):
     group_config = GroupConfig.objects.create(
         object_id=obj.id,
         config=config,
-        object_type=ContentType.objects.get(model=model_name),
+        object_type=ContentType.objects.get_by_natural_key(app_label="cm", model=model_name),
         **group,
     )
     group_config.hosts.set(hosts)
@@ -149,27 +196,52 @@ def switch_encoding(msg):
     return f"{settings.ANSIBLE_VAULT_HEADER}\n{str(ciphertext, settings.ENCODING_UTF_8)}"
 
 
-def process_config(proto, config):
+def get_fields_of_type(prototypes, types):
+    """
+    Returns names and subnames of config fields of given types for each prototype with one query
+
+    :param prototypes: List of prototypes
+    :type prototypes: list
+    :param types: Types of fields
+    :type types: tuple
+    :return: Lists of (name, subname) by prototype ID
+    :rtype: dict
+    """
+    fields = {prototype.pk: [] for prototype in prototypes}
+    for prototype_id, name, subname in PrototypeConfig.objects.filter(
+        prototype_id__in=list(fields), type__in=types
+    ).values_list("prototype_id", "name", "subname"):
+        fields[prototype_id].append((name, subname))
+
+    return fields
+
+
+def process_config(proto, config, secret_fields=None):
     if config is not None and proto is not None:
+        if secret_fields is None:
+            secret_fields = get_fields_of_type([proto], ("secrettext", "password"))[proto.pk]
+
         conf = config["config"]
-        for pconf in PrototypeConfig.objects.filter(prototype=proto, type__in=("secrettext", "password")):
-            if pconf.subname and conf[pconf.name][pconf.subname]:
-                conf[pconf.name][pconf.subname] = switch_encoding(conf[pconf.name][pconf.subname])
-            elif conf.get(pconf.name) and not pconf.subname:
-                conf[pconf.name] = switch_encoding(conf[pconf.name])
+        for name, subname in secret_fields:
+            if subname and conf[name][subname]:
+                conf[name][subname] = switch_encoding(conf[name][subname])
+            elif conf.get(name) and not subname:
+                conf[name] = switch_encoding(conf[name])
         config["config"] = conf
     return config
 
 
-def create_file_from_config(obj, config):
+def create_file_from_config(obj, config, file_fields=None):
     if config is not None:
+        if file_fields is None:
+            file_fields = get_fields_of_type([obj.prototype], ("file",))[obj.prototype.pk]
+
         conf = config["current"]["config"]
-        proto = obj.prototype
-        for pconf in PrototypeConfig.objects.filter(prototype=proto, type="file"):
-            if pconf.subname and conf[pconf.name].get(pconf.subname):
-                save_file_type(obj, pconf.name, pconf.subname, conf[pconf.name][pconf.subname])
-            elif conf.get(pconf.name):
-                save_file_type(obj, pconf.name, "", conf[pconf.name])
+        for name, subname in file_fields:
+            if subname and conf[name].get(subname):
+                save_file_type(obj, name, subname, conf[name][subname])
+            elif conf.get(name):
+                save_file_type(obj, name, "", conf[name])
 
 
 def create_cluster(cluster):
@@ -222,150 +294,188 @@ def create_provider(provider):
         return ex_id, provider
 
 
-def create_host(host, cluster):
-    """
-    Creating Host object
-
-    :param host: Host object in dictionary format
-    :type host: dict
-    :param cluster: Cluster object
-    :type cluster: models.Cluster
-    :return: Host object
-    :rtype: models.Host
-    """
-    host.pop("provider")
-    provider = HostProvider.objects.get(name=host.pop("provider__name"))
-    try:
-        Host.objects.get(fqdn=host["fqdn"])
-        provider.delete()
-        cluster.delete()
-        raise AdcmEx("HOST_CONFLICT", "Host fqdn already in use")
-    except Host.DoesNotExist:
-        prototype = get_prototype(bundle_hash=host.pop("bundle_hash"), type="host")
-        ex_id = host.pop("id")
-        config = host.pop("config")
-        new_host = Host.objects.create(
-            prototype=prototype,
-            provider=provider,
-            config=create_config(config, prototype),
-            cluster=cluster,
-            **host,
-        )
-        create_file_from_config(new_host, config)
-        return ex_id, new_host
-
-
-def create_service(service, cluster):
+class ClusterLoader:
     """
-    Creating Service object
-
-    :param service: ClusterObject object in dictionary format
-    :type service: dict
-    :param cluster: Cluster object
-    :type cluster: models.Cluster
-    :return: ClusterObject object
-    :rtype: models.ClusterObject
+    Creates objects from records of dump batch by batch.
+    Prototypes and their config fields are looked up once for all objects of the same prototype.
     """
-    prototype = get_prototype(
-        bundle_hash=service.pop("bundle_hash"),
-        type="service",
-        name=service.pop("prototype__name"),
-    )
-    ex_id = service.pop("id")
-    config = service.pop("config")
-    service = ClusterObject.objects.create(
-        prototype=prototype,
-        cluster=cluster,
-        config=create_config(config, prototype),
-        **service,
-    )
-    create_file_from_config(service, config)
-    return ex_id, service
 
-
-def create_component(component, cluster, service):
+    def __init__(self):
+        self.cluster = None
+        self.ex_provider_ids = {}
+        self.providers_by_name = {}
+        self.ex_host_ids = {}
+        self.fqdns = set()
+        self.ex_service_ids = {}
+        self.ex_component_ids = {}
+        self._prototypes = {}
+        self._secret_fields = {}
+        self._file_fields = {}
+
+    def load(self, record_type, batch):
+        """
+        Creating objects of one type
+
+        :param record_type: Type of records
+        :type record_type: str
+        :param batch: Objects in dictionary format
+        :type batch: list
+        """
+        getattr(self, f"load_{record_type}")(batch)
+
+    def load_header(self, batch):
+        for header in batch:
+            check_version(header)
+            set_old_password(header["adcm_password"])
+
+    def load_bundle(self, batch):
+        check_bundles(batch)
+
+    def load_cluster(self, batch):
+        (cluster,) = batch
+        _, self.cluster = create_cluster(cluster)
+
+    def load_provider(self, batch):
+        for provider_data in batch:
+            ex_provider_id, provider = create_provider(provider_data)
+            self.ex_provider_ids[ex_provider_id] = provider
+            self.providers_by_name[provider.name] = provider
+
+    def load_host(self, batch):
+        fqdns = [host["fqdn"] for host in batch]
+        if (
+            len(set(fqdns)) != len(fqdns)
+            or not self.fqdns.isdisjoint(fqdns)
+            or Host.objects.filter(fqdn__in=fqdns).exists()
+        ):
+            raise AdcmEx("HOST_CONFLICT", "Host fqdn already in use")
+
+        self.fqdns.update(fqdns)
+
+        for host in batch:
+            host.pop("provider")
+            host["provider"] = self.providers_by_name[host.pop("provider__name")]
+            host["prototype"] = self.get_prototype(bundle_hash=host.pop("bundle_hash"), type="host")
+
+        self.ex_host_ids.update(self.create_objects(Host, batch, cluster=self.cluster))
+
+    def load_service(self, batch):
+        for service in batch:
+            service["prototype"] = self.get_prototype(
+                bundle_hash=service.pop("bundle_hash"), type="service", name=service.pop("prototype__name")
+            )
+
+        self.ex_service_ids.update(self.create_objects(ClusterObject, batch, cluster=self.cluster))
+
+    def load_component(self, batch):
+        for component in batch:
+            component["service"] = self.ex_service_ids[component.pop("service")]
+            component["prototype"] = self.get_prototype(
+                bundle_hash=component.pop("bundle_hash"),
+                type="component",
+                name=component.pop("prototype__name"),
+                parent=component["service"].prototype,
+            )
+
+        self.ex_component_ids.update(self.create_objects(ServiceComponent, batch, cluster=self.cluster))
+
+    def load_host_component(self, batch):
+        host_components = []
+        for host_component in batch:
+            host_component.pop("cluster")
+            host_components.append(
+                HostComponent(
+                    cluster=self.cluster,
+                    host=self.ex_host_ids[host_component.pop("host")],
+                    service=self.ex_service_ids[host_component.pop("service")],
+                    component=self.ex_component_ids[host_component.pop("component")],
+                    **host_component,
+                )
+            )
+
+        HostComponent.objects.bulk_create(host_components, batch_size=OBJECTS_IN_BATCH)
+
+    def load_group(self, batch):
+        for group_data in batch:
+            if group_data["model_name"] == "cluster":
+                obj = self.cluster
+            elif group_data["model_name"] == "clusterobject":
+                obj = self.ex_service_ids[group_data["object_id"]]
+            elif group_data["model_name"] == "servicecomponent":
+                obj = self.ex_component_ids[group_data["object_id"]]
+            elif group_data["model_name"] == "hostprovider":
+                obj = self.ex_provider_ids[group_data["object_id"]]
+            create_group(group_data, self.ex_host_ids, obj)
+
+    def get_prototype(self, **kwargs):
+        key = tuple(sorted(kwargs.items(), key=lambda item: item[0]))
+        if key not in self._prototypes:
+            self._prototypes[key] = get_prototype(**kwargs)
+
+        return self._prototypes[key]
+
+    def create_objects(self, model, batch, **fields):
+        """
+        Creating objects of one type with their configs
+
+        :param model: Type object
+        :param batch: Objects in dictionary format with prototype and related objects set
+        :type batch: list
+        :return: Map of ex_ids and new objects
+        :rtype: dict
+        """
+        prototypes = [obj["prototype"] for obj in batch]
+        new_prototypes = {prototype.pk: prototype for prototype in prototypes if prototype.pk not in self._file_fields}
+        if new_prototypes:
+            self._secret_fields.update(get_fields_of_type(new_prototypes.values(), ("secrettext", "password")))
+            self._file_fields.update(get_fields_of_type(new_prototypes.values(), ("file",)))
+
+        ex_ids = [obj.pop("id") for obj in batch]
+        configs = [obj.pop("config") for obj in batch]
+        object_configs = create_configs(configs, prototypes, self._secret_fields)
+
+        objects = [model(config=object_config, **fields, **obj) for obj, object_config in zip(batch, object_configs)]
+        create_objects(model, objects)
+
+        for obj, config in zip(objects, configs):
+            create_file_from_config(obj, config, self._file_fields[obj.prototype_id])
+
+        return dict(zip(ex_ids, objects))
+
+
+def check_version(header):
     """
-    Creating Component object
+    Checking ADCM version of dump
 
-    :param component: ServiceComponent object in dictionary format
-    :type component: dict
-    :param cluster: Cluster object
-    :type cluster: models.Cluster
-    :param service: Service object
-    :type service: models.ClusterObject
-    :return: Component object
-    :rtype: models.ServiceComponent
+    :param header: Header record of dump
+    :type header: dict
     """
-    prototype = get_prototype(
-        bundle_hash=component.pop("bundle_hash"),
-        type="component",
-        name=component.pop("prototype__name"),
-        parent=service.prototype,
-    )
-    ex_id = component.pop("id")
-    config = component.pop("config")
-    component = ServiceComponent.objects.create(
-        prototype=prototype,
-        cluster=cluster,
-        service=service,
-        config=create_config(config, prototype),
-        **component,
-    )
-    create_file_from_config(component, config)
-    return ex_id, component
-
-
-def create_host_component(host_component, cluster, host, service, component):
-    """
-    Creating HostComponent object
-
-    :param host_component: HostComponent object in dictionary format
-    :type host_component: dict
-    :param cluster: Cluster object
-    :type cluster: models.Cluster
-    :param host: Host object
-    :type host: models.Host
-    :param service: Service object
-    :type service: models.ClusterObject
-    :param component: Component object
-    :type component: models.ServiceComponent
-    :return: HostComponent object
-    :rtype: models.HostComponent
-    """
-    host_component.pop("cluster")
-    return HostComponent.objects.create(
-        cluster=cluster,
-        host=host,
-        service=service,
-        component=component,
-        **host_component,
-    )
-
-
-def check(data):
-    """
-    Checking cluster load
-
-    :param data: Data from file
-    :type data: dict
-    """
-    if data["ADCM_VERSION"] != settings.ADCM_VERSION:
+    if header["ADCM_VERSION"] != settings.ADCM_VERSION:
         raise AdcmEx(
             "DUMP_LOAD_ADCM_VERSION_ERROR",
             msg=(
-                f"ADCM versions do not match, dump version: {data['ADCM_VERSION']},"
+                f"ADCM versions do not match, dump version: {header['ADCM_VERSION']},"
                 f" load version: {settings.ADCM_VERSION}"
             ),
         )
 
-    for bundle_hash, bundle in data["bundles"].items():
-        try:
-            Bundle.objects.get(hash=bundle_hash)
-        except Bundle.DoesNotExist as err:
+
+def check_bundles(bundles):
+    """
+    Checking all bundles of dump are uploaded
+
+    :param bundles: Bundle objects in dictionary format
+    :type bundles: list
+    """
+    existing = set(
+        Bundle.objects.filter(hash__in=[bundle["hash"] for bundle in bundles]).values_list("hash", flat=True)
+    )
+    for bundle in bundles:
+        if bundle["hash"] not in existing:
             raise AdcmEx(
                 "DUMP_LOAD_BUNDLE_ERROR",
                 msg=f"Bundle '{bundle['name']} {bundle['version']}' not found",
-            ) from err
+            )
 
 
 def decrypt_file(pass_from_user, file):
@@ -386,83 +496,162 @@ def set_old_password(password):
     OLD_ADCM_PASSWORD = password
 
 
+def legacy_records(data):
+    """
+    Yields records of dump made in single JSON document format
+
+    :param data: Data from file
+    :type data: dict
+    :return: Records in dictionary format
+    :rtype: Iterator[dict]
+    """
+    yield {"type": "header", "data": {"ADCM_VERSION": data["ADCM_VERSION"], "adcm_password": data["adcm_password"]}}
+    for bundle in data["bundles"].values():
+        yield {"type": "bundle", "data": bundle}
+
+    yield {"type": "cluster", "data": data["cluster"]}
+    for record_type, key in (
+        ("provider", "providers"),
+        ("host", "hosts"),
+        ("service", "services"),
+        ("component", "components"),
+        ("host_component", "host_components"),
+        ("group", "groups"),
+    ):
+        for obj in data[key]:
+            yield {"type": record_type, "data": obj}
+
+
+def read_records(file_path, password) -> Iterator[dict]:
+    """
+    Yields records of dump decrypting it chunk by chunk
+
+    :param file_path: Path to dump file
+    :type file_path: str
+    :param password: Password of dump
+    :type password: str
+    :return: Records in dictionary format
+    :rtype: Iterator[dict]
+    """
+    with Path(file_path).open(encoding=settings.ENCODING_UTF_8) as f:
+        first_line = f.readline()
+        if first_line.strip() != DUMP_FORMAT_HEADER:
+            encrypted = first_line + f.read()
+            decrypted = decrypt_file(password, encrypted)
+            yield from legacy_records(json.loads(decrypted.decode(settings.ENCODING_UTF_8)))
+            return
+
+        fernet = get_fernet(password)
+        counts = Counter()
+        chunks = 0
+        end = None
+        for line in f:
+            if not line.strip():
+                continue
+
+            if end is not None:
+                raise_damaged_dump("there is data after end of dump")
+
+            chunk_record, *records = decrypt_chunk(fernet, line.strip(), is_first=chunks == 0)
+            if chunk_record != {"type": "chunk", "data": {"index": chunks}}:
+                raise_damaged_dump(f"chunk #{chunks} is missing or out of order")
+
+            chunks += 1
+            for record in records:
+                if end is not None:
+                    raise_damaged_dump("there are records after end of dump")
+
+                if record["type"] == "end":
+                    end = record["data"]
+                    continue
+
+                counts[record["type"]] += 1
+                yield record
+
+    if end is None:
+        raise_damaged_dump("end of dump is missing, file is probably truncated")
+
+    # the last chunk holds only end record
+    if end != {"chunks": chunks - 1, "records": dict(counts)}:
+        raise_damaged_dump(f"expected {end['records']} records in {end['chunks']} chunks, got {dict(counts)}")
+
+
+def decrypt_chunk(fernet, token, is_first):
+    """
+    Decrypts one chunk of dump
+
+    Token that can't be decrypted is reported as wrong password only if it's the first one and is not truncated,
+    otherwise password is already checked by previous chunks and file is damaged.
+
+    :param fernet: Key to decrypt chunk with
+    :type fernet: Fernet
+    :param token: Encrypted chunk
+    :type token: str
+    :param is_first: Whether chunk is the first one in dump
+    :type is_first: bool
+    :return: Records in dictionary format
+    :rtype: list
+    """
+    token = token.encode(settings.ENCODING_UTF_8)
+    try:
+        chunk = fernet.decrypt(token)
+    except InvalidToken as err:
+        if is_first and is_complete_token(token):
+            raise
+
+        raise AdcmEx("DUMP_LOAD_FILE_DAMAGED", msg="Dump file is damaged: chunk can't be decrypted") from err
+
+    try:
+        return [json.loads(record) for record in chunk.decode(settings.ENCODING_UTF_8).split("\n")]
+    except ValueError as err:
+        raise AdcmEx("DUMP_LOAD_FILE_DAMAGED", msg="Dump file is damaged: chunk can't be parsed") from err
+
+
+def is_complete_token(token):
+    # Fernet token is version byte, timestamp, IV, ciphertext padded to AES blocks and HMAC
+    try:
+        data = base64.urlsafe_b64decode(token)
+    except (binascii.Error, ValueError):
+        return False
+
+    return data[:1] == b"\x80" and len(data) >= 73 and (len(data) - 57) % 16 == 0
+
+
+def raise_damaged_dump(reason):
+    raise AdcmEx("DUMP_LOAD_FILE_DAMAGED", msg=f"Dump file is damaged: {reason}")
+
+
 @atomic
 def load(file_path):
     """
-    Loading and creating objects from JSON file
+    Loading and creating objects from dump file
 
-    :param file_path: Path to JSON file
+    :param file_path: Path to dump file
     :type file_path: str
     """
+    password = getpass.getpass()
+    loader = ClusterLoader()
     try:
-        password = getpass.getpass()
-        with Path(file_path).open(encoding=settings.ENCODING_UTF_8) as f:
-            encrypted = f.read()
-            decrypted = decrypt_file(password, encrypted)
-            data = json.loads(decrypted.decode(settings.ENCODING_UTF_8))
+        for record_type, records in groupby(read_records(file_path, password), key=lambda record: record["type"]):
+            for batch in batched((record["data"] for record in records), OBJECTS_IN_BATCH):
+                loader.load(record_type, batch)
     except FileNotFoundError as err:
         raise AdcmEx("DUMP_LOAD_CLUSTER_ERROR", msg="Loaded file not found") from err
     except InvalidToken as err:
         raise AdcmEx("WRONG_PASSWORD") from err
 
-    check(data)
-    set_old_password(data["adcm_password"])
-    _, cluster = create_cluster(data["cluster"])
-
-    ex_provider_ids = {}
-    for provider_data in data["providers"]:
-        ex_provider_id, provider = create_provider(provider_data)
-        ex_provider_ids[ex_provider_id] = provider
-
-    ex_host_ids = {}
-    for host_data in data["hosts"]:
-        ex_host_id, host = create_host(host_data, cluster)
-        ex_host_ids[ex_host_id] = host
-
-    ex_service_ids = {}
-    for service_data in data["services"]:
-        ex_service_id, service = create_service(service_data, cluster)
-        ex_service_ids[ex_service_id] = service
-
-    ex_component_ids = {}
-    for component_data in data["components"]:
-        ex_component_id, component = create_component(
-            component_data,
-            cluster,
-            ex_service_ids[component_data.pop("service")],
-        )
-        ex_component_ids[ex_component_id] = component
-
-    for host_component_data in data["host_components"]:
-        create_host_component(
-            host_component_data,
-            cluster,
-            ex_host_ids[host_component_data.pop("host")],
-            ex_service_ids[host_component_data.pop("service")],
-            ex_component_ids[host_component_data.pop("component")],
-        )
-    for group_data in data["groups"]:
-        if group_data["model_name"] == "cluster":
-            obj = cluster
-        elif group_data["model_name"] == "clusterobject":
-            obj = ex_service_ids[group_data["object_id"]]
-        elif group_data["model_name"] == "servicecomponent":
-            obj = ex_component_ids[group_data["object_id"]]
-        elif group_data["model_name"] == "hostprovider":
-            obj = ex_provider_ids[group_data["object_id"]]
-        create_group(group_data, ex_host_ids, obj)
-    sys.stdout.write(f"Load successfully ended, cluster {cluster.display_name} created\n")
+    sys.stdout.write(f"Load successfully ended, cluster {loader.cluster.display_name} created\n")
 
 
 class Command(BaseCommand):
     """
-    Command for load cluster object from JSON file
+    Command for load cluster object from dump file
 
     Example:
         manage.py loadcluster cluster.json
     """
 
-    help = "Load cluster object from JSON format"
+    help = "Load cluster object from dump made by dumpcluster"
 
     def add_arguments(self, parser):
         """Parsing command line arguments"""
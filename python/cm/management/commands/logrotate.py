@@ -10,20 +10,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from subprocess import STDOUT, CalledProcessError, check_output
 import os
+import time
 import shutil
 import logging
 
 from audit.models import AuditLogOperationResult
 from audit.utils import make_audit_log
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import Exists, F, Max, Min, OuterRef, Q
 from django.utils import timezone
+from guardian.models import GroupObjectPermission, UserObjectPermission
 
 from cm.models import (
     ADCM,
@@ -38,6 +43,7 @@ from cm.models import (
     ServiceComponent,
     TaskLog,
 )
+from cm.services.adcm import get_adcm_settings
 
 logger = logging.getLogger("background_tasks")
 
@@ -81,6 +87,13 @@ class Command(BaseCommand):
             help=f"Rotation target. Must be one of: {[i.value for i in TargetType]}",
         )
         parser.add_argument("--disable_logs", action="store_true", help="Disable logging")
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=10000,
+            help="Primary key range of ConfigLogs (or amount of ObjectConfigs, TaskLogs) deleted in one transaction",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Amount of threads removing run directories")
 
     def handle(self, *args, **options):  # noqa: ARG002
         __target_method_map = {
@@ -95,6 +108,8 @@ class Command(BaseCommand):
         }
 
         self.verbose = not options["disable_logs"]
+        self.batch_size = max(options.get("batch_size", 10000), 1)
+        self.workers = max(options.get("workers", 4), 1)
         target = options["target"]
         self.config = self.__get_logrotate_config()
         self.__log(f"Running logrotation for `{target}` target", "info")
@@ -114,12 +129,11 @@ class Command(BaseCommand):
             self.__log(msg, "exception")
 
     def __get_logrotate_config(self):
-        adcm_object = ADCM.objects.first()
-        current_configlog = ConfigLog.objects.get(obj_ref=adcm_object.config, id=adcm_object.config.current)
-        adcm_conf = current_configlog.config
+        adcm_settings = get_adcm_settings()
+        adcm_conf = adcm_settings.config
         logrotate_config = {
             "logrotate": {
-                "active": current_configlog.attr["logrotate"]["active"],
+                "active": adcm_settings.attr["logrotate"]["active"],
                 "nginx": adcm_conf["logrotate"],
             },
             "config": adcm_conf["audit_data_retention"],
@@ -158,33 +172,39 @@ class Command(BaseCommand):
             threshold_date = timezone.now() - timedelta(days=configlog_days_delta)
             self.__log(f"ConfigLog rotation started. Threshold date: {threshold_date}", "info")
 
-            exclude_pks = set()
-            target_configlogs = ConfigLog.objects.filter(date__lte=threshold_date)
-            for config_log in target_configlogs:
-                for cl_pk in (config_log.obj_ref.current, config_log.obj_ref.previous):
-                    exclude_pks.add(cl_pk)
-
-            for group_config in GroupConfig.objects.order_by("id"):
-                if group_config.config:
-                    exclude_pks.add(group_config.config.previous)
-                    exclude_pks.add(group_config.config.current)
-
-            target_configlogs = target_configlogs.exclude(pk__in=exclude_pks)
-            target_configlog_ids = {i[0] for i in target_configlogs.values_list("id")}
-            target_objectconfig_ids = {
-                cl.obj_ref.id for cl in target_configlogs if not self.__has_related_records(cl.obj_ref)
-            }
-            if target_configlog_ids or target_objectconfig_ids:
+            target_configlogs = self.__get_target_configlogs(threshold_date=threshold_date)
+            # ObjectConfigs are selected before ConfigLogs deletion, because they are found by those ConfigLogs
+            target_objectconfig_ids = list(
+                ObjectConfig.objects.filter(pk__in=target_configlogs.values("obj_ref_id"))
+                .filter(
+                    *(
+                        ~Exists(model.objects.filter(config_id=OuterRef("pk")))
+                        for model in (ADCM, Cluster, ClusterObject, Host, HostProvider, ServiceComponent, GroupConfig)
+                    )
+                )
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            configlogs_amount = target_configlogs.count()
+
+            if configlogs_amount or target_objectconfig_ids:
                 make_audit_log("config", AuditLogOperationResult.SUCCESS, "launched")
 
-            with transaction.atomic():
-                ConfigLog.objects.filter(id__in=target_configlog_ids).delete()
-                ObjectConfig.objects.filter(id__in=target_objectconfig_ids).delete()
-                if target_configlog_ids or target_objectconfig_ids:
-                    make_audit_log("config", AuditLogOperationResult.SUCCESS, "completed")
+            started = time.monotonic()
+            deleted_configlogs = self.__delete_configlogs(queryset=target_configlogs, total=configlogs_amount)
+            deleted_objectconfigs = 0
+            for i in range(0, len(target_objectconfig_ids), self.batch_size):
+                with transaction.atomic():
+                    ObjectConfig.objects.filter(pk__in=target_objectconfig_ids[i : i + self.batch_size]).delete()
+                deleted_objectconfigs += len(target_objectconfig_ids[i : i + self.batch_size])
 
+            if configlogs_amount or target_objectconfig_ids:
+                make_audit_log("config", AuditLogOperationResult.SUCCESS, "completed")
+
+            duration = time.monotonic() - started
             self.__log(
-                f"Deleted {len(target_configlog_ids)} ConfigLogs and " f"{len(target_objectconfig_ids)} ObjectConfigs",
+                f"Deleted {deleted_configlogs} ConfigLogs and {deleted_objectconfigs} ObjectConfigs "
+                f"in {duration:.2f}s ({deleted_configlogs / duration if duration > 0 else 0:.0f} ConfigLogs/s)",
                 "info",
             )
 
@@ -194,23 +214,50 @@ class Command(BaseCommand):
             self.__log(e, "exception")
 
     @staticmethod
-    def __has_related_records(obj_conf: ObjectConfig) -> bool:
-        if (
-            sum(
-                [
-                    ADCM.objects.filter(config=obj_conf).count(),
-                    Cluster.objects.filter(config=obj_conf).count(),
-                    ClusterObject.objects.filter(config=obj_conf).count(),
-                    Host.objects.filter(config=obj_conf).count(),
-                    HostProvider.objects.filter(config=obj_conf).count(),
-                    ServiceComponent.objects.filter(config=obj_conf).count(),
-                    GroupConfig.objects.filter(config=obj_conf).count(),
-                ],
+    def __get_target_configlogs(threshold_date: datetime):
+        target_configlogs = (
+            ConfigLog.objects.filter(date__lte=threshold_date)
+            # current and previous configs of objects and groups are kept
+            .exclude(obj_ref__current=F("pk"))
+            .exclude(obj_ref__previous=F("pk"))
+        )
+
+        # snapshots can't be removed while there are records stored as deltas against them
+        return target_configlogs.exclude(
+            Exists(
+                ConfigLog.objects.filter(base_id=OuterRef("pk")).exclude(
+                    Q(date__lte=threshold_date) & ~Q(obj_ref__current=F("pk")) & ~Q(obj_ref__previous=F("pk"))
+                )
             )
-            > 0
-        ):
-            return True
-        return False
+        )
+
+    def __delete_configlogs(self, queryset, total: int) -> int:
+        """
+        Delete ConfigLogs by primary key ranges from the newest ones,
+        so deltas are always deleted before (or together with) their snapshots
+        """
+
+        bounds = queryset.aggregate(min_pk=Min("pk"), max_pk=Max("pk"))
+        if bounds["min_pk"] is None:
+            return 0
+
+        started = time.monotonic()
+        deleted = 0
+        for end in range(bounds["max_pk"] + 1, bounds["min_pk"], -self.batch_size):
+            with transaction.atomic():
+                _, deleted_per_model = queryset.filter(pk__gte=end - self.batch_size, pk__lt=end).delete()
+
+            chunk_deleted = deleted_per_model.get(ConfigLog._meta.label, 0)
+            if not chunk_deleted:
+                continue
+
+            deleted += chunk_deleted
+            duration = time.monotonic() - started
+            self.__log(
+                f"Deleted {deleted}/{total} ConfigLogs ({deleted / duration if duration > 0 else 0:.0f} ConfigLogs/s)"
+            )
+
+        return deleted
 
     def __run_joblog_rotation(self):
         try:
@@ -226,43 +273,127 @@ class Command(BaseCommand):
                 "info",
             )
             is_deleted = False
+            deleted_jobs = {}
             if days_delta_db > 0:
-                target_tasklogs = TaskLog.objects.filter(
-                    finish_date__lte=threshold_date_db,
-                    status__in=["success", "failed"],
+                started = time.monotonic()
+                deleted_tasks, deleted_jobs = self.__delete_tasklogs(threshold_date=threshold_date_db)
+                is_deleted = bool(deleted_tasks or deleted_jobs)
+                duration = time.monotonic() - started
+                self.__log(
+                    f"db JobLog rotated: {deleted_tasks} TaskLogs and {len(deleted_jobs)} JobLogs deleted "
+                    f"in {duration:.2f}s ({len(deleted_jobs) / duration if duration > 0 else 0:.0f} JobLogs/s)",
+                    "info",
                 )
-                if target_tasklogs:
-                    is_deleted = True
-                    with transaction.atomic():
-                        target_tasklogs.delete()
-
-                        # valid as long as `on_delete=models.SET_NULL` in JobLog.task field
-                        JobLog.objects.filter(task__isnull=True).delete()
-
-                self.__log("db JobLog rotated", "info")
             if days_delta_fs > 0:
-                for name in os.listdir(settings.RUN_DIR):
-                    if not name.startswith("."):  # a line of code is used for development
-                        path = settings.RUN_DIR / name
-                        try:
-                            m_time = datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.get_current_timezone())  # noqa: PTH204
-                            if timezone.now() - m_time > timedelta(days=days_delta_fs):
-                                is_deleted = True
-                                if os.path.isdir(path):  # noqa: PTH112
-                                    shutil.rmtree(path)
-                                else:
-                                    os.remove(path)  # noqa: PTH107
-                        except FileNotFoundError:
-                            pass
+                started = time.monotonic()
+                removed = self.__remove_run_dirs(threshold_date=threshold_date_fs, deleted_jobs=deleted_jobs)
+                is_deleted = is_deleted or removed > 0
+                duration = time.monotonic() - started
+                self.__log(
+                    f"fs JobLog rotated: {removed} run directories removed "
+                    f"in {duration:.2f}s ({removed / duration if duration > 0 else 0:.0f} dirs/s)",
+                    "info",
+                )
                 if is_deleted:
                     make_audit_log("task", AuditLogOperationResult.SUCCESS, "launched")
                     make_audit_log("task", AuditLogOperationResult.SUCCESS, "completed")
-                self.__log("fs JobLog rotated", "info")
         except Exception as e:  # noqa: BLE001
             make_audit_log("task", AuditLogOperationResult.FAIL, "completed")
             self.__log("Error in JobLog rotation", "warning")
             self.__log(e, "exception")
 
+    def __delete_tasklogs(self, threshold_date: datetime) -> tuple[int, dict[int, datetime | None]]:
+        """
+        Delete finished tasks with their jobs by batches of primary keys, each batch in its own transaction.
+
+        Returns amount of deleted tasks and finish dates of deleted jobs.
+        """
+
+        task_ids = list(
+            TaskLog.objects.filter(finish_date__lte=threshold_date, status__in=["success", "failed"])
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        task_content_type = ContentType.objects.get_for_model(model=TaskLog)
+        job_content_type = ContentType.objects.get_for_model(model=JobLog)
+
+        deleted_jobs = {}
+        for i in range(0, len(task_ids), self.batch_size):
+            batch_task_ids = task_ids[i : i + self.batch_size]
+            batch_jobs = dict(JobLog.objects.filter(task_id__in=batch_task_ids).values_list("pk", "finish_date"))
+
+            with transaction.atomic():
+                JobLog.objects.filter(pk__in=batch_jobs).delete()
+                TaskLog.objects.filter(pk__in=batch_task_ids).delete()
+
+                # object permissions aren't bound by foreign keys, so they aren't cascaded
+                for content_type, object_ids in ((task_content_type, batch_task_ids), (job_content_type, batch_jobs)):
+                    object_pks = [str(object_id) for object_id in object_ids]
+                    for permission_model in (UserObjectPermission, GroupObjectPermission):
+                        permission_model.objects.filter(content_type=content_type, object_pk__in=object_pks).delete()
+
+            deleted_jobs.update(batch_jobs)
+            self.__log(f"Deleted {i + len(batch_task_ids)}/{len(task_ids)} TaskLogs")
+
+        if task_ids:
+            # valid as long as `on_delete=models.SET_NULL` in JobLog.task field
+            deleted_jobs.update(JobLog.objects.filter(task__isnull=True).values_list("pk", "finish_date"))
+            JobLog.objects.filter(task__isnull=True).delete()
+
+        return len(task_ids), deleted_jobs
+
+    def __remove_run_dirs(self, threshold_date: datetime, deleted_jobs: dict[int, datetime | None]) -> int:
+        """
+        Remove run directories of jobs finished before `threshold_date`.
+
+        Directories are matched to jobs by name, so finish date is taken from DB (or from just deleted jobs)
+        and only entries that don't belong to any known job are checked by modification time.
+        """
+
+        entries = [entry for entry in os.scandir(settings.RUN_DIR) if not entry.name.startswith(".")]
+        job_entries = {int(entry.name): entry for entry in entries if entry.name.isdigit()}
+
+        finish_dates = {job_id: deleted_jobs[job_id] for job_id in job_entries.keys() & deleted_jobs.keys()}
+        unknown_ids = list(job_entries.keys() - finish_dates.keys())
+        for i in range(0, len(unknown_ids), self.batch_size):
+            finish_dates.update(
+                JobLog.objects.filter(pk__in=unknown_ids[i : i + self.batch_size]).values_list("pk", "finish_date")
+            )
+
+        targets = [
+            job_entries[job_id].path
+            for job_id, finish_date in finish_dates.items()
+            if finish_date is not None and finish_date < threshold_date
+        ]
+        for entry in entries:
+            if entry.name.isdigit() and int(entry.name) in finish_dates:
+                continue
+
+            try:
+                modified_at = datetime.fromtimestamp(
+                    entry.stat(follow_symlinks=False).st_mtime, tz=timezone.get_current_timezone()
+                )
+            except FileNotFoundError:
+                continue
+
+            if modified_at < threshold_date:
+                targets.append(entry.path)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return sum(executor.map(self.__remove_run_entry, targets))
+
+    @staticmethod
+    def __remove_run_entry(path: str) -> bool:
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):  # noqa: PTH112, PTH114
+                shutil.rmtree(path)
+            else:
+                os.remove(path)  # noqa: PTH107
+        except FileNotFoundError:
+            return False
+
+        return True
+
     def __log(self, msg, method="debug"):
         self.stdout.write(msg)
         if self.verbose:
@@ -0,0 +1,50 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cm.services.job.run import TaskScheduler, get_queue_stats
+
+
+class Command(BaseCommand):
+    help = "Start runners of queued tasks within concurrency limits (ADCM_TASK_SCHEDULER_* settings)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Dispatch queued tasks once and exit")
+        parser.add_argument("--stats", action="store_true", help="Print queue depth as JSON and exit")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if options["stats"]:
+            stats = get_queue_stats()
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "queued": stats.queued,
+                        "running": stats.dispatched,
+                        "queued_by_cluster": {
+                            str(cluster_id or ""): amount for cluster_id, amount in stats.queued_by_cluster.items()
+                        },
+                    }
+                )
+            )
+            return
+
+        scheduler = TaskScheduler()
+        if options["once"]:
+            scheduler.fail_lost_tasks()
+            scheduler.dispatch()
+            return
+
+        scheduler.run(interval=settings.TASK_SCHEDULER_INTERVAL)
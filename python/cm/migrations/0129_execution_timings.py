@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by Django 3.2.23 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cm", "0128_sub_action_parallel_group"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joblog",
+            name="timings",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="tasklog",
+            name="timings",
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -20,6 +20,7 @@ import time
 import signal
 import os.path
 
+from core.config.patch import apply_patch
 from core.job.types import ScriptType
 from core.types import ADCMCoreType
 from django.conf import settings
@@ -29,6 +30,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
+from django.utils import timezone
 
 from cm.adcm_config.ansible import ansible_decrypt
 from cm.errors import AdcmEx
@@ -158,6 +160,7 @@ class Bundle(ADCMModel):
     name = models.CharField(max_length=1000)
     version = models.CharField(max_length=1000)
     version_order = models.PositiveIntegerField(default=0)
+    version_key = models.TextField(default="")
     edition = models.CharField(max_length=1000, default="community")
     hash = models.CharField(max_length=1000)
     description = models.TextField(blank=True)
@@ -218,6 +221,7 @@ class Prototype(ADCMModel):
     display_name = models.CharField(max_length=1000, blank=True)
     version = models.CharField(max_length=1000)
     version_order = models.PositiveIntegerField(default=0)
+    version_key = models.TextField(default="")
     required = models.BooleanField(default=False)
     shared = models.BooleanField(default=False)
     constraint = models.JSONField(default=partial(list, (0, "+")))
@@ -270,9 +274,39 @@ class ConfigLog(ADCMModel):
     attr = models.JSONField(default=dict)
     date = models.DateTimeField(auto_now=True)
     description = models.TextField(blank=True)
+    # When config history is stored in delta mode, `config` and `attr` of a historical record are empty
+    # and the record is restored from `base` snapshot (always stored in full) with `delta` patches applied
+    base = models.ForeignKey("self", on_delete=models.RESTRICT, null=True, default=None, related_name="deltas")
+    delta = models.JSONField(null=True, default=None)
 
     __error_code__ = "CONFIG_NOT_FOUND"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        if instance.__dict__.get("delta") is not None:
+            base_config, base_attr = (
+                ConfigLog.objects.using(db).filter(pk=instance.base_id).values_list("config", "attr").get()
+            )
+            instance.config = apply_patch(document=base_config, patch=instance.delta["config"])
+            instance.attr = apply_patch(document=base_attr, patch=instance.delta["attr"])
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Restored from delta record is saved in full, because its `config` and `attr` may be changed"""
+
+        if self.__dict__.get("delta") is not None:
+            self.base = None
+            self.delta = None
+
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "config", "attr", "base", "delta"}
+
+        super().save(*args, **kwargs)
+
 
 class ADCMEntity(ADCMModel):
     prototype = models.ForeignKey(Prototype, on_delete=models.CASCADE)
@@ -389,6 +423,9 @@ class Upgrade(ADCMModel):
     state_available = models.JSONField(default=list)
     state_on_success = models.CharField(max_length=1000, blank=True)
     action = models.OneToOneField("Action", on_delete=models.CASCADE, null=True)
+    # `min_version`/`max_version` bounds translated to `Prototype.version_order`, see `cm.bundle.index_upgrades`
+    min_version_order = models.PositiveIntegerField(null=True, default=None)
+    max_version_order = models.PositiveIntegerField(null=True, default=None)
 
     __error_code__ = "UPGRADE_NOT_FOUND"
 
@@ -1189,6 +1226,8 @@ class AbstractSubAction(ADCMModel):
     multi_state_on_fail_unset = models.JSONField(default=list)
     params = models.JSONField(default=dict)
     allow_to_terminate = models.BooleanField(default=False)
+    # consecutive sub actions of the same group are executed simultaneously
+    parallel_group = models.CharField(max_length=1000, blank=True, default="")
 
     class Meta:
         abstract = True
@@ -1329,19 +1368,17 @@ class TaskLog(ADCMModel):
     start_date = models.DateTimeField(null=True, default=None)
     finish_date = models.DateTimeField(null=True, default=None)
     lock = models.ForeignKey("ConcernItem", null=True, on_delete=models.SET_NULL, default=None)
+    # seconds spent in execution phases like {"configure": 0.02, "finish.update_issues": 1.3}
+    timings = models.JSONField(default=dict)
 
     __error_code__ = "TASK_NOT_FOUND"
 
     def cancel(self, obj_deletion=False):
         """
         Cancel running task process
-        task status will be updated in separate process of task runner
+        task status will be updated in separate process of task runner,
+        task that is still waiting in queue is aborted right away
         """
-        if self.pid == 0:
-            raise AdcmEx(
-                "NOT_ALLOWED_TERMINATION",
-                "Termination is too early, try to execute later",
-            )
         errors = {
             JobStatus.FAILED: ("TASK_IS_FAILED", f"task #{self.pk} is failed"),
             JobStatus.ABORTED: ("TASK_IS_ABORTED", f"task #{self.pk} is aborted"),
@@ -1355,6 +1392,15 @@ class TaskLog(ADCMModel):
             )
         if self.status in [JobStatus.FAILED, JobStatus.ABORTED, JobStatus.SUCCESS]:
             raise AdcmEx(*errors.get(self.status))
+
+        if self.status == JobStatus.CREATED and self.pid == 0 and self._abort_queued():
+            return
+
+        if self.pid == 0:
+            raise AdcmEx(
+                "NOT_ALLOWED_TERMINATION",
+                "Termination is too early, try to execute later",
+            )
         i = 0
         while not JobLog.objects.filter(task=self, status=JobStatus.RUNNING) and i < 10:
             time.sleep(0.5)
@@ -1367,6 +1413,36 @@ class TaskLog(ADCMModel):
         except OSError as e:
             raise AdcmEx("NOT_ALLOWED_TERMINATION", f"Failed to terminate process: {e}") from e
 
+    def _abort_queued(self) -> bool:
+        """Abort task that no runner is started for yet, return False if runner has already taken it"""
+
+        from cm.status_api import send_task_status_update_event
+
+        with transaction.atomic():
+            now = timezone.now()
+            if not TaskLog.objects.filter(id=self.pk, status=JobStatus.CREATED, pid=0).update(
+                status=JobStatus.ABORTED, finish_date=now
+            ):
+                self.refresh_from_db(fields=["status", "pid"])
+                return False
+
+            JobLog.objects.filter(task_id=self.pk, status=JobStatus.CREATED).update(
+                status=JobStatus.ABORTED, finish_date=now
+            )
+            self.status, self.finish_date = JobStatus.ABORTED, now
+
+            self.refresh_from_db(fields=["lock"])
+            if self.lock:
+                lock, self.lock = self.lock, None
+                self.save(update_fields=["lock"])
+                lock.delete()
+
+            transaction.on_commit(
+                partial(send_task_status_update_event, task_id=self.pk, status=JobStatus.ABORTED.value)
+            )
+
+        return True
+
     @property
     def duration(self) -> float | None:
         if self.finish_date is None or self.start_date is None:
@@ -1381,6 +1457,8 @@ class JobLog(AbstractSubAction):
     status = models.CharField(max_length=1000, choices=JobStatus.choices, default="created")
     start_date = models.DateTimeField(null=True, default=None)
     finish_date = models.DateTimeField(db_index=True, null=True, default=None)
+    # seconds spent in execution phases like {"spawn": 0.01, "run": 30.5, "finalize.finish_check_logs": 0.1}
+    timings = models.JSONField(default=dict)
 
     __error_code__ = "JOB_NOT_FOUND"
 
@@ -1462,6 +1540,18 @@ class LogStorage(ADCMModel):
         ]
 
 
+class LogChunk(models.Model):
+    """Part of stdout/stderr log saved while job is running, `body` is compressed with zlib"""
+
+    log = models.ForeignKey(LogStorage, on_delete=models.CASCADE, related_name="chunks")
+    offset = models.BigIntegerField()
+    size = models.PositiveIntegerField()
+    body = models.BinaryField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["log", "offset"], name="unique_log_chunk_offset")]
+
+
 class StagePrototype(ADCMModel):
     type = models.CharField(max_length=1000, choices=ObjectType.choices)
     parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, default=None)
@@ -0,0 +1,146 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from typing import Collection, Iterable, Mapping, NamedTuple
+
+from guardian.core import ObjectPermissionChecker
+from rbac.models import User
+
+from cm.models import Action, ADCMEntity, Prototype
+
+ANY = None
+"""Marker for "any state" in compiled predicates"""
+
+
+class StatePredicate(NamedTuple):
+    """
+    Action's state requirements compiled to sets.
+
+    `ANY` (None) in `*_available` fields means there's no restriction,
+    `never` is set when action is unavailable in any state.
+    """
+
+    never: bool
+    state_unavailable: frozenset[str]
+    multi_state_unavailable: frozenset[str]
+    state_available: frozenset[str] | None
+    multi_state_available: frozenset[str] | None
+
+
+def _compile_available(value: str | list) -> frozenset[str] | None:
+    if value == "any":
+        return ANY
+
+    if isinstance(value, list):
+        return frozenset(value)
+
+    return frozenset()
+
+
+def _compile_unavailable(value: str | list) -> frozenset[str]:
+    if isinstance(value, list):
+        return frozenset(value)
+
+    return frozenset()
+
+
+def compile_state_predicate(action: Action) -> StatePredicate:
+    return StatePredicate(
+        never=action.state_unavailable == "any" or action.multi_state_unavailable == "any",
+        state_unavailable=_compile_unavailable(action.state_unavailable),
+        multi_state_unavailable=_compile_unavailable(action.multi_state_unavailable),
+        state_available=_compile_available(action.state_available),
+        multi_state_available=_compile_available(action.multi_state_available),
+    )
+
+
+def is_state_allowed(predicate: StatePredicate, state: str, multi_state: frozenset[str]) -> bool:
+    """Same semantics as `Action.allowed`, but on compiled predicate and pre-built multi state set"""
+    if predicate.never or state in predicate.state_unavailable:
+        return False
+
+    if not multi_state.isdisjoint(predicate.multi_state_unavailable):
+        return False
+
+    if predicate.state_available is not ANY and state not in predicate.state_available:
+        return False
+
+    return predicate.multi_state_available is ANY or not multi_state.isdisjoint(predicate.multi_state_available)
+
+
+def filter_available_actions(
+    actions: Iterable[Action], prototype_objects: Mapping[Prototype, ADCMEntity]
+) -> list[Action]:
+    """
+    Filter out actions that can't be launched on objects in their current state.
+
+    State of each object is read once, predicates are compiled once per action,
+    so the whole pass is linear in number of actions with set operations only.
+    """
+
+    object_states = {
+        prototype: (object_.state, frozenset(object_._multi_state))  # noqa: SLF001
+        for prototype, object_ in prototype_objects.items()
+    }
+
+    return [
+        action
+        for action in actions
+        if is_state_allowed(compile_state_predicate(action), *object_states[action.prototype])
+    ]
+
+
+def get_granted_permissions(user: User, obj: ADCMEntity) -> set[str] | None:
+    """
+    Return all permissions granted to `user` on `obj` by all auth backends in "app_label.codename" format.
+
+    All object permissions (both user's and groups') are read in one pass.
+    None is returned for active superuser, which means "everything is granted".
+    """
+
+    if user.is_active and user.is_superuser:
+        return None
+
+    app_label = obj._meta.app_label  # noqa: SLF001
+
+    # object permission backend returns bare codenames, while others use full names
+    return {
+        permission if "." in permission else f"{app_label}.{permission}"
+        for permission in user.get_all_permissions(obj=obj)
+    }
+
+
+def get_objects_granted_permissions(user: User, objects: Collection[ADCMEntity]) -> dict[ADCMEntity, set[str]] | None:
+    """
+    Return object permissions granted to `user` on each of `objects` in "app_label.codename" format.
+
+    Permissions are prefetched for all objects of the same model at once.
+    None is returned for active superuser, which means "everything is granted".
+    """
+
+    if user.is_active and user.is_superuser:
+        return None
+
+    checker = ObjectPermissionChecker(user_or_group=user)
+
+    objects_by_model = defaultdict(list)
+    for object_ in objects:
+        objects_by_model[object_.__class__].append(object_)
+
+    for model_objects in objects_by_model.values():
+        checker.prefetch_perms(objects=model_objects)
+
+    return {
+        object_: {f"{object_._meta.app_label}.{codename}" for codename in checker.get_perms(obj=object_)}  # noqa: SLF001
+        for object_ in objects
+    }
@@ -32,8 +32,20 @@ def adcm_config(config_id: int) -> ConfigAttrPair:
     return ConfigAttrPair(**ConfigLog.objects.values("config", "attr").get(id=config_id))
 
 
+def get_adcm_settings() -> ConfigAttrPair:
+    """
+    Current configuration of ADCM object, shared between callers and must not be changed.
+
+    Every config update creates new `ConfigLog`, so id of the current one works as a version:
+    the only query here is the lookup of this id, content is read once per version.
+    In-place changes of `ConfigLog` reset the cache (see `cm.signals`).
+    """
+
+    return adcm_config(config_id=get_adcm_config_id())
+
+
 def retrieve_password_requirements() -> PasswordRequirements:
-    auth_policy = adcm_config(get_adcm_config_id()).config["auth_policy"]
+    auth_policy = get_adcm_settings().config["auth_policy"]
     return PasswordRequirements(
         min_length=auth_policy["min_password_length"], max_length=auth_policy["max_password_length"]
     )
@@ -0,0 +1,254 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from functools import partial, reduce
+from itertools import chain
+from operator import or_
+from typing import Collection, Iterable
+
+from api_v2.concern.serializers import ConcernSerializer
+from core.cluster.operations import calculate_maintenance_mode_for_cluster_objects
+from core.cluster.types import ObjectMaintenanceModeState
+from core.types import ADCMCoreType, ClusterID, CoreObjectDescriptor
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.db.transaction import on_commit
+from djangorestframework_camel_case.util import camelize
+
+from cm.converters import core_type_to_db_record_type, core_type_to_model, model_name_to_core_type
+from cm.models import (
+    ADCM,
+    ADCMEntity,
+    Cluster,
+    ClusterObject,
+    ConcernItem,
+    ConcernType,
+    Host,
+    HostProvider,
+    ServiceComponent,
+)
+from cm.services.cluster import retrieve_clusters_objects_maintenance_mode, retrieve_clusters_topology
+from cm.status_api import send_concern_events
+
+
+def redistribute_concerns(cluster_ids: Collection[ClusterID], concern_types: Collection[ConcernType]) -> None:
+    """
+    Link concerns of given types to objects of their owner's hierarchy.
+
+    Concerns owned by given clusters, their services, components, hosts and providers of these hosts are processed.
+    Objects are the same as `cm.hierarchy.Tree.get_directly_affected` returns for each concern's owner,
+    but hierarchy is read once for all concerns and links are changed in bulk.
+    """
+
+    hierarchy = ClustersHierarchy(cluster_ids=cluster_ids)
+    if not hierarchy.owners:
+        return
+
+    owners_by_type = defaultdict(set)
+    for owner in hierarchy.owners:
+        owners_by_type[owner.type].add(owner.id)
+
+    content_types = ContentType.objects.get_for_models(*map(core_type_to_model, owners_by_type))
+    concerns = {
+        concern.id: concern
+        for concern in ConcernItem.objects.select_related("owner_type").filter(
+            Q(type__in=concern_types)
+            & reduce(
+                or_,
+                (
+                    Q(owner_type=content_types[core_type_to_model(core_type)], owner_id__in=ids)
+                    for core_type, ids in owners_by_type.items()
+                ),
+            )
+        )
+    }
+    if not concerns:
+        return
+
+    affected = {
+        concern_id: hierarchy.get_directly_affected(
+            owner=CoreObjectDescriptor(id=concern.owner_id, type=model_name_to_core_type(concern.owner_type.model))
+        )
+        for concern_id, concern in concerns.items()
+    }
+
+    created_events, deleted_events = [], []
+    for model in (ADCM, Cluster, ClusterObject, ServiceComponent, HostProvider, Host):
+        created, deleted = _update_links(model=model, concerns=concerns, affected=affected)
+        created_events.extend(created)
+        deleted_events.extend(deleted)
+
+    if created_events or deleted_events:
+        on_commit(func=partial(send_concern_events, created=created_events, deleted=deleted_events))
+
+
+class ClustersHierarchy:
+    """
+    Links between objects of clusters and providers of their hosts, built by the same rules as `cm.hierarchy.Tree`.
+
+    "Up" links (host -> component -> service -> cluster, provider -> host) respect maintenance mode,
+    "down" links (cluster -> service -> component -> host) are present only for clusters reached by "up" links.
+    """
+
+    __slots__ = ("owners", "_up", "_up_reversed", "_down", "_down_reversed", "_cluster_of")
+
+    def __init__(self, cluster_ids: Collection[ClusterID]):
+        self.owners: set[CoreObjectDescriptor] = set()
+        self._up: dict[CoreObjectDescriptor, set[CoreObjectDescriptor]] = defaultdict(set)
+        self._up_reversed: dict[CoreObjectDescriptor, set[CoreObjectDescriptor]] = defaultdict(set)
+        self._down: dict[CoreObjectDescriptor, set[CoreObjectDescriptor]] = defaultdict(set)
+        self._down_reversed: dict[CoreObjectDescriptor, set[CoreObjectDescriptor]] = defaultdict(set)
+        self._cluster_of: dict[CoreObjectDescriptor, ClusterID] = {}
+
+        provider_ids = set(Host.objects.filter(cluster_id__in=cluster_ids).values_list("provider_id", flat=True))
+        self.owners.update(CoreObjectDescriptor(id=id_, type=ADCMCoreType.HOSTPROVIDER) for id_ in provider_ids)
+
+        # provider's concern reaches clusters of all its hosts, so their links are required as well
+        all_cluster_ids = set(cluster_ids)
+        for host_id, provider_id, cluster_id in Host.objects.filter(provider_id__in=provider_ids).values_list(
+            "id", "provider_id", "cluster_id"
+        ):
+            self._link_up(
+                child=CoreObjectDescriptor(id=provider_id, type=ADCMCoreType.HOSTPROVIDER),
+                parent=CoreObjectDescriptor(id=host_id, type=ADCMCoreType.HOST),
+            )
+            if cluster_id is not None:
+                all_cluster_ids.add(cluster_id)
+
+        own_maintenance_mode = retrieve_clusters_objects_maintenance_mode(cluster_ids=all_cluster_ids)
+        for topology in retrieve_clusters_topology(cluster_ids=all_cluster_ids):
+            maintenance_mode = calculate_maintenance_mode_for_cluster_objects(
+                topology=topology, own_maintenance_mode=own_maintenance_mode
+            )
+            cluster = CoreObjectDescriptor(id=topology.cluster_id, type=ADCMCoreType.CLUSTER)
+            cluster_objects = [cluster]
+
+            for service_id, service_topology in topology.services.items():
+                service = CoreObjectDescriptor(id=service_id, type=ADCMCoreType.SERVICE)
+                cluster_objects.append(service)
+                self._link_down(parent=cluster, child=service)
+                if maintenance_mode.services[service_id] == ObjectMaintenanceModeState.OFF:
+                    self._link_up(child=service, parent=cluster)
+
+                for component_id, component_topology in service_topology.components.items():
+                    component = CoreObjectDescriptor(id=component_id, type=ADCMCoreType.COMPONENT)
+                    cluster_objects.append(component)
+                    self._link_down(parent=service, child=component)
+                    if maintenance_mode.components[component_id] == ObjectMaintenanceModeState.OFF:
+                        self._link_up(child=component, parent=service)
+
+                    for host_id in component_topology.hosts:
+                        host = CoreObjectDescriptor(id=host_id, type=ADCMCoreType.HOST)
+                        self._link_down(parent=component, child=host)
+                        if own_maintenance_mode.hosts.get(host_id) != ObjectMaintenanceModeState.ON:
+                            self._link_up(child=host, parent=component)
+
+            hosts = [CoreObjectDescriptor(id=host_id, type=ADCMCoreType.HOST) for host_id in topology.hosts]
+            for object_ in chain(cluster_objects, hosts):
+                self._cluster_of[object_] = topology.cluster_id
+
+            if topology.cluster_id in cluster_ids:
+                self.owners.update(cluster_objects, hosts)
+
+    def get_directly_affected(self, owner: CoreObjectDescriptor) -> set[CoreObjectDescriptor]:
+        """Same objects as `Tree.get_directly_affected` returns for tree built from `owner`"""
+
+        reached = self._collect(start=owner, get_next=self._up.__getitem__)
+        reached_clusters = {object_.id for object_ in reached if object_.type == ADCMCoreType.CLUSTER}
+
+        def get_parents(object_: CoreObjectDescriptor) -> Iterable[CoreObjectDescriptor]:
+            parents = self._up[object_] if object_ in reached else ()
+            if self._cluster_of.get(object_) in reached_clusters:
+                return chain(parents, self._down_reversed[object_])
+
+            return parents
+
+        def get_children(object_: CoreObjectDescriptor) -> Iterable[CoreObjectDescriptor]:
+            children = self._up_reversed[object_].intersection(reached)
+            if self._cluster_of.get(object_) in reached_clusters:
+                return chain(children, self._down[object_])
+
+            return children
+
+        return self._collect(start=owner, get_next=get_parents) | self._collect(start=owner, get_next=get_children)
+
+    def _link_up(self, child: CoreObjectDescriptor, parent: CoreObjectDescriptor) -> None:
+        self._up[child].add(parent)
+        self._up_reversed[parent].add(child)
+
+    def _link_down(self, parent: CoreObjectDescriptor, child: CoreObjectDescriptor) -> None:
+        self._down[parent].add(child)
+        self._down_reversed[child].add(parent)
+
+    @staticmethod
+    def _collect(start: CoreObjectDescriptor, get_next) -> set[CoreObjectDescriptor]:
+        result = {start}
+        to_visit = [start]
+        while to_visit:
+            for object_ in get_next(to_visit.pop()):
+                if object_ not in result:
+                    result.add(object_)
+                    to_visit.append(object_)
+
+        return result
+
+
+def _update_links(
+    model: type[ADCMEntity], concerns: dict[int, ConcernItem], affected: dict[int, set[CoreObjectDescriptor]]
+) -> tuple[list[tuple[ADCMEntity, dict]], list[tuple[int, str, int]]]:
+    """Returns data for concern creation and deletion events of changed links"""
+
+    core_type = model_name_to_core_type(model.__name__)
+    object_field = f"{model.__name__.lower()}_id"
+    links = model.concerns.through.objects
+
+    existing = {
+        (concern_id, object_id): link_id
+        for link_id, object_id, concern_id in links.filter(concernitem_id__in=concerns.keys()).values_list(
+            "id", object_field, "concernitem_id"
+        )
+    }
+    required = {
+        (concern_id, object_.id)
+        for concern_id, objects in affected.items()
+        for object_ in objects
+        if object_.type == core_type
+    }
+
+    deleted = []
+    outdated = existing.keys() - required
+    if outdated:
+        links.filter(id__in=[existing[key] for key in outdated]).delete()
+
+        object_type = core_type_to_db_record_type(core_type)
+        deleted = [(object_id, object_type, concern_id) for concern_id, object_id in outdated]
+
+    new = required - existing.keys()
+    if not new:
+        return [], deleted
+
+    links.bulk_create(
+        model.concerns.through(**{object_field: object_id, "concernitem_id": concern_id})
+        for concern_id, object_id in new
+    )
+
+    objects = model.objects.select_related("prototype").in_bulk({object_id for _, object_id in new})
+    concerns_data = {}
+    created = []
+    for concern_id, object_id in new:
+        if concern_id not in concerns_data:
+            concerns_data[concern_id] = camelize(data=ConcernSerializer(instance=concerns[concern_id]).data)
+
+        created.append((objects[object_id], concerns_data[concern_id]))
+
+    return created, deleted
@@ -18,7 +18,7 @@ from itertools import chain
 from operator import or_
 from typing import Collection
 
-from core.types import CoreObjectDescriptor
+from core.types import ClusterID, CoreObjectDescriptor
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 
@@ -26,6 +26,7 @@ from cm.converters import core_type_to_model
 from cm.hierarchy import Tree
 from cm.issue import add_concern_to_object, remove_concern_from_object
 from cm.models import ADCMEntity, ConcernCause, ConcernItem, ConcernType
+from cm.services.concern.distribution import redistribute_concerns
 from cm.services.concern.messages import (
     ADCM_ENTITY_AS_PLACEHOLDERS,
     ConcernMessage,
@@ -145,6 +146,17 @@ def update_hierarchy(concern: ConcernItem) -> None:
         add_concern_to_object(object_=new_object, concern=concern)
 
 
+def update_hierarchy_for_clusters(cluster_ids: Collection[ClusterID]) -> None:
+    """
+    Update objects related to flags of given clusters, their services, components, hosts and providers of these hosts.
+
+    Related objects are the same as `update_hierarchy` links for each flag separately,
+    but hierarchy is read once for all flags and links are changed in bulk.
+    """
+
+    redistribute_concerns(cluster_ids=cluster_ids, concern_types=(ConcernType.FLAG,))
+
+
 def _get_filter_for_flags_of_objects(content_type_id_map: dict[ContentType, set[int]]) -> Q:
     return Q(type=ConcernType.FLAG) & reduce(
         or_,
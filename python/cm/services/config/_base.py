@@ -12,6 +12,7 @@
 
 from typing import Iterable, NamedTuple
 
+from core.config.patch import apply_patch
 from core.types import ConfigID
 
 from cm.models import ConfigLog
@@ -23,7 +24,30 @@ class ConfigAttrPair(NamedTuple):
 
 
 def retrieve_config_attr_pairs(configurations: Iterable[ConfigID]) -> dict[ConfigID, ConfigAttrPair]:
-    return {
-        id_: ConfigAttrPair(config=config_ or {}, attr=attr_ or {})
-        for id_, config_, attr_ in ConfigLog.objects.filter(id__in=configurations).values_list("id", "config", "attr")
-    }
+    result = {}
+    deltas = {}
+
+    for id_, config_, attr_, base_id, delta in ConfigLog.objects.filter(id__in=configurations).values_list(
+        "id", "config", "attr", "base_id", "delta"
+    ):
+        if delta is not None:
+            deltas[id_] = (base_id, delta)
+            continue
+
+        result[id_] = ConfigAttrPair(config=config_ or {}, attr=attr_ or {})
+
+    if deltas:
+        bases = {
+            id_: (config_ or {}, attr_ or {})
+            for id_, config_, attr_ in ConfigLog.objects.filter(
+                id__in={base_id for base_id, _ in deltas.values()}
+            ).values_list("id", "config", "attr")
+        }
+        for id_, (base_id, delta) in deltas.items():
+            base_config, base_attr = bases[base_id]
+            result[id_] = ConfigAttrPair(
+                config=apply_patch(document=base_config, patch=delta["config"]),
+                attr=apply_patch(document=base_attr, patch=delta["attr"]),
+            )
+
+    return result
@@ -0,0 +1,141 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable
+
+from core.config.patch import make_patch
+from core.types import ConfigID, ObjectID
+from django.conf import settings
+from django.db.models import Q
+
+from cm.models import ConfigLog, ObjectConfig
+
+# Config history in delta mode:
+#   - current and previous records of every ObjectConfig are always stored in full,
+#     so the most common reads don't pay for reconstruction
+#   - every `CONFIG_LOG_SNAPSHOT_INTERVAL` historical record is kept in full (snapshot),
+#     the rest store patch against the closest older snapshot in `delta` and have empty `config` and `attr`
+#   - reconstruction is transparent (see `ConfigLog.from_db`) and costs one extra query
+
+
+def _is_pinned(config_log_id: ConfigID) -> bool:
+    return ObjectConfig.objects.filter(Q(current=config_log_id) | Q(previous=config_log_id)).exists()
+
+
+def _build_delta(snapshot: tuple[dict, dict], config: dict, attr: dict) -> dict:
+    return {
+        "config": make_patch(source=snapshot[0] or {}, target=config or {}),
+        "attr": make_patch(source=snapshot[1] or {}, target=attr or {}),
+    }
+
+
+def compact_config_log(config_log_id: ConfigID, snapshot_interval: int | None = None) -> bool:
+    """
+    Convert historical config record into patch against the closest older snapshot.
+    Returns True if record was converted, False if it should be kept in full.
+    """
+
+    snapshot_interval = snapshot_interval or settings.CONFIG_LOG_SNAPSHOT_INTERVAL
+
+    record = (
+        ConfigLog.objects.filter(pk=config_log_id, delta__isnull=True)
+        .values("id", "obj_ref_id", "config", "attr")
+        .first()
+    )
+    if record is None or _is_pinned(config_log_id) or ConfigLog.objects.filter(base_id=config_log_id).exists():
+        return False
+
+    snapshot = (
+        ConfigLog.objects.filter(obj_ref_id=record["obj_ref_id"], pk__lt=config_log_id, delta__isnull=True)
+        .order_by("-pk")
+        .values_list("id", "config", "attr")
+        .first()
+    )
+    if snapshot is None or ConfigLog.objects.filter(base_id=snapshot[0]).count() + 1 >= snapshot_interval:
+        # record becomes new snapshot
+        return False
+
+    ConfigLog.objects.filter(pk=config_log_id).update(
+        config={},
+        attr={},
+        base_id=snapshot[0],
+        delta=_build_delta(snapshot=snapshot[1:], config=record["config"], attr=record["attr"]),
+    )
+
+    return True
+
+
+def compact_config_history(
+    object_config_ids: Iterable[ObjectID], snapshot_interval: int | None = None, batch_size: int = 100
+) -> int:
+    """
+    Convert whole history of given ObjectConfigs to delta mode in one pass per object.
+    Returns amount of converted records.
+    """
+
+    snapshot_interval = snapshot_interval or settings.CONFIG_LOG_SNAPSHOT_INTERVAL
+    converted = 0
+
+    for object_config_id, current_id, previous_id in ObjectConfig.objects.filter(pk__in=object_config_ids).values_list(
+        "id", "current", "previous"
+    ):
+        pinned = {current_id, previous_id}
+        bases = set(
+            ConfigLog.objects.filter(obj_ref_id=object_config_id, base__isnull=False).values_list("base_id", flat=True)
+        )
+        snapshot: tuple[ConfigID, dict, dict] | None = None
+        deltas_in_snapshot = 0
+        to_update = []
+
+        for record in (
+            ConfigLog.objects.filter(obj_ref_id=object_config_id)
+            .order_by("pk")
+            .values("id", "config", "attr", "base_id", "delta")
+            .iterator(chunk_size=batch_size)
+        ):
+            if record["delta"] is not None:
+                if snapshot is not None and record["base_id"] == snapshot[0]:
+                    deltas_in_snapshot += 1
+
+                continue
+
+            if (
+                snapshot is None
+                or record["id"] in pinned
+                or record["id"] in bases
+                or deltas_in_snapshot + 1 >= snapshot_interval
+            ):
+                snapshot = (record["id"], record["config"], record["attr"])
+                deltas_in_snapshot = 0
+                continue
+
+            to_update.append(
+                ConfigLog(
+                    pk=record["id"],
+                    config={},
+                    attr={},
+                    base_id=snapshot[0],
+                    delta=_build_delta(snapshot=snapshot[1:], config=record["config"], attr=record["attr"]),
+                )
+            )
+            deltas_in_snapshot += 1
+
+            if len(to_update) >= batch_size:
+                converted += len(to_update)
+                ConfigLog.objects.bulk_update(to_update, fields=["config", "attr", "base", "delta"])
+                to_update = []
+
+        if to_update:
+            converted += len(to_update)
+            ConfigLog.objects.bulk_update(to_update, fields=["config", "attr", "base", "delta"])
+
+    return converted
@@ -10,11 +10,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import defaultdict
+from copy import deepcopy
 from dataclasses import dataclass, field
 from functools import partial
-from typing import TypeAlias
+from typing import Collection, Iterable, TypeAlias
 
-from core.job.dto import TaskPayloadDTO
+from core.job.dto import TaskCreateDTO, TaskPayloadDTO
 from core.types import ADCMCoreType, CoreObjectDescriptor
 from django.conf import settings
 from django.db.transaction import atomic, on_commit
@@ -38,15 +40,17 @@ from cm.models import (
     HostComponent,
     HostProvider,
     JobStatus,
+    PrototypeConfig,
     ServiceComponent,
     TaskLog,
     get_object_cluster,
 )
+from cm.services.action import compile_state_predicate, is_state_allowed
 from cm.services.config.spec import convert_to_flat_spec_from_proto_flat_spec
 from cm.services.job.checks import check_constraints_for_upgrade, check_hostcomponentmap
 from cm.services.job.inventory._config import update_configuration_for_inventory_inplace
-from cm.services.job.prepare import prepare_task_for_action
-from cm.services.job.run import run_task
+from cm.services.job.prepare import prepare_task_for_action, prepare_tasks_for_action
+from cm.services.job.run import run_task, run_tasks
 from cm.status_api import send_task_status_update_event
 from cm.variant import process_variant
 
@@ -167,6 +171,150 @@ def run_action(
     return task_
 
 
+def run_action_bulk(action: Action, objects: Collection[ObjectWithAction], payload: ActionRunPayload) -> list[TaskLog]:
+    """
+    Launch the same action on multiple objects at once.
+
+    Checks that depend only on action are performed once, object-related checks are done in bulk.
+    Either all tasks are created or none of them.
+    Created tasks are queued to a single runner process with limited concurrency.
+    Host action tasks of hosts that share the owner (cluster, service or component) are run one by one.
+    """
+
+    if not objects:
+        return []
+
+    if action.name in settings.ADCM_SERVICE_ACTION_NAMES_SET or action.hostcomponentmap or hasattr(action, "upgrade"):
+        raise AdcmEx(code="TASK_ERROR", msg=f'action "{action.display_name}" can\'t be launched on multiple objects')
+
+    action_targets = {}
+    cluster_action_targets = {}
+    for obj in objects:
+        cluster = get_object_cluster(obj=obj)
+        if not action.host_action:
+            action_targets[obj] = obj
+            continue
+
+        cluster_id = cluster.pk if cluster else None
+        if cluster_id not in cluster_action_targets:
+            cluster_action_targets[cluster_id] = _get_host_object(action=action, cluster=cluster)
+
+        action_targets[obj] = cluster_action_targets[cluster_id]
+
+    unique_targets = set(action_targets.values())
+    locked = _get_objects_with_concern(objects=unique_targets, concern_type=ConcernType.LOCK)
+    with_issues = _get_objects_with_concern(objects=unique_targets, concern_type=ConcernType.ISSUE)
+    predicate = compile_state_predicate(action=action)
+
+    for action_target in unique_targets:
+        if action_target in locked:
+            raise AdcmEx(code="LOCK_ERROR", msg=f"object {action_target} is locked")
+
+        if action_target in with_issues:
+            raise AdcmEx(code="ISSUE_INTEGRITY_ERROR", msg=f"object {action_target} has issues")
+
+        if not is_state_allowed(
+            predicate=predicate,
+            state=action_target.state,
+            multi_state=frozenset(action_target._multi_state),  # noqa: SLF001
+        ):
+            raise AdcmEx(code="TASK_ERROR", msg=f"action is disabled for {action_target}")
+
+    checked_configs = {}
+    if (
+        not action.config_jinja
+        and not PrototypeConfig.objects.filter(
+            prototype=action.prototype, action=action, type__in=("variant", "file", "secretfile")
+        ).exists()
+    ):
+        # configuration doesn't depend on target object, so it's enough to check it once
+        conf = deepcopy(payload.conf)
+        checked = _check_action_config(action=action, obj=next(iter(objects)), conf=conf, attr=payload.attr)
+        checked_configs = {obj: (conf, *checked) for obj in objects}
+    else:
+        for obj in objects:
+            conf = deepcopy(payload.conf)
+            checked_configs[obj] = (conf, *_check_action_config(action=action, obj=obj, conf=conf, attr=payload.attr))
+
+    hostcomponent_of_clusters = {}
+    tasks_to_create = []
+    for obj in objects:
+        cluster = get_object_cluster(obj=obj)
+        cluster_id = cluster.pk if cluster else None
+        if cluster_id not in hostcomponent_of_clusters:
+            hostcomponent_of_clusters[cluster_id] = get_hc(cluster=cluster)
+
+        target = CoreObjectDescriptor(id=obj.pk, type=model_name_to_core_type(obj.__class__.__name__.lower()))
+        owner = target
+        if action.host_action:
+            action_target = action_targets[obj]
+            owner = CoreObjectDescriptor(
+                id=action_target.pk, type=model_name_to_core_type(action_target.__class__.__name__.lower())
+            )
+
+        tasks_to_create.append(
+            TaskCreateDTO(
+                target=target,
+                owner=owner,
+                payload=TaskPayloadDTO(
+                    conf=checked_configs[obj][0],
+                    attr=payload.attr,
+                    verbose=payload.verbose,
+                    hostcomponent=hostcomponent_of_clusters[cluster_id],
+                    post_upgrade_hostcomponent=[],
+                ),
+            )
+        )
+
+    with atomic():
+        task_ids = prepare_tasks_for_action(action=action.pk, tasks=tasks_to_create)
+        tasks = TaskLog.objects.select_related("action").in_bulk(task_ids)
+        tasks = [tasks[task_id] for task_id in task_ids]
+
+        for obj, task_ in zip(objects, tasks):
+            conf, spec, flat_spec = checked_configs[obj]
+            if not conf:
+                continue
+
+            # configuration is updated inplace and may be shared between tasks
+            conf = deepcopy(conf)
+            task_.config = update_configuration_for_inventory_inplace(
+                configuration=conf,
+                attributes=payload.attr,
+                specification=convert_to_flat_spec_from_proto_flat_spec(prototypes_flat_spec=flat_spec),
+                config_owner=CoreObjectDescriptor(
+                    id=obj.pk, type=model_name_to_core_type(model_name=obj._meta.model_name)
+                ),
+            )
+            process_file_type(obj=task_, spec=spec, conf=conf)
+            task_.save(update_fields=["config"])
+
+        for task_ in tasks:
+            on_commit(func=partial(send_task_status_update_event, task_id=task_.pk, status=JobStatus.CREATED.value))
+
+    for obj, task_ in zip(objects, tasks):
+        re_apply_policy_for_jobs(action_object=obj, task=task_)
+
+    run_tasks(tasks)
+
+    return tasks
+
+
+def _get_objects_with_concern(objects: Iterable[ADCMEntity], concern_type: ConcernType) -> set[ADCMEntity]:
+    ids_by_model = defaultdict(set)
+    for obj in objects:
+        ids_by_model[obj.__class__].add(obj.pk)
+
+    concerned = set()
+    for model, ids in ids_by_model.items():
+        concerned_ids = set(
+            model.objects.filter(pk__in=ids, concerns__type=concern_type).values_list("pk", flat=True).distinct()
+        )
+        concerned.update(obj for obj in objects if obj.__class__ is model and obj.pk in concerned_ids)
+
+    return concerned
+
+
 def _get_host_object(action: Action, cluster: Cluster | None) -> ADCMEntity | None:
     obj = None
     if action.prototype.type == "service":
@@ -21,6 +21,7 @@ from django.conf import settings
 from django.db.models import F, QuerySet, Value
 
 from cm.models import ADCM, Cluster, ClusterObject, Host, HostProvider, ServiceComponent
+from cm.services.adcm import adcm_config
 from cm.services.config import retrieve_config_attr_pairs
 from cm.services.config.spec import FlatSpec, retrieve_flat_spec_for_objects
 from cm.services.config.types import AttrDict, ConfigDict
@@ -185,15 +186,16 @@ def get_objects_configurations(
 
 
 def get_adcm_configuration() -> dict[str, Any]:
-    adcm = ADCM.objects.select_related("config").get()
-    config_attr_pair = retrieve_config_attr_pairs(configurations=(adcm.config.current,))[adcm.config.current]
-    flat_spec = retrieve_flat_spec_for_objects(prototypes=(adcm.prototype_id,))[adcm.prototype_id]
+    adcm_id, prototype_id, config_id = ADCM.objects.values_list("id", "prototype_id", "config__current").get()
+    # cached settings are shared, while preparation for inventory changes configuration in place
+    config_attr_pair = deepcopy(adcm_config(config_id=config_id))
+    flat_spec = retrieve_flat_spec_for_objects(prototypes=(prototype_id,))[prototype_id]
 
     return update_configuration_for_inventory_inplace(
         configuration=config_attr_pair.config,
         attributes=config_attr_pair.attr,
         specification=flat_spec,
-        config_owner=GeneralEntityDescriptor(id=adcm.pk, type="adcm"),
+        config_owner=GeneralEntityDescriptor(id=adcm_id, type="adcm"),
     )
 
 
@@ -10,8 +10,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from core.job.dto import TaskPayloadDTO
-from core.job.task import compose_task
+from typing import Collection
+
+from core.job.dto import TaskCreateDTO, TaskPayloadDTO
+from core.job.task import compose_task, compose_tasks
 from core.job.types import Task
 from core.types import ActionID, CoreObjectDescriptor
 
@@ -27,3 +29,7 @@ def prepare_task_for_action(
     return compose_task(
         target=target, owner=owner, action=action, payload=payload, job_repo=JobRepoImpl, action_repo=ActionRepoImpl
     )
+
+
+def prepare_tasks_for_action(action: ActionID, tasks: Collection[TaskCreateDTO]) -> list[int]:
+    return compose_tasks(tasks=tasks, action=action, job_repo=JobRepoImpl, action_repo=ActionRepoImpl)
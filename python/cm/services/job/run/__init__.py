@@ -11,6 +11,16 @@
 # limitations under the License.
 
 from cm.services.job.run._impl import get_default_runner, get_restart_runner
-from cm.services.job.run._task import restart_task, run_task
+from cm.services.job.run._scheduler import SchedulerLimits, TaskScheduler, get_queue_stats
+from cm.services.job.run._task import restart_task, run_task, run_tasks
 
-__all__ = ["get_default_runner", "get_restart_runner", "run_task", "restart_task"]
+__all__ = [
+    "get_default_runner",
+    "get_restart_runner",
+    "run_task",
+    "run_tasks",
+    "restart_task",
+    "SchedulerLimits",
+    "TaskScheduler",
+    "get_queue_stats",
+]
@@ -64,12 +64,16 @@ def _get_runner(filter_predicate: Callable = id) -> TaskRunner:
         notifier=status_api,
         status_server=notify,
         logger=logger,
+        parallel_jobs_limit=settings.JOB_PARALLEL_GROUP_LIMIT,
     )
 
 
 def _prepare_settings() -> ExternalSettings:
     return ExternalSettings(
         adcm=ADCMSettings(code_root_dir=settings.CODE_DIR, run_dir=settings.RUN_DIR, log_dir=settings.LOG_DIR),
-        ansible=AnsibleSettings(ansible_secret_script=settings.CODE_DIR / "ansible_secret.py"),
+        ansible=AnsibleSettings(
+            ansible_secret_script=settings.CODE_DIR / "ansible_secret.py",
+            plugin_rpc=settings.ANSIBLE_PLUGIN_RPC_ENABLED,
+        ),
         integrations=IntegrationsSettings(status_server_token=settings.STATUS_SECRET_KEY),
     )
@@ -0,0 +1,251 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import Counter
+from functools import partial
+from typing import Callable, Iterable, NamedTuple
+import os
+import time
+import logging
+import subprocess
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.transaction import atomic, on_commit
+from django.utils import timezone
+
+from cm.issue import unlock_affected_objects
+from cm.models import Action, JobLog, JobStatus, TaskLog
+from cm.services.job.run._task import spawn_task_runner
+from cm.status_api import send_task_status_update_event
+
+logger = logging.getLogger("adcm")
+
+# Task is queued until scheduler starts a runner for it, runner sets its own pid and RUNNING status at start
+QUEUED = Q(status=JobStatus.CREATED, pid=0)
+DISPATCHED = Q(status=JobStatus.RUNNING) | (Q(status=JobStatus.CREATED) & ~Q(pid=0))
+
+
+class SchedulerLimits(NamedTuple):
+    """Maximum amount of simultaneously running tasks, zero means no limit"""
+
+    total: int
+    per_cluster: int
+    per_action: int
+
+    @classmethod
+    def from_settings(cls) -> "SchedulerLimits":
+        return cls(
+            total=settings.TASK_SCHEDULER_LIMIT,
+            per_cluster=settings.TASK_SCHEDULER_CLUSTER_LIMIT,
+            per_action=settings.TASK_SCHEDULER_ACTION_LIMIT,
+        )
+
+
+class ScheduledTask(NamedTuple):
+    id: int
+    # tasks of objects outside of cluster are limited only globally and by action
+    cluster_id: int | None
+    action_id: int | None
+    # tasks of the same owner (e.g. host action launched in bulk on hosts of one cluster) are run one by one
+    owner: tuple[str | None, int]
+
+
+class QueueStats(NamedTuple):
+    queued: int
+    dispatched: int
+    queued_by_cluster: dict[int | None, int]
+
+
+def _read_tasks(condition: Q) -> list[ScheduledTask]:
+    return [
+        ScheduledTask(
+            id=id_,
+            cluster_id=selector.get("cluster", {}).get("id"),
+            action_id=action_id,
+            owner=(owner_type, owner_id),
+        )
+        for id_, selector, action_id, owner_type, owner_id in TaskLog.objects.filter(condition)
+        .order_by("id")
+        .values_list("id", "selector", "action_id", "owner_type", "owner_id")
+    ]
+
+
+def get_queue_stats() -> QueueStats:
+    queued = _read_tasks(condition=QUEUED)
+
+    return QueueStats(
+        queued=len(queued),
+        dispatched=TaskLog.objects.filter(DISPATCHED).count(),
+        queued_by_cluster=dict(Counter(task.cluster_id for task in queued)),
+    )
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def fail_lost_task(task_id: int) -> bool:
+    """
+    Mark task which runner is gone without finishing it as failed, return False if task is already finished
+
+    Jobs that weren't finished are aborted and objects locked by task are released.
+    """
+
+    with atomic():
+        task = TaskLog.objects.select_for_update().filter(DISPATCHED, id=task_id).first()
+        if task is None:
+            return False
+
+        now = timezone.now()
+        task.status = JobStatus.FAILED
+        task.finish_date = now
+        task.save(update_fields=["status", "finish_date"])
+        JobLog.objects.filter(task_id=task_id, status__in=(JobStatus.CREATED, JobStatus.RUNNING)).update(
+            status=JobStatus.ABORTED, finish_date=now
+        )
+        unlock_affected_objects(task=task)
+
+        on_commit(func=partial(send_task_status_update_event, task_id=task_id, status=JobStatus.FAILED.value))
+
+    return True
+
+
+def select_tasks_to_dispatch(
+    queued: Iterable[ScheduledTask], dispatched: Iterable[ScheduledTask], limits: SchedulerLimits
+) -> list[ScheduledTask]:
+    """
+    Pick queued tasks that fit into limits given already dispatched ones.
+
+    Queue is fair between clusters: n-th task of each cluster goes before (n + 1)-th task of any cluster,
+    older tasks go first within one cluster.
+    Task that hits cluster or action limit doesn't hold back tasks behind it.
+    Only one task of the same owner is dispatched at a time.
+    """
+
+    dispatched = tuple(dispatched)
+    total = len(dispatched)
+    by_cluster = Counter(task.cluster_id for task in dispatched)
+    by_action = Counter(task.action_id for task in dispatched)
+    busy_owners = {task.owner for task in dispatched}
+
+    position_in_cluster = Counter()
+    ordered = []
+    for task in sorted(queued):
+        ordered.append((position_in_cluster[task.cluster_id], task.id, task))
+        position_in_cluster[task.cluster_id] += 1
+
+    selected = []
+    for _, _, task in sorted(ordered):
+        if limits.total and total >= limits.total:
+            break
+
+        if (
+            (limits.per_cluster and task.cluster_id is not None and by_cluster[task.cluster_id] >= limits.per_cluster)
+            or (limits.per_action and by_action[task.action_id] >= limits.per_action)
+            or task.owner in busy_owners
+        ):
+            continue
+
+        selected.append(task)
+        total += 1
+        by_cluster[task.cluster_id] += 1
+        by_action[task.action_id] += 1
+        busy_owners.add(task.owner)
+
+    return selected
+
+
+class TaskScheduler:
+    """
+    Starts runners of queued tasks within limits.
+
+    Runners are started as children of scheduler, so only one scheduler should work at a time.
+    State is read from DB on each step, so scheduler may be restarted without losing the queue.
+    Call `fail_lost_tasks` on start to free slots of tasks which runners died while scheduler was down.
+    """
+
+    def __init__(
+        self,
+        limits: SchedulerLimits | None = None,
+        spawn: Callable[[int, str], subprocess.Popen] = spawn_task_runner,
+    ):
+        self._limits = limits or SchedulerLimits.from_settings()
+        self._spawn = spawn
+        self._runners: dict[int, subprocess.Popen] = {}
+
+    def dispatch(self) -> list[int]:
+        """Start runners for as many queued tasks as limits allow, return ids of started tasks"""
+
+        self._reap_finished_runners()
+
+        tasks = select_tasks_to_dispatch(
+            queued=_read_tasks(condition=QUEUED), dispatched=_read_tasks(condition=DISPATCHED), limits=self._limits
+        )
+        if not tasks:
+            return []
+
+        actions = Action.objects.select_related("prototype").in_bulk({task.action_id for task in tasks})
+        for task in tasks:
+            action = actions.get(task.action_id)
+            process = self._spawn(task.id, action.venv if action else "default")
+            self._runners[task.id] = process
+            # runner may already be started and have written the same pid
+            TaskLog.objects.filter(QUEUED, id=task.id).update(pid=process.pid)
+
+        stats = get_queue_stats()
+        logger.info("Task scheduler: %s started, %s running, %s queued", len(tasks), stats.dispatched, stats.queued)
+
+        return [task.id for task in tasks]
+
+    def fail_lost_tasks(self) -> list[int]:
+        """Fail dispatched tasks which runners are no longer alive, return ids of failed tasks"""
+
+        failed = []
+        for task_id, pid in TaskLog.objects.filter(DISPATCHED).order_by("id").values_list("id", "pid"):
+            if task_id in self._runners or (pid and _is_process_alive(pid=pid)):
+                continue
+
+            if fail_lost_task(task_id=task_id):
+                logger.error("Runner of task #%s at pid %s is gone, task is failed", task_id, pid)
+                failed.append(task_id)
+
+        return failed
+
+    def run(self, interval: float) -> None:
+        self.fail_lost_tasks()
+        while True:
+            self.dispatch()
+            time.sleep(interval)
+
+    def _reap_finished_runners(self) -> None:
+        for task_id, process in tuple(self._runners.items()):
+            return_code = process.poll()
+            if return_code is None:
+                continue
+
+            del self._runners[task_id]
+            self._on_runner_finished(task_id=task_id, return_code=return_code)
+
+    def _on_runner_finished(self, task_id: int, return_code: int) -> None:
+        # runner finishes task itself, task left dispatched means runner has failed before or during the run
+        if fail_lost_task(task_id=task_id):
+            logger.error(
+                "Runner of task #%s exited with %s without finishing the task, task is failed", task_id, return_code
+            )
@@ -16,15 +16,17 @@ from pathlib import Path
 from typing import Any, Generator, Iterable, Literal
 import json
 
-from ansible_plugin.utils import finish_check
+from ansible_plugin.utils import finish_check, flush_deferred_config
 from core.job.executors import BundleExecutorConfig, ExecutorConfig
 from core.job.runners import ExecutionTarget, ExternalSettings
 from core.job.types import Job, ScriptType, Task
 from core.types import ADCMCoreType
+from django.db.models import Sum
 from django.db.transaction import atomic
 from rbac.roles import re_apply_policy_for_jobs
 
 from cm.api import get_hc, save_hc
+from cm.log import LogStorageOutputSink
 from cm.models import (
     Cluster,
     HostComponent,
@@ -33,7 +35,7 @@ from cm.models import (
     ServiceComponent,
     TaskLog,
 )
-from cm.services.adcm import adcm_config, get_adcm_config_id
+from cm.services.adcm import get_adcm_settings
 from cm.services.job._utils import cook_delta, get_old_hc
 from cm.services.job.checks import check_hostcomponentmap
 from cm.services.job.inventory import get_adcm_configuration, get_inventory_data
@@ -59,7 +61,7 @@ from cm.status_api import send_prototype_and_state_update_event
 
 class ExecutionTargetFactory:
     def __init__(self):
-        self._default_ansible_finalizers = (finish_check_logs,)
+        self._default_ansible_finalizers = (finish_check_logs, flush_deferred_config_updates)
         self._supported_internal_scripts = {
             "bundle_switch": internal_script_bundle_switch,
             "bundle_revert": internal_script_bundle_revert,
@@ -86,17 +88,21 @@ class ExecutionTargetFactory:
                             verbose=task.verbose,
                             venv=task.action.venv,
                             ansible_secret_script=configuration.ansible.ansible_secret_script,
-                        )
+                            plugin_rpc=configuration.ansible.plugin_rpc,
+                            job_id=job_info.id,
+                        ),
+                        output_sink=LogStorageOutputSink(job_id=job_info.id, name=job_info.type.value),
                     )
                     finalizers = (*self._default_ansible_finalizers, *finalizers)
-                    environment_builders = (prepare_ansible_environment,)
+                    environment_builders = (write_ansible_job_config, write_ansible_inventory, write_ansible_cfg)
                 case ScriptType.PYTHON:
                     executor = PythonProcessExecutor(
                         config=BundleExecutorConfig(
                             job_script=job_info.script,
                             work_dir=work_dir,
                             bundle=task.bundle,
-                        )
+                        ),
+                        output_sink=LogStorageOutputSink(job_id=job_info.id, name=job_info.type.value),
                     )
                     environment_builders = ()
                 case ScriptType.INTERNAL:
@@ -195,22 +201,37 @@ def _switch_hc_if_required(task: TaskLog):
 
 
 def prepare_ansible_environment(task: Task, job: Job, configuration: ExternalSettings) -> None:
-    job_config = prepare_ansible_job_config(task=task, job=job, configuration=configuration)
+    for prepare in (write_ansible_job_config, write_ansible_inventory, write_ansible_cfg):
+        prepare(task=task, job=job, configuration=configuration)
+
+
+# files of ansible environment are prepared by separate builders to have their own timings
+
+
+def write_ansible_job_config(task: Task, job: Job, configuration: ExternalSettings) -> None:
     job_run_dir = configuration.adcm.run_dir / str(job.id)
+    job_config = prepare_ansible_job_config(task=task, job=job, configuration=configuration)
     with (job_run_dir / "config.json").open(mode="w", encoding="utf-8") as config_file:
         json.dump(obj=job_config, fp=config_file, sort_keys=True, separators=(",", ":"))
 
+
+def write_ansible_inventory(task: Task, job: Job, configuration: ExternalSettings) -> None:
+    job_run_dir = configuration.adcm.run_dir / str(job.id)
     inventory = prepare_ansible_inventory(task=task)
     with (job_run_dir / "inventory.json").open(mode="w", encoding="utf-8") as file_descriptor:
         json.dump(obj=inventory, fp=file_descriptor, separators=(",", ":"))
 
+
+def write_ansible_cfg(task: Task, job: Job, configuration: ExternalSettings) -> None:
+    _ = task
+    job_run_dir = configuration.adcm.run_dir / str(job.id)
     config_parser = ConfigParser()
     config_parser["defaults"] = {
         "stdout_callback": "yaml",
         "callback_whitelist": "profile_tasks",
     }
 
-    forks = adcm_config(get_adcm_config_id()).config["ansible_settings"]["forks"]
+    forks = get_adcm_settings().config["ansible_settings"]["forks"]
     config_parser["defaults"]["forks"] = str(forks)
 
     jinja_2_native = getattr(job.params, "jinja2_native", None)
@@ -358,6 +379,10 @@ def finish_check_logs(job: Job) -> None:
     finish_check(job.id)
 
 
+def flush_deferred_config_updates(job: Job) -> None:
+    flush_deferred_config(job_id=job.id)
+
+
 def save_fs_logs_to_db(job: Job, work_dir: Path, log_type: Literal["stdout", "stderr"]) -> None:
     log_path = work_dir / f"{job.type.value}-{log_type}.txt"
     if not log_path.is_file():
@@ -367,5 +392,11 @@ def save_fs_logs_to_db(job: Job, work_dir: Path, log_type: Literal["stdout", "st
     if not corresponding_log:
         return
 
+    # output is saved by chunks while job is running, file is read only if some of them are missing
+    saved_size = corresponding_log.chunks.aggregate(size=Sum("size"))["size"]
+    if saved_size is not None and saved_size == log_path.stat().st_size:
+        return
+
+    corresponding_log.chunks.all().delete()
     corresponding_log.body = log_path.read_text(encoding="utf-8")
     corresponding_log.save(update_fields=["body"])
@@ -11,7 +11,7 @@
 # limitations under the License.
 
 from pathlib import Path
-from typing import Literal
+from typing import Collection, Literal
 import logging
 import subprocess
 
@@ -26,6 +26,11 @@ logger = logging.getLogger("adcm")
 
 
 def run_task(task: TaskLog) -> None:
+    if settings.TASK_SCHEDULER_ENABLED:
+        _lock_task_objects(task=task)
+        logger.info("task #%s is queued", task.pk)
+        return
+
     _run_task(task=task, command="start")
 
 
@@ -33,24 +38,70 @@ def restart_task(task: TaskLog) -> None:
     _run_task(task=task, command="restart")
 
 
-def _run_task(task: TaskLog, command: Literal["start", "restart"]):
-    err_file = open(  # noqa: SIM115
+def run_tasks(tasks: Collection[TaskLog], concurrency: int | None = None) -> None:
+    """
+    Launch tasks of the same action in one runner process.
+
+    Runner executes at most `concurrency` tasks simultaneously and only one task of the same owner at a time,
+    the rest wait in its queue.
+    Affected objects are locked right away, so queued tasks keep objects locked too.
+    When task scheduler is enabled, tasks are left in its queue and `concurrency` is ignored.
+    """
+
+    if not tasks:
+        return
+
+    for task in tasks:
+        _lock_task_objects(task=task)
+
+    if settings.TASK_SCHEDULER_ENABLED:
+        logger.info("%s tasks are queued", len(tasks))
+        return
+
+    cmd = [
+        str(settings.CODE_DIR / "task_runner.py"),
+        "start-batch",
+        "--concurrency",
+        str(concurrency or settings.TASK_BATCH_CONCURRENCY),
+        *(str(task.pk) for task in tasks),
+    ]
+    logger.info("batch task run cmd: %s", " ".join(cmd))
+    proc = subprocess.Popen(  # noqa: SIM115
+        args=cmd, stderr=_open_err_file(), env=get_env_with_venv_path(venv=next(iter(tasks)).action.venv)
+    )
+    logger.info("batch task run of %s tasks, python process %s", len(tasks), proc.pid)
+
+
+def _open_err_file():
+    return open(  # noqa: SIM115
         Path(settings.LOG_DIR, "task_runner.err"),
         "a+",
         encoding=settings.ENCODING_UTF_8,
     )
 
+
+def _lock_task_objects(task: TaskLog) -> None:
+    tree = Tree(obj=task.task_object)
+    affected_objs = (node.value for node in tree.get_all_affected(node=tree.built_from))
+    lock_affected_objects(task=task, objects=affected_objs)
+
+
+def spawn_task_runner(task_id: int, venv: str, command: Literal["start", "restart"] = "start") -> subprocess.Popen:
     cmd = [
         str(settings.CODE_DIR / "task_runner.py"),
         command,
-        str(task.pk),
+        str(task_id),
     ]
     logger.info("task run cmd: %s", " ".join(cmd))
     proc = subprocess.Popen(  # noqa: SIM115
-        args=cmd, stderr=err_file, env=get_env_with_venv_path(venv=task.action.venv)
+        args=cmd, stderr=_open_err_file(), env=get_env_with_venv_path(venv=venv)
     )
-    logger.info("task run #%s, python process %s", task.pk, proc.pid)
+    logger.info("task run #%s, python process %s", task_id, proc.pid)
 
-    tree = Tree(obj=task.task_object)
-    affected_objs = (node.value for node in tree.get_all_affected(node=tree.built_from))
-    lock_affected_objects(task=task, objects=affected_objs)
+    return proc
+
+
+def _run_task(task: TaskLog, command: Literal["start", "restart"]):
+    spawn_task_runner(task_id=task.pk, venv=task.action.venv, command=command)
+
+    _lock_task_objects(task=task)
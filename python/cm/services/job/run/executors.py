@@ -13,11 +13,13 @@
 from pathlib import Path
 from typing import Callable
 
+from ansible_plugin.rpc import PLUGIN_RPC_SOCKET_ENV, PluginRPCServer
 from core.job.executors import (
     BundleExecutorConfig,
     ExecutionResult,
     Executor,
     ExecutorConfig,
+    OutputSink,
     ProcessExecutor,
     WithErrOutLogsMixin,
 )
@@ -32,6 +34,8 @@ class AnsibleExecutorConfig(BundleExecutorConfig):
     tags: str
     verbose: bool
     venv: str
+    plugin_rpc: bool = False
+    job_id: int | None = None
 
 
 class AnsibleProcessExecutor(ProcessExecutor):
@@ -39,8 +43,34 @@ class AnsibleProcessExecutor(ProcessExecutor):
 
     _config: AnsibleExecutorConfig
 
-    def __init__(self, config: AnsibleExecutorConfig):
-        super().__init__(config=config)
+    def __init__(self, config: AnsibleExecutorConfig, output_sink: OutputSink | None = None):
+        super().__init__(config=config, output_sink=output_sink)
+
+        self._plugin_rpc_server = (
+            PluginRPCServer(socket_path=self._config.work_dir / "plugin.sock", job_id=self._config.job_id)
+            if self._config.plugin_rpc
+            else None
+        )
+
+    def execute(self) -> Self:
+        if self._plugin_rpc_server:
+            self._plugin_rpc_server.start()
+
+        try:
+            return super().execute()
+        except Exception:
+            self._stop_plugin_rpc_server()
+            raise
+
+    def wait_finished(self) -> Self:
+        try:
+            return super().wait_finished()
+        finally:
+            self._stop_plugin_rpc_server()
+
+    def _stop_plugin_rpc_server(self) -> None:
+        if self._plugin_rpc_server:
+            self._plugin_rpc_server.stop()
 
     def _prepare_command(self) -> list[str]:
         cmd = [
@@ -73,6 +103,9 @@ class AnsibleProcessExecutor(ProcessExecutor):
             # bundle root dir (workdir) is used as in `stack_dir` in ansible job config
             env["ANSIBLE_CONFIG"] = str(self._config.work_dir / "ansible.cfg")
 
+        if self._plugin_rpc_server:
+            env[PLUGIN_RPC_SOCKET_ENV] = str(self._plugin_rpc_server.socket_path)
+
         return env
 
 
@@ -18,7 +18,14 @@ from typing import Collection, Iterable
 import operator
 
 from core.errors import NotFoundError
-from core.job.dto import JobUpdateDTO, LogCreateDTO, TaskMutableFieldsDTO, TaskPayloadDTO, TaskUpdateDTO
+from core.job.dto import (
+    JobUpdateDTO,
+    LogCreateDTO,
+    TaskCreateDTO,
+    TaskMutableFieldsDTO,
+    TaskPayloadDTO,
+    TaskUpdateDTO,
+)
 from core.job.types import (
     ActionInfo,
     BundleInfo,
@@ -46,6 +53,7 @@ from core.types import (
 )
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.db.models import F, QuerySet, Value
 
 from cm.converters import core_type_to_model, db_record_type_to_core_type
@@ -162,36 +170,25 @@ class JobRepoImpl:
     def create_task(
         cls, target: CoreObjectDescriptor, owner: CoreObjectDescriptor, action: ActionInfo, payload: TaskPayloadDTO
     ) -> Task:
-        if action.owner_prototype.type == ADCMCoreType.ADCM:
-            if target.type != ADCMCoreType.ADCM:
-                message = f"ADCM actions can be launched only on ADCM: {target=} ; {action.owner_prototype=}"
-                raise TypeError(message)
+        task = cls._prepare_task_record(target=target, owner=owner, action=action, payload=payload)
+        task.save()
 
-            selector = {"adcm": {"id": target.id, "name": "adcm"}}
-            object_type = ADCM.class_content_type
-        elif target.type == ADCMDescriptor:
-            message = f"ADCM actions can be launched only on ADCM: {target=} ; {action.owner_prototype=}"
-            raise TypeError(message)
-        else:
-            selector = cls._get_selector_for_core_object(target=target, owner=action.owner_prototype)
-            object_type = core_type_to_model(core_type=target.type).class_content_type
+        return cls.get_task(id=task.pk)
 
-        task = TaskLog.objects.create(
-            action_id=action.id,
-            object_id=target.id,
-            object_type=object_type,
-            owner_id=owner.id,
-            owner_type=owner.type.value,
-            config=payload.conf,
-            attr=payload.attr or {},
-            hostcomponentmap=payload.hostcomponent,
-            post_upgrade_hc_map=payload.post_upgrade_hostcomponent,
-            verbose=payload.verbose,
-            status=ExecutionStatus.CREATED.value,
-            selector=selector,
-        )
+    @classmethod
+    def create_tasks(cls, tasks: Iterable[TaskCreateDTO], action: ActionInfo) -> list[int]:
+        records = [
+            cls._prepare_task_record(target=task.target, owner=task.owner, action=action, payload=task.payload)
+            for task in tasks
+        ]
 
-        return cls.get_task(id=task.pk)
+        if connection.features.can_return_rows_from_bulk_insert:
+            TaskLog.objects.bulk_create(records)
+        else:
+            for record in records:
+                record.save()
+
+        return [record.pk for record in records]
 
     @classmethod
     def get_task_jobs(cls, task_id: int) -> Iterable[Job]:
@@ -232,6 +229,22 @@ class JobRepoImpl:
             for job in jobs
         )
 
+    @staticmethod
+    def create_jobs_for_tasks(task_ids: Collection[int], jobs: Collection[JobSpec]) -> None:
+        JobLog.objects.bulk_create(
+            JobLog(
+                task_id=task_id,
+                status=ExecutionStatus.CREATED.value,
+                **job.dict(),
+            )
+            for task_id in task_ids
+            for job in jobs
+        )
+
+    @classmethod
+    def get_jobs_of_tasks(cls, task_ids: Collection[int]) -> Iterable[Job]:
+        return map(cls._job_from_job_log, cls._job_log_qs().filter(task_id__in=task_ids))
+
     @staticmethod
     def create_logs(logs: Iterable[LogCreateDTO]) -> None:
         LogStorage.objects.bulk_create(
@@ -276,6 +289,7 @@ class JobRepoImpl:
             status=ExecutionStatus(job.status),
             script=job.script,
             params=JobParams(ansible_tags=ansible_tags, **params),
+            parallel_group=job.parallel_group,
             on_fail=StateChanges(
                 state=job.state_on_fail,
                 multi_state_set=tuple(job.multi_state_on_fail_set or ()),
@@ -289,6 +303,39 @@ class JobRepoImpl:
             script_type__in=cls._supported_script_types, status__in=cls._supported_statuses
         )
 
+    @classmethod
+    def _prepare_task_record(
+        cls, target: CoreObjectDescriptor, owner: CoreObjectDescriptor, action: ActionInfo, payload: TaskPayloadDTO
+    ) -> TaskLog:
+        if action.owner_prototype.type == ADCMCoreType.ADCM:
+            if target.type != ADCMCoreType.ADCM:
+                message = f"ADCM actions can be launched only on ADCM: {target=} ; {action.owner_prototype=}"
+                raise TypeError(message)
+
+            selector = {"adcm": {"id": target.id, "name": "adcm"}}
+            object_type = ADCM.class_content_type
+        elif target.type == ADCMDescriptor:
+            message = f"ADCM actions can be launched only on ADCM: {target=} ; {action.owner_prototype=}"
+            raise TypeError(message)
+        else:
+            selector = cls._get_selector_for_core_object(target=target, owner=action.owner_prototype)
+            object_type = core_type_to_model(core_type=target.type).class_content_type
+
+        return TaskLog(
+            action_id=action.id,
+            object_id=target.id,
+            object_type=object_type,
+            owner_id=owner.id,
+            owner_type=owner.type.value,
+            config=payload.conf,
+            attr=payload.attr or {},
+            hostcomponentmap=payload.hostcomponent,
+            post_upgrade_hc_map=payload.post_upgrade_hostcomponent,
+            verbose=payload.verbose,
+            status=ExecutionStatus.CREATED.value,
+            selector=selector,
+        )
+
     @classmethod
     def _get_selector_for_core_object(cls, target: CoreObjectDescriptor, owner: PrototypeDescriptor) -> dict:
         model_ = core_type_to_model(core_type=target.type)
@@ -478,6 +525,7 @@ class ActionRepoImpl:
             "multi_state_on_fail_set",
             "multi_state_on_fail_unset",
             "params",
+            "parallel_group",
         )
 
     @staticmethod
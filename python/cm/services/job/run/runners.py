@@ -10,13 +10,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import groupby
 from logging import Logger
-from typing import Any, Protocol
+from typing import Any, Iterable, Protocol
 import os
 import signal
 
 from core.job.dto import JobUpdateDTO, TaskUpdateDTO
-from core.job.runners import ExecutionTarget, RunnerRuntime, TaskRunner
+from core.job.runners import ExecutionTarget, PhaseTimer, RunnerRuntime, TaskRunner
 from core.job.types import ExecutionStatus, Job, Task
 from core.types import CoreObjectDescriptor
 
@@ -31,6 +35,16 @@ from cm.services.job.run._task_finalizers import (
 NO_PROCESS_PID = 0
 
 
+def _phase_name(step: Any) -> str:
+    """Name of environment builder or finalizer, string arguments of partials are added, e.g. `save_logs.stdout`"""
+
+    if isinstance(step, partial):
+        arguments = (value for value in step.keywords.values() if isinstance(value, str))
+        return ".".join((_phase_name(step.func), *arguments))
+
+    return getattr(step, "__name__", type(step).__name__)
+
+
 class EventNotifier(Protocol):
     def send_update_event(self, object_: CoreObjectDescriptor, changes: dict) -> Any:
         ...
@@ -52,13 +66,20 @@ class JobSequenceRunner(TaskRunner):
     _status_server = StatusServerInteractor
 
     def __init__(
-        self, *, notifier: EventNotifier, status_server: StatusServerInteractor, logger: Logger, **kwargs: Any
+        self,
+        *,
+        notifier: EventNotifier,
+        status_server: StatusServerInteractor,
+        logger: Logger,
+        parallel_jobs_limit: int = 1,
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
 
         self._notifier = notifier
         self._status_server = status_server
         self._logger = logger
+        self._parallel_jobs_limit = max(parallel_jobs_limit, 1)
 
     def terminate(self) -> None:
         self._runtime.termination.is_requested = True
@@ -84,7 +105,11 @@ class JobSequenceRunner(TaskRunner):
             # force set task finish date if something goes wrong
             self._repo.update_task(
                 id=self._runtime.task_id,
-                data=TaskUpdateDTO(status=self._runtime.status, finish_date=self._environment.now()),
+                data=TaskUpdateDTO(
+                    status=self._runtime.status,
+                    finish_date=self._environment.now(),
+                    timings=self._runtime.timer.timings,
+                ),
             )
 
     def run(self, task_id: int):
@@ -93,21 +118,20 @@ class JobSequenceRunner(TaskRunner):
 
         last_processed_job = None
         last_job_result = None
-        for current_job in configured_jobs:
-            task = self._get_updated_task(task=task)
-            self._prepare_job_environment(task=task, target=current_job)
+        with self._runtime.timer.phase("jobs"):
+            for current_jobs in self._group_jobs(targets=configured_jobs):
+                task = self._get_updated_task(task=task)
 
-            last_processed_job = current_job.job
-            last_job_result = self._execute_job(target=current_job)
+                last_processed_job, last_job_result = self._execute_jobs(task=task, targets=current_jobs)
 
-            if self._runtime.status != ExecutionStatus.ABORTED and last_job_result not in (
-                ExecutionStatus.SUCCESS,
-                ExecutionStatus.ABORTED,
-            ):
-                self._runtime.status = ExecutionStatus.FAILED
+                if self._runtime.status != ExecutionStatus.ABORTED and last_job_result not in (
+                    ExecutionStatus.SUCCESS,
+                    ExecutionStatus.ABORTED,
+                ):
+                    self._runtime.status = ExecutionStatus.FAILED
 
-            if not self._should_proceed(last_job_result=last_job_result):
-                break
+                if not self._should_proceed(last_job_result=last_job_result):
+                    break
 
         if self._runtime.termination.is_requested or (
             last_job_result == ExecutionStatus.ABORTED and last_processed_job.id == configured_jobs[-1].job.id
@@ -127,19 +151,20 @@ class JobSequenceRunner(TaskRunner):
     def _configure(self, task_id: int) -> tuple[Task, tuple[ExecutionTarget, ...]]:
         self._runtime: RunnerRuntime = RunnerRuntime(task_id=task_id)
 
-        task = self._repo.get_task(id=task_id)
+        with self._runtime.timer.phase("configure"):
+            task = self._repo.get_task(id=task_id)
 
-        if not (task.target and task.bundle):
-            message = "Can't run task with no owner and/or bundle info"
-            raise RuntimeError(message)
+            if not (task.target and task.bundle):
+                message = "Can't run task with no owner and/or bundle info"
+                raise RuntimeError(message)
 
-        configured_jobs = tuple(
-            self._job_processor.convert(
-                task=task,
-                jobs=filter(self._job_processor.filter_predicate, self._repo.get_task_jobs(task_id=task_id)),
-                configuration=self._settings,
+            configured_jobs = tuple(
+                self._job_processor.convert(
+                    task=task,
+                    jobs=filter(self._job_processor.filter_predicate, self._repo.get_task_jobs(task_id=task_id)),
+                    configuration=self._settings,
+                )
             )
-        )
         if not configured_jobs:
             raise RuntimeError()
 
@@ -149,7 +174,10 @@ class JobSequenceRunner(TaskRunner):
         self._repo.update_task(
             id=task_id,
             data=TaskUpdateDTO(
-                pid=self._environment.pid, start_date=self._environment.now(), status=ExecutionStatus.RUNNING
+                pid=self._environment.pid,
+                start_date=self._environment.now(),
+                status=ExecutionStatus.RUNNING,
+                timings=self._runtime.timer.timings,
             ),
         )
         self._runtime.status = ExecutionStatus.RUNNING
@@ -165,14 +193,88 @@ class JobSequenceRunner(TaskRunner):
 
         return Task(**(task.dict() | {"hostcomponent": new_fields.hostcomponent}))
 
+    def _job_timer(self, job_id: int) -> PhaseTimer:
+        return self._runtime.job_timers.setdefault(job_id, PhaseTimer())
+
     def _prepare_job_environment(self, task: Task, target: ExecutionTarget) -> None:
         (self._settings.adcm.run_dir / str(target.job.id) / "tmp").mkdir(parents=True, exist_ok=True)
 
+        timer = self._job_timer(job_id=target.job.id)
         for prepare_environment in target.environment_builders:
-            prepare_environment(task=task, job=target.job, configuration=self._settings)
+            with timer.phase(f"prepare.{_phase_name(prepare_environment)}"):
+                prepare_environment(task=task, job=target.job, configuration=self._settings)
+
+    @staticmethod
+    def _group_jobs(targets: Iterable[ExecutionTarget]) -> Iterable[tuple[ExecutionTarget, ...]]:
+        """Consecutive jobs of the same parallel group are executed together, other jobs are executed one by one"""
+
+        for parallel_group, group_targets in groupby(targets, key=lambda target: target.job.parallel_group):
+            if parallel_group:
+                yield tuple(group_targets)
+            else:
+                yield from ((target,) for target in group_targets)
+
+    def _execute_jobs(self, task: Task, targets: tuple[ExecutionTarget, ...]) -> tuple[Job, ExecutionStatus]:
+        """
+        Execute jobs of one group, at most `parallel_jobs_limit` at a time.
+
+        Once any job of the group fails or termination is requested, the rest of group isn't started,
+        but already running jobs are waited for.
+        Result of the group is the one of its first failed job or of its last executed job otherwise.
+        """
+
+        if len(targets) == 1:
+            (target,) = targets
+            self._prepare_job_environment(task=task, target=target)
+            return target.job, self._execute_job(target=target)
+
+        results: dict[int, ExecutionStatus] = {}
+        pending = deque(targets)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self._parallel_jobs_limit) as pool:
+            while pending or running:
+                while (
+                    pending
+                    and len(running) < self._parallel_jobs_limit
+                    and not self._runtime.termination.is_requested
+                    and all(map(self._should_proceed, results.values()))
+                ):
+                    target = pending.popleft()
+                    self._prepare_job_environment(task=task, target=target)
+                    self._start_job(target=target)
+                    # only waiting is done in threads, DB is accessed from the main one
+                    running[pool.submit(self._wait_job, target)] = target
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    target = running.pop(future)
+                    future.result()
+                    results[target.job.id] = self._finish_job(target=target)
+
+        executed = [target.job for target in targets if target.job.id in results]
+        if not executed:
+            # termination is requested before group is started
+            return targets[0].job, ExecutionStatus.ABORTED
+
+        result_job = next(
+            (job for job in executed if results[job.id] not in (ExecutionStatus.SUCCESS, ExecutionStatus.ABORTED)),
+            executed[-1],
+        )
+
+        return result_job, results[result_job.id]
 
     def _execute_job(self, target: ExecutionTarget) -> ExecutionStatus:
-        target.executor.execute()
+        self._start_job(target=target)
+        self._wait_job(target=target)
+
+        return self._finish_job(target=target)
+
+    def _start_job(self, target: ExecutionTarget) -> None:
+        with self._job_timer(job_id=target.job.id).phase("spawn"):
+            target.executor.execute()
 
         self._repo.update_job(
             id=target.job.id,
@@ -185,7 +287,12 @@ class JobSequenceRunner(TaskRunner):
 
         set_job_lock(job_id=target.job.id)
 
-        result = target.executor.wait_finished().result
+    def _wait_job(self, target: ExecutionTarget) -> None:
+        with self._job_timer(job_id=target.job.id).phase("run"):
+            target.executor.wait_finished()
+
+    def _finish_job(self, target: ExecutionTarget) -> ExecutionStatus:
+        result = target.executor.result
 
         if result.code == -15:
             job_status = ExecutionStatus.ABORTED
@@ -207,14 +314,18 @@ class JobSequenceRunner(TaskRunner):
         # meaning we'll try to execute all specified finalizers,
         # log their exceptions and raise the last exception
         exception_to_raise = None
+        timer = self._job_timer(job_id=target.job.id)
         for finalizer in target.finalizers:
             try:
-                finalizer(job=target.job)
+                with timer.phase(f"finalize.{_phase_name(finalizer)}"):
+                    finalizer(job=target.job)
             except Exception as err:
                 exception_to_raise = err
                 message = "Unhandled exception occurred during after-job finalization"
                 self._logger.exception(message)
 
+        self._repo.update_job(id=target.job.id, data=JobUpdateDTO(timings=timer.timings))
+
         if exception_to_raise:
             raise exception_to_raise
 
@@ -234,15 +345,18 @@ class JobSequenceRunner(TaskRunner):
         from audit.utils import audit_job_finish
 
         task_result = self._runtime.status
+        timer = self._runtime.timer
 
-        remove_task_lock(task_id=task.id)
+        with timer.phase("finish.remove_task_lock"):
+            remove_task_lock(task_id=task.id)
 
-        audit_job_finish(
-            owner=task.target,
-            display_name=task.action.display_name,
-            is_upgrade=task.action.is_upgrade,
-            job_result=task_result,
-        )
+        with timer.phase("finish.audit"):
+            audit_job_finish(
+                owner=task.target,
+                display_name=task.action.display_name,
+                is_upgrade=task.action.is_upgrade,
+                job_result=task_result,
+            )
 
         finished_task = self._repo.get_task(id=task.id)
         if finished_task.owner:
@@ -253,29 +367,41 @@ class JobSequenceRunner(TaskRunner):
             )
 
         if finished_task.target:
-            update_object_maintenance_mode(action_name=finished_task.action.name, object_=finished_task.target)
+            with timer.phase("finish.update_maintenance_mode"):
+                update_object_maintenance_mode(action_name=finished_task.action.name, object_=finished_task.target)
 
-        self._repo.update_task(id=task.id, data=TaskUpdateDTO(finish_date=self._environment.now(), status=task_result))
+        self._repo.update_task(
+            id=task.id,
+            data=TaskUpdateDTO(finish_date=self._environment.now(), status=task_result, timings=timer.timings),
+        )
         self._notifier.send_task_status_update_event(task_id=self._runtime.task_id, status=task_result)
 
         try:
-            self._status_server.reset_objects_in_mm()
+            with timer.phase("finish.reset_objects_in_mm"):
+                self._status_server.reset_objects_in_mm()
         except:  # noqa: E722
             self._logger.exception("Error loading mm objects on task finish")
 
+        self._repo.update_task(id=task.id, data=TaskUpdateDTO(timings=timer.timings))
+
     def _update_owner_object(self, owner: CoreObjectDescriptor, finished_task: Task, last_job: Job | None):
         """Task should be re-read before calling this method, because some flags need to be updated"""
+        timer = self._runtime.timer
+
         if last_job:
-            self._update_owner_state(task=finished_task, job=last_job, owner=owner)
+            with timer.phase("finish.update_owner_state"):
+                self._update_owner_state(task=finished_task, job=last_job, owner=owner)
 
         if (
             self._runtime.status in {ExecutionStatus.FAILED, ExecutionStatus.ABORTED, ExecutionStatus.BROKEN}
             and finished_task.action.hc_acl
             and finished_task.hostcomponent.restore_on_fail
         ):
-            set_hostcomponent(task=finished_task, logger=self._logger)
+            with timer.phase("finish.restore_hostcomponent"):
+                set_hostcomponent(task=finished_task, logger=self._logger)
 
-        update_issues(object_=owner)
+        with timer.phase("finish.update_issues"):
+            update_issues(object_=owner)
 
     def _update_owner_state(self, task: Task, job: Job, owner: CoreObjectDescriptor) -> None:
         if self._runtime.status == ExecutionStatus.SUCCESS:
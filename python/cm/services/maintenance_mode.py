@@ -15,11 +15,9 @@ from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_409_CONFLICT
 
-from cm.issue import update_hierarchy_issues, update_issue_after_deleting
 from cm.models import (
     Action,
     ClusterObject,
-    ConcernItem,
     ConcernType,
     Host,
     HostComponent,
@@ -27,7 +25,7 @@ from cm.models import (
     Prototype,
     ServiceComponent,
 )
-from cm.services.concern.flags import update_hierarchy
+from cm.services.concern.distribution import redistribute_concerns
 from cm.services.job.action import ActionRunPayload, run_action
 from cm.services.status.notify import reset_objects_in_mm
 from cm.status_api import send_object_update_event
@@ -52,24 +50,12 @@ def _change_mm_via_action(
 
 
 def _update_mm_hierarchy_issues(obj: Host | ClusterObject | ServiceComponent) -> None:
-    if isinstance(obj, Host):
-        update_hierarchy_issues(obj.provider)
-
-    providers = {host_component.host.provider for host_component in HostComponent.objects.filter(cluster=obj.cluster)}
-    for provider in providers:
-        update_hierarchy_issues(provider)
-
-    update_hierarchy_issues(obj.cluster)
-    update_issue_after_deleting()
-    _update_flags()
+    # concerns themselves don't depend on maintenance mode, only objects they are linked to do,
+    # and these objects are within cluster's hierarchy (and providers of its hosts)
+    redistribute_concerns(cluster_ids=[obj.cluster_id], concern_types=(ConcernType.ISSUE, ConcernType.FLAG))
     reset_objects_in_mm()
 
 
-def _update_flags() -> None:
-    for flag in ConcernItem.objects.filter(type=ConcernType.FLAG):
-        update_hierarchy(concern=flag)
-
-
 def get_maintenance_mode_response(
     obj: Host | ClusterObject | ServiceComponent,
     serializer: Serializer,
@@ -184,5 +170,4 @@ def set_maintenance_mode(obj: ClusterObject | ServiceComponent | Host, value: Ma
     obj.maintenance_mode = value
     obj.save(update_fields=["maintenance_mode"] if isinstance(obj, Host) else ["_maintenance_mode"])
     send_object_update_event(object_=obj, changes={"maintenanceMode": obj.maintenance_mode})
-    update_hierarchy_issues(obj.cluster)
-    reset_objects_in_mm()
+    _update_mm_hierarchy_issues(obj=obj)
@@ -11,6 +11,7 @@
 # limitations under the License.
 
 from contextlib import suppress
+from functools import cached_property
 from typing import TypeAlias
 
 from pydantic import (
@@ -54,6 +55,12 @@ class FullStatusMap(BaseModel):
     clusters: dict[StringID, _ClusterStatusEntry] = Field(default_factory=dict)
     hosts: dict[StringID, _StatusEntry] = Field(default_factory=dict)
 
+    @cached_property
+    def hosts_up(self) -> frozenset[IntegerID]:
+        """Ids of hosts that are up, built once per map, so hosts can be filtered and sorted by status in DB"""
+
+        return frozenset(int(host_id) for host_id, entry in self.hosts.items() if entry.status == 0)
+
     def get_for_cluster(self, cluster_id: IntegerID) -> RawStatus | None:
         with suppress(KeyError):
             return self.clusters[str(cluster_id)].status
@@ -13,12 +13,13 @@
 from functools import partial
 
 from audit.models import MODEL_TO_AUDIT_OBJECT_TYPE_MAP, AuditObject
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import post_save, pre_delete, pre_save
 from django.db.transaction import on_commit
 from django.dispatch import receiver
 from rbac.models import Group, Policy
 
-from cm.models import Cluster, ConcernItem, Host
+from cm.models import Cluster, ConcernItem, ConfigLog, Host
+from cm.services.adcm import adcm_config
 from cm.status_api import send_concern_delete_event
 
 
@@ -73,3 +74,9 @@ def send_delete_event(sender, instance, **kwargs):  # noqa: ARG001
                 concern_id=instance.pk,
             )
         )
+
+
+@receiver(signal=post_save, sender=ConfigLog)
+def reset_adcm_settings_cache(sender, instance, **kwargs) -> None:  # noqa: ARG001
+    # configs are cached by id, which doesn't cover in-place changes
+    adcm_config.cache_clear()
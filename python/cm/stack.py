@@ -618,6 +618,7 @@ def save_sub_actions(conf, action, prototype_dir: Path | str):
             script_type=sub["script_type"],
             name=sub["name"],
             allow_to_terminate=sub.get("allow_to_terminate", action.allow_to_terminate),
+            parallel_group=sub.get("parallel_group", ""),
         )
         if sub_action.script_type != ScriptType.INTERNAL:
             sub_action.script = str(
@@ -42,7 +42,7 @@ class EventTypes:
     UPDATE = "update_{}"
 
 
-def api_request(method: str, url: str, data: dict = None) -> Response | None:
+def api_request(method: str, url: str, data: dict = None, session: requests.Session | None = None) -> Response | None:
     url = urljoin(settings.API_URL, url)
     kwargs = {
         "headers": {
@@ -56,7 +56,7 @@ def api_request(method: str, url: str, data: dict = None) -> Response | None:
         kwargs["data"] = json.dumps(data)
 
     try:
-        response = requests.request(method, url, **kwargs)
+        response = (session or requests).request(method, url, **kwargs)
         if response.status_code not in {HTTP_200_OK, HTTP_201_CREATED}:
             logger.error("%s %s error %d: %s", method, url, response.status_code, response.text)
         return response  # noqa: TRY300
@@ -68,7 +68,9 @@ def api_request(method: str, url: str, data: dict = None) -> Response | None:
         return None
 
 
-def post_event(event: str, object_id: int | None, changes: dict | None = None) -> Response | None:
+def post_event(
+    event: str, object_id: int | None, changes: dict | None = None, session: requests.Session | None = None
+) -> Response | None:
     if object_id is None:
         return None
 
@@ -77,7 +79,7 @@ def post_event(event: str, object_id: int | None, changes: dict | None = None) -
         "object": {"id": object_id, **({"changes": changes} if changes else {})},
     }
 
-    return api_request(method="post", url="event/", data=data)
+    return api_request(method="post", url="event/", data=data, session=session)
 
 
 def fix_object_type(type_: str) -> str:
@@ -103,6 +105,34 @@ def send_concern_delete_event(object_id: int, object_type: str, concern_id: int)
     )
 
 
+def send_concern_events(created: Iterable[tuple[ADCMEntity, dict]], deleted: Iterable[tuple[int, str, int]]) -> None:
+    """
+    Send creation events of (object, concern data) pairs and deletion events of (object id, object type, concern id)
+    over one connection to status server
+    """
+
+    with requests.Session() as session:
+        # environment is the same for all events, so proxies are resolved once
+        session.proxies = requests.utils.get_environ_proxies(settings.API_URL)
+        session.trust_env = False
+
+        for object_, concern in created:
+            post_event(
+                event=EventTypes.CREATE_CONCERN.format(fix_object_type(type_=object_.prototype.type)),
+                object_id=object_.pk,
+                changes=concern,
+                session=session,
+            )
+
+        for object_id, object_type, concern_id in deleted:
+            post_event(
+                event=EventTypes.DELETE_CONCERN.format(fix_object_type(type_=object_type)),
+                object_id=object_id,
+                changes={"id": concern_id},
+                session=session,
+            )
+
+
 def send_delete_service_event(service_id: int) -> Response | None:
     return post_event(
         event=EventTypes.DELETE_SERVICE,
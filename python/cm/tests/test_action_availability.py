@@ -0,0 +1,109 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from itertools import product
+
+from adcm.tests.base import ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from api_v2.action.utils import check_run_perms, filter_actions_by_user_perm, get_str_hash
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from guardian.shortcuts import assign_perm
+from rbac.models import User
+
+from cm.models import Action, Cluster
+from cm.services.action import filter_available_actions
+from cm.tests.utils import gen_action, gen_cluster
+
+
+class TestActionAvailability(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cluster = gen_cluster()
+        self.cluster.set_state("installed")
+        self.cluster.set_multi_state("upgraded")
+        self.cluster.set_multi_state("checked")
+
+        state_variants = ("any", [], ["created"], ["installed", "created"], "unknown")
+        multi_state_variants = ("any", [], ["upgraded"], ["created", "checked"], ["nothing"])
+
+        for i, (state_available, state_unavailable, multi_state_available, multi_state_unavailable) in enumerate(
+            product(state_variants, state_variants, multi_state_variants, multi_state_variants)
+        ):
+            Action.objects.create(
+                prototype=self.cluster.prototype,
+                name=f"action_{i}",
+                state_available=state_available,
+                state_unavailable=state_unavailable,
+                multi_state_available=multi_state_available,
+                multi_state_unavailable=multi_state_unavailable,
+            )
+
+    def test_same_as_allowed(self) -> None:
+        cluster = Cluster.objects.get(pk=self.cluster.pk)
+        actions = list(Action.objects.filter(prototype=cluster.prototype).select_related("prototype").order_by("pk"))
+
+        expected = [action.pk for action in actions if action.allowed(obj=cluster)]
+
+        with self.assertNumQueries(0):
+            actual = [
+                action.pk
+                for action in filter_available_actions(actions=actions, prototype_objects={cluster.prototype: cluster})
+            ]
+
+        self.assertNotEqual(expected, [])
+        self.assertNotEqual(len(expected), len(actions))
+        self.assertListEqual(actual, expected)
+
+
+class TestRunPermissions(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cluster = gen_cluster()
+        self.actions = [gen_action(name=f"action_{i}", prototype=self.cluster.prototype) for i in range(10)]
+        self.user = User.objects.create_user(username="regular", password="password")  # noqa: S106
+        self.group = Group.objects.create(name="action runners")
+        self.user.groups.add(self.group)
+
+        content_type = ContentType.objects.get_for_model(Cluster)
+        for i, action in enumerate(self.actions):
+            permission = Permission.objects.create(
+                codename=f"run_action_{get_str_hash(value=action.name)}", content_type=content_type, name=action.name
+            )
+
+            if i % 3 == 0:
+                assign_perm(permission, self.user, self.cluster)
+            elif i % 3 == 1:
+                assign_perm(permission, self.group, self.cluster)
+
+    def test_same_as_has_perm(self) -> None:
+        user = User.objects.get(pk=self.user.pk)
+        expected = [action.pk for action in self.actions if check_run_perms(user=user, action=action, obj=self.cluster)]
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(2):
+            actual = [
+                action.pk for action in filter_actions_by_user_perm(user=user, obj=self.cluster, actions=self.actions)
+            ]
+
+        self.assertEqual(len(expected), 7)
+        self.assertListEqual(actual, expected)
+
+    def test_superuser_has_all(self) -> None:
+        self.user.is_superuser = True
+        self.user.save(update_fields=["is_superuser"])
+
+        with self.assertNumQueries(0):
+            actual = list(filter_actions_by_user_perm(user=self.user, obj=self.cluster, actions=self.actions))
+
+        self.assertListEqual(actual, self.actions)
@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest.mock import patch
+import time
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+import task_runner
+
+from cm.errors import AdcmEx
+from cm.models import Action, ConcernItem, ConcernType, Host, JobLog, LogStorage, TaskLog
+from cm.services.job.action import ActionRunPayload, run_action_bulk
+
+
+class TestActionBulkRun(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        bundle = self.add_bundle(source_dir=Path(__file__).parent / "bundles" / "provider")
+        self.provider = self.add_provider(bundle=bundle, name="provider")
+        for i in range(5):
+            self.add_host(provider=self.provider, fqdn=f"host-{i}")
+
+        self.hosts = list(Host.objects.select_related("prototype").order_by("pk"))
+        self.action = Action.objects.select_related("prototype").get(name="action_on_host")
+
+    def test_task_is_created_for_each_object(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock:
+            tasks = run_action_bulk(action=self.action, objects=self.hosts, payload=ActionRunPayload())
+
+        self.assertListEqual([task.task_object for task in tasks], self.hosts)
+        self.assertEqual(JobLog.objects.filter(task__in=tasks).count(), len(self.hosts))
+        self.assertEqual(LogStorage.objects.filter(job__task__in=tasks).count(), 2 * len(self.hosts))
+
+        for host, task in zip(self.hosts, tasks):
+            self.assertEqual(task.owner_id, host.pk)
+            self.assertIsNotNone(task.lock)
+            self.assertTrue(host.concerns.filter(pk=task.lock_id).exists())
+
+        popen_mock.assert_called_once()
+        command = popen_mock.call_args.kwargs["args"]
+        self.assertEqual(command[1:3], ["start-batch", "--concurrency"])
+        self.assertListEqual(command[4:], [str(task.pk) for task in tasks])
+
+    def test_one_locked_object_fails_whole_launch(self) -> None:
+        lock = ConcernItem.objects.create(type=ConcernType.LOCK, name="lock", reason={}, owner=self.hosts[2])
+        self.hosts[2].concerns.add(lock)
+
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock, self.assertRaises(AdcmEx) as error:
+            run_action_bulk(action=self.action, objects=self.hosts, payload=ActionRunPayload())
+
+        self.assertEqual(error.exception.code, "LOCK_ERROR")
+        self.assertFalse(TaskLog.objects.exists())
+        popen_mock.assert_not_called()
+
+    def test_batch_runner_runs_tasks_of_one_owner_one_by_one(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen"):
+            tasks = run_action_bulk(action=self.action, objects=self.hosts, payload=ActionRunPayload())
+
+        # the same as host action on hosts of one cluster
+        shared_owner = [task.pk for task in tasks[:3]]
+        TaskLog.objects.filter(id__in=shared_owner).update(owner_type="cluster", owner_id=1)
+
+        events_file = Path(self.directories["DATA_DIR"]) / "events.txt"
+
+        def run_forked(task_id: int) -> None:
+            with events_file.open(mode="a", encoding="utf-8") as events:
+                events.write(f"start {task_id}\n")
+            time.sleep(0.1)
+            with events_file.open(mode="a", encoding="utf-8") as events:
+                events.write(f"end {task_id}\n")
+
+        with patch("task_runner.run_forked", new=run_forked), patch("task_runner.connections"):
+            task_runner.run_batch(task_ids=[task.pk for task in tasks], concurrency=5)
+
+        events = [
+            line.split()
+            for line in events_file.read_text(encoding="utf-8").splitlines()
+            if int(line.split()[1]) in shared_owner
+        ]
+        self.assertListEqual(events, [[event, str(task_id)] for task_id in shared_owner for event in ("start", "end")])
@@ -13,7 +13,9 @@
 from pathlib import Path
 
 from adcm.tests.base import BaseTestCase, BusinessLogicMixin
-from ansible_plugin.utils import set_cluster_config, set_provider_config
+from ansible.errors import AnsibleError
+from ansible_plugin.utils import flush_deferred_config, set_cluster_config, set_provider_config
+from django.conf import settings
 
 from cm.adcm_config.ansible import ansible_decrypt
 from cm.models import ConfigLog
@@ -153,3 +155,82 @@ class TestAnsiblePluginADCMConfig(BusinessLogicMixin, BaseTestCase):
         self.cluster_1.refresh_from_db()
         changed_cluster_config = ConfigLog.objects.get(id=self.cluster_1.config.current)
         self.assertEqual(changed_cluster_config.pk, self.current_cluster_1_config.pk)
+
+
+class TestAnsiblePluginADCMConfigDeferred(BusinessLogicMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        bundles_dir = Path(__file__).parent.parent / "bundles"
+        self.cluster = self.add_cluster(
+            bundle=self.add_bundle(source_dir=bundles_dir / "cluster_full_config"), name="cluster"
+        )
+        self.provider = self.add_provider(
+            bundle=self.add_bundle(source_dir=bundles_dir / "provider_full_config"), name="provider"
+        )
+
+        self.job_id = 1000
+        (settings.RUN_DIR / str(self.job_id)).mkdir(parents=True, exist_ok=True)
+
+    def _config_revisions(self) -> int:
+        return ConfigLog.objects.filter(obj_ref__in=(self.cluster.config, self.provider.config)).count()
+
+    def test_deferred_changes_saved_as_single_revision_success(self):
+        initial_revisions = self._config_revisions()
+
+        for value in range(1, 6):
+            result = set_cluster_config(
+                cluster_id=self.cluster.pk, config={"integer": str(value)}, attr={}, defer_job_id=self.job_id
+            )
+            self.assertEqual(result.value, str(value))
+            self.assertTrue(result.changed)
+
+        set_cluster_config(
+            cluster_id=self.cluster.pk,
+            config={"plain_group": {"simple": "whole group"}},
+            attr={},
+            defer_job_id=self.job_id,
+        )
+        set_cluster_config(
+            cluster_id=self.cluster.pk, config={"plain_group/simple": "subkey"}, attr={}, defer_job_id=self.job_id
+        )
+        set_provider_config(
+            provider_id=self.provider.pk, config={"source_list": ["deferred"]}, attr={}, defer_job_id=self.job_id
+        )
+
+        self.assertEqual(self._config_revisions(), initial_revisions)
+
+        self.assertTrue(flush_deferred_config(job_id=self.job_id))
+
+        self.assertEqual(self._config_revisions(), initial_revisions + 2)
+        self.cluster.refresh_from_db()
+        self.provider.refresh_from_db()
+        cluster_config = ConfigLog.objects.get(id=self.cluster.config.current).config
+        self.assertEqual(cluster_config["integer"], 5)
+        self.assertEqual(cluster_config["plain_group"]["simple"], "subkey")
+        self.assertListEqual(ConfigLog.objects.get(id=self.provider.config.current).config["source_list"], ["deferred"])
+
+        self.assertFalse(flush_deferred_config(job_id=self.job_id))
+        self.assertEqual(self._config_revisions(), initial_revisions + 2)
+
+    def test_deferred_change_is_compared_with_pending_changes_success(self):
+        current_value = ConfigLog.objects.get(id=self.cluster.config.current).config["string"]
+
+        result = set_cluster_config(
+            cluster_id=self.cluster.pk, config={"string": current_value}, attr={}, defer_job_id=self.job_id
+        )
+        self.assertFalse(result.changed)
+
+        set_cluster_config(cluster_id=self.cluster.pk, config={"string": "new"}, attr={}, defer_job_id=self.job_id)
+        result = set_cluster_config(
+            cluster_id=self.cluster.pk, config={"string": "new"}, attr={}, defer_job_id=self.job_id
+        )
+        self.assertFalse(result.changed)
+
+    def test_deferred_change_of_unknown_key_fail(self):
+        with self.assertRaisesRegex(AnsibleError, "Config parameter 'plain_group/unknown' does not exist"):
+            set_cluster_config(
+                cluster_id=self.cluster.pk, config={"plain_group/unknown": 1}, attr={}, defer_job_id=self.job_id
+            )
+
+        self.assertFalse(flush_deferred_config(job_id=self.job_id))
@@ -12,10 +12,20 @@
 
 from pathlib import Path
 import json
-
-from adcm.tests.base import APPLICATION_JSON, BaseTestCase, BundleLogicMixin, BusinessLogicMixin
+import string
+
+from adcm.tests.base import (
+    APPLICATION_JSON,
+    BaseTestCase,
+    BundleLogicMixin,
+    BusinessLogicMixin,
+    ParallelReadyTestCase,
+    TestCaseWithCommonSetUpTearDown,
+)
+from adcm_version import compare_prototype_versions
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -27,7 +37,7 @@ from rest_framework.status import (
 
 from cm.adcm_config.ansible import ansible_decrypt
 from cm.api import delete_host_provider
-from cm.bundle import delete_bundle
+from cm.bundle import VERSION_ORDER_GAP, delete_bundle, get_version_key, order_versions
 from cm.errors import AdcmEx
 from cm.models import (
     Action,
@@ -524,3 +534,118 @@ class TestBundleParsing(BaseTestCase, BundleLogicMixin):
             self.assertDictEqual(jinja_paths, expected_task_jinja_paths)
             paths = {sa.name: sa.script for sa in SubAction.objects.filter(action__prototype=proto)}
             self.assertDictEqual(paths, expected_scripts)
+
+
+class TestVersionOrder(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase):
+    versions = (
+        "1",
+        "1.0",
+        "1.00.1",
+        "1.0~rc1",
+        "1.0~rc2",
+        "1.0a",
+        "1.0b",
+        "1.0ab",
+        "1.0.1",
+        "1.2",
+        "1.10",
+        "1.10-1",
+        "2.0.0-b123",
+        "2.0.0-b1234",
+        "2.0.0",
+        "10",
+        "~10",
+        "a",
+        "B",
+        "2024.01.10.15-a1b2c3d4",
+        "3.1.2.1-1.2.1",
+    )
+
+    def assert_order_matches_comparison(self, model) -> None:
+        rows = list(model.objects.values_list("version", "version_order"))
+
+        for version_a, order_a in rows:
+            for version_b, order_b in rows:
+                comparison = compare_prototype_versions(version_a, version_b)
+                self.assertEqual(
+                    (order_a > order_b) - (order_a < order_b),
+                    comparison,
+                    f"{version_a} ({order_a}) vs {version_b} ({order_b})",
+                )
+
+    def test_version_key_matches_comparison(self) -> None:
+        for version_a in self.versions:
+            for version_b in self.versions:
+                key_a, key_b = get_version_key(version_a), get_version_key(version_b)
+                with self.subTest(version_a=version_a, version_b=version_b):
+                    self.assertEqual(
+                        (key_a > key_b) - (key_a < key_b), compare_prototype_versions(version_a, version_b)
+                    )
+
+    def test_incremental_ordering(self) -> None:
+        for version in self.versions:
+            cook_cluster_bundle(version)
+            order_versions()
+
+            self.assert_order_matches_comparison(Prototype)
+            self.assert_order_matches_comparison(Bundle)
+
+    def test_only_new_versions_are_ordered(self) -> None:
+        for version in ("1.0", "3.0"):
+            cook_cluster_bundle(version)
+        order_versions()
+
+        existing = dict(Prototype.objects.values_list("id", "version_order"))
+
+        cook_cluster_bundle("2.0")
+        order_versions()
+
+        self.assertDictEqual(
+            dict(Prototype.objects.filter(id__in=existing).values_list("id", "version_order")), existing
+        )
+        self.assert_order_matches_comparison(Prototype)
+
+    def test_renumber_when_gap_is_exhausted(self) -> None:
+        cook_cluster_bundle("1")
+        cook_cluster_bundle("2")
+        order_versions()
+
+        # each version is inserted between "1" and previously inserted one, so the gap is halved every time
+        for letter in reversed(string.ascii_lowercase[-(VERSION_ORDER_GAP.bit_length() + 1) :]):
+            cook_cluster_bundle(f"1.{letter}")
+            order_versions()
+
+            self.assert_order_matches_comparison(Prototype)
+
+    def test_legacy_orders_are_renumbered(self) -> None:
+        for version in ("2.0", "1.0", "1.5"):
+            cook_cluster_bundle(version)
+        order_versions()
+        Prototype.objects.update(version_key="", version_order=1)
+
+        order_versions()
+
+        self.assert_order_matches_comparison(Prototype)
+        self.assertFalse(Prototype.objects.filter(version_key="").exists())
+
+    def test_upload_cost_does_not_grow_with_catalog(self) -> None:
+        def add_version(version: str) -> tuple[int, int]:
+            cook_cluster_bundle(version)
+            with CaptureQueriesContext(connection) as queries:
+                order_versions()
+
+            updated = sum(
+                query["sql"].count("WHEN") for query in queries.captured_queries if query["sql"].startswith("UPDATE")
+            )
+            return len(queries), updated
+
+        add_version("0.1")
+        small_catalog = add_version("0.2")
+
+        for i in range(1, 50):
+            cook_cluster_bundle(f"1.{i}")
+        order_versions()
+
+        large_catalog = add_version("1.25.1")
+
+        self.assertEqual(small_catalog, large_catalog)
@@ -0,0 +1,131 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from copy import deepcopy
+from datetime import timedelta
+from io import StringIO
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from cm.adcm_config.config import save_object_config
+from cm.models import ADCM, ConfigLog
+from cm.services.config import retrieve_config_attr_pairs
+from cm.services.config.history import compact_config_history
+
+
+@override_settings(CONFIG_LOG_DELTA_STORAGE=True, CONFIG_LOG_SNAPSHOT_INTERVAL=3)
+class TestConfigHistoryDeltaStorage(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.adcm = ADCM.objects.first()
+
+    def _save_revisions(self, amount: int) -> list[tuple[int, dict, dict]]:
+        current = ConfigLog.objects.get(pk=self.adcm.config.current)
+        revisions = [(current.pk, deepcopy(current.config), deepcopy(current.attr))]
+
+        for i in range(amount):
+            config = deepcopy(revisions[-1][1])
+            config["global"]["adcm_url"] = f"http://adcm-{i}.local"
+            attr = deepcopy(revisions[-1][2])
+            attr["logrotate"] = {"active": bool(i % 2)}
+
+            config_log = save_object_config(object_config=self.adcm.config, config=config, attr=attr)
+            revisions.append((config_log.pk, config, attr))
+
+        self.adcm.config.refresh_from_db()
+
+        return revisions
+
+    def test_history_is_stored_as_deltas_and_restored(self) -> None:
+        revisions = self._save_revisions(amount=10)
+
+        self.assertTrue(ConfigLog.objects.filter(obj_ref=self.adcm.config, delta__isnull=False).exists())
+
+        for pinned_id in (self.adcm.config.current, self.adcm.config.previous):
+            self.assertIsNone(ConfigLog.objects.values_list("delta", flat=True).get(pk=pinned_id))
+
+        for config_log_id, config, attr in revisions:
+            config_log = ConfigLog.objects.get(pk=config_log_id)
+            self.assertDictEqual(config_log.config, config)
+            self.assertDictEqual(config_log.attr, attr)
+
+        restored = retrieve_config_attr_pairs(configurations=[id_ for id_, *_ in revisions])
+        for config_log_id, config, attr in revisions:
+            self.assertDictEqual(restored[config_log_id].config, config)
+            self.assertDictEqual(restored[config_log_id].attr, attr)
+
+        self.assertFalse(
+            ConfigLog.objects.filter(base__isnull=False).exclude(base__delta__isnull=True).exists(),
+            msg="Delta records should be based only on full snapshots",
+        )
+
+    def test_saving_restored_delta_stores_it_in_full(self) -> None:
+        revisions = self._save_revisions(amount=6)
+        delta_id, config, _ = next(
+            revision for revision in revisions if ConfigLog.objects.filter(pk=revision[0], delta__isnull=False).exists()
+        )
+
+        config_log = ConfigLog.objects.get(pk=delta_id)
+        config_log.description = "restored"
+        config_log.save(update_fields=["description"])
+
+        stored = ConfigLog.objects.values("config", "delta", "base_id", "description").get(pk=delta_id)
+        self.assertDictEqual(stored["config"], config)
+        self.assertIsNone(stored["delta"])
+        self.assertIsNone(stored["base_id"])
+        self.assertEqual(stored["description"], "restored")
+
+    def test_compact_existing_history(self) -> None:
+        with override_settings(CONFIG_LOG_DELTA_STORAGE=False):
+            revisions = self._save_revisions(amount=8)
+
+        self.assertFalse(ConfigLog.objects.filter(delta__isnull=False).exists())
+
+        converted = compact_config_history(object_config_ids=[self.adcm.config.pk])
+
+        self.assertGreater(converted, 0)
+        for config_log_id, config, attr in revisions:
+            config_log = ConfigLog.objects.get(pk=config_log_id)
+            self.assertDictEqual(config_log.config, config)
+            self.assertDictEqual(config_log.attr, attr)
+
+    def test_delete_object_config_with_deltas(self) -> None:
+        self._save_revisions(amount=5)
+
+        ConfigLog.objects.filter(obj_ref=self.adcm.config).delete()
+
+        self.assertFalse(ConfigLog.objects.filter(obj_ref=self.adcm.config).exists())
+
+    def test_rotation_keeps_snapshots_of_remaining_deltas(self) -> None:
+        current = ConfigLog.objects.get(pk=self.adcm.config.current)
+        current.config["audit_data_retention"]["config_rotation_in_db"] = 1
+        current.save(update_fields=["config"])
+        revisions = self._save_revisions(amount=10)
+        old_ids = [id_ for id_, *_ in revisions[:-3]]
+        ConfigLog.objects.filter(pk__in=old_ids).update(date=timezone.now() - timedelta(days=5))
+        kept_delta = ConfigLog.objects.get(pk=revisions[-3][0])
+        self.assertIsNotNone(kept_delta.base_id)
+
+        call_command("logrotate", target="config", batch_size=1, disable_logs=True, stdout=StringIO())
+
+        self.assertSetEqual(
+            set(ConfigLog.objects.filter(obj_ref=self.adcm.config).values_list("pk", flat=True)),
+            {kept_delta.base_id, *(id_ for id_, *_ in revisions[-3:])},
+        )
+        for config_log_id, config, attr in revisions[-3:]:
+            config_log = ConfigLog.objects.get(pk=config_log_id)
+            self.assertDictEqual(config_log.config, config)
+            self.assertDictEqual(config_log.attr, attr)
@@ -28,10 +28,19 @@ from cm.models import (
     Host,
     HostProvider,
     JobLog,
+    MaintenanceMode,
     ServiceComponent,
     TaskLog,
 )
-from cm.services.concern.flags import BuiltInFlag, ConcernFlag, lower_all_flags, lower_flag, raise_flag
+from cm.services.concern.flags import (
+    BuiltInFlag,
+    ConcernFlag,
+    lower_all_flags,
+    lower_flag,
+    raise_flag,
+    update_hierarchy,
+    update_hierarchy_for_clusters,
+)
 
 
 class TestFlag(BaseTestCase, BusinessLogicMixin):
@@ -221,3 +230,113 @@ class TestFlag(BaseTestCase, BusinessLogicMixin):
         lower_all_flags(on_objects=[CoreObjectDescriptor(id=component_2.id, type=ADCMCoreType.COMPONENT)])
         self.assertEqual(ConcernItem.objects.count(), 12)
         self.assertEqual(ConcernItem.objects.filter(type=ConcernType.FLAG).count(), 0)
+
+
+class TestFlagsHierarchyOfClusters(BusinessLogicMixin, BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        bundles_dir = Path(__file__).parent / "bundles"
+        cluster_bundle = self.add_bundle(bundles_dir / "cluster_1")
+        provider_bundle = self.add_bundle(bundles_dir / "provider")
+
+        self.cluster_1, self.cluster_2, self.cluster_3 = (
+            self.add_cluster(bundle=cluster_bundle, name=f"Cluster {i}") for i in range(1, 4)
+        )
+        self.provider, another_provider = (
+            self.add_provider(bundle=provider_bundle, name=f"Provider {i}") for i in range(1, 3)
+        )
+
+        # provider's hosts are in two clusters, so cluster_2 is reached by provider's flags
+        for cluster, provider, hosts_amount in (
+            (self.cluster_1, self.provider, 4),
+            (self.cluster_2, self.provider, 2),
+            (self.cluster_3, another_provider, 2),
+        ):
+            self.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=cluster)
+            hosts = [
+                self.add_host(provider=provider, fqdn=f"{cluster.name}-host-{i}", cluster=cluster)
+                for i in range(hosts_amount)
+            ]
+            components = ServiceComponent.objects.filter(cluster=cluster).order_by("id")
+            self.set_hostcomponent(
+                cluster=cluster,
+                entries=[(host, component) for i, host in enumerate(hosts) for component in components[i % 2 :]],
+            )
+
+        self.add_host(provider=self.provider, fqdn="free-host")
+
+        flag = ConcernFlag(name="custom", message="flag")
+        for model in (Cluster, ClusterObject, ServiceComponent, HostProvider, Host):
+            raise_flag(
+                flag=flag,
+                on_objects=[
+                    CoreObjectDescriptor(id=object_.id, type=orm_object_to_core_type(object_))
+                    for object_ in model.objects.all()
+                ],
+            )
+
+        for concern in ConcernItem.objects.filter(type=ConcernType.FLAG):
+            update_hierarchy(concern=concern)
+
+    @staticmethod
+    def get_flags_links() -> set[tuple[int, str, int]]:
+        return {
+            (concern.id, object_.prototype.type, object_.id)
+            for concern in ConcernItem.objects.filter(type=ConcernType.FLAG)
+            for object_ in concern.related_objects
+        }
+
+    def test_same_links_as_tree_success(self) -> None:
+        service = ClusterObject.objects.filter(cluster=self.cluster_1).order_by("id").last()
+        component = ServiceComponent.objects.filter(cluster=self.cluster_1).order_by("id").first()
+        host_1, _, host_3, _ = Host.objects.filter(cluster=self.cluster_1).order_by("id")
+
+        for name, change_maintenance_mode in (
+            ("service", lambda: ClusterObject.objects.filter(id=service.id).update(_maintenance_mode="on")),
+            ("component", lambda: ServiceComponent.objects.filter(id=component.id).update(_maintenance_mode="on")),
+            ("host", lambda: Host.objects.filter(id=host_1.id).update(maintenance_mode=MaintenanceMode.ON)),
+            ("changing host", lambda: Host.objects.filter(id=host_1.id).update(maintenance_mode="changing")),
+            (
+                "all hosts of component",
+                lambda: Host.objects.filter(id=host_3.id).update(maintenance_mode=MaintenanceMode.ON),
+            ),
+            ("turn off", lambda: ClusterObject.objects.filter(id=service.id).update(_maintenance_mode="off")),
+        ):
+            with self.subTest(name):
+                change_maintenance_mode()
+
+                links_before = self.get_flags_links()
+                update_hierarchy_for_clusters(cluster_ids=[self.cluster_1.id])
+                links = self.get_flags_links()
+
+                for concern in ConcernItem.objects.filter(type=ConcernType.FLAG):
+                    update_hierarchy(concern=concern)
+
+                self.assertSetEqual(links, self.get_flags_links())
+                self.assertNotEqual(links, links_before)
+
+    def test_only_clusters_hierarchy_is_updated(self) -> None:
+        for model in (Cluster, ClusterObject, ServiceComponent, HostProvider, Host):
+            model.concerns.through.objects.all().delete()
+
+        update_hierarchy_for_clusters(cluster_ids=[self.cluster_1.id])
+
+        expected_owners = {
+            (object_.prototype.type, object_.id)
+            for object_ in (
+                self.cluster_1,
+                *ClusterObject.objects.filter(cluster=self.cluster_1),
+                *ServiceComponent.objects.filter(cluster=self.cluster_1),
+                *Host.objects.filter(cluster=self.cluster_1),
+                self.provider,
+            )
+        }
+        self.assertSetEqual(
+            {
+                (concern.owner.prototype.type, concern.owner_id)
+                for concern in ConcernItem.objects.filter(type=ConcernType.FLAG)
+                if any(True for _ in concern.related_objects)
+            },
+            expected_owners,
+        )
@@ -11,10 +11,11 @@
 # limitations under the License.
 
 from operator import attrgetter
+from pathlib import Path
 from typing import Iterable
 from unittest.mock import patch
 
-from adcm.tests.base import BaseTestCase
+from adcm.tests.base import BaseTestCase, BusinessLogicMixin
 
 from cm.api import add_cluster, add_service_to_cluster
 from cm.hierarchy import Tree
@@ -33,10 +34,16 @@ from cm.models import (
     ClusterBind,
     ClusterObject,
     ConcernCause,
+    ConcernItem,
+    ConcernType,
+    Host,
+    MaintenanceMode,
     Prototype,
     PrototypeImport,
+    ServiceComponent,
 )
 from cm.services.cluster import perform_host_to_cluster_map
+from cm.services.maintenance_mode import set_maintenance_mode
 from cm.services.status import notify
 from cm.tests.utils import gen_job_log, gen_service, gen_task_log, generate_hierarchy
 
@@ -367,3 +374,53 @@ class TestConcernsRedistribution(BaseTestCase):
         self.assertEqual(
             set(map(attrgetter("owner_type"), concerns_after)), {self.hostprovider.content_type, self.host.content_type}
         )
+
+
+class TestConcernsRedistributionOnMaintenanceModeChange(BusinessLogicMixin, BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        bundles_dir = Path(__file__).parent / "bundles"
+        self.cluster = self.add_cluster(bundle=self.add_bundle(bundles_dir / "cluster_1"), name="Cluster")
+        self.provider = self.add_provider(bundle=self.add_bundle(bundles_dir / "provider"), name="Provider")
+        self.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=self.cluster)
+
+        self.hosts = [self.add_host(provider=self.provider, fqdn=f"host-{i}", cluster=self.cluster) for i in range(3)]
+        self.components = list(ServiceComponent.objects.filter(cluster=self.cluster).order_by("id"))
+        self.set_hostcomponent(
+            cluster=self.cluster,
+            entries=[(host, component) for i, host in enumerate(self.hosts) for component in self.components[i:]],
+        )
+
+        with patch("cm.issue._issue_check_map", TestConcernsRedistribution.MOCK_ISSUE_CHECK_MAP_ALL_FALSE):
+            for object_ in (self.cluster, self.provider, *self.components, *self.hosts):
+                add_issue_on_linked_objects(object_, ConcernCause.CONFIG)
+
+    def assert_concerns_follow_hierarchy(self) -> None:
+        for concern in ConcernItem.objects.filter(type=ConcernType.ISSUE):
+            tree = Tree(concern.owner)
+            self.assertSetEqual(
+                set(concern.related_objects),
+                {node.value for node in tree.get_directly_affected(node=tree.built_from)},
+            )
+
+    def test_concerns_follow_maintenance_mode_success(self) -> None:
+        host, *_ = self.hosts
+        component, *_ = self.components
+        issues_of_host = set(host.concerns.values_list("id", flat=True))
+
+        set_maintenance_mode(obj=Host.objects.get(id=host.id), value=MaintenanceMode.ON)
+
+        self.assert_concerns_follow_hierarchy()
+        # host is out of hierarchy, so its own issue isn't linked to cluster's objects
+        self.assertListEqual(list(host.get_own_issue(cause=ConcernCause.CONFIG).related_objects), [host])
+
+        set_maintenance_mode(obj=ServiceComponent.objects.get(id=component.id), value=MaintenanceMode.ON)
+
+        self.assert_concerns_follow_hierarchy()
+
+        set_maintenance_mode(obj=ServiceComponent.objects.get(id=component.id), value=MaintenanceMode.OFF)
+        set_maintenance_mode(obj=Host.objects.get(id=host.id), value=MaintenanceMode.OFF)
+
+        self.assert_concerns_follow_hierarchy()
+        self.assertSetEqual(set(host.concerns.values_list("id", flat=True)), issues_of_host)
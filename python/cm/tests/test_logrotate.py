@@ -0,0 +1,83 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+import os
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from guardian.models import UserObjectPermission
+from guardian.shortcuts import assign_perm
+
+from cm.models import ADCM, ConfigLog, JobLog, LogStorage, TaskLog
+
+
+class TestJobLogRotation(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        adcm = ADCM.objects.first()
+        config_log = ConfigLog.objects.get(id=adcm.config.current)
+        config_log.config["audit_data_retention"].update({"log_rotation_in_db": 1, "log_rotation_on_fs": 1})
+        config_log.save(update_fields=["config"])
+
+        self.old_date = timezone.now() - timedelta(days=3)
+
+    def _create_task(self, finish_date, status: str = "success", jobs: int = 2) -> tuple[TaskLog, list[JobLog]]:
+        task = TaskLog.objects.create(object_id=1, start_date=self.old_date, finish_date=finish_date, status=status)
+        jobs = [
+            JobLog.objects.create(task=task, start_date=self.old_date, finish_date=finish_date, status=status)
+            for _ in range(jobs)
+        ]
+        for job in jobs:
+            LogStorage.objects.create(job=job, name="ansible", type="stdout", format="txt")
+            (Path(settings.RUN_DIR) / str(job.pk)).mkdir()
+
+        return task, jobs
+
+    def test_rotation_by_batches(self):
+        old_tasks = [self._create_task(finish_date=self.old_date) for _ in range(3)]
+        recent_task, recent_jobs = self._create_task(finish_date=timezone.now())
+        running_task, running_jobs = self._create_task(finish_date=None, status="running")
+
+        user = User.objects.create_user(username="task_viewer")
+        assign_perm(perm="cm.view_tasklog", user_or_group=user, obj=old_tasks[0][0])
+        assign_perm(perm="cm.view_tasklog", user_or_group=user, obj=recent_task)
+
+        run_dir = Path(settings.RUN_DIR)
+        orphan_dir = run_dir / "100500"
+        orphan_dir.mkdir()
+        old_timestamp = self.old_date.timestamp()
+        os.utime(orphan_dir, (old_timestamp, old_timestamp))
+        recent_file = run_dir / "recent.txt"
+        recent_file.touch()
+
+        call_command("logrotate", target="job", batch_size=2, workers=2, disable_logs=True, stdout=StringIO())
+
+        self.assertSetEqual(set(TaskLog.objects.values_list("pk", flat=True)), {recent_task.pk, running_task.pk})
+        self.assertSetEqual(
+            set(JobLog.objects.values_list("pk", flat=True)), {job.pk for job in (*recent_jobs, *running_jobs)}
+        )
+        self.assertEqual(LogStorage.objects.count(), len(recent_jobs) + len(running_jobs))
+        self.assertListEqual(
+            list(UserObjectPermission.objects.filter(user=user).values_list("object_pk", flat=True)),
+            [str(recent_task.pk)],
+        )
+        self.assertSetEqual(
+            {path.name for path in run_dir.iterdir()},
+            {str(job.pk) for job in (*recent_jobs, *running_jobs)} | {recent_file.name},
+        )
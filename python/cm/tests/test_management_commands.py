@@ -10,13 +10,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import json
 
+from adcm.tests.base import BaseTestCase, BusinessLogicMixin
 from api_v2.tests.base import BaseAPITestCase
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.management import load_command_class
 from rbac.models import Policy, Role, User
 
-from cm.models import ADCM, Bundle, ServiceComponent
+from cm.adcm_config.ansible import ansible_decrypt
+from cm.errors import AdcmEx
+from cm.management.commands.dumpcluster import (
+    DUMP_FORMAT_HEADER,
+    dump,
+    encrypt_data,
+    get_fernet,
+    iter_records,
+    write_records,
+)
+from cm.management.commands.loadcluster import load
+from cm.models import ADCM, Bundle, Cluster, ConfigLog, GroupConfig, Host, HostComponent, ServiceComponent
 from cm.tests.utils import gen_cluster, gen_provider
 
 
@@ -196,3 +213,171 @@ class TestStatistics(BaseAPITestCase):
         self.assertListEqual(data["data"]["providers"], expected_data["data"]["providers"])
         self.assertListEqual(data["data"]["users"], expected_data["data"]["users"])
         self.assertListEqual(data["data"]["roles"], expected_data["data"]["roles"])
+
+
+@patch("getpass.getpass", return_value="dump password")
+class TestDumpLoadCluster(BusinessLogicMixin, BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        bundles_dir = Path(__file__).parent / "bundles"
+        self.cluster = self.add_cluster(bundle=self.add_bundle(bundles_dir / "cluster_1"), name="Dumped Cluster")
+        self.provider = self.add_provider(bundle=self.add_bundle(bundles_dir / "provider"), name="Dumped Provider")
+        hosts = [self.add_host(provider=self.provider, fqdn=f"host-{i}", cluster=self.cluster) for i in range(5)]
+        self.add_host(provider=self.provider, fqdn="host-out-of-cluster")
+
+        self.add_services_to_cluster(["service_one_component", "service_two_components"], cluster=self.cluster)
+        components = ServiceComponent.objects.filter(cluster=self.cluster).order_by("pk")
+        self.set_hostcomponent(
+            cluster=self.cluster,
+            entries=[(host, component) for i, host in enumerate(hosts) for component in components[: i % 3 + 1]],
+        )
+
+        group = GroupConfig.objects.create(
+            object_type=ContentType.objects.get_for_model(ServiceComponent),
+            object_id=components[0].pk,
+            name="Component group",
+        )
+        group.hosts.set(hosts[:2])
+
+        self.directory = TemporaryDirectory()
+        self.dump_path = Path(self.directory.name) / "cluster.dump"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+        super().tearDown()
+
+    @staticmethod
+    def _describe_cluster(name: str) -> dict:
+        cluster = Cluster.objects.get(name=name)
+        config = ConfigLog.objects.get(id=cluster.config.current).config
+
+        return {
+            "config": {**config, "password": ansible_decrypt(config["password"])},
+            "hosts": sorted(Host.objects.filter(cluster=cluster).values_list("fqdn", "provider__name")),
+            "hc": sorted(
+                HostComponent.objects.filter(cluster=cluster).values_list(
+                    "host__fqdn", "service__prototype__name", "component__prototype__name"
+                )
+            ),
+            "groups": sorted(
+                (group.name, group.object.name, tuple(group.hosts.order_by("fqdn").values_list("fqdn", flat=True)))
+                for group in GroupConfig.objects.filter(object_type__model="servicecomponent")
+            ),
+        }
+
+    def _remove_dumped_cluster(self) -> None:
+        Host.objects.filter(cluster=self.cluster).delete()
+        self.cluster.delete()
+
+    def test_dump_and_load_success(self, _) -> None:
+        expected = self._describe_cluster(name=self.cluster.name)
+
+        with patch("cm.management.commands.dumpcluster.RECORDS_IN_CHUNK", 4):
+            dump(cluster_id=self.cluster.pk, output=self.dump_path)
+
+        lines = self.dump_path.read_text(encoding=settings.ENCODING_UTF_8).splitlines()
+        self.assertEqual(lines[0], DUMP_FORMAT_HEADER)
+        self.assertGreater(len(lines), 5)
+
+        self._remove_dumped_cluster()
+        with patch("cm.management.commands.loadcluster.OBJECTS_IN_BATCH", 2):
+            load(file_path=self.dump_path)
+
+        self.assertDictEqual(self._describe_cluster(name=self.cluster.name), expected)
+
+    def test_load_single_document_dump_success(self, _) -> None:
+        expected = self._describe_cluster(name=self.cluster.name)
+
+        data = {"bundles": {}, "providers": [], "hosts": [], "services": [], "components": [], "host_components": []}
+        data["groups"] = []
+        for record in iter_records(cluster_id=self.cluster.pk):
+            match record["type"]:
+                case "header":
+                    data.update(record["data"])
+                case "bundle":
+                    data["bundles"][record["data"]["hash"]] = record["data"]
+                case "cluster":
+                    data["cluster"] = record["data"]
+                case record_type:
+                    data[f"{record_type}s"].append(record["data"])
+
+        self.dump_path.write_bytes(encrypt_data("dump password", json.dumps(data, indent=2).encode()))
+
+        self._remove_dumped_cluster()
+        load(file_path=self.dump_path)
+
+        self.assertDictEqual(self._describe_cluster(name=self.cluster.name), expected)
+
+    def test_load_errors(self, _) -> None:
+        dump(cluster_id=self.cluster.pk, output=self.dump_path)
+
+        with self.assertRaises(AdcmEx) as err:
+            load(file_path=self.dump_path)
+
+        self.assertEqual(err.exception.code, "CLUSTER_CONFLICT")
+
+        # hosts are left without cluster
+        self.cluster.delete()
+        with self.assertRaises(AdcmEx) as err:
+            load(file_path=self.dump_path)
+
+        self.assertEqual(err.exception.code, "HOST_CONFLICT")
+        self.assertFalse(Cluster.objects.filter(name=self.cluster.name).exists())
+
+        with patch("getpass.getpass", return_value="wrong"), self.assertRaises(AdcmEx) as err:
+            load(file_path=self.dump_path)
+
+        self.assertEqual(err.exception.code, "WRONG_PASSWORD")
+        self.assertEqual(Host.objects.count(), 6)
+
+    def test_load_damaged_dump_fail(self, _) -> None:
+        with patch("cm.management.commands.dumpcluster.RECORDS_IN_CHUNK", 4):
+            dump(cluster_id=self.cluster.pk, output=self.dump_path)
+
+        header, *chunks = self.dump_path.read_text(encoding=settings.ENCODING_UTF_8).splitlines()
+        self._remove_dumped_cluster()
+
+        damaged_dumps = {
+            "truncated by lines": chunks[:-2],
+            "truncated inside chunk": [*chunks[:-1], chunks[-1][: len(chunks[-1]) // 2]],
+            "chunk dropped": [*chunks[:1], *chunks[2:]],
+            "chunks reordered": [chunks[1], chunks[0], *chunks[2:]],
+            "chunk duplicated": [*chunks[:2], *chunks[1:]],
+        }
+        for case, lines in damaged_dumps.items():
+            with self.subTest(case):
+                self.dump_path.write_text("\n".join((header, *lines, "")), encoding=settings.ENCODING_UTF_8)
+
+                with self.assertRaises(AdcmEx) as err:
+                    load(file_path=self.dump_path)
+
+                self.assertEqual(err.exception.code, "DUMP_LOAD_FILE_DAMAGED")
+                self.assertFalse(Cluster.objects.filter(name=self.cluster.name).exists())
+                self.assertEqual(Host.objects.count(), 1)
+
+        with self.subTest("wrong password"):
+            self.dump_path.write_text("\n".join((header, *chunks, "")), encoding=settings.ENCODING_UTF_8)
+
+            with patch("getpass.getpass", return_value="wrong"), self.assertRaises(AdcmEx) as err:
+                load(file_path=self.dump_path)
+
+            self.assertEqual(err.exception.code, "WRONG_PASSWORD")
+
+    def test_load_duplicated_fqdn_in_different_batches_fail(self, _) -> None:
+        records = list(iter_records(cluster_id=self.cluster.pk))
+        hosts = [record for record in records if record["type"] == "host"]
+        last_host_index = records.index(hosts[-1])
+        records.insert(last_host_index + 1, hosts[0])
+
+        with self.dump_path.open(mode="w", encoding=settings.ENCODING_UTF_8) as f:
+            write_records(records=records, fernet=get_fernet("dump password"), stream=f)
+
+        self._remove_dumped_cluster()
+        with patch("cm.management.commands.loadcluster.OBJECTS_IN_BATCH", 2), self.assertRaises(AdcmEx) as err:
+            load(file_path=self.dump_path)
+
+        self.assertEqual(err.exception.code, "HOST_CONFLICT")
+        self.assertFalse(Cluster.objects.filter(name=self.cluster.name).exists())
+        self.assertEqual(Host.objects.count(), 1)
@@ -0,0 +1,74 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from django.conf import settings
+
+from cm.log import LogStorageOutputSink, extract_log_content_from_db
+from cm.models import Action, JobLog, LogChunk, LogStorage
+from cm.services.job.action import ActionRunPayload, run_action
+from cm.services.job.run._target_factories import save_fs_logs_to_db
+from cm.services.job.run.repo import JobRepoImpl
+from cm.tests.mocks.task_runner import RunTaskMock
+
+
+class TestJobOutputSavedByChunks(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        cluster = self.add_cluster(
+            bundle=self.add_bundle(Path(__file__).parent / "bundles" / "cluster"), name="Cluster"
+        )
+        with RunTaskMock():
+            run_action(
+                action=Action.objects.get(prototype=cluster.prototype, name="two_ansible_steps"),
+                obj=cluster,
+                payload=ActionRunPayload(),
+            )
+
+        self.job = JobRepoImpl.get_job(id=JobLog.objects.order_by("id").values_list("id", flat=True).first())
+        self.work_dir = settings.RUN_DIR / str(self.job.id)
+        self.work_dir.mkdir(parents=True)
+        self.stdout_log = LogStorage.objects.get(job_id=self.job.id, type="stdout")
+
+    def _save_output(self, data: bytes, chunk_size: int) -> None:
+        (self.work_dir / "ansible-stdout.txt").write_bytes(data)
+
+        sink = LogStorageOutputSink(job_id=self.job.id, name=self.job.type.value)
+        for offset in range(0, len(data), chunk_size):
+            sink.append(stream="stdout", offset=offset, data=data[offset : offset + chunk_size])
+
+    def test_file_is_not_read_when_chunks_are_complete(self) -> None:
+        data = b"TASK [Gathering Facts]\nok: [host-1]\n" * 10_000
+        self._save_output(data=data, chunk_size=64 * 1024)
+
+        save_fs_logs_to_db(job=self.job, work_dir=self.work_dir, log_type="stdout")
+
+        self.stdout_log.refresh_from_db()
+        self.assertIsNone(self.stdout_log.body)
+        self.assertEqual(LogChunk.objects.filter(log=self.stdout_log).count(), len(data) // (64 * 1024) + 1)
+        # chunks are compressed
+        self.assertLess(sum(map(len, self.stdout_log.chunks.values_list("body", flat=True))), len(data) // 10)
+        self.assertEqual(extract_log_content_from_db(log_id=self.stdout_log.pk), data.decode("utf-8"))
+
+    def test_file_is_saved_when_chunks_are_incomplete(self) -> None:
+        data = b"ok: [host-1]\n" * 1000
+        self._save_output(data=data, chunk_size=1024)
+        LogChunk.objects.filter(log=self.stdout_log, offset=1024).delete()
+
+        save_fs_logs_to_db(job=self.job, work_dir=self.work_dir, log_type="stdout")
+
+        self.stdout_log.refresh_from_db()
+        self.assertEqual(self.stdout_log.body, data.decode("utf-8"))
+        self.assertFalse(LogChunk.objects.filter(log=self.stdout_log).exists())
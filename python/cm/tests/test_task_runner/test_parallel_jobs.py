@@ -0,0 +1,162 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from threading import Barrier, Lock
+from time import sleep
+from typing import Generator, Iterable
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from core.job.executors import ExecutionResult, ExecutorConfig
+from core.job.runners import ExecutionTarget, ExternalSettings
+from core.job.types import Job, Task
+from django.test import override_settings
+from typing_extensions import Self
+
+from cm.models import Action, JobLog, JobStatus, SubAction
+from cm.services.job.action import ActionRunPayload, run_action
+from cm.tests.mocks.task_runner import ETFMockWithEnvPreparation, MockExecutor, RunTaskMock
+
+
+class Tracker:
+    def __init__(self, simultaneous_jobs: Iterable[str] = ()):
+        self.lock = Lock()
+        # jobs that are expected to run at the same time wait for each other before finishing
+        self.simultaneous_jobs = set(simultaneous_jobs)
+        self.barrier = Barrier(parties=len(self.simultaneous_jobs), timeout=10) if self.simultaneous_jobs else None
+        self.running = 0
+        self.max_running = 0
+        self.events: list[tuple[str, str]] = []
+
+
+class TrackingExecutor(MockExecutor):
+    def __init__(self, *, job_name: str, tracker: Tracker, return_code: int, duration: float, **kwargs):
+        super().__init__(**kwargs)
+
+        self._job_name = job_name
+        self._tracker = tracker
+        self._return_code = return_code
+        self._duration = duration
+
+    def execute(self) -> Self:
+        with self._tracker.lock:
+            self._tracker.running += 1
+            self._tracker.max_running = max(self._tracker.max_running, self._tracker.running)
+            self._tracker.events.append(("start", self._job_name))
+
+        self._result = ExecutionResult(code=self._return_code)
+
+        return self
+
+    def wait_finished(self) -> Self:
+        if self._job_name in self._tracker.simultaneous_jobs:
+            self._tracker.barrier.wait()
+
+        sleep(self._duration)
+
+        with self._tracker.lock:
+            self._tracker.running -= 1
+            self._tracker.events.append(("finish", self._job_name))
+
+        return self
+
+
+class ETFMockWithTracking(ETFMockWithEnvPreparation):
+    def __init__(self, tracker: Tracker, failed_jobs: Iterable[str] = (), durations: dict[str, float] | None = None):
+        super().__init__()
+
+        self._tracker = tracker
+        self._failed_jobs = set(failed_jobs)
+        self._durations = durations or {}
+
+    def __call__(
+        self, task: Task, jobs: Iterable[Job], configuration: ExternalSettings
+    ) -> Generator[ExecutionTarget, None, None]:
+        for target in super().__call__(task=task, jobs=jobs, configuration=configuration):
+            yield target._replace(
+                executor=TrackingExecutor(
+                    job_name=target.job.name,
+                    tracker=self._tracker,
+                    return_code=1 if target.job.name in self._failed_jobs else 0,
+                    duration=self._durations.get(target.job.name, 0.2),
+                    config=ExecutorConfig(work_dir=configuration.adcm.run_dir / str(target.job.id)),
+                )
+            )
+
+
+class TestParallelJobGroups(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cluster = self.add_cluster(
+            bundle=self.add_bundle(Path(__file__).parent / "bundles" / "cluster"), name="Cluster"
+        )
+        self.action = Action.objects.get(prototype=self.cluster.prototype, name="with_parallel_checks")
+        self.tracker = Tracker()
+
+    def _run(self, etf: ETFMockWithTracking) -> dict[str, str]:
+        with RunTaskMock(execution_target_factory=etf) as run_task:
+            run_action(action=self.action, obj=self.cluster, payload=ActionRunPayload())
+
+        run_task.runner.run(task_id=run_task.target_task.pk)
+        run_task.target_task.refresh_from_db()
+        self.task_status = run_task.target_task.status
+
+        return dict(JobLog.objects.filter(task=run_task.target_task).values_list("name", "status"))
+
+    def test_parallel_group_is_loaded(self) -> None:
+        self.assertDictEqual(
+            dict(SubAction.objects.filter(action=self.action).values_list("name", "parallel_group")),
+            {"prepare": "", "check_1": "checks", "check_2": "checks", "check_3": "checks", "finish": ""},
+        )
+
+    @override_settings(JOB_PARALLEL_GROUP_LIMIT=3)
+    def test_group_is_executed_simultaneously(self) -> None:
+        self.tracker = Tracker(simultaneous_jobs=("check_1", "check_2", "check_3"))
+
+        jobs = self._run(etf=ETFMockWithTracking(tracker=self.tracker))
+
+        self.assertEqual(self.task_status, JobStatus.SUCCESS)
+        self.assertTrue(all(status == JobStatus.SUCCESS for status in jobs.values()))
+        self.assertEqual(self.tracker.max_running, 3)
+
+        events = self.tracker.events
+        self.assertListEqual(events[:2], [("start", "prepare"), ("finish", "prepare")])
+        self.assertSetEqual(set(events[2:5]), {("start", "check_1"), ("start", "check_2"), ("start", "check_3")})
+        self.assertSetEqual(set(events[5:8]), {("finish", "check_1"), ("finish", "check_2"), ("finish", "check_3")})
+        self.assertListEqual(events[8:], [("start", "finish"), ("finish", "finish")])
+
+    @override_settings(JOB_PARALLEL_GROUP_LIMIT=2)
+    def test_group_fan_out_is_bounded(self) -> None:
+        jobs = self._run(etf=ETFMockWithTracking(tracker=self.tracker))
+
+        self.assertEqual(self.task_status, JobStatus.SUCCESS)
+        self.assertTrue(all(status == JobStatus.SUCCESS for status in jobs.values()))
+        self.assertEqual(self.tracker.max_running, 2)
+
+    @override_settings(JOB_PARALLEL_GROUP_LIMIT=2)
+    def test_failed_job_stops_task_after_running_jobs_of_group(self) -> None:
+        jobs = self._run(
+            etf=ETFMockWithTracking(tracker=self.tracker, failed_jobs=["check_1"], durations={"check_1": 0.05})
+        )
+
+        self.assertEqual(self.task_status, JobStatus.FAILED)
+        self.assertDictEqual(
+            jobs,
+            {
+                "prepare": JobStatus.SUCCESS,
+                "check_1": JobStatus.FAILED,
+                "check_2": JobStatus.SUCCESS,
+                "check_3": JobStatus.CREATED,
+                "finish": JobStatus.CREATED,
+            },
+        )
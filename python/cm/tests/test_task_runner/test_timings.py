@@ -0,0 +1,70 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+
+from cm.models import Action, JobLog
+from cm.services.job.action import ActionRunPayload, run_action
+from cm.tests.mocks.task_runner import ETFMockWithEnvPreparation, RunTaskMock
+
+
+class TestExecutionTimings(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cluster = self.add_cluster(
+            bundle=self.add_bundle(Path(__file__).parent / "bundles" / "cluster"), name="Cluster"
+        )
+
+    def test_phases_of_task_and_jobs_are_saved(self) -> None:
+        with RunTaskMock(execution_target_factory=ETFMockWithEnvPreparation()) as run_task:
+            run_action(
+                action=Action.objects.get(prototype=self.cluster.prototype, name="two_ansible_steps"),
+                obj=self.cluster,
+                payload=ActionRunPayload(),
+            )
+
+        run_task.runner.run(task_id=run_task.target_task.pk)
+        task = run_task.target_task
+        task.refresh_from_db()
+
+        self.assertEqual(task.status, "success")
+        self.assertTrue(
+            {
+                "configure",
+                "jobs",
+                "finish.remove_task_lock",
+                "finish.audit",
+                "finish.update_owner_state",
+                "finish.update_issues",
+                "finish.reset_objects_in_mm",
+            }.issubset(task.timings)
+        )
+        self.assertTrue(all(isinstance(duration, float) and duration >= 0 for duration in task.timings.values()))
+
+        for timings in JobLog.objects.filter(task=task).values_list("timings", flat=True):
+            self.assertSetEqual(
+                set(timings),
+                {
+                    "prepare.write_ansible_job_config",
+                    "prepare.write_ansible_inventory",
+                    "prepare.write_ansible_cfg",
+                    "spawn",
+                    "run",
+                    "finalize.finish_check_logs",
+                    "finalize.flush_deferred_config_updates",
+                    "finalize.save_fs_logs_to_db.stderr",
+                    "finalize.save_fs_logs_to_db.stdout",
+                },
+            )
@@ -0,0 +1,208 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from itertools import count
+from pathlib import Path
+from unittest.mock import patch
+import os
+
+from adcm.tests.base import BusinessLogicMixin, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
+from django.test import SimpleTestCase, override_settings
+
+from cm.models import Action, Host, JobLog, JobStatus, TaskLog
+from cm.services.job.action import ActionRunPayload, run_action, run_action_bulk
+from cm.services.job.run import SchedulerLimits, TaskScheduler, get_queue_stats
+from cm.services.job.run._scheduler import ScheduledTask, select_tasks_to_dispatch
+
+
+class FakeRunner:
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.return_code = None
+
+    def poll(self) -> int | None:
+        return self.return_code
+
+
+class FakeSpawn:
+    def __init__(self):
+        self.runners: dict[int, FakeRunner] = {}
+        self._pids = count(start=1000)
+
+    def __call__(self, task_id: int, venv: str) -> FakeRunner:
+        _ = venv
+        self.runners[task_id] = FakeRunner(pid=next(self._pids))
+
+        return self.runners[task_id]
+
+
+class TestTaskSelection(SimpleTestCase):
+    @staticmethod
+    def _tasks(*clusters: int | None, action_id: int = 1, start: int = 1) -> list[ScheduledTask]:
+        return [
+            ScheduledTask(id=id_, cluster_id=cluster_id, action_id=action_id, owner=("host", id_))
+            for id_, cluster_id in enumerate(clusters, start=start)
+        ]
+
+    def test_clusters_are_served_in_turn(self) -> None:
+        queued = self._tasks(1, 1, 1, 1, 2, 2, 3)
+
+        selected = select_tasks_to_dispatch(
+            queued=queued, dispatched=(), limits=SchedulerLimits(total=5, per_cluster=0, per_action=0)
+        )
+
+        self.assertListEqual([task.id for task in selected], [1, 5, 7, 2, 6])
+
+    def test_task_over_limit_does_not_hold_queue(self) -> None:
+        dispatched = self._tasks(1, 1, start=100)
+        queued = [*self._tasks(1, 1, 2), *self._tasks(3, action_id=2, start=4), *self._tasks(4, 5, start=5)]
+
+        selected = select_tasks_to_dispatch(
+            queued=queued, dispatched=dispatched, limits=SchedulerLimits(total=10, per_cluster=2, per_action=3)
+        )
+
+        self.assertListEqual([task.id for task in selected], [3, 4])
+
+    def test_tasks_outside_of_cluster_are_limited_globally(self) -> None:
+        selected = select_tasks_to_dispatch(
+            queued=self._tasks(None, None, None, None),
+            dispatched=self._tasks(None, start=10),
+            limits=SchedulerLimits(total=3, per_cluster=1, per_action=0),
+        )
+
+        self.assertListEqual([task.id for task in selected], [1, 2])
+
+    def test_tasks_of_one_owner_are_dispatched_one_by_one(self) -> None:
+        queued = [task._replace(owner=("cluster", 1)) for task in self._tasks(1, 1, 1)]
+        queued.append(self._tasks(1, start=4)[0])
+        limits = SchedulerLimits(total=0, per_cluster=0, per_action=0)
+
+        selected = select_tasks_to_dispatch(queued=queued, dispatched=(), limits=limits)
+        self.assertListEqual([task.id for task in selected], [1, 4])
+
+        selected = select_tasks_to_dispatch(queued=queued[1:3], dispatched=queued[:1], limits=limits)
+        self.assertListEqual(selected, [])
+
+
+@override_settings(TASK_SCHEDULER_ENABLED=True)
+class TestTaskScheduler(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase, BusinessLogicMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        bundle = self.add_bundle(source_dir=Path(__file__).parent / "bundles" / "provider")
+        self.provider = self.add_provider(bundle=bundle, name="provider")
+        for i in range(5):
+            self.add_host(provider=self.provider, fqdn=f"host-{i}")
+
+        self.hosts = list(Host.objects.select_related("prototype").order_by("pk"))
+        self.action = Action.objects.select_related("prototype").get(name="action_on_host")
+
+    def test_launched_tasks_are_queued(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen") as popen_mock:
+            tasks = run_action_bulk(action=self.action, objects=self.hosts[:4], payload=ActionRunPayload())
+            task = run_action(action=self.action, obj=self.hosts[4], payload=ActionRunPayload())
+
+        popen_mock.assert_not_called()
+        for task_ in (*tasks, task):
+            task_.refresh_from_db()
+            self.assertEqual(task_.status, JobStatus.CREATED)
+            self.assertEqual(task_.pid, 0)
+            self.assertIsNotNone(task_.lock)
+
+        self.assertEqual(get_queue_stats().queued, 5)
+        self.assertEqual(get_queue_stats().dispatched, 0)
+
+    def test_dispatch_within_limits(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen"):
+            tasks = run_action_bulk(action=self.action, objects=self.hosts, payload=ActionRunPayload())
+
+        spawn = FakeSpawn()
+        scheduler = TaskScheduler(limits=SchedulerLimits(total=10, per_cluster=0, per_action=2), spawn=spawn)
+
+        self.assertListEqual(scheduler.dispatch(), [tasks[0].pk, tasks[1].pk])
+        self.assertListEqual(scheduler.dispatch(), [])
+        self.assertDictEqual(
+            dict(TaskLog.objects.filter(pid__gt=0).values_list("id", "pid")),
+            {task_id: runner.pid for task_id, runner in spawn.runners.items()},
+        )
+        self.assertEqual(get_queue_stats().queued, 3)
+
+        # runner marks task as running, then finishes it
+        TaskLog.objects.filter(id=tasks[0].pk).update(status=JobStatus.RUNNING)
+        self.assertListEqual(scheduler.dispatch(), [])
+
+        TaskLog.objects.filter(id=tasks[0].pk).update(status=JobStatus.SUCCESS)
+        spawn.runners[tasks[0].pk].return_code = 0
+        self.assertListEqual(scheduler.dispatch(), [tasks[2].pk])
+
+        stats = get_queue_stats()
+        self.assertEqual(stats.queued, 2)
+        self.assertEqual(stats.dispatched, 2)
+        self.assertDictEqual(stats.queued_by_cluster, {None: 2})
+
+    def test_task_is_failed_when_runner_exits_before_start(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen"):
+            task = run_action(action=self.action, obj=self.hosts[0], payload=ActionRunPayload())
+
+        spawn = FakeSpawn()
+        scheduler = TaskScheduler(limits=SchedulerLimits(total=1, per_cluster=0, per_action=0), spawn=spawn)
+        self.assertListEqual(scheduler.dispatch(), [task.pk])
+
+        spawn.runners[task.pk].return_code = 1
+        scheduler.dispatch()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, JobStatus.FAILED)
+        self.assertIsNotNone(task.finish_date)
+        self.assertIsNone(task.lock)
+        self.assertSetEqual(set(JobLog.objects.filter(task=task).values_list("status", flat=True)), {JobStatus.ABORTED})
+        self.assertEqual(get_queue_stats().dispatched, 0)
+
+    def test_tasks_of_dead_runners_are_failed_on_start(self) -> None:
+        with patch("cm.services.job.run._task.subprocess.Popen"):
+            tasks = run_action_bulk(action=self.action, objects=self.hosts[:3], payload=ActionRunPayload())
+
+        dead_pid = 4_000_000
+        TaskLog.objects.filter(id=tasks[0].pk).update(pid=dead_pid)
+        TaskLog.objects.filter(id=tasks[1].pk).update(pid=dead_pid, status=JobStatus.RUNNING)
+        TaskLog.objects.filter(id=tasks[2].pk).update(pid=os.getpid(), status=JobStatus.RUNNING)
+
+        scheduler = TaskScheduler(limits=SchedulerLimits(total=1, per_cluster=0, per_action=0), spawn=FakeSpawn())
+        with patch("cm.services.job.run._scheduler._is_process_alive", side_effect=lambda pid: pid != dead_pid):
+            self.assertListEqual(scheduler.fail_lost_tasks(), [tasks[0].pk, tasks[1].pk])
+
+        self.assertDictEqual(
+            dict(TaskLog.objects.filter(id__in=[task.pk for task in tasks]).values_list("id", "status")),
+            {tasks[0].pk: JobStatus.FAILED, tasks[1].pk: JobStatus.FAILED, tasks[2].pk: JobStatus.RUNNING},
+        )
+        self.assertListEqual(
+            list(TaskLog.objects.filter(lock__isnull=False).values_list("id", flat=True)), [tasks[2].pk]
+        )
+
+    def test_cancel_queued_task(self) -> None:
+        self.action.allow_to_terminate = True
+        self.action.save(update_fields=["allow_to_terminate"])
+
+        with patch("cm.services.job.run._task.subprocess.Popen"):
+            task = run_action(action=self.action, obj=self.hosts[0], payload=ActionRunPayload())
+
+        with patch("cm.models.os.kill") as kill_mock:
+            task.cancel()
+
+        kill_mock.assert_not_called()
+        self.assertEqual(task.status, JobStatus.ABORTED)
+        task.refresh_from_db()
+        self.assertEqual(task.status, JobStatus.ABORTED)
+        self.assertIsNotNone(task.finish_date)
+        self.assertIsNone(task.lock)
+        self.assertSetEqual(set(JobLog.objects.filter(task=task).values_list("status", flat=True)), {JobStatus.ABORTED})
+        self.assertListEqual(TaskScheduler(spawn=FakeSpawn()).dispatch(), [])
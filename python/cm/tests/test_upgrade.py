@@ -10,7 +10,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from adcm.tests.base import BaseTestCase
+from adcm.tests.base import BaseTestCase, ParallelReadyTestCase, TestCaseWithCommonSetUpTearDown
 
 from cm.adcm_config.config import save_object_config, switch_config
 from cm.api import (
@@ -22,10 +22,12 @@ from cm.api import (
     add_service_to_cluster,
     update_obj_config,
 )
+from cm.bundle import order_versions
 from cm.errors import AdcmEx
 from cm.issue import add_issue_on_linked_objects
 from cm.models import (
     Bundle,
+    Cluster,
     ClusterObject,
     ConcernCause,
     ConfigLog,
@@ -37,7 +39,7 @@ from cm.models import (
     Upgrade,
 )
 from cm.tests.utils import gen_cluster
-from cm.upgrade import bundle_revert, check_upgrade, do_upgrade, switch_components
+from cm.upgrade import bundle_revert, check_upgrade, do_upgrade, get_upgrade, switch_components
 
 
 def cook_cluster_bundle(ver):
@@ -169,6 +171,69 @@ class TestUpgradeVersion(BaseTestCase):
         self.check_upgrade(self.obj, self.upgrade, False)
 
 
+class TestUpgradeIndex(TestCaseWithCommonSetUpTearDown, ParallelReadyTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.versions = ("1.0", "1.5", "2.0", "2.5", "3.0")
+        self.bundles = {version: cook_cluster_bundle(version) for version in self.versions}
+        self.clusters = {
+            version: cook_cluster(bundle=bundle, name=f"cluster-{version}") for version, bundle in self.bundles.items()
+        }
+
+    def check_candidates(self) -> None:
+        order_versions()
+
+        for version, cluster in self.clusters.items():
+            cluster = Cluster.objects.select_related("prototype__bundle").get(pk=cluster.pk)  # noqa: PLW2901
+            with self.subTest(version=version):
+                expected = {
+                    upgrade.pk for upgrade in Upgrade.objects.all() if check_upgrade(obj=cluster, upgrade=upgrade)[0]
+                }
+
+                with self.assertNumQueries(2):
+                    actual = {upgrade.pk for upgrade in get_upgrade(obj=cluster)}
+
+                self.assertSetEqual(actual, expected)
+
+    def test_bounds(self) -> None:
+        for min_strict, max_strict in ((False, False), (True, False), (False, True), (True, True)):
+            Upgrade.objects.create(
+                bundle=self.bundles["3.0"],
+                min_version="1.5",
+                max_version="2.5",
+                min_strict=min_strict,
+                max_strict=max_strict,
+                state_available="any",
+            )
+
+        Upgrade.objects.create(bundle=self.bundles["2.5"], min_version="0.1", max_version="0.9", state_available="any")
+        Upgrade.objects.create(bundle=self.bundles["2.5"], min_version="1.2", max_version="1.3", state_available="any")
+        Upgrade.objects.create(bundle=self.bundles["2.5"], min_version="3.1", max_version="4.0", state_available="any")
+        Upgrade.objects.create(bundle=self.bundles["2.0"], min_version="1.0", max_version="1.5", state_available=[])
+
+        self.check_candidates()
+
+    def test_bounds_are_reindexed_on_new_versions(self) -> None:
+        Upgrade.objects.create(bundle=self.bundles["3.0"], min_version="1.1", max_version="2.0", state_available="any")
+        self.check_candidates()
+
+        bundle = cook_cluster_bundle("1.2")
+        self.clusters["1.2"] = cook_cluster(bundle=bundle, name="cluster-1.2")
+
+        self.check_candidates()
+
+    def test_not_indexed_upgrade_is_checked(self) -> None:
+        order_versions()
+
+        upgrade = Upgrade.objects.create(
+            bundle=self.bundles["3.0"], min_version="2.0", max_version="2.5", state_available="any"
+        )
+
+        self.assertListEqual(get_upgrade(obj=self.clusters["2.0"]), [upgrade])
+        self.assertListEqual(get_upgrade(obj=self.clusters["1.0"]), [])
+
+
 class TestConfigUpgrade(BaseTestCase):
     def setUp(self) -> None:
         super().setUp()
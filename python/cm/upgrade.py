@@ -10,11 +10,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import defaultdict
+from typing import Collection
 import functools
 
 from adcm_version import compare_prototype_versions
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
 from rbac.models import Policy
 
 from cm.adcm_config.config import (
@@ -264,21 +267,43 @@ def switch_hc(obj: Cluster, upgrade: Upgrade) -> None:
 
 
 def get_upgrade(obj: Cluster | HostProvider, order=None) -> list[Upgrade]:
+    if obj.locked:
+        return []
+
+    version_order = obj.prototype.version_order
+    candidates = (
+        Upgrade.objects.filter(bundle__name=obj.prototype.bundle.name)
+        .filter(
+            Q(min_version_order__lte=version_order, max_version_order__gte=version_order)
+            # not indexed yet, version is checked "manually"
+            | Q(min_version_order__isnull=True)
+            | Q(max_version_order__isnull=True)
+        )
+        .select_related("bundle", "action")
+        .annotate(
+            license=Subquery(
+                Prototype.objects.filter(bundle_id=OuterRef("bundle_id"), name=OuterRef("bundle__name"))
+                .order_by("id")
+                .values("license")[:1]
+            )
+        )
+        .order_by("id")
+    )
+
     res = []
-    for upgrade in Upgrade.objects.filter(bundle__name=obj.prototype.bundle.name):
-        success, _ = check_upgrade_version(prototype=obj.prototype, upgrade=upgrade)
-        if not success:
-            continue
+    for upgrade in candidates:
+        if upgrade.min_version_order is None or upgrade.max_version_order is None:
+            success, _ = check_upgrade_version(prototype=obj.prototype, upgrade=upgrade)
+            if not success:
+                continue
 
         success, _ = check_upgrade_edition(prototype=obj.prototype, upgrade=upgrade)
         if not success:
             continue
 
-        if obj.locked or not upgrade.allowed(obj=obj):
+        if not upgrade.allowed(obj=obj):
             continue
 
-        upgrade_proto = Prototype.objects.filter(bundle=upgrade.bundle, name=upgrade.bundle.name).first()
-        upgrade.license = upgrade_proto.license
         res.append(upgrade)
 
     if order:
@@ -297,6 +322,55 @@ def get_upgrade(obj: Cluster | HostProvider, order=None) -> list[Upgrade]:
     return res
 
 
+def _is_locked(obj: Cluster | HostProvider) -> bool:
+    if "concerns" in getattr(obj, "_prefetched_objects_cache", {}):
+        return any(concern.blocking for concern in obj.concerns.all())
+
+    return obj.locked
+
+
+def get_upgradable(objects: Collection[Cluster | HostProvider]) -> set[int]:
+    """
+    Return ids of `objects` that have at least one upgrade, same as `bool(get_upgrade(obj))` for each of them.
+
+    Candidates for all objects are read in one query, locks are taken from prefetched concerns when possible.
+    """
+
+    objects = [obj for obj in objects if not _is_locked(obj=obj)]
+    if not objects:
+        return set()
+
+    version_orders = [obj.prototype.version_order for obj in objects]
+    candidates = defaultdict(list)
+    for upgrade in (
+        Upgrade.objects.filter(bundle__name__in={obj.prototype.bundle.name for obj in objects})
+        .filter(
+            Q(min_version_order__lte=max(version_orders), max_version_order__gte=min(version_orders))
+            | Q(min_version_order__isnull=True)
+            | Q(max_version_order__isnull=True)
+        )
+        .select_related("bundle", "action")
+        .order_by("id")
+    ):
+        candidates[upgrade.bundle.name].append(upgrade)
+
+    upgradable = set()
+    for obj in objects:
+        version_order = obj.prototype.version_order
+        for upgrade in candidates[obj.prototype.bundle.name]:
+            if upgrade.min_version_order is None or upgrade.max_version_order is None:
+                if not check_upgrade_version(prototype=obj.prototype, upgrade=upgrade)[0]:
+                    continue
+            elif not upgrade.min_version_order <= version_order <= upgrade.max_version_order:
+                continue
+
+            if check_upgrade_edition(prototype=obj.prototype, upgrade=upgrade)[0] and upgrade.allowed(obj=obj):
+                upgradable.add(obj.pk)
+                break
+
+    return upgradable
+
+
 def re_apply_policy_for_upgrade(obj: Cluster | HostProvider) -> None:
     obj_type_map = {obj: ContentType.objects.get_for_model(obj)}
 
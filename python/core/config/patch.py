@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Minimal JSON Patch (RFC 6902) support for configuration documents.
+
+Only "add", "remove" and "replace" operations are produced and understood.
+Mappings are compared key by key, any other value (lists included) is replaced as a whole,
+which is enough for ADCM configurations where lists are rarely large and mostly changed entirely.
+"""
+
+from copy import deepcopy
+from typing import Any, TypeAlias
+
+PatchOperation: TypeAlias = dict[str, Any]
+Patch: TypeAlias = list[PatchOperation]
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(source: dict, target: dict) -> Patch:
+    """Build list of operations that turns `source` into `target`"""
+
+    patch = []
+    _diff(source=source, target=target, path="", patch=patch)
+
+    return patch
+
+
+def _diff(source: Any, target: Any, path: str, patch: Patch) -> None:
+    if not (isinstance(source, dict) and isinstance(target, dict)):
+        # `type` check is required, because 1 == True and 0 == 0.0 for python
+        if type(source) is not type(target) or source != target:
+            patch.append({"op": "replace", "path": path, "value": deepcopy(target)})
+
+        return
+
+    for key, value in source.items():
+        key_path = f"{path}/{_escape(key)}"
+        if key not in target:
+            patch.append({"op": "remove", "path": key_path})
+        else:
+            _diff(source=value, target=target[key], path=key_path, patch=patch)
+
+    for key in target.keys() - source.keys():
+        patch.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": deepcopy(target[key])})
+
+
+def apply_patch(document: dict, patch: Patch) -> dict:
+    """Return copy of `document` with `patch` applied, `document` itself stays untouched"""
+
+    result = deepcopy(document)
+
+    for operation in patch:
+        path = operation["path"]
+        if path == "":
+            result = deepcopy(operation["value"])
+            continue
+
+        *parents, last = map(_unescape, path[1:].split("/"))
+        node = result
+        for token in parents:
+            node = node[token]
+
+        if operation["op"] == "remove":
+            node.pop(last, None)
+        else:
+            node[last] = deepcopy(operation["value"])
+
+    return result
@@ -15,6 +15,7 @@ from datetime import datetime
 from pydantic import BaseModel
 
 from core.job.types import ExecutionStatus, HostComponentChanges
+from core.types import CoreObjectDescriptor
 
 
 class TaskUpdateDTO(BaseModel):
@@ -22,6 +23,7 @@ class TaskUpdateDTO(BaseModel):
     start_date: datetime | None = None
     finish_date: datetime | None = None
     status: ExecutionStatus | None = None
+    timings: dict[str, float] | None = None
 
 
 class JobUpdateDTO(BaseModel):
@@ -29,6 +31,7 @@ class JobUpdateDTO(BaseModel):
     start_date: datetime | None = None
     finish_date: datetime | None = None
     status: ExecutionStatus | None = None
+    timings: dict[str, float] | None = None
 
 
 class LogCreateDTO(BaseModel):
@@ -48,5 +51,11 @@ class TaskPayloadDTO(BaseModel):
     post_upgrade_hostcomponent: list[dict] | None = None
 
 
+class TaskCreateDTO(BaseModel):
+    target: CoreObjectDescriptor
+    owner: CoreObjectDescriptor
+    payload: TaskPayloadDTO
+
+
 class TaskMutableFieldsDTO(BaseModel):
     hostcomponent: HostComponentChanges
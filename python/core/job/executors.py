@@ -11,9 +11,13 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, NamedTuple, TextIO
+from threading import Thread
+from time import monotonic
+from typing import Any, BinaryIO, Literal, NamedTuple, Protocol, TextIO
 import os
+import selectors
 import subprocess
 
 from pydantic import BaseModel
@@ -21,11 +25,33 @@ from typing_extensions import Self
 
 from core.job.types import BundleInfo
 
+# pipes are read by blocks of this size, up to `OUTPUT_CHUNK_SIZE` bytes of each stream are kept in memory
+OUTPUT_READ_SIZE = 64 * 1024
+OUTPUT_CHUNK_SIZE = 1024 * 1024
+# output that is smaller than chunk is passed to sink with at least this interval (seconds)
+OUTPUT_FLUSH_INTERVAL = 2.0
+
+OutputStream = Literal["stdout", "stderr"]
+
 
 class ExecutionResult(NamedTuple):
     code: int
 
 
+class OutputSink(Protocol):
+    def append(self, stream: OutputStream, offset: int, data: bytes) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+@dataclass(slots=True)
+class OutputProgress:
+    bytes_read: int = 0
+    chunks_saved: int = 0
+
+
 class WithErrOutLogsMixin:
     _out_log: TextIO | None = None
     _err_log: TextIO | None = None
@@ -83,39 +109,127 @@ class Executor(ABC):
         raise NotImplementedError()
 
 
-class ProcessExecutor(Executor, WithErrOutLogsMixin, ABC):
+class ProcessExecutor(Executor, ABC):
+    """
+    Runs script in child process, its stdout and stderr are read while it's running.
+
+    Output is appended to `<script type>-<stream>.txt` files of work dir as soon as it's read
+    and passed to `output_sink` by chunks of at most `OUTPUT_CHUNK_SIZE` bytes.
+    """
+
     _config: BundleExecutorConfig
     _process: subprocess.Popen | None
 
-    def __init__(self, config: BundleExecutorConfig) -> None:
+    def __init__(self, config: BundleExecutorConfig, output_sink: OutputSink | None = None) -> None:
         super().__init__(config=config)
 
         self._process = None
+        self._output_sink = output_sink
+        self._output_progress = {"stdout": OutputProgress(), "stderr": OutputProgress()}
+        self._output_pump: Thread | None = None
+
+    @property
+    def output_progress(self) -> dict[OutputStream, OutputProgress]:
+        return self._output_progress
 
     def execute(self) -> Self:
         command = self._prepare_command()
         environment = self._get_environment_variables()
 
-        self._open_logs(log_dir=self._config.work_dir, log_prefix=self.script_type)
-
         os.chdir(self._config.bundle.root)
         self._process = subprocess.Popen(
             command,  # noqa S603
             env=environment,
-            stdout=self._out_log,
-            stderr=self._err_log,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
 
+        self._output_pump = Thread(target=self._pump_output, name=f"output-pump-{self._process.pid}", daemon=True)
+        self._output_pump.start()
+
         return self
 
     def wait_finished(self) -> Self:
         return_code = self._process.wait()
+        self._output_pump.join()
         self._result = ExecutionResult(code=return_code)
 
-        self._close_logs()
-
         return self
 
+    def _pump_output(self) -> None:
+        streams: dict[OutputStream, BinaryIO] = {"stdout": self._process.stdout, "stderr": self._process.stderr}
+        files = {
+            stream: (self._config.work_dir / f"{self.script_type}-{stream}.txt").open(mode="ab", buffering=0)
+            for stream in streams
+        }
+        # offset of the first byte that isn't passed to sink yet, output is appended to existing files
+        offsets = {stream: file.tell() for stream, file in files.items()}
+        buffers = {stream: bytearray() for stream in streams}
+
+        sink_failed = False
+
+        def flush(stream: OutputStream) -> None:
+            nonlocal sink_failed
+
+            if not buffers[stream]:
+                return
+
+            data = bytes(buffers[stream])
+            buffers[stream].clear()
+            if self._output_sink and not sink_failed:
+                try:
+                    self._output_sink.append(stream=stream, offset=offsets[stream], data=data)
+                except Exception:  # noqa: BLE001
+                    # pipes should be read till the end anyway, otherwise process will hang on full pipe,
+                    # output is still written to files
+                    sink_failed = True
+                else:
+                    self._output_progress[stream].chunks_saved += 1
+
+            offsets[stream] += len(data)
+
+        selector = selectors.DefaultSelector()
+        for stream, pipe in streams.items():
+            selector.register(pipe, selectors.EVENT_READ, data=stream)
+
+        try:
+            last_flush = monotonic()
+            while selector.get_map():
+                events = selector.select(timeout=OUTPUT_FLUSH_INTERVAL)
+                # pipes may be held open by processes detached from finished one, their output isn't awaited
+                if not events and self._process.poll() is not None:
+                    break
+
+                for key, _ in events:
+                    stream = key.data
+                    data = os.read(key.fd, OUTPUT_READ_SIZE)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+
+                    files[stream].write(data)
+                    buffers[stream] += data
+                    self._output_progress[stream].bytes_read += len(data)
+                    if len(buffers[stream]) >= OUTPUT_CHUNK_SIZE:
+                        flush(stream)
+
+                if monotonic() - last_flush >= OUTPUT_FLUSH_INTERVAL:
+                    for stream in streams:
+                        flush(stream)
+
+                    last_flush = monotonic()
+
+            for stream in streams:
+                flush(stream)
+        finally:
+            selector.close()
+            for stream, file in files.items():
+                file.close()
+                streams[stream].close()
+
+            if self._output_sink:
+                self._output_sink.close()
+
     @abstractmethod
     def _prepare_command(self) -> list[str]:
         raise NotImplementedError()
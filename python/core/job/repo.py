@@ -12,7 +12,14 @@
 
 from typing import Collection, Iterable, Protocol
 
-from core.job.dto import JobUpdateDTO, LogCreateDTO, TaskMutableFieldsDTO, TaskPayloadDTO, TaskUpdateDTO
+from core.job.dto import (
+    JobUpdateDTO,
+    LogCreateDTO,
+    TaskCreateDTO,
+    TaskMutableFieldsDTO,
+    TaskPayloadDTO,
+    TaskUpdateDTO,
+)
 from core.job.types import ActionInfo, Job, JobSpec, Task
 from core.types import ActionID, CoreObjectDescriptor
 
@@ -26,6 +33,9 @@ class JobRepoInterface(Protocol):
     ) -> Task:
         ...
 
+    def create_tasks(self, tasks: Iterable[TaskCreateDTO], action: ActionInfo) -> list[int]:
+        """Should return ids of created tasks in the same order"""
+
     def update_task(self, id: int, data: TaskUpdateDTO) -> None:  # noqa: A002
         ...
 
@@ -38,6 +48,12 @@ class JobRepoInterface(Protocol):
     def create_jobs(self, task_id: int, jobs: Iterable[JobSpec]) -> None:
         ...
 
+    def create_jobs_for_tasks(self, task_ids: Collection[int], jobs: Collection[JobSpec]) -> None:
+        ...
+
+    def get_jobs_of_tasks(self, task_ids: Collection[int]) -> Iterable[Job]:
+        ...
+
     def get_job(self, id: int) -> Job:  # noqa: A002
         """Should raise `NotFoundError` on fail"""
 
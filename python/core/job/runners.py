@@ -11,10 +11,12 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Iterable, NamedTuple, Protocol
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, NamedTuple, Protocol
 
 from core.job.executors import Executor
 from core.job.repo import JobRepoInterface
@@ -29,6 +31,7 @@ class ADCMSettings(NamedTuple):
 
 class AnsibleSettings(NamedTuple):
     ansible_secret_script: Path
+    plugin_rpc: bool = False
 
 
 class IntegrationsSettings(NamedTuple):
@@ -82,11 +85,28 @@ class Termination:
     is_requested: bool = False
 
 
+class PhaseTimer:
+    """Accumulates durations of named execution phases in seconds"""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(self.timings.get(name, 0.0) + perf_counter() - start, 6)
+
+
 @dataclass(slots=True)
 class RunnerRuntime:
     task_id: int
     status: ExecutionStatus = ExecutionStatus.CREATED
     termination: Termination = field(default_factory=Termination)
+    timer: PhaseTimer = field(default_factory=PhaseTimer)
+    job_timers: dict[int, PhaseTimer] = field(default_factory=dict)
 
 
 class TaskRunner(ABC):
@@ -10,11 +10,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Collection, Iterable
 
-from core.job.dto import LogCreateDTO, TaskPayloadDTO
+from core.job.dto import LogCreateDTO, TaskCreateDTO, TaskPayloadDTO
 from core.job.errors import TaskCreateError
 from core.job.repo import ActionRepoInterface, JobRepoInterface
-from core.job.types import JobSpec
+from core.job.types import Job, JobSpec
 from core.types import ActionID, CoreObjectDescriptor
 
 
@@ -51,16 +52,52 @@ def compose_task(
 
     job_repo.create_jobs(task_id=task.id, jobs=job_specifications)
 
+    _create_logs_for_jobs(jobs=job_repo.get_task_jobs(task_id=task.id), job_repo=job_repo)
+
+    return task
+
+
+def compose_tasks(
+    tasks: Collection[TaskCreateDTO],
+    action: ActionID,
+    job_repo: JobRepoInterface,
+    action_repo: ActionRepoInterface,
+) -> list[int]:
+    """
+    Prepare tasks of the same action for multiple targets.
+
+    Works the same way as `compose_task`, but action is read once
+    and all tasks, jobs and logs are created in bulk.
+    Returns ids of created tasks in the same order as `tasks`.
+    """
+
+    job_specifications = get_specifications_for_jobs(action=action, repo=action_repo)
+    if not job_specifications:
+        message = f"Can't compose task for action #{action}, because no associated jobs found"
+        raise TaskCreateError(message)
+
+    if not tasks:
+        return []
+
+    action_info = action_repo.get_action(id=action)
+    task_ids = job_repo.create_tasks(tasks=tasks, action=action_info)
+
+    job_repo.create_jobs_for_tasks(task_ids=task_ids, jobs=job_specifications)
+
+    _create_logs_for_jobs(jobs=job_repo.get_jobs_of_tasks(task_ids=task_ids), job_repo=job_repo)
+
+    return task_ids
+
+
+def _create_logs_for_jobs(jobs: Iterable[Job], job_repo: JobRepoInterface) -> None:
     logs = []
-    for job in job_repo.get_task_jobs(task_id=task.id):
+    for job in jobs:
         logs.append(LogCreateDTO(job_id=job.id, name=job.type.value, type="stdout", format="txt"))
         logs.append(LogCreateDTO(job_id=job.id, name=job.type.value, type="stderr", format="txt"))
 
     if logs:
         job_repo.create_logs(logs)
 
-    return task
-
 
 def get_specifications_for_jobs(action: ActionID, repo: ActionRepoInterface) -> tuple[JobSpec, ...]:
     # jinja_scripts will be used here
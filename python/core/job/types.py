@@ -138,6 +138,7 @@ class JobSpec(BaseModel):
 
     # extra
     params: dict
+    parallel_group: str = ""
 
 
 # it is validated, because we want to fail here on incorrect data
@@ -156,5 +157,7 @@ class Job(BaseModel):
     script: str
 
     params: JobParams
+    # consecutive jobs of the same group are executed simultaneously
+    parallel_group: str = ""
 
     on_fail: StateChanges
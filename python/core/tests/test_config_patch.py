@@ -0,0 +1,56 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from copy import deepcopy
+from unittest import TestCase
+
+from core.config.patch import apply_patch, make_patch
+
+
+class TestConfigPatch(TestCase):
+    def test_patch_roundtrip(self) -> None:
+        source = {
+            "plain": 1,
+            "flag": True,
+            "removed": "value",
+            "group": {"inner": "a", "list": [1, 2, 3], "nested": {"deep": None}},
+            "with/slash~tilde": {"key": 1},
+        }
+        target = {
+            "plain": 1.0,
+            "flag": 1,
+            "added": {"new": []},
+            "group": {"inner": "b", "list": [1, 2], "nested": {"deep": {"deeper": 2}}},
+            "with/slash~tilde": {"key": 2},
+        }
+        source_copy = deepcopy(source)
+
+        patch = make_patch(source=source, target=target)
+        result = apply_patch(document=source, patch=patch)
+
+        self.assertEqual(result, target)
+        self.assertIsInstance(result["plain"], float)
+        self.assertIs(type(result["flag"]), int)
+        self.assertEqual(source, source_copy)
+
+    def test_no_changes_empty_patch(self) -> None:
+        document = {"a": {"b": [1, {"c": 2}]}, "d": None}
+
+        self.assertEqual(make_patch(source=document, target=deepcopy(document)), [])
+
+    def test_patch_is_independent_of_target(self) -> None:
+        target = {"a": {"b": [1]}}
+
+        patch = make_patch(source={}, target=target)
+        target["a"]["b"].append(2)
+
+        self.assertEqual(apply_patch(document={}, patch=patch), {"a": {"b": [1]}})
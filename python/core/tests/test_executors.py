@@ -0,0 +1,133 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+import sys
+
+from core.job.executors import (
+    OUTPUT_CHUNK_SIZE,
+    OUTPUT_READ_SIZE,
+    BundleExecutorConfig,
+    OutputStream,
+    ProcessExecutor,
+)
+from core.job.types import BundleInfo
+
+# 5 MiB of stdout with stderr lines in between
+SCRIPT = """
+import sys
+line = "x" * 1023 + "\\n"
+for i in range(5 * 1024):
+    sys.stdout.write(line)
+    if i % 1024 == 0:
+        sys.stderr.write(f"stderr line {i}\\n")
+        sys.stderr.flush()
+"""
+EXPECTED_STDOUT = ("x" * 1023 + "\n").encode() * 5 * 1024
+EXPECTED_STDERR = "".join(f"stderr line {i}\n" for i in range(0, 5 * 1024, 1024)).encode()
+
+
+class InlinePythonExecutor(ProcessExecutor):
+    script_type = "python"
+
+    def _prepare_command(self) -> list[str]:
+        return [sys.executable, "-c", SCRIPT]
+
+
+class CollectingSink:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.chunks: list[tuple[OutputStream, int, bytes]] = []
+        self.closed = False
+
+    def append(self, stream: OutputStream, offset: int, data: bytes) -> None:
+        if self.fail:
+            raise RuntimeError("Storage is unavailable")
+
+        self.chunks.append((stream, offset, data))
+
+    def close(self) -> None:
+        self.closed = True
+
+    def content(self, stream: OutputStream, start: int = 0) -> bytes:
+        content = b""
+        for chunk_stream, offset, data in self.chunks:
+            if chunk_stream == stream:
+                if offset != start + len(content):
+                    raise AssertionError(f"Chunk of {stream} at {offset} isn't contiguous")
+
+                content += data
+
+        return content
+
+
+class TestProcessExecutorOutput(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.addCleanup(os.chdir, Path.cwd())
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.work_dir = Path(directory.name)
+
+        self.config = BundleExecutorConfig(
+            work_dir=self.work_dir,
+            job_script="",
+            bundle=BundleInfo(root=self.work_dir, config_dir=self.work_dir),
+        )
+
+    def test_output_is_written_to_files_and_sink_by_chunks(self) -> None:
+        sink = CollectingSink()
+
+        executor = InlinePythonExecutor(config=self.config, output_sink=sink).execute().wait_finished()
+
+        self.assertEqual(executor.result.code, 0)
+        self.assertEqual((self.work_dir / "python-stdout.txt").read_bytes(), EXPECTED_STDOUT)
+        self.assertEqual((self.work_dir / "python-stderr.txt").read_bytes(), EXPECTED_STDERR)
+
+        self.assertEqual(sink.content("stdout"), EXPECTED_STDOUT)
+        self.assertEqual(sink.content("stderr"), EXPECTED_STDERR)
+        self.assertTrue(all(len(data) < OUTPUT_CHUNK_SIZE + OUTPUT_READ_SIZE for *_, data in sink.chunks))
+        self.assertTrue(sink.closed)
+
+        progress = executor.output_progress
+        self.assertEqual(progress["stdout"].bytes_read, len(EXPECTED_STDOUT))
+        self.assertEqual(progress["stderr"].bytes_read, len(EXPECTED_STDERR))
+        self.assertGreaterEqual(progress["stdout"].chunks_saved, len(EXPECTED_STDOUT) // OUTPUT_CHUNK_SIZE)
+        self.assertEqual(
+            progress["stdout"].chunks_saved + progress["stderr"].chunks_saved,
+            len(sink.chunks),
+        )
+
+    def test_output_is_appended_to_existing_files(self) -> None:
+        existing = b"previous run\n"
+        (self.work_dir / "python-stdout.txt").write_bytes(existing)
+        sink = CollectingSink()
+
+        InlinePythonExecutor(config=self.config, output_sink=sink).execute().wait_finished()
+
+        self.assertEqual((self.work_dir / "python-stdout.txt").read_bytes(), existing + EXPECTED_STDOUT)
+        self.assertEqual(sink.content("stdout", start=len(existing)), EXPECTED_STDOUT)
+
+    def test_sink_failure_does_not_stop_output_reading(self) -> None:
+        sink = CollectingSink(fail=True)
+
+        executor = InlinePythonExecutor(config=self.config, output_sink=sink).execute().wait_finished()
+
+        self.assertEqual(executor.result.code, 0)
+        self.assertEqual((self.work_dir / "python-stdout.txt").read_bytes(), EXPECTED_STDOUT)
+        self.assertEqual(executor.output_progress["stdout"].bytes_read, len(EXPECTED_STDOUT))
+        self.assertEqual(executor.output_progress["stdout"].chunks_saved, 0)
+        self.assertTrue(sink.closed)
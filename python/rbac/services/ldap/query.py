@@ -10,21 +10,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Iterable
+from typing import Iterable, Iterator
 
-from django_auth_ldap.config import LDAPSearch
+from ldap.cidict import cidict
+from ldap.controls import SimplePagedResultsControl
 import ldap
 
 from rbac.services.ldap.errors import LDAPConfigurationError
-from rbac.services.ldap.types import DistinguishedName, LDAPGroup, LDAPSettings, LDAPUser
+from rbac.services.ldap.types import DistinguishedName, LDAPEntry, LDAPGroup, LDAPSettings, LDAPUser
+
+DEFAULT_PAGE_SIZE = 1000
 
 
 class LDAPQuery:
-    def __init__(self, connection: ldap.ldapobject.LDAPObject, settings: LDAPSettings) -> None:
+    """
+    Searches are paged (RFC 2696), so result of any size is read without hitting server's size limit.
+    Entries are yielded as pages arrive, so they can be processed while the rest is being read.
+    """
+
+    def __init__(
+        self, connection: ldap.ldapobject.LDAPObject, settings: LDAPSettings, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> None:
         self._connection = connection
         self._settings = settings
+        self._page_size = page_size
 
-    def users(self, target_group_dns: Iterable[DistinguishedName] | None = None) -> Iterable[LDAPUser]:
+    def users(self, target_group_dns: Iterable[DistinguishedName] | None = None) -> Iterator[LDAPUser]:
         group_filter = ""
         for group_dn in target_group_dns or []:
             group_filter += f"({self._settings.user.group_membership_attribute}={group_dn})"
@@ -39,13 +50,9 @@ class LDAPQuery:
             ")"
         )
 
-        return LDAPSearch(
-            base_dn=self._settings.user.search_base,
-            scope=ldap.SCOPE_SUBTREE,
-            filterstr=filterstr,
-        ).execute(self._connection)
+        return self._search(base_dn=self._settings.user.search_base, filterstr=filterstr)
 
-    def groups(self) -> Iterable[LDAPGroup]:
+    def groups(self) -> Iterator[LDAPGroup]:
         if not self._settings.group.search_base:
             raise LDAPConfigurationError("Can't search LDAP groups. Configure `Group search base` settings parameter")
 
@@ -56,11 +63,38 @@ class LDAPQuery:
             ")"
         )
 
-        return LDAPSearch(
-            base_dn=self._settings.group.search_base,
-            scope=ldap.SCOPE_SUBTREE,
-            filterstr=filterstr,
-        ).execute(self._connection)
+        return self._search(base_dn=self._settings.group.search_base, filterstr=filterstr)
+
+    def _search(self, base_dn: DistinguishedName, filterstr: str) -> Iterator[LDAPEntry]:
+        # not critical, so servers without paging support just return everything at once
+        page_control = SimplePagedResultsControl(criticality=False, size=self._page_size, cookie="")
+
+        while True:
+            message_id = self._connection.search_ext(
+                base=base_dn, scope=ldap.SCOPE_SUBTREE, filterstr=filterstr, serverctrls=[page_control]
+            )
+            _, entries, _, response_controls = self._connection.result3(msgid=message_id)
+
+            for dn, attributes in entries:
+                # search references (referrals) come without DN
+                if dn is not None:
+                    yield (
+                        dn,
+                        cidict(
+                            {name: [_decode_value(value) for value in values] for name, values in attributes.items()}
+                        ),
+                    )
+
+            page_control.cookie = next(
+                (
+                    control.cookie
+                    for control in response_controls or ()
+                    if control.controlType == SimplePagedResultsControl.controlType
+                ),
+                None,
+            )
+            if not page_control.cookie:
+                return
 
     @staticmethod
     def _process_extra_filter(filterstr: str) -> str:
@@ -75,3 +109,11 @@ class LDAPQuery:
 
         # assume that composed filter is syntactically valid
         return filterstr
+
+
+def _decode_value(value: bytes) -> str | bytes:
+    # binary attributes (e.g. `objectGUID`) are kept as is
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return value
@@ -0,0 +1,431 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from itertools import islice
+from typing import Iterable, Iterator, Pattern
+import os
+import sys
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from rbac.models import Group, OriginType, User
+from rbac.services.ldap.errors import LDAPDataError
+from rbac.services.ldap.query import LDAPQuery
+from rbac.services.ldap.types import (
+    DistinguishedName,
+    LDAPAttributes,
+    LDAPGroup,
+    LDAPSettings,
+    LDAPUser,
+    LDAPUserAttrs,
+)
+from rbac.services.ldap.utils import str_join_attr_list
+from rbac.utils import get_group_name_display_name
+
+UNIQUE_FIELDS = {User.__name__: (("username",),), Group.__name__: (("display_name", "type"), ("name",))}
+
+DEFAULT_BATCH_SIZE = 500
+
+UserGroupMembership = User.groups.through
+
+
+def sync_ldap(query: LDAPQuery, settings: LDAPSettings, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Synchronize LDAP groups and users with ADCM ones.
+
+    Users are read from LDAP page by page and reconciled by batches of `batch_size`:
+    each batch is read from DB, updated and has its group memberships changed with a fixed amount of queries.
+    """
+
+    groups = None
+    if settings.group.search_base:
+        groups = list(query.groups())
+
+        if not groups:
+            sys.stdout.write(f"No groups found. Clearing ldap users and groups{os.linesep}")
+
+            removed_users, removed_groups = _remove_all_ldap_users_and_groups()
+            if removed_users:
+                sys.stdout.write(f"Users deleted:{os.linesep}{removed_users}{os.linesep}")
+            if removed_groups:
+                sys.stdout.write(f"Users deleted:{os.linesep}{removed_groups}{os.linesep}")
+
+            return
+
+    dn_adcm_group_name_map = _process_groups(groups=groups or [], group_name_attribute=settings.group.name_attribute)
+    _process_users(
+        users=query.users(target_group_dns=[group_dn for group_dn, _ in groups] if groups else None),
+        group_dn_adcm_name_map=dn_adcm_group_name_map,
+        settings=settings,
+        batch_size=batch_size,
+    )
+
+
+def _process_groups(groups: Iterable[LDAPGroup], group_name_attribute: str) -> dict[str, str]:
+    sys.stdout.write(f"Synchronizing groups...{os.linesep}")
+
+    dn_adcm_name_map: dict[str, str] = {}
+    for group_dn, group_attrs in groups:
+        dn_adcm_name_map[group_dn.lower()] = str_join_attr_list(
+            ldap_attributes=group_attrs, target_attr=group_name_attribute
+        )
+
+    ldap_groups_qs = Group.objects.filter(type=OriginType.LDAP)
+    existing_groups = ldap_groups_qs.filter(display_name__in=dn_adcm_name_map.values()).values("id", "display_name")
+
+    to_delete_groups = ldap_groups_qs.exclude(id__in=(group["id"] for group in existing_groups))
+    if to_delete_groups.exists():
+        deleted_group_names = os.linesep.join(
+            f" - {name}" for name in to_delete_groups.values_list("display_name", flat=True)
+        )
+        to_delete_groups.delete()
+        sys.stdout.write(f"Groups deleted:{os.linesep}{deleted_group_names}{os.linesep}")
+
+    created = []
+    errors = []
+    for adcm_group_name in set(dn_adcm_name_map.values()).difference(
+        {group["display_name"] for group in existing_groups}
+    ):
+        name, display_name = get_group_name_display_name(name=adcm_group_name, type_=OriginType.LDAP.value)
+        kwargs_get = {
+            "name": name,
+            "display_name": display_name,
+            "type": OriginType.LDAP.value,
+            "built_in": False,
+        }
+        group, _ = _safe_get_or_create(model=Group, kwargs_get=kwargs_get)
+        if group is not None:
+            created.append(f" - {adcm_group_name}")
+        else:
+            errors.append(f" - {adcm_group_name}")
+
+    if created:
+        sys.stdout.write(f"Create group(s):{os.linesep}{os.linesep.join(created)}{os.linesep}")
+
+    if errors:
+        sys.stderr.write(f"Error synchronizing group(s):{os.linesep}{os.linesep.join(errors)}{os.linesep}")
+
+    sys.stdout.write(f"Groups synchronization finished{os.linesep}")
+
+    return dn_adcm_name_map
+
+
+def _process_users(
+    users: Iterable[LDAPUser],
+    group_dn_adcm_name_map: dict[str, str],
+    settings: LDAPSettings,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    sys.stdout.write(f"Synchronizing users...{os.linesep}")
+
+    ldap_group_ids = dict(Group.objects.filter(type=OriginType.LDAP).values_list("display_name", "id"))
+    active_usernames = set()
+
+    all_users_attrs = (
+        _extract_user_attributes(user_attrs=ldap_user_attrs, settings=settings) for _, ldap_user_attrs in users
+    )
+    for batch in _batched(all_users_attrs, size=batch_size):
+        active_users_attrs = [user_attrs for user_attrs in batch if user_attrs.is_active]
+        active_usernames.update(user_attrs.username.lower() for user_attrs in active_users_attrs)
+
+        _sync_ldap_users(
+            users_attrs=active_users_attrs,
+            group_dn_adcm_name_map=group_dn_adcm_name_map,
+            ldap_group_ids=ldap_group_ids,
+            settings=settings,
+        )
+
+    to_delete_users = {
+        user_id: username
+        for user_id, username in User.objects.filter(type=OriginType.LDAP).values_list("id", "username")
+        if username.lower() not in active_usernames
+    }
+    if to_delete_users:
+        user_ids = list(to_delete_users)
+        for i in range(0, len(user_ids), batch_size):
+            User.objects.filter(id__in=user_ids[i : i + batch_size]).delete()
+
+        to_delete_usernames = os.linesep.join(f" - {name}" for name in to_delete_users.values())
+        sys.stdout.write(f"Delete user(s):{os.linesep}{to_delete_usernames}{os.linesep}")
+
+    sys.stdout.write(f"Users synchronization finished{os.linesep}")
+
+
+def _sync_ldap_users(
+    users_attrs: list[LDAPUserAttrs],
+    group_dn_adcm_name_map: dict[str, str],
+    ldap_group_ids: dict[str, int],
+    settings: LDAPSettings,
+) -> None:
+    """
+    Reconcile batch of active LDAP users with ADCM ones.
+
+    Existing users are read with one query and changed ones are saved with one bulk update,
+    group memberships are compared as sets and changed with one insert and one delete.
+    """
+
+    users_attrs = {user_attrs.username.lower(): user_attrs for user_attrs in users_attrs}
+    existing_users = defaultdict(list)
+    for user in User.objects.annotate(username_lower=Lower("username")).filter(
+        username_lower__in=users_attrs, type=OriginType.LDAP.value, built_in=False
+    ):
+        existing_users[user.username_lower].append(user)
+
+    synced_users = []
+    to_update = {}
+    update_fields = set()
+    for username_lower, attrs in users_attrs.items():
+        actual_user_attrs = attrs.dict(include=settings.user.attr_map.keys())
+
+        candidates = existing_users.get(username_lower, [])
+        if len(candidates) > 1:
+            sys.stderr.write(f"Error synchronizing user {attrs.username}{os.linesep}")
+            continue
+
+        if candidates:
+            user = candidates[0]
+            changed_fields = [key for key, value in actual_user_attrs.items() if getattr(user, key, None) != value]
+            if changed_fields:
+                for key in changed_fields:
+                    setattr(user, key, actual_user_attrs[key])
+
+                to_update[user.pk] = user
+                update_fields.update(changed_fields)
+                sys.stdout.write(f"User updated: {user.username}{os.linesep}")
+        else:
+            # users are created one by one: multi-table inheritance doesn't allow bulk creation
+            user, _ = _safe_get_or_create(
+                model=User,
+                kwargs_get={"username__iexact": attrs.username, "type": OriginType.LDAP.value, "built_in": False},
+                kwargs_create={"type": OriginType.LDAP.value, **actual_user_attrs},
+            )
+            if user is None:
+                sys.stderr.write(f"Error synchronizing user {attrs.username}{os.linesep}")
+                continue
+
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+            sys.stdout.write(f"User created: {user.username}{os.linesep}")
+
+        if user.is_superuser != attrs.is_superuser:
+            user.is_superuser = attrs.is_superuser
+            to_update[user.pk] = user
+            update_fields.add("is_superuser")
+            if attrs.is_superuser:
+                sys.stdout.write(f"Grant admin rights to {user.username}\n")
+            else:
+                sys.stdout.write(f"Remove admin rights from {user.username}\n")
+
+        synced_users.append((user, attrs))
+
+    if to_update:
+        User.objects.bulk_update(objs=to_update.values(), fields=sorted(update_fields))
+
+    desired_group_ids = {}
+    for user, attrs in synced_users:
+        if settings.group.search_base:
+            user_group_names = [
+                group_dn_adcm_name_map[group_dn.lower()]
+                for group_dn in attrs.groups
+                if group_dn.lower() in group_dn_adcm_name_map
+            ]
+        else:
+            sys.stdout.write(
+                f"`Group search base` is not configured. Getting all {user.username}'s ldap groups{os.linesep}"
+            )
+            user_group_names = _create_user_groups(
+                group_dns=attrs.groups, cn_pattern=settings.cn_pattern, ldap_group_ids=ldap_group_ids
+            )
+
+        desired_group_ids[user.pk] = {ldap_group_ids[name] for name in user_group_names if name in ldap_group_ids}
+
+    _sync_memberships(
+        users={user.pk: user for user, _ in synced_users},
+        desired_group_ids=desired_group_ids,
+        group_names={group_id: name for name, group_id in ldap_group_ids.items()},
+    )
+
+
+def _sync_memberships(
+    users: dict[int, User], desired_group_ids: dict[int, set[int]], group_names: dict[int, str]
+) -> None:
+    current_memberships = defaultdict(dict)
+    for membership_id, user_id, group_id in UserGroupMembership.objects.filter(
+        user_id__in=users, group_id__in=Group.objects.filter(type=OriginType.LDAP).values("pk")
+    ).values_list("id", "user_id", "group_id"):
+        current_memberships[user_id][group_id] = membership_id
+
+    to_add = []
+    to_remove = []
+    for user_id, user in users.items():
+        current = current_memberships[user_id]
+        desired = desired_group_ids[user_id]
+
+        removed = current.keys() - desired
+        if removed:
+            to_remove.extend(current[group_id] for group_id in removed)
+            to_remove_names = os.linesep.join(
+                f" - {group_names.get(group_id, group_id)}" for group_id in sorted(removed)
+            )
+            sys.stdout.write(f"Remove user {user.username} from group(s):{os.linesep}{to_remove_names}{os.linesep}")
+
+        added = desired - current.keys()
+        if added:
+            to_add.extend(UserGroupMembership(user_id=user_id, group_id=group_id) for group_id in added)
+            to_add_names = os.linesep.join(f" - {group_names.get(group_id, group_id)}" for group_id in sorted(added))
+            sys.stdout.write(f"Add user {user.username} to group(s):{os.linesep}{to_add_names}{os.linesep}")
+
+    if to_remove:
+        UserGroupMembership.objects.filter(id__in=to_remove).delete()
+
+    if to_add:
+        UserGroupMembership.objects.bulk_create(objs=to_add)
+
+
+def _create_user_groups(
+    group_dns: list[DistinguishedName], cn_pattern: Pattern, ldap_group_ids: dict[str, int]
+) -> list[str]:
+    """
+    Returns list of user's groups' display_names.
+
+    `ldap_group_ids` (display name to id) is used to skip known groups and is updated with created ones.
+    """
+
+    errors = []
+    created = []
+    adcm_group_names = []
+    for group_dn in group_dns:
+        adcm_group_name = " ".join(sorted(cn_pattern.findall(group_dn)))
+        if adcm_group_name in ldap_group_ids:
+            adcm_group_names.append(adcm_group_name)
+            continue
+
+        name, display_name = get_group_name_display_name(name=adcm_group_name, type_=OriginType.LDAP.value)
+        kwargs_get = {
+            "name": name,
+            "display_name": display_name,
+            "type": OriginType.LDAP.value,
+            "built_in": False,
+        }
+        group, created_ = _safe_get_or_create(model=Group, kwargs_get=kwargs_get)
+
+        if group is not None:
+            adcm_group_names.append(adcm_group_name)
+            ldap_group_ids[adcm_group_name] = group.pk
+            if created_:
+                created.append(adcm_group_name)
+        else:
+            errors.append(adcm_group_name)
+
+    if created:
+        sys.stdout.write(
+            f"Create group(s):{os.linesep}"
+            f"{os.linesep.join([f' - {group_name}' for group_name in created])}{os.linesep}"
+        )
+
+    if errors:
+        sys.stderr.write(f"Can't synchronize group(s):{os.linesep}{os.linesep.join(errors)}{os.linesep}")
+
+    return adcm_group_names
+
+
+def _extract_user_attributes(user_attrs: LDAPAttributes, settings: LDAPSettings) -> LDAPUserAttrs:
+    attributes = {}
+
+    for adcm_attr_name, ldap_attr_name in settings.user.attr_map.items():
+        # LDAP attribute can be associated with multiple values and represented as a list of strings
+        # if attribute is absent, default value ("") is used
+        values = user_attrs.get(ldap_attr_name, [""])
+
+        if len(values) != 1:
+            raise LDAPDataError(
+                f"Can't translate ldap `{ldap_attr_name}` attribute ({values}) of entity `"
+                f"{user_attrs.get(settings.dn_attribute)}` to user's `{adcm_attr_name}` attribute"
+            )
+
+        attributes[adcm_attr_name] = values[0]
+
+    # https://learn.microsoft.com/ru-ru/windows/win32/adschema/a-useraccountcontrol
+    is_user_active = True
+    if user_attrs.get(settings.user.active_attribute) and hex(
+        int(user_attrs[settings.user.active_attribute][0])
+    ).endswith("2"):
+        is_user_active = False
+
+    attributes["is_active"] = is_user_active
+    attributes["groups"] = list(user_attrs.get(settings.user.group_membership_attribute, []))
+    attributes["is_superuser"] = any(
+        group_dn.lower() in settings.user.group_dn_adcm_admin for group_dn in attributes["groups"]
+    )
+
+    return LDAPUserAttrs(**attributes)
+
+
+def _remove_all_ldap_users_and_groups() -> tuple[str, str]:
+    """Returns formatted for writing to stdout removed users' usernames and removed groups' display_names"""
+
+    ldap_users = User.objects.filter(type=OriginType.LDAP, built_in=False)
+    ldap_groups = Group.objects.filter(type=OriginType.LDAP, built_in=False)
+
+    user_usernames = ""
+    if ldap_users.exists():
+        user_usernames = os.linesep.join(f" - {username}" for username in ldap_users.values_list("username", flat=True))
+        ldap_users.delete()
+
+    group_display_names = ""
+    if ldap_groups.exists():
+        group_display_names = os.linesep.join(
+            f" - {display_name}" for display_name in ldap_groups.values_list("display_name", flat=True)
+        )
+        ldap_groups.delete()
+
+    return user_usernames, group_display_names
+
+
+def _safe_get_or_create(
+    model: type[User | Group], kwargs_get: dict, kwargs_create: dict | None = None
+) -> tuple[User | Group | None, bool | None]:
+    """
+    Purpose of this function is to get or create `model` instance without raising database errors,
+    since they are the reason of transaction rollback, even if handled. And this breaks ldap_sync logic.
+    """
+
+    qs = model.objects.filter(**kwargs_get)
+    if qs.count() > 1:
+        return None, None
+
+    if qs.count() == 1:
+        return qs.get(), False
+
+    kwargs_create = kwargs_get if kwargs_create is None else kwargs_create
+
+    model_constraints = UNIQUE_FIELDS[model.__name__]
+    query_check_unique_constraints = Q(
+        **{key: value for key, value in kwargs_create.items() if key in model_constraints[0]}
+    )
+    for unique_constraint in model_constraints[1:]:
+        query_check_unique_constraints |= Q(
+            **{key: value for key, value in kwargs_create.items() if key in unique_constraint}
+        )
+
+    if model.objects.filter(query_check_unique_constraints).exists():
+        return None, None
+
+    return model.objects.create(**kwargs_create), True
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
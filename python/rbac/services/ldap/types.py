@@ -17,8 +17,9 @@ from pydantic import BaseModel, ConfigDict, Field
 
 DistinguishedName: TypeAlias = str
 LDAPAttributes: TypeAlias = Mapping
-LDAPUser: TypeAlias = tuple[DistinguishedName, LDAPAttributes]
-LDAPGroup: TypeAlias = tuple[DistinguishedName, LDAPAttributes]
+LDAPEntry: TypeAlias = tuple[DistinguishedName, LDAPAttributes]
+LDAPUser: TypeAlias = LDAPEntry
+LDAPGroup: TypeAlias = LDAPEntry
 
 
 class FrozenBaseModel(BaseModel):
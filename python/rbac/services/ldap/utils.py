@@ -10,9 +10,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from copy import deepcopy
 
 from cm.adcm_config.ansible import ansible_decrypt
-from cm.services.adcm import adcm_config, get_adcm_config_id
+from cm.services.adcm import get_adcm_settings
 
 from rbac.services.ldap.errors import LDAPConfigurationError
 from rbac.services.ldap.types import ConnectionSettings, GroupSettings, LDAPAttributes, LDAPSettings, UserSettings
@@ -30,12 +31,13 @@ def str_join_attr_list(ldap_attributes: LDAPAttributes, target_attr: str, sort:
 
 
 def get_ldap_settings() -> LDAPSettings:
-    adcm_config_attr = adcm_config(config_id=get_adcm_config_id())
+    adcm_config_attr = get_adcm_settings()
 
     if not adcm_config_attr.attr["ldap_integration"]["active"]:
         raise LDAPConfigurationError("LDAP integration is disabled")
 
-    ldap_config = adcm_config_attr.config["ldap_integration"]
+    # cached settings are shared, so they are copied before decryption
+    ldap_config = deepcopy(adcm_config_attr.config["ldap_integration"])
     ldap_config["ldap_password"] = ansible_decrypt(msg=ldap_config["ldap_password"])
     ldap_config["group_dn_adcm_admin"] = [group_dn.lower() for group_dn in ldap_config["group_dn_adcm_admin"] or []]
 
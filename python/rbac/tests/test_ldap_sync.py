@@ -0,0 +1,208 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Iterable, Iterator
+
+from adcm.tests.base import BaseTestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from ldap.controls import SimplePagedResultsControl
+
+from rbac.models import Group, OriginType, User
+from rbac.services.ldap import LDAPQuery
+from rbac.services.ldap.sync import sync_ldap
+from rbac.services.ldap.types import DistinguishedName, LDAPEntry, LDAPSettings
+
+GROUPS_BASE = "OU=Groups,DC=ad,DC=local"
+USERS_BASE = "OU=Users,DC=ad,DC=local"
+ADMINS_DN = f"CN=adcm_admins,{GROUPS_BASE}"
+
+
+def group_dn(index: int) -> DistinguishedName:
+    return f"CN=group_{index},{GROUPS_BASE}"
+
+
+class FakeDirectory:
+    """Generated LDAP directory, users are yielded lazily like pages of real search"""
+
+    def __init__(self, users: int, groups: int) -> None:
+        self.groups_amount = groups
+        self.users = {
+            f"user_{i}": {
+                "sAMAccountName": [f"user_{i}"],
+                "givenName": [f"Name {i}"],
+                "sn": [f"Surname {i}"],
+                "mail": [f"user_{i}@ad.local"],
+                "memberOf": [group_dn(i % groups), group_dn((i + 1) % groups)] + ([ADMINS_DN] if i % 100 == 0 else []),
+                "userAccountControl": ["512"],
+            }
+            for i in range(users)
+        }
+
+    def groups(self) -> Iterator[LDAPEntry]:
+        for dn in [*map(group_dn, range(self.groups_amount)), ADMINS_DN]:
+            yield dn, {"cn": [dn.split(",")[0][3:]]}
+
+    def users_query(self, target_group_dns: Iterable[DistinguishedName] | None = None) -> Iterator[LDAPEntry]:
+        _ = target_group_dns
+        for username, attributes in self.users.items():
+            yield f"CN={username},{USERS_BASE}", attributes
+
+
+class FakeQuery:
+    def __init__(self, directory: FakeDirectory) -> None:
+        self.directory = directory
+
+    def groups(self) -> Iterator[LDAPEntry]:
+        return self.directory.groups()
+
+    def users(self, target_group_dns: Iterable[DistinguishedName] | None = None) -> Iterator[LDAPEntry]:
+        return self.directory.users_query(target_group_dns=target_group_dns)
+
+
+class FakePagedConnection:
+    """Serves search results by pages of `page_size` the way server supporting RFC 2696 does"""
+
+    def __init__(self, entries: list[LDAPEntry], page_size: int) -> None:
+        self.entries = entries
+        self.page_size = page_size
+        self.requests = []
+
+    def search_ext(self, base: str, scope: int, filterstr: str, serverctrls: list) -> int:
+        _ = base, scope, filterstr
+        (control,) = serverctrls
+        self.requests.append(control.cookie)
+
+        return len(self.requests)
+
+    def result3(self, msgid: int) -> tuple:
+        offset = int(self.requests[msgid - 1] or 0)
+        page = [(None, ["ldap://referral"]), *self.entries[offset : offset + self.page_size]]
+        next_offset = offset + self.page_size
+        response_control = SimplePagedResultsControl(
+            criticality=False, size=0, cookie=str(next_offset).encode() if next_offset < len(self.entries) else b""
+        )
+
+        return 101, page, msgid, [response_control]
+
+
+class TestLDAPSync(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.settings = LDAPSettings(
+            connection={
+                "ldap_uri": "ldap://localhost",
+                "ldap_user": "admin",
+                "ldap_password": "",
+                "tls_enabled": False,
+            },
+            user={
+                "user_search_base": USERS_BASE,
+                "user_name_attribute": "sAMAccountName",
+                "attr_map": {
+                    "username": "sAMAccountName",
+                    "first_name": "givenName",
+                    "last_name": "sn",
+                    "email": "mail",
+                },
+                "group_dn_adcm_admin": [ADMINS_DN.lower()],
+            },
+            group={
+                "group_search_base": GROUPS_BASE,
+                "group_object_class": "group",
+                "group_name_attribute": "cn",
+                "group_member_attribute_name": "member",
+            },
+            sync_interval=0,
+        )
+
+    def _sync(self, directory: FakeDirectory, batch_size: int = 500) -> None:
+        with redirect_stdout(StringIO()):
+            sync_ldap(query=FakeQuery(directory=directory), settings=self.settings, batch_size=batch_size)
+
+    @staticmethod
+    def _ldap_memberships() -> set[tuple[str, str]]:
+        return set(
+            User.groups.through.objects.filter(user__username__startswith="user_").values_list(
+                "user__username", "group__group__display_name"
+            )
+        )
+
+    def test_sync_large_directory(self):
+        directory = FakeDirectory(users=1500, groups=30)
+
+        self._sync(directory=directory)
+
+        self.assertEqual(User.objects.filter(type=OriginType.LDAP).count(), 1500)
+        self.assertEqual(Group.objects.filter(type=OriginType.LDAP).count(), 31)
+        self.assertSetEqual(
+            set(User.objects.filter(type=OriginType.LDAP, is_superuser=True).values_list("username", flat=True)),
+            {f"user_{i}" for i in range(0, 1500, 100)},
+        )
+        self.assertEqual(
+            self._ldap_memberships(),
+            {
+                (username, dn.split(",")[0][3:])
+                for username, attributes in directory.users.items()
+                for dn in attributes["memberOf"]
+            },
+        )
+
+    def test_resync_amount_of_queries_depends_on_batches_only(self):
+        directory = FakeDirectory(users=1200, groups=20)
+        self._sync(directory=directory)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._sync(directory=directory, batch_size=600)
+
+        self.assertLess(len(queries), 30)
+
+    def test_resync_changes(self):
+        directory = FakeDirectory(users=500, groups=10)
+        self._sync(directory=directory)
+
+        del directory.users["user_1"]
+        directory.users["user_2"]["userAccountControl"] = ["514"]
+        directory.users["user_3"]["mail"] = ["changed@ad.local"]
+        directory.users["user_4"]["memberOf"] = [group_dn(9)]
+        directory.users["user_5"]["memberOf"].append(ADMINS_DN)
+        directory.users["user_100"]["memberOf"].remove(ADMINS_DN)
+
+        self._sync(directory=directory, batch_size=200)
+
+        ldap_users = User.objects.filter(type=OriginType.LDAP)
+        self.assertEqual(ldap_users.count(), 498)
+        self.assertFalse(ldap_users.filter(username__in=["user_1", "user_2"]).exists())
+        self.assertEqual(ldap_users.get(username="user_3").email, "changed@ad.local")
+        self.assertSetEqual(
+            set(ldap_users.get(username="user_4").groups.values_list("group__display_name", flat=True)), {"group_9"}
+        )
+        self.assertTrue(ldap_users.get(username="user_5").is_superuser)
+        self.assertFalse(ldap_users.get(username="user_100").is_superuser)
+
+
+class TestLDAPQueryPaging(BaseTestCase):
+    def test_all_pages_are_read(self):
+        entries = [(f"CN=user_{i},{USERS_BASE}", {"sAMAccountName": [f"user_{i}".encode()]}) for i in range(25)]
+        connection_ = FakePagedConnection(entries=entries, page_size=10)
+        settings = LDAPSettings.model_construct(user=None, group=None)
+
+        found = list(
+            LDAPQuery(connection=connection_, settings=settings, page_size=10)._search(base_dn=USERS_BASE, filterstr="")
+        )
+
+        self.assertEqual(len(connection_.requests), 3)
+        self.assertListEqual([dn for dn, _ in found], [dn for dn, _ in entries])
+        self.assertListEqual(found[0][1]["samaccountname"], ["user_0"])
@@ -11,23 +11,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from multiprocessing.connection import wait
 import os
 import sys
 import signal
 import logging
 import argparse
+import multiprocessing
 
 import adcm.init_django  # noqa: F401, isort:skip
+from cm.models import JobStatus, TaskLog
 from cm.services.job.run import get_default_runner, get_restart_runner
+from django.db import connections
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("command", choices=["start", "restart"])
-    parser.add_argument("task_id", type=int)
-    args = parser.parse_args()
+def run(command: str, task_id: int) -> int:
+    if command == "start" and not TaskLog.objects.filter(id=task_id, status=JobStatus.CREATED).exists():
+        # task may be cancelled while waiting in queue of scheduler or batch runner
+        logging.getLogger("task_runner_err").info(f"Task #{task_id} is not waiting for start, skipping")
+        return 0
 
-    runner = get_restart_runner() if args.command == "restart" else get_default_runner()
+    runner = get_restart_runner() if command == "restart" else get_default_runner()
 
     logger = logging.getLogger("task_runner_err")
 
@@ -51,7 +55,7 @@ def main():
     signal.signal(signal.SIGTERM, terminate)
 
     try:
-        runner.run(task_id=args.task_id)
+        runner.run(task_id=task_id)
     except:  # noqa: E722
         logger.exception("Unhandled error occurred during runner execution")
 
@@ -59,7 +63,67 @@ def main():
 
         exit_["code"] = 1
 
-    sys.exit(exit_["code"])
+    return exit_["code"]
+
+
+def run_forked(task_id: int) -> None:
+    sys.exit(run(command="start", task_id=task_id))
+
+
+def run_batch(task_ids: list[int], concurrency: int) -> int:
+    # tasks of the same owner (e.g. host action on hosts of one cluster) affect the same objects,
+    # so they are run one by one, like they would be if launched separately
+    owners = {
+        task_id: (owner_type, owner_id)
+        for task_id, owner_type, owner_id in TaskLog.objects.filter(id__in=task_ids).values_list(
+            "id", "owner_type", "owner_id"
+        )
+    }
+
+    # Django is initialized only once here, each task is run in a forked process,
+    # so it still has its own pid to be terminated by and doesn't pay for cold start
+    connections.close_all()
+    context = multiprocessing.get_context("fork")
+
+    queue = list(task_ids)
+    running = {}
+    while queue or running:
+        busy_owners = {owner for _, owner in running.values()}
+        for task_id in tuple(queue):
+            if len(running) >= concurrency:
+                break
+
+            owner = owners.get(task_id)
+            if owner in busy_owners:
+                continue
+
+            queue.remove(task_id)
+            process = context.Process(target=run_forked, args=(task_id,))
+            process.start()
+            running[process.sentinel] = process, owner
+            busy_owners.add(owner)
+
+        for sentinel in wait(list(running)):
+            process, _ = running.pop(sentinel)
+            process.join()
+
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["start", "restart", "start-batch"])
+    parser.add_argument("task_id", type=int, nargs="+")
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "start-batch":
+        sys.exit(run_batch(task_ids=args.task_id, concurrency=max(args.concurrency, 1)))
+
+    if len(args.task_id) != 1:
+        parser.error(f"exactly one task id is expected for {args.command}")
+
+    sys.exit(run(command=args.command, task_id=args.task_id[0]))
 
 
 if __name__ == "__main__":